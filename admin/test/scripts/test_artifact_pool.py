@@ -0,0 +1,214 @@
+"""Guard the pieces --workers relies on to assemble a report that reads like a serial run.
+
+With --workers N, scripts/artifact_pool.py runs artifacts in worker processes, each one
+writing to a staging _lava_artifacts.db, and the main process merges them back in the
+order the artifacts were selected. A merge that drops rows, lets a second copy of a
+media item in, or reorders the device info would leave a report that looks complete but
+differs from the serial one, and nothing downstream would notice.
+
+The seekers are handed to the workers by pickling them, which an open ZipFile or
+TarFile handle does not survive, so the archive seekers reopen their archive instead.
+"""
+import pathlib
+import pickle
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+import zipfile
+
+from types import SimpleNamespace
+from unittest import mock
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import artifact_pool  # pylint: disable=wrong-import-position
+from scripts import ilapfuncs  # pylint: disable=wrong-import-position
+from scripts import lavafuncs  # pylint: disable=wrong-import-position
+from scripts.artifact_pool import runs_in_pool  # pylint: disable=wrong-import-position
+from scripts.artifacts import Ph006ViewedPlayData, burnerCache  # pylint: disable=wrong-import-position
+from scripts.context import Context  # pylint: disable=wrong-import-position
+from scripts.search_files import FileSeekerZip  # pylint: disable=wrong-import-position
+
+
+class TestRunsInPool(unittest.TestCase):
+    """Artifacts with ordering constraints stay in the main process."""
+
+    def _plugin(self, name, module_name, search=('*/file',)):
+        return SimpleNamespace(name=name, module_name=module_name, search=search)
+
+    def test_independent_artifact_runs_in_pool(self):
+        self.assertTrue(runs_in_pool(self._plugin('burnerCache_accounts', 'burnerCache')))
+
+    def test_ordered_artifacts_run_in_main_process(self):
+        self.assertFalse(runs_in_pool(self._plugin('last_build', 'lastBuild')))
+        self.assertFalse(runs_in_pool(self._plugin('logarchive', 'logarchive')))
+        self.assertFalse(runs_in_pool(self._plugin('logarchive_artifacts', 'logarchive')))
+        self.assertFalse(runs_in_pool(self._plugin('lava_reader', 'lavaReader', search=None)))
+
+
+class TestTaskKey(unittest.TestCase):
+    """The Photos.sqlite modules share one task, any other module is a task of its own."""
+
+    def test_photos_modules_share_a_task(self):
+        photos = SimpleNamespace(name='Ph006_1ViewandPlayDataPhDaPsql', module_name='Ph006ViewedPlayData',
+                                 method=Ph006ViewedPlayData.Ph006_1ViewandPlayDataPhDaPsql)
+        burner = SimpleNamespace(name='burnerCache_accounts', module_name='burnerCache',
+                                 method=burnerCache.burnerCache_accounts)
+        self.assertEqual(artifact_pool._task_key(photos), artifact_pool.PHOTOS_TASK)  # pylint: disable=protected-access
+        self.assertEqual(artifact_pool._task_key(burner), 'burnerCache')  # pylint: disable=protected-access
+
+
+class TestLavaMergeStagedOutput(unittest.TestCase):
+    """A staged LAVA database merges into the run's database without loss or duplicates."""
+
+    def setUp(self):
+        self.tmpdir = pathlib.Path(tempfile.mkdtemp())
+        self.staging = self.tmpdir / '_parallel' / '1'
+        self.staging.mkdir(parents=True)
+        Context.set_artifact_info({'description': ''})
+        Context.set_module_file_path('testModule.py')
+        lavafuncs.initialize_lava(str(self.tmpdir), str(self.staging), 'fs')
+        self.staged = self._write_artifact('Staged artifact', [('one',), ('two',)], 'media-1')
+        lavafuncs.lava_db.commit()
+        lavafuncs.lava_db.close()
+        lavafuncs.initialize_lava(str(self.tmpdir), str(self.tmpdir), 'fs')
+        self._write_artifact('Main artifact', [('three',)], 'media-1')
+
+    def tearDown(self):
+        if lavafuncs.lava_db is not None:
+            lavafuncs.lava_db.close()
+            lavafuncs.lava_db = None
+        lavafuncs.lava_data = None
+        Context.clear()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write_artifact(self, artifact_name, rows, media_id):
+        table_name, object_columns, column_map = lavafuncs.lava_process_artifact(
+            'Tests', 'testModule', artifact_name, ['Value'], len(rows))
+        lavafuncs.lava_insert_sqlite_data(table_name, rows, object_columns, ['Value'], column_map)
+        lavafuncs.lava_db.execute(
+            'INSERT INTO _lava_media_items (id, source_path, extraction_path, type, metadata, '
+            'created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (media_id, 'src', 'dst', 'image/png', '', 0, 0))
+        return {
+            'artifacts': lavafuncs.lava_data['artifacts'],
+            'modules': lavafuncs.lava_data['meta']['modules'],
+        }
+
+    def test_merge_copies_tables_metadata_and_media_once(self):
+        lavafuncs.lava_merge_staged_output(str(self.staging / lavafuncs.lava_db_name),
+                                           self.staged['artifacts'], self.staged['modules'])
+
+        rows = lavafuncs.lava_db.execute('SELECT value FROM staged_artifact').fetchall()
+        self.assertEqual(rows, [('one',), ('two',)])
+        media = lavafuncs.lava_db.execute('SELECT COUNT(*) FROM _lava_media_items').fetchone()[0]
+        self.assertEqual(media, 1)
+        self.assertEqual([a['name'] for a in lavafuncs.lava_data['artifacts']['Tests']],
+                         ['Main artifact', 'Staged artifact'])
+        modules = lavafuncs.lava_data['meta']['modules']
+        self.assertEqual(len(modules), 1)
+        self.assertEqual([a['name'] for a in modules[0]['artifacts']], ['Main artifact', 'Staged artifact'])
+
+
+class TestMergeDeviceInfo(unittest.TestCase):
+    """Device info from a worker is added after what the main process already recorded."""
+
+    def setUp(self):
+        ilapfuncs.identifiers.clear()
+
+    def tearDown(self):
+        ilapfuncs.identifiers.clear()
+
+    def test_values_are_appended_after_existing_ones(self):
+        ilapfuncs.device_info('Device', 'Model', 'iPhone14,2')
+        staged = {'Device': {
+            'Model': {'value': 'iPhone14,3', 'source_file': '', 'artifact': 'worker'},
+            'Name': {'value': 'phone', 'source_file': '', 'artifact': 'worker'},
+        }}
+        ilapfuncs.merge_device_info(staged)
+        models = ilapfuncs.identifiers['Device']['Model']
+        self.assertEqual([model['value'] for model in models], ['iPhone14,2', 'iPhone14,3'])
+        self.assertEqual(ilapfuncs.identifiers['Device']['Name']['value'], 'phone')
+
+
+class TestMergeStagedExports(unittest.TestCase):
+    """Timeline rows staged by a worker end up in the report's timeline database."""
+
+    def setUp(self):
+        self.tmpdir = pathlib.Path(tempfile.mkdtemp())
+        self.staging = self.tmpdir / '_parallel' / '1'
+        (self.staging / '_Timeline').mkdir(parents=True)
+        db = sqlite3.connect(self.staging / '_Timeline' / 'tl.db')
+        db.execute('CREATE TABLE data (key TEXT, activity TEXT, datalist TEXT)')
+        db.execute("INSERT INTO data VALUES ('2024-01-01', 'Staged', '{}')")
+        db.commit()
+        db.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_staged_timeline_rows_are_merged(self):
+        ilapfuncs.merge_staged_exports(str(self.staging), str(self.tmpdir))
+        db = sqlite3.connect(self.tmpdir / '_Timeline' / 'tl.db')
+        self.assertEqual(db.execute('SELECT activity FROM data').fetchall(), [('Staged',)])
+        db.close()
+
+
+class TestArchiveSeekerPickling(unittest.TestCase):
+    """Archive seekers survive the trip to a worker process."""
+
+    def setUp(self):
+        self.tmpdir = pathlib.Path(tempfile.mkdtemp())
+        self.archive = self.tmpdir / 'extraction.zip'
+        with zipfile.ZipFile(self.archive, 'w') as zf:
+            zf.writestr('private/var/mobile/Library/test.plist', b'data')
+        self.data_folder = self.tmpdir / 'data'
+        self.data_folder.mkdir()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_zip_seeker_reopens_archive(self):
+        seeker = FileSeekerZip(str(self.archive), str(self.data_folder))
+        copy = pickle.loads(pickle.dumps(seeker))
+        try:
+            found = copy.search('*/Library/test.plist')
+            self.assertEqual(len(found), 1)
+            self.assertEqual(pathlib.Path(found[0]).read_bytes(), b'data')
+        finally:
+            copy.zip_file.close()
+            seeker.zip_file.close()
+
+    def test_forked_seeker_opens_its_own_archive(self):
+        seeker = FileSeekerZip(str(self.archive), str(self.data_folder))
+        inherited = seeker.zip_file
+        seeker.reopen()
+        self.assertIs(seeker.zip_file, inherited)  # same process, nothing to do
+        seeker._pid = -1  # pylint: disable=protected-access
+        seeker.reopen()
+        try:
+            self.assertIsNot(seeker.zip_file, inherited)
+            self.assertEqual(len(seeker.search('*/Library/test.plist')), 1)
+        finally:
+            inherited.close()
+            seeker.zip_file.close()
+
+
+class TestWorkerCleanups(unittest.TestCase):
+    """Pool workers exit without running atexit, so each task runs the module cleanups."""
+
+    def test_cleanups_run_after_a_task(self):
+        calls = []
+        cleanup = ilapfuncs.register_cleanup(lambda: calls.append('cleaned'))
+        self.addCleanup(ilapfuncs._cleanups.remove, cleanup)  # pylint: disable=protected-access
+        with mock.patch.object(artifact_pool, '_run_artifact', side_effect=RuntimeError('failed')):
+            with self.assertRaises(RuntimeError):
+                artifact_pool._run_task('unused', [('artifact', [], 'category')])  # pylint: disable=protected-access
+        self.assertEqual(calls, ['cleaned'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""Guard the string extraction of scripts/ascii_strings.py and the walStrings artifacts.
+
+The strings of a journal are read through a memory map, counted in a StringCounts that
+moves to a temporary database past STRINGS_MAX_IN_MEMORY distinct strings, written to a
+text file per journal, across processes with --workers, and walStringsDetails streams
+its rows back from those files. Whatever the path taken, the strings, first offsets,
+counts and their order have to be those the artifact found when it read each journal
+whole into memory, and the temporary files must not be left behind.
+"""
+import os
+import pathlib
+import random
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import ascii_strings  # pylint: disable=wrong-import-position
+from scripts.artifacts import walStrings  # pylint: disable=wrong-import-position
+
+
+def reference_strings(data):
+    """The extraction walStrings used to do, over the whole file in memory."""
+    strings = {}
+    total_matches = 0
+    for match in re.finditer(rb'[\x20-\x7e]{4,}', data):
+        raw_value = match.group()
+        value = raw_value.decode('ascii').strip()
+        if len(value) < 4:
+            continue
+        total_matches += 1
+        offset = match.start() + len(raw_value) - len(raw_value.lstrip())
+        if value in strings:
+            strings[value][1] += 1
+        else:
+            strings[value] = [offset, 1]
+    return [(value, offset, count) for value, (offset, count) in strings.items()], total_matches
+
+
+def journal_bytes(seed, size=20000):
+    """Binary noise with strings, repeated strings and space padded strings in it."""
+    rng = random.Random(seed)
+    words = [f'{word}_{number}'.encode() for number in range(40) for word in ('INSERT', 'url', 'msg')]
+    words += [b'    ', b'  ab  ', b'   padded value   ', b'tiny', b'abc']
+    chunks = []
+    while sum(map(len, chunks)) < size:
+        chunks.append(bytes(rng.randrange(256) for _ in range(rng.randrange(1, 12))))
+        chunks.append(rng.choice(words))
+    return b''.join(chunks)
+
+
+class StubContext:
+    """The parts of Context that process_journal_files() reads."""
+
+    def __init__(self, files_found, report_folder):
+        self.files_found = files_found
+        self.report_folder = report_folder
+
+    def get_files_found(self):
+        return self.files_found
+
+    def get_report_folder(self):
+        return self.report_folder
+
+    @staticmethod
+    def get_relative_path(path):
+        return os.path.basename(path)
+
+
+class TestAsciiStrings(unittest.TestCase):
+    """Strings are found, counted and ordered as when each file was read whole."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, True)
+
+    def write(self, name, data):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def test_strings_match_the_whole_file_extraction(self):
+        data = journal_bytes(1)
+        path = self.write('a.db-wal', data)
+        expected, expected_total = reference_strings(data)
+        for max_in_memory in (None, 7, 1):
+            strings, total = ascii_strings.extract_strings(path, max_in_memory)
+            with strings:
+                self.assertEqual(list(strings.items()), expected)
+                self.assertEqual(len(strings), len(expected))
+            self.assertEqual(total, expected_total)
+
+    def test_spilled_counts_are_deleted(self):
+        path = self.write('a.db-wal', journal_bytes(2))
+        spill_paths = []
+        real_mkstemp = tempfile.mkstemp
+
+        def mkstemp(**kwargs):
+            handle, spill_path = real_mkstemp(dir=self.tmpdir, **kwargs)
+            spill_paths.append(spill_path)
+            return handle, spill_path
+
+        with mock.patch.object(ascii_strings.tempfile, 'mkstemp', mkstemp):
+            strings, _ = ascii_strings.extract_strings(path, 5)
+            with strings:
+                self.assertTrue(os.path.exists(spill_paths[0]))
+                list(strings.items())
+        self.assertEqual(len(spill_paths), 1)
+        self.assertFalse(os.path.exists(spill_paths[0]))
+
+    def test_files_written_across_processes(self):
+        datas = [journal_bytes(seed) for seed in range(4)] + [b'\x00\x01 no', b'']
+        jobs = [(self.write(f'{index}.db-wal', data), os.path.join(self.tmpdir, f'{index}.txt'))
+                for index, data in enumerate(datas)]
+        jobs.append((os.path.join(self.tmpdir, 'missing-wal'), os.path.join(self.tmpdir, 'missing.txt')))
+        with mock.patch.object(ascii_strings, 'STRINGS_PARALLEL_MIN_BYTES', 0):
+            parallel = ascii_strings.write_strings_files(jobs, workers=2)
+        serial = ascii_strings.write_strings_files(jobs, workers=1)
+        for results in (parallel, serial):
+            for (file_path, output_path), data, (total, distinct, error) in zip(jobs, datas, results):
+                expected, expected_total = reference_strings(data)
+                self.assertIsNone(error)
+                self.assertEqual((total, distinct), (expected_total, len(expected)))
+                if expected:
+                    self.assertEqual(list(ascii_strings.read_strings_file(output_path)), expected)
+                else:
+                    self.assertFalse(os.path.exists(output_path), file_path)
+            self.assertIsInstance(results[-1][2], FileNotFoundError)
+
+    def test_wal_strings_artifacts(self):
+        datas = [journal_bytes(5), b'\x00' * 10, journal_bytes(6)]
+        files_found = [self.write(name, data) for name, data in zip(('a.db-wal', 'b.db-wal', 'c.db-journal'), datas)]
+        report_folder = os.path.join(self.tmpdir, 'Database Metadata')
+        os.makedirs(report_folder)
+        context = StubContext(files_found, report_folder)
+        self.addCleanup(walStrings._extraction_cache.clear)  # pylint: disable=protected-access
+
+        summary, html_summary, strings_files, source_path = walStrings.process_journal_files(context)
+        self.assertIs(walStrings.process_journal_files(context)[2], strings_files)
+        self.assertEqual(source_path, 'a.db-wal')
+        self.assertEqual([row[:4] for row in summary], [
+            ('Database Metadata/1_a.db-wal.txt', 'a.db-wal', reference_strings(datas[0])[1],
+             len(reference_strings(datas[0])[0])),
+            ('Database Metadata/2_c.db-journal.txt', 'c.db-journal', reference_strings(datas[2])[1],
+             len(reference_strings(datas[2])[0])),
+        ])
+        self.assertEqual(len(html_summary), 2)
+        self.assertEqual(sorted(os.listdir(report_folder)), ['1_a.db-wal.txt', '2_c.db-journal.txt'])
+
+        expected_rows = [(value, len(value), offset, count, name, name)
+                         for name, data in (('a.db-wal', datas[0]), ('c.db-journal', datas[2]))
+                         for value, offset, count in reference_strings(data)[0]]
+        self.assertEqual(list(walStrings._detail_rows(strings_files)), expected_rows)  # pylint: disable=protected-access
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""Guard the batch SEGB reader of scripts/biome_reader.py.
+
+The biome* artifacts read their streams through read_biome_batches() instead of
+ccl_segb.read_segb_file(). The records of a file have to be those ccl_segb yields, with
+the same timestamps, states, offsets and payloads, including for the trailer quirks of
+SEGB v2 files (entries sharing an end offset, empty, zeroed and stale entries). A payload
+that does not decode has to raise from record.decode() where decode_message() raised
+before, and reading a stream across processes must give the records of a serial read. A
+serial read yields the batch of one file before reading the next.
+"""
+import os
+import pathlib
+import shutil
+import struct
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import biome_reader  # pylint: disable=wrong-import-position
+from scripts.ccl_segb.ccl_segb import read_segb_file  # pylint: disable=wrong-import-position
+from scripts.ccl_segb.ccl_segb_common import EntryState  # pylint: disable=wrong-import-position
+
+TYPEDEF = {'1': {'name': '', 'type': 'str'}, '2': {'name': '', 'type': 'int'}}
+
+
+def message(text, number):
+    encoded = text.encode()
+    return b'\x0a' + bytes([len(encoded)]) + encoded + b'\x10' + bytes([number])
+
+
+def segb2(entries, extra_trailer=()):
+    """entries: (payload, state, timestamp); extra_trailer: raw (end offset, state, timestamp)"""
+    body = b''
+    trailer = []
+    for payload, state, timestamp in entries:
+        body += struct.pack('Ii', 0, 0) + payload
+        trailer.append((len(body), state, timestamp))
+        body += b'\x00' * (-len(body) % 4)
+    trailer.extend(extra_trailer)
+    header = struct.pack('<4sid16s', b'SEGB', len(trailer), 700000000.0, b'\x00' * 16)
+    return header + body + b''.join(struct.pack('<2id', *entry) for entry in trailer)
+
+
+def segb1(entries):
+    records = b''
+    for payload, state, timestamp in entries:
+        records += struct.pack('<iiddIi', len(payload), state, timestamp, timestamp, 0, 0) + payload
+        records += b'\x00' * (-(56 + len(records)) % 8)
+    header = struct.pack('<I', 56 + len(records)) + b'\x00' * 48 + b'SEGB'
+    return header + records
+
+
+class TestBiomeReader(unittest.TestCase):
+    """Batches hold the records ccl_segb reads, decoded against the typedef of the stream."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(content)
+        return path
+
+    def _ccl_records(self, path):
+        return [(record.timestamp1, record.state, record.data_start_offset, record.data)
+                for record in read_segb_file(path)]
+
+    def _batch_records(self, batch):
+        return [(record.timestamp1, record.state, record.data_start_offset, record.data) for record in batch]
+
+    def test_segb2_records_match_ccl_segb(self):
+        path = self._write('2', segb2(
+            [(message('first', 1), 1, 700000001.0), (message('second', 2), 3, 700000002.0),
+             (b'', 4, 700000003.0), (message('third!', 3), 1, 700000004.0)],
+            # A zeroed slot, a second entry for the data of the first record, as deleting it
+            # leaves, and a stale entry pointing inside the first record
+            extra_trailer=[(0, 0, 0.0), (17, 3, 700000005.0), (20, 1, 700000006.0)]))
+        batch = biome_reader.read_segb_batch(path, TYPEDEF)
+        self.assertEqual(self._batch_records(batch), self._ccl_records(path))
+        self.assertEqual([record.state for record in batch],
+                         [EntryState.Written, EntryState.Deleted, EntryState.Deleted, EntryState.Written])
+
+    def test_segb1_records_match_ccl_segb(self):
+        path = self._write('1', segb1([(message('first', 1), 1, 700000001.0), (message('odd', 2), 3, 700000002.0),
+                                       (message('third', 3), 1, 700000003.0)]))
+        batch = biome_reader.read_segb_batch(path, TYPEDEF)
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(self._batch_records(batch), self._ccl_records(path))
+
+    def test_payloads_are_decoded_against_the_typedef(self):
+        path = self._write('2', segb2([(message('first', 1), 1, 700000001.0), (b'\xff\xff', 1, 700000002.0),
+                                       (message('gone', 2), 3, 700000003.0)]))
+        first, broken, deleted = biome_reader.read_segb_batch(path, TYPEDEF)
+        self.assertEqual(first.decode(), {'1': 'first', '2': 1})
+        with self.assertRaises(Exception):
+            broken.decode()
+        with self.assertRaises(ValueError):
+            deleted.decode()
+        untyped, = biome_reader.read_segb_batch(self._write('3', segb2([(message('x', 5), 1, 1.0)])), {})
+        self.assertEqual(untyped.decode(), {'1': b'x', '2': 5})
+
+    def test_not_a_segb_file(self):
+        with self.assertRaises(ValueError):
+            biome_reader.read_segb_batch(self._write('plain', b'not a segb file at all' * 4))
+
+    def test_stream_files(self):
+        kept = self._write('local/2', segb2([(message('a', 1), 1, 1.0)]))
+        self._write('local/.DS_Store', b'')
+        self._write('tombstone/3', segb2([(message('b', 2), 1, 2.0)]))
+        files_found = [kept, os.path.join(self.tmpdir, 'local/.DS_Store'), os.path.join(self.tmpdir, 'local'),
+                       os.path.join(self.tmpdir, 'tombstone/3')]
+        self.assertEqual(biome_reader.get_stream_files(map(pathlib.Path, files_found)), [kept])
+        self.assertEqual([batch.file_path for batch in biome_reader.read_biome_batches(files_found)], [kept])
+
+    def test_parallel_read_matches_serial_read(self):
+        files_found = [self._write(str(number), segb2([(message(f'r{number}-{index}', index), 1, float(index))
+                                                       for index in range(1, 30)])) for number in range(8)]
+        self.addCleanup(setattr, biome_reader, 'BIOME_PARALLEL_MIN_BYTES', biome_reader.BIOME_PARALLEL_MIN_BYTES)
+        biome_reader.BIOME_PARALLEL_MIN_BYTES = 0
+        serial = list(biome_reader.read_biome_batches(files_found, TYPEDEF))
+        parallel = list(biome_reader.read_biome_batches(files_found, TYPEDEF, workers=2))
+        self.assertEqual([batch.file_path for batch in parallel], files_found)
+        self.assertEqual([[(record.data_start_offset, record.decode()) for record in batch] for batch in parallel],
+                         [[(record.data_start_offset, record.decode()) for record in batch] for batch in serial])
+
+    def test_serial_read_holds_one_file_at_a_time(self):
+        files_found = [self._write(str(number), segb2([(message(f'r{number}', 1), 1, 1.0)])) for number in range(3)]
+        read_segb_batch = biome_reader.read_segb_batch
+        with mock.patch.object(biome_reader, 'read_segb_batch', wraps=read_segb_batch) as read:
+            batches = biome_reader.read_biome_batches(files_found, TYPEDEF)
+            self.assertEqual(read.call_count, 0)
+            self.assertEqual(next(batches).file_path, files_found[0])
+            self.assertEqual(read.call_count, 1)
+            self.assertEqual([batch.file_path for batch in batches], files_found[1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
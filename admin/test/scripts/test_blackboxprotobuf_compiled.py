@@ -0,0 +1,131 @@
+"""Guard the compiled typedefs of the vendored blackboxprotobuf.
+
+decode_message() decodes against a table compiled once per typedef instead of the
+released decoder, which it only falls back to for the cases the table does not
+reproduce. The artifacts are written against the output of the released decoder, so the
+values, the typedef returned and the exceptions raised have to be exactly those of
+length_delim.decode_message(), for typed, untyped and malformed messages alike.
+"""
+import pathlib
+import random
+import struct
+import sys
+import unittest
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from google.protobuf.internal import encoder  # pylint: disable=wrong-import-position
+
+from scripts import blackboxprotobuf  # pylint: disable=wrong-import-position
+from scripts.blackboxprotobuf.lib import compiled  # pylint: disable=wrong-import-position
+from scripts.blackboxprotobuf.lib.types import length_delim  # pylint: disable=wrong-import-position
+
+TYPES = ['int', 'uint', 'sint', 'fixed32', 'fixed64', 'sfixed32', 'float', 'double', 'str', 'bytes',
+         'packed_int', 'message', 'group']
+
+
+def varint(value):
+    output = bytearray()
+    encoder._EncodeVarint(output.extend, value)  # pylint: disable=protected-access
+    return bytes(output)
+
+
+def random_message(rng, depth=0):
+    output = b''
+    for _ in range(rng.randint(0, 6)):
+        wire_type = rng.choice([0, 0, 1, 2, 2, 2, 5]) if rng.random() < 0.9 else rng.randint(0, 7)
+        output += varint(rng.randint(1, 7) << 3 | wire_type)
+        if wire_type == 0:
+            output += varint(rng.choice([0, 1, 300, 2 ** 40, 2 ** 64 - 5]))
+        elif wire_type in (1, 5):
+            output += bytes(rng.getrandbits(8) for _ in range(8 if wire_type == 1 else 4))
+        elif wire_type == 2:
+            if depth < 3 and rng.random() < 0.5:
+                inner = random_message(rng, depth + 1)
+            else:
+                inner = rng.choice([b'hello', 'héllo'.encode(), b'\xff\x00', b''])
+            output += varint(len(inner)) + inner
+    if rng.random() < 0.05:
+        output = output[:rng.randint(0, len(output))]
+    return output
+
+
+def random_typedef(rng, depth=0):
+    typedef = {}
+    for field_number in rng.sample(range(1, 8), rng.randint(0, 5)):
+        field_typedef = {'type': rng.choice(TYPES)}
+        if rng.random() < 0.8:
+            field_typedef['name'] = rng.choice(['', '', f'field{field_number}', 'same'])
+        if field_typedef['type'] == 'message' and depth < 2 and rng.random() < 0.9:
+            field_typedef['message_typedef'] = random_typedef(rng, depth + 1)
+        typedef[str(field_number)] = field_typedef
+    return typedef
+
+
+def outcome(function, *args):
+    try:
+        return 'ok', function(*args)
+    except Exception as ex:  # pylint: disable=broad-exception-caught
+        return 'error', type(ex), str(ex)
+
+
+def released(buf, typedef):
+    length_delim.reset_guess_budget()
+    values, typedef_out, _ = length_delim.decode_message(buf, typedef)
+    return values, typedef_out
+
+
+class TestCompiledTypedef(unittest.TestCase):
+    """decode_message() and decode_messages() give what the released decoder gives."""
+
+    def test_random_messages_match_the_released_decoder(self):
+        rng = random.Random(16)
+        for _ in range(2000):
+            typedef = random_typedef(rng)
+            for _ in range(3):
+                buf = random_message(rng)
+                expected = outcome(released, buf, typedef)
+                # repr() so that NaN floats compare equal
+                self.assertEqual(repr(outcome(blackboxprotobuf.decode_message, buf, typedef)), repr(expected),
+                                 (buf, typedef))
+                batch = outcome(blackboxprotobuf.decode_messages, [buf], typedef)
+                if expected[0] == 'ok':
+                    self.assertEqual(repr(batch), repr(('ok', [expected[1][0]])))
+                else:
+                    self.assertEqual(batch, expected)
+
+    def test_typed_and_discovered_fields(self):
+        typedef = {'1': {'name': '', 'type': 'str'}, '2': {'name': '', 'type': 'double'},
+                   '4': {'type': 'message', 'message_typedef': {'1': {'name': 'label', 'type': 'str'}}}}
+        buf = (b'\x0a\x03abc' + b'\x11' + struct.pack('<d', 1.5) + b'\x22\x03\x0a\x01x' + b'\x22\x03\x0a\x01y'
+               + b'\x28\x07' + b'\x28\x08' + b'\x32\x02\x08\x01')
+        values, typedef_out = blackboxprotobuf.decode_message(buf, typedef)
+        self.assertEqual(values, {'1': 'abc', '2': 1.5, '4': [{'label': 'x'}, {'label': 'y'}], '5': [7, 8],
+                                  '6': {'1': 1}})
+        self.assertEqual((values, typedef_out), released(buf, typedef))
+        self.assertEqual(typedef_out['4'], {'type': 'message',
+                                            'message_typedef': {'1': {'name': 'label', 'type': 'str'}}, 'name': ''})
+        self.assertNotIn('5', typedef)
+        self.assertNotIn('name', typedef['4'])
+
+    def test_typedef_is_compiled_once(self):
+        typedef = {'1': {'name': '', 'type': 'int'}}
+        first = compiled.compile_typedef(typedef)
+        self.assertIs(compiled.compile_typedef(typedef), first)
+        self.assertIsNot(compiled.compile_typedef({'1': {'name': '', 'type': 'int'}}), first)
+
+    def test_batch_errors(self):
+        typedef = {'1': {'name': '', 'type': 'int'}}
+        with self.assertRaises(ValueError):
+            blackboxprotobuf.decode_messages([b'\x08\x01', b'\x0a\x01x'], typedef)
+        errors = []
+        values = blackboxprotobuf.decode_messages([b'\x08\x01', b'\x0a\x01x', b'\x08\x02'], typedef, errors)
+        self.assertEqual(values, [{'1': 1}, None, {'1': 2}])
+        self.assertIsNone(errors[0])
+        self.assertIsInstance(errors[1], ValueError)
+        self.assertIsNone(errors[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
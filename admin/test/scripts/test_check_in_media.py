@@ -0,0 +1,100 @@
+"""Guard check_in_media() for artifacts that check in thousands of attachments.
+
+check_in_media() used to read every file it was given whole, and query the LAVA
+database twice, for each media cell. It now sniffs the type from the first 8 KB of the
+file, which is all scripts/filetype.py looks at, and keeps the ids of the media items
+and references of the run in memory. A media item checked in twice, a reference that
+goes missing, or a type that comes out different from a full read would only show up
+as a broken thumbnail in the report.
+
+get_data_list_with_media() then resolves the references of all the rows of an artifact
+with a few IN queries instead of one query per cell, and has to build the same HTML and
+TSV cells as looking each one up did.
+"""
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import unittest
+
+from types import SimpleNamespace
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import lavafuncs  # pylint: disable=wrong-import-position
+from scripts.context import Context  # pylint: disable=wrong-import-position
+from scripts.filetype import guess_mime  # pylint: disable=wrong-import-position
+from scripts.ilapfuncs import check_in_media, get_data_list_with_media  # pylint: disable=wrong-import-position
+from scripts.search_files import FileInfo  # pylint: disable=wrong-import-position
+
+# A PNG header followed by more data than the 8 KB the type is sniffed from
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00\x00\x00\rIHDR' + os.urandom(64 * 1024)
+
+
+class TestCheckInMedia(unittest.TestCase):
+    """Media is checked in once per run and once per artifact reference."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        output = SimpleNamespace(output_folder_base=self.tmpdir,
+                                 media_folder=os.path.join(self.tmpdir, 'media'),
+                                 html_media_folder=os.path.join(self.tmpdir, '_HTML', 'media'))
+        os.makedirs(output.media_folder)
+        os.makedirs(output.html_media_folder)
+        self.attachment = os.path.join(self.tmpdir, 'data', 'Attachments', 'IMG_0001.PNG')
+        os.makedirs(os.path.dirname(self.attachment))
+        pathlib.Path(self.attachment).write_bytes(PNG)
+        seeker = SimpleNamespace(file_infos={self.attachment: FileInfo('/private/var/IMG_0001.PNG', 1, 2)},
+                                 materialize=lambda path: path)
+        lavafuncs.initialize_lava(self.tmpdir, self.tmpdir, 'fs')
+        Context.set_output_params(output)
+        Context.set_seeker(seeker)
+        Context.set_files_found([self.attachment])
+        Context.set_module_name('testModule')
+        Context.set_artifact_name('Attachments')
+
+    def tearDown(self):
+        if lavafuncs.lava_db is not None:
+            lavafuncs.lava_db.close()
+            lavafuncs.lava_db = None
+        lavafuncs.lava_data = None
+        Context.clear()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _count(self, table_name):
+        lavafuncs.lava_flush()
+        return lavafuncs.lava_db.execute(f'SELECT COUNT(*) FROM {table_name}').fetchone()[0]
+
+    def test_type_matches_full_read(self):
+        media_ref_id = check_in_media(self.attachment)
+        media_item = lavafuncs.lava_get_full_media_info(media_ref_id)
+        self.assertEqual(media_item['type'], guess_mime(PNG))
+        self.assertEqual(pathlib.Path(self.tmpdir, media_item['extraction_path']).read_bytes(), PNG)
+
+    def test_media_is_checked_in_once(self):
+        first = check_in_media(self.attachment)
+        self.assertEqual(check_in_media(self.attachment), first)
+        Context.set_artifact_name('Other attachments')
+        self.assertNotEqual(check_in_media(self.attachment), first)
+        self.assertEqual(self._count('_lava_media_items'), 1)
+        self.assertEqual(self._count('_lava_media_references'), 2)
+
+    def test_data_list_resolves_every_reference(self):
+        # More references than fit in one IN query
+        media_ref_ids = [check_in_media(self.attachment, f'IMG_{number:04}.PNG')
+                         for number in range(lavafuncs.LAVA_MEDIA_INFO_CHUNK_SIZE + 1)]
+        data_list = [('single', media_ref_ids[0]), ('list', media_ref_ids[1:]), ('none', None),
+                     ('unknown', 'not-a-reference')]
+        html_data_list, txt_data_list = get_data_list_with_media({1: ''}, data_list)
+        extraction_path = lavafuncs.lava_get_full_media_info(media_ref_ids[0])['extraction_path']
+        self.assertEqual([row[1] for row in txt_data_list],
+                         [extraction_path, ' | '.join([extraction_path] * len(media_ref_ids[1:])), '', ''])
+        self.assertEqual(html_data_list[1][1].count('<img'), len(media_ref_ids[1:]))
+        self.assertIn('title="IMG_0000.PNG"', html_data_list[0][1])
+        self.assertEqual(html_data_list[3][1], '')
+
+
+if __name__ == '__main__':
+    unittest.main()
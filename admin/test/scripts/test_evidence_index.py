@@ -0,0 +1,119 @@
+"""Guard --evidence_index, which reuses a seeker's file listing on the next run.
+
+FileSeekerDir and FileSeekerItunes save their listing in scripts/evidence_index.py the
+first time they see an evidence source and load it from there afterwards. A listing
+that loads with fewer paths, paths in another form, or the dates of another file would
+not fail anywhere: the artifacts would just find less, or report the wrong dates.
+"""
+import os
+import pathlib
+import plistlib
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+# pylint: disable-next=wrong-import-position
+from scripts.evidence_index import evidence_identity, load_files
+# pylint: disable-next=wrong-import-position
+from scripts import search_files
+# pylint: disable-next=wrong-import-position
+from scripts.search_files import FileSeekerDir, FileSeekerItunes
+
+FILES = [
+    'private/var/mobile/Library/SMS/sms.db',
+    'private/var/mobile/Library/SMS/Attachments/ab/01/IMG_0001.HEIC',
+    'private/var/mobile/Library/Preferences/com.apple.Preferences.plist',
+    'private/var/mobile/Media/PhotoData/Photos.sqlite',
+]
+
+PATTERNS = [
+    '*/Library/SMS/sms.db',
+    '*/SMS/Attachments/*.HEIC',
+    '*/Library/Preferences/*',
+    '*/Preferences/com.apple.[!x]*.plist',
+    '*/PhotoData/Photos.sqlite*',
+    '*.db*',
+    '*/Library/SMS/missing.db',
+]
+
+
+class EvidenceIndexTestCase(unittest.TestCase):
+    """Builds an extraction folder and an empty index folder."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.index_folder = os.path.join(self.tmpdir, 'index')
+        self.extraction = os.path.join(self.tmpdir, 'extraction')
+        for relative_path in FILES:
+            file_path = os.path.join(self.extraction, *relative_path.split('/'))
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            pathlib.Path(file_path).write_bytes(b'data')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+class TestDirectoryIndex(EvidenceIndexTestCase):
+    """A folder listed once is loaded from the index with the same paths."""
+
+    def test_listing_is_saved_and_reused(self):
+        first = FileSeekerDir(self.extraction, os.path.join(self.tmpdir, 'first'), self.index_folder)
+        self.assertIsNotNone(load_files(self.extraction, self.index_folder))
+        second = FileSeekerDir(self.extraction, os.path.join(self.tmpdir, 'second'), self.index_folder)
+        self.assertEqual(second._all_files, first._all_files)  # pylint: disable=protected-access
+        for pattern in PATTERNS:
+            with self.subTest(pattern=pattern):
+                self.assertEqual([os.path.relpath(path, second.data_folder) for path in second.search(pattern)],
+                                 [os.path.relpath(path, first.data_folder) for path in first.search(pattern)])
+
+    def test_new_top_level_entry_changes_identity(self):
+        identity = evidence_identity(self.extraction)
+        os.makedirs(os.path.join(self.extraction, 'System'))
+        self.assertNotEqual(evidence_identity(self.extraction), identity)
+
+
+class TestItunesIndex(EvidenceIndexTestCase):
+    """An unencrypted backup keeps the dates of each file from Manifest.db."""
+
+    def setUp(self):
+        super().setUp()
+        self.backup = os.path.join(self.tmpdir, 'backup')
+        os.makedirs(os.path.join(self.backup, 'ab'))
+        file_id = 'ab' + '0' * 38
+        pathlib.Path(self.backup, 'ab', file_id).write_bytes(b'sms')
+        db = sqlite3.connect(os.path.join(self.backup, 'Manifest.db'))
+        db.execute('CREATE TABLE Files (fileID TEXT, domain TEXT, relativePath TEXT, flags INTEGER, file BLOB)')
+        metadata = plistlib.dumps({'Birth': 1600000000, 'LastModified': 1700000000, 'Size': 3},
+                                  fmt=plistlib.PlistFormat.FMT_BINARY)
+        db.execute('INSERT INTO Files VALUES (?, ?, ?, 1, ?)', (file_id, 'HomeDomain', 'Library/SMS/sms.db', metadata))
+        db.commit()
+        db.close()
+
+    def _search(self, name):
+        seeker = FileSeekerItunes(self.backup, os.path.join(self.tmpdir, name), 'db', None, self.index_folder)
+        found = seeker.search('*/Library/SMS/sms.db')
+        return [seeker.file_infos[path] for path in found]
+
+    def test_dates_are_kept(self):
+        first = self._search('first')
+        self.assertEqual([indexed_file.size for indexed_file in load_files(self.backup, self.index_folder)], [3])
+        second = self._search('second')
+        self.assertEqual([(info.creation_date, info.modification_date) for info in second],
+                         [(info.creation_date, info.modification_date) for info in first])
+        self.assertEqual([(info.creation_date, info.modification_date) for info in second],
+                         [(1600000000, 1700000000)])
+
+    def test_metadata_is_parsed_once(self):
+        with mock.patch.object(search_files, 'get_plist_content', wraps=search_files.get_plist_content) as parsed:
+            self._search('first')
+        self.assertEqual(parsed.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""Guard the random access reader FileSeekerTar reads .tar.gz inputs through.
+
+scripts/gzip_index.py resumes inflating from the nearest checkpoint when a seek goes
+backwards instead of from the start of the archive, and scripts/evidence_index.py saves
+the member list so that a second run on the same archive does not list it again. A
+checkpoint taken at the wrong place, or a member offset saved wrong, would not fail: the
+member would just be extracted with someone else's bytes.
+"""
+import gzip
+import io
+import os
+import pathlib
+import random
+import shutil
+import sys
+import tarfile
+import tempfile
+import unittest
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.evidence_index import load_tar_members  # pylint: disable=wrong-import-position
+from scripts.gzip_index import GzipIndexedReader  # pylint: disable=wrong-import-position
+from scripts.search_files import FileSeekerTar  # pylint: disable=wrong-import-position
+
+SPACING = 64 * 1024
+
+
+class TestGzipIndexedReader(unittest.TestCase):
+    """Reads at any offset return what a sequential read returns there."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        rng = random.Random(4)
+        # Half incompressible, half repetitive, so checkpoints land at uneven input offsets
+        self.data = bytes(rng.getrandbits(8) for _ in range(300 * 1024)) + b'iLEAPP' * 60000
+        self.path = os.path.join(self.tmpdir, 'data.gz')
+        with open(self.path, 'wb') as f:
+            f.write(gzip.compress(self.data[:200000]))
+            f.write(gzip.compress(self.data[200000:]))  # concatenated members
+            f.write(b'\x00' * 512)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_sequential_read(self):
+        with GzipIndexedReader(self.path, SPACING) as reader:
+            self.assertEqual(reader.read(), self.data)
+            self.assertEqual(reader.seek(0, io.SEEK_END), len(self.data))
+
+    def test_random_seeks(self):
+        rng = random.Random(7)
+        with GzipIndexedReader(self.path, SPACING) as reader:
+            reader.seek(0, io.SEEK_END)
+            for _ in range(200):
+                offset = rng.randrange(len(self.data))
+                size = rng.randrange(1, 5000)
+                reader.seek(offset)
+                self.assertEqual(reader.read(size), self.data[offset:offset + size])
+                self.assertEqual(reader.tell(), min(offset + size, len(self.data)))
+
+    def test_every_checkpoint_resumes_from_the_file(self):
+        with GzipIndexedReader(self.path, SPACING) as reader:
+            reader.seek(0, io.SEEK_END)
+            checkpoints = reader._checkpoints  # pylint: disable=protected-access
+            self.assertGreater(len(checkpoints), 2)
+            for checkpoint in reversed(checkpoints):
+                reader.seek(checkpoint.offset)
+                self.assertEqual(reader.read(3000), self.data[checkpoint.offset:checkpoint.offset + 3000])
+
+    def test_reopen_keeps_position_and_checkpoints(self):
+        with GzipIndexedReader(self.path, SPACING) as reader:
+            reader.seek(0, io.SEEK_END)
+            reader.seek(250000)
+            inherited = reader._file  # pylint: disable=protected-access
+            reader.reopen()
+            self.assertIsNot(reader._file, inherited)  # pylint: disable=protected-access
+            inherited.close()
+            self.assertEqual(reader.read(5000), self.data[250000:255000])
+            reader.seek(100)
+            self.assertEqual(reader.read(100), self.data[100:200])
+
+    def test_truncated_file(self):
+        with open(self.path, 'rb') as f:
+            truncated = f.read()[:1000]
+        with open(self.path, 'wb') as f:
+            f.write(truncated)
+        with GzipIndexedReader(self.path, SPACING) as reader:
+            with self.assertRaises(EOFError):
+                reader.read()
+
+
+class TestIndexedTarSeeker(unittest.TestCase):
+    """A .tar.gz seeker finds the same bytes whether it listed the archive or loaded its index."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.index_folder = os.path.join(self.tmpdir, 'index')
+        self.tar_path = os.path.join(self.tmpdir, 'extraction.tar.gz')
+        self.members = {f'private/var/mobile/Library/file{n}.db': os.urandom(n * 1000) for n in range(1, 20)}
+        with tarfile.open(self.tar_path, 'w:gz') as tf:
+            for name, data in self.members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = 1700000000
+                tf.addfile(info, io.BytesIO(data))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _search_all(self, name):
+        seeker = FileSeekerTar(self.tar_path, os.path.join(self.tmpdir, name), self.index_folder)
+        try:
+            # Later members first, so extraction seeks backwards through the archive
+            found = {}
+            for member_name in reversed(list(self.members)):
+                path = seeker.search('*/' + member_name.rsplit('/', 1)[1])[0]
+                found[member_name] = pathlib.Path(path).read_bytes()
+            return found
+        finally:
+            seeker.cleanup()
+
+    def test_index_is_saved_and_reused(self):
+        self.assertIsNone(load_tar_members(self.tar_path, self.index_folder))
+        self.assertEqual(self._search_all('first'), self.members)
+        members = load_tar_members(self.tar_path, self.index_folder)
+        self.assertEqual([member.name for member in members], list(self.members))
+        self.assertEqual(self._search_all('second'), self.members)
+
+    def test_modified_archive_is_listed_again(self):
+        self._search_all('first')
+        os.utime(self.tar_path, (1, 1))
+        self.assertIsNone(load_tar_members(self.tar_path, self.index_folder))
+
+
+if __name__ == '__main__':
+    unittest.main()
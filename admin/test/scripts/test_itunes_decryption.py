@@ -0,0 +1,131 @@
+"""Guard the decryption of files from encrypted iTunes backups.
+
+FileSeekerItunes decrypts the files of an encrypted backup on a thread pool, a chunk at
+a time, starting with the files the selected artifacts will search for as soon as
+index_patterns() tells it their patterns. The plaintext has to come out exactly as
+Manifest.db sizes it: a chunk boundary that drops or repeats a block, or padding left
+at the end, would go unnoticed until an artifact failed to open a database.
+"""
+import os
+import pathlib
+import plistlib
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import cryptography.hazmat.primitives.keywrap as crypt
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import search_files  # pylint: disable=wrong-import-position
+from scripts.search_files import FileSeekerItunes  # pylint: disable=wrong-import-position
+
+PROTECTION_CLASS = 3
+ZERO_IV = b'\x00' * 16
+
+
+def _encrypt(key, data):
+    padded = data + b'\x00' * (-len(data) % 16)
+    encryptor = Cipher(algorithms.AES(key), modes.CBC(ZERO_IV)).encryptor()
+    return encryptor.update(padded) + encryptor.finalize()
+
+
+class TestEncryptedBackupSeeker(unittest.TestCase):
+    """Decrypted files match their plaintext, whether prefetched or decrypted on search."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.backup = os.path.join(self.tmpdir, 'backup')
+        os.makedirs(self.backup)
+        class_key = os.urandom(32)
+        manifest_key = os.urandom(32)
+        self.decryption_keys = ({PROTECTION_CLASS: {'Unwrapped': class_key}}, manifest_key)
+        self.files = {
+            'Library/SMS/sms.db': os.urandom(2 * 1024 * 1024 + 5),
+            'Library/SMS/sms.db-wal': b'journal',
+            'Library/Notes/notes.sqlite': os.urandom(1000),
+        }
+        manifest = os.path.join(self.tmpdir, 'Manifest.db')
+        db = sqlite3.connect(manifest)
+        db.execute('CREATE TABLE Files (fileID TEXT, domain TEXT, relativePath TEXT, flags INTEGER, file BLOB)')
+        for number, (relative_path, data) in enumerate(self.files.items()):
+            file_id = f'{number:02x}' + '0' * 38
+            file_key = os.urandom(32)
+            os.makedirs(os.path.join(self.backup, file_id[:2]), exist_ok=True)
+            pathlib.Path(self.backup, file_id[:2], file_id).write_bytes(_encrypt(file_key, data))
+            wrapped_key = PROTECTION_CLASS.to_bytes(4, 'little') + crypt.aes_key_wrap(class_key, file_key)
+            metadata = plistlib.dumps({'EncryptionKey': {'NS.data': wrapped_key}, 'Size': len(data),
+                                       'Birth': 1600000000, 'LastModified': 1700000000}, fmt=plistlib.PlistFormat.FMT_BINARY)
+            db.execute('INSERT INTO Files VALUES (?, ?, ?, 1, ?)', (file_id, 'HomeDomain', relative_path, metadata))
+        db.commit()
+        db.close()
+        pathlib.Path(self.backup, 'Manifest.db').write_bytes(_encrypt(manifest_key, pathlib.Path(manifest).read_bytes()))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _seeker(self, name):
+        data_folder = os.path.join(self.tmpdir, name)
+        os.makedirs(data_folder)
+        return FileSeekerItunes(self.backup, data_folder, 'db', self.decryption_keys)
+
+    def _assert_decrypted(self, seeker, found):
+        self.assertEqual(sorted(pathlib.Path(path).read_bytes() for path in found),
+                         sorted(data for relative_path, data in self.files.items() if relative_path.startswith(
+                             'Library/SMS')))
+        for path in found:
+            self.assertEqual(seeker.file_infos[path].modification_date, 1700000000)
+
+    def test_search_decrypts_matches(self):
+        seeker = self._seeker('search')
+        self._assert_decrypted(seeker, seeker.search('*/Library/SMS/sms.db*'))
+        seeker.cleanup()
+
+    def test_prefetched_files_are_decrypted(self):
+        seeker = self._seeker('prefetch')
+        seeker.index_patterns(['*/Library/SMS/sms.db*', '*/Library/Notes/notes.sqlite'])
+        self._assert_decrypted(seeker, seeker.search('*/Library/SMS/sms.db*'))
+        notes = seeker.search('*/Library/Notes/notes.sqlite')
+        self.assertEqual(pathlib.Path(notes[0]).read_bytes(), self.files['Library/Notes/notes.sqlite'])
+        seeker.cleanup()
+
+    def test_prefetching_is_bounded(self):
+        seeker = self._seeker('bounded')
+        started = threading.Event()
+        decrypt_file = seeker._decrypt_file  # pylint: disable=protected-access
+
+        def gated_decrypt_file(*args):
+            started.wait()
+            decrypt_file(*args)
+
+        with mock.patch.object(search_files, '_DECRYPTION_PREFETCH', 1), \
+                mock.patch.object(seeker, '_decrypt_file', side_effect=gated_decrypt_file) as decrypted:
+            seeker.index_patterns(['*/Library/SMS/sms.db*', '*/Library/Notes/notes.sqlite'])
+            self.assertEqual(len(seeker._prefetch_queue), 2)  # pylint: disable=protected-access
+            started.set()
+            self._assert_decrypted(seeker, seeker.search('*/Library/SMS/sms.db*'))
+            seeker.search('*/Library/Notes/notes.sqlite')
+        self.assertEqual(decrypted.call_count, 3)
+        seeker.cleanup()
+
+    def test_forked_seeker_starts_its_own_pool(self):
+        seeker = self._seeker('forked')
+        self._assert_decrypted(seeker, seeker.search('*/Library/SMS/sms.db*'))
+        inherited = seeker._decryption_pool  # pylint: disable=protected-access
+        seeker._pid = -1  # pylint: disable=protected-access
+        seeker.reopen()
+        self.assertIsNone(seeker._decryption_pool)  # pylint: disable=protected-access
+        self._assert_decrypted(seeker, seeker.search('*/Library/SMS/sms.db*', force=True))
+        self.assertIsNot(seeker._decryption_pool, inherited)  # pylint: disable=protected-access
+        inherited.shutdown()
+        seeker.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
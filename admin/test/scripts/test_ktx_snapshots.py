@@ -0,0 +1,161 @@
+"""Guard the conversion of KTX snapshots in scripts/ktx_snapshots.py.
+
+convert_ktx_snapshots() converts the KTX snapshots of an artifact in one call, across
+processes with --workers, in the PNG the artifacts always saved or in lossless WebP, and
+keeps each image in a cache folder named after the SHA-1 of its KTX file. The images
+have to hold the pixels of the texture whatever the format, the path taken or the
+number of processes, a snapshot found in the cache must not be decoded again, and the
+files that are not valid iOS snapshots must be reported as not converted. The cache is
+kept under its size cap by deleting the least recently used images first.
+"""
+import os
+import pathlib
+import shutil
+import struct
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import liblzfse
+from PIL import Image
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import ktx_snapshots  # pylint: disable=wrong-import-position
+
+KTX_IDENTIFIER = b'\xabKTX 11\xbb\r\n\x1a\n'
+ASTC_4X4 = 0x93B0
+# The colors of the 4x4 blocks of a 12x8 texture, row by row
+BLOCK_COLORS = [(255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 255),
+                (10, 20, 30, 0), (200, 100, 50, 128), (255, 255, 255, 255)]
+
+
+def void_extent_block(rgba):
+    """An ASTC block of one color: the void-extent marker, no extent, then RGBA as UNORM16."""
+    return struct.pack('<Q4H', 0xFFFFFFFFFFFFFDFC, *(channel * 257 for channel in rgba))
+
+
+def make_ktx(compressed=True):
+    """A 12x8 iOS KTX texture, LZFSE compressed as iOS saves it or stored as is."""
+    texture = b''.join(map(void_extent_block, BLOCK_COLORS))
+    key_value = b''
+    if compressed:
+        key = b'Compression_APPLE\x00LZFSE\x00'
+        key_value = struct.pack('<I', len(key)) + key + b'\x00' * (-len(key) % 4)
+        compressed_texture = liblzfse.compress(texture)  # pylint: disable=c-extension-no-member
+        data = struct.pack('<I', len(texture)) + b'\x00' * 8 + compressed_texture
+    else:
+        data = struct.pack('<I', len(texture)) + texture
+    header = KTX_IDENTIFIER + struct.pack('<13I', 0x04030201, 0, 1, 0, ASTC_4X4, 0x1908, 12, 8, 0, 0, 1, 1,
+                                          len(key_value))
+    return header + key_value + data
+
+
+def expected_pixels():
+    """The RGBA bytes of the texture, row by row."""
+    return bytes(channel for y in range(8) for x in range(12) for channel in BLOCK_COLORS[(y // 4) * 3 + x // 4])
+
+
+class TestKtxSnapshots(unittest.TestCase):
+    """Snapshots convert to the same pixels in every format, path and number of processes."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, True)
+        self.addCleanup(ktx_snapshots.set_snapshot_options)
+        self.cache_folder = os.path.join(self.tmpdir, 'cache')
+
+    def write(self, name, data):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def pixels(self, path):
+        with Image.open(path) as image:
+            return image.convert('RGBA').tobytes()
+
+    def test_formats_keep_the_pixels(self):
+        for image_format in ktx_snapshots.SNAPSHOT_FORMATS:
+            ktx_snapshots.set_snapshot_options(image_format=image_format)
+            self.assertEqual(ktx_snapshots.get_snapshot_extension(), image_format)
+            for compressed in (True, False):
+                ktx_path = self.write(f'{compressed}.ktx', make_ktx(compressed))
+                image_path = os.path.join(self.tmpdir, f'{compressed}.{image_format}')
+                self.assertEqual(ktx_snapshots.convert_ktx_snapshots([(ktx_path, image_path)]), [True])
+                with Image.open(image_path) as image:
+                    self.assertEqual(image.format, ktx_snapshots.SNAPSHOT_FORMATS[image_format][0])
+                self.assertEqual(self.pixels(image_path), expected_pixels())
+        with self.assertRaises(ValueError):
+            ktx_snapshots.set_snapshot_options(image_format='gif')
+
+    def test_invalid_files_are_not_converted(self):
+        conversions = [
+            (self.write('text.ktx', b'not a texture at all' * 4), os.path.join(self.tmpdir, 'text.png')),
+            (self.write('zlib.ktx', make_ktx().replace(b'bvx', b'zlb')), os.path.join(self.tmpdir, 'zlib.png')),
+            (self.write('good.ktx', make_ktx()), os.path.join(self.tmpdir, 'good.png')),
+        ]
+        with mock.patch.object(ktx_snapshots, 'logfunc') as logged:
+            self.assertEqual(ktx_snapshots.convert_ktx_snapshots(conversions), [False, False, True])
+        self.assertEqual(len(logged.call_args_list), 1)
+        self.assertEqual(logged.call_args.args[0], 'Had an exception - Unsupported compression, not lzfse!')
+
+    def test_cached_snapshots_are_not_decoded_again(self):
+        ktx_snapshots.set_snapshot_options(self.cache_folder)
+        ktx_path = self.write('snapshot.ktx', make_ktx())
+        first = os.path.join(self.tmpdir, 'first.png')
+        second = os.path.join(self.tmpdir, 'second.png')
+        self.assertEqual(ktx_snapshots.convert_ktx_snapshots([(ktx_path, first)]), [True])
+        with mock.patch.object(ktx_snapshots.Image, 'frombytes') as decode:
+            self.assertEqual(ktx_snapshots.convert_ktx_snapshots([(ktx_path, second)]), [True])
+        decode.assert_not_called()
+        with open(first, 'rb') as file, open(second, 'rb') as copy:
+            self.assertEqual(file.read(), copy.read())
+
+        # Another format is another image
+        ktx_snapshots.set_snapshot_options(self.cache_folder, 'webp')
+        webp = os.path.join(self.tmpdir, 'snapshot.webp')
+        self.assertEqual(ktx_snapshots.convert_ktx_snapshots([(ktx_path, webp)]), [True])
+        self.assertEqual(self.pixels(webp), expected_pixels())
+        cached = [name for _, _, names in os.walk(self.cache_folder) for name in names]
+        self.assertEqual(sorted(os.path.splitext(name)[1] for name in cached), ['.png', '.webp'])
+
+    def test_prune_deletes_the_least_recently_used(self):
+        ktx_snapshots.set_snapshot_options(self.cache_folder)
+        conversions = []
+        for index in range(3):
+            # A different key for each file, the same pixels
+            ktx_path = self.write(f'{index}.ktx', make_ktx() + bytes([index]))
+            conversions.append((ktx_path, os.path.join(self.tmpdir, f'{index}.png')))
+        self.assertEqual(ktx_snapshots.convert_ktx_snapshots(conversions), [True] * 3)
+        cached = sorted(os.path.join(root, name) for root, _, names in os.walk(self.cache_folder)
+                        for name in names)
+        for age, path in enumerate(cached):
+            os.utime(path, (1000 + age, 1000 + age))
+        # Reading the oldest from the cache makes it the most recently used
+        ktx_snapshots.convert_ktx_snapshots([(conversions[0][0], os.path.join(self.tmpdir, 'again.png'))])
+        used = next(path for path in cached if os.path.getmtime(path) > 2000)
+        size = os.path.getsize(cached[0])
+
+        self.assertEqual(ktx_snapshots.prune_snapshot_cache(self.cache_folder, 3 * size), 0)
+        self.assertEqual(ktx_snapshots.prune_snapshot_cache(self.cache_folder, size), 2)
+        remaining = [os.path.join(root, name) for root, _, names in os.walk(self.cache_folder) for name in names]
+        self.assertEqual(remaining, [used])
+        self.assertEqual(ktx_snapshots.prune_snapshot_cache(os.path.join(self.tmpdir, 'missing')), 0)
+
+    def test_processes_give_the_serial_results(self):
+        ktx = make_ktx()
+        conversions = []
+        for index in range(ktx_snapshots.SNAPSHOT_PARALLEL_MIN_COUNT + 2):
+            data = ktx if index % 5 else b'invalid' * 10
+            conversions.append((self.write(f'{index}.ktx', data), os.path.join(self.tmpdir, f'{index}.png')))
+        converted = ktx_snapshots.convert_ktx_snapshots(conversions, workers=2)
+        self.assertEqual(converted, [bool(index % 5) for index in range(len(conversions))])
+        self.assertEqual(self.pixels(conversions[1][1]), expected_pixels())
+        self.assertFalse(os.path.exists(conversions[0][1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Guard the queued writes and deferred commits of the LAVA writer.
+
+scripts/lavafuncs.py queues the rows of its bookkeeping tables (file paths, search
+patterns, media items and references) and writes them with executemany, and only
+commits once per artifact. check_in_media() asks the database whether a media item or
+reference is already there before adding it, so a queued row that a read cannot see
+would be checked in twice; and anything that reads _lava_artifacts.db through its own
+connection, the unified log artifacts and the LAVA reader, only sees what has been
+committed. The run also has to end with one self-contained database file, not a WAL
+file next to it.
+"""
+import os
+import pathlib
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+from types import SimpleNamespace
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import lavafuncs  # pylint: disable=wrong-import-position
+from scripts.context import Context  # pylint: disable=wrong-import-position
+
+
+class TestLavaBulkWriter(unittest.TestCase):
+    """Queued rows are readable right away, committed per artifact, and all there at the end."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, lavafuncs.lava_db_name)
+        lavafuncs.initialize_lava(self.tmpdir, self.tmpdir, 'fs')
+
+    def tearDown(self):
+        if lavafuncs.lava_db is not None:
+            lavafuncs.lava_db.close()
+            lavafuncs.lava_db = None
+        lavafuncs.lava_data = None
+        Context.clear()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _committed_count(self, table_name):
+        db = sqlite3.connect(self.db_path)
+        try:
+            return db.execute(f'SELECT COUNT(*) FROM {table_name}').fetchone()[0]
+        finally:
+            db.close()
+
+    def _media_item(self, media_id):
+        return SimpleNamespace(id=media_id, source_path='src', extraction_path='dst', mimetype='image/png',
+                               metadata='', created_at=0, updated_at=0, is_embedded=0)
+
+    def test_queued_media_is_visible_to_reads(self):
+        lavafuncs.lava_insert_sqlite_media_item(self._media_item('media-1'))
+        self.assertIsNotNone(lavafuncs.lava_get_media_item('media-1'))
+        # A second check in of the same media is ignored, as it was before it was queued
+        lavafuncs.lava_insert_sqlite_media_item(self._media_item('media-1'))
+        lavafuncs.lava_flush()
+        self.assertEqual(lavafuncs.lava_db.execute('SELECT COUNT(*) FROM _lava_media_items').fetchone()[0], 1)
+
+    def test_rows_are_committed_with_the_module(self):
+        for file_id in range(1, 101):
+            lavafuncs.lava_insert_sqlite_file_path(file_id, f'private/var/file{file_id}')
+            lavafuncs.lava_insert_sqlite_artifact_link_pattern_to_file(1, file_id)
+        self.assertEqual(self._committed_count('_file_path_list'), 0)
+        lavafuncs.lava_add_module('testModule', 'Complete', 100)
+        self.assertEqual(self._committed_count('_file_path_list'), 100)
+        self.assertEqual(self._committed_count('_artifact_pattern_to_file'), 100)
+
+    def test_finalize_leaves_a_single_committed_file(self):
+        lavafuncs.lava_insert_sqlite_file_path(1, 'private/var/file')
+        lavafuncs.lava_finalize_output(self.tmpdir)
+        lavafuncs.lava_db = None
+        self.assertFalse(os.path.exists(self.db_path + '-wal'))
+        self.assertEqual(self._committed_count('_file_path_list'), 1)
+        db = sqlite3.connect(self.db_path)
+        self.assertEqual(db.execute('PRAGMA journal_mode').fetchone()[0], 'delete')
+        db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
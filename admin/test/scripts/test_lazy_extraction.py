@@ -0,0 +1,153 @@
+"""Guard --lazy_extraction, which defers extracting archive members until they are read.
+
+For artifacts that declare "lazy_extraction", FileSeekerZip and FileSeekerTar return
+the paths their matches would be extracted to without writing them, and the file
+helpers of scripts/ilapfuncs.py extract a member on its first read. Two things must
+hold for that to be safe: an artifact that reads files directly, and so does not
+declare it, must still find every file it was given on disk, even one an earlier lazy
+artifact left unextracted; and the size cap may only ever evict files no running
+artifact is reading.
+"""
+import io
+import os
+import pathlib
+import shutil
+import sys
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.context import Context  # pylint: disable=wrong-import-position
+from scripts.extraction_cache import ExtractionCache  # pylint: disable=wrong-import-position
+from scripts.ilapfuncs import get_file_path  # pylint: disable=wrong-import-position
+from scripts.search_files import FileSeekerTar, FileSeekerZip  # pylint: disable=wrong-import-position
+
+MEMBERS = {
+    'private/var/mobile/Media/Recordings/Recordings.db': b'database',
+    'private/var/mobile/Media/Recordings/Recordings.db-wal': b'journal',
+    'private/var/mobile/Media/Recordings/one.m4a': b'audio one',
+    'private/var/mobile/Media/Recordings/two.m4a': b'audio two',
+    'private/var/mobile/Media/Recordings/copy.m4a': b'audio one',
+}
+
+
+class LazyExtractionTestCase(unittest.TestCase):
+    """Builds the same extraction as a zip and as a tar archive."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.zip_path = os.path.join(self.tmpdir, 'extraction.zip')
+        with zipfile.ZipFile(self.zip_path, 'w') as zf:
+            for name, data in MEMBERS.items():
+                zf.writestr(name, data)
+        self.tar_path = os.path.join(self.tmpdir, 'extraction.tar')
+        with tarfile.open(self.tar_path, 'w') as tf:
+            for name, data in MEMBERS.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+
+    def tearDown(self):
+        Context.clear()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _seekers(self, max_size=1024):
+        for name, seeker_class, archive in (('zip', FileSeekerZip, self.zip_path),
+                                            ('tar', FileSeekerTar, self.tar_path)):
+            data_folder = os.path.join(self.tmpdir, name, 'data')
+            os.makedirs(data_folder)
+            seeker = seeker_class(archive, data_folder)
+            seeker.enable_lazy_extraction(os.path.join(self.tmpdir, name, 'cache'), max_size)
+            yield name, seeker
+
+
+class TestDeferredSearch(LazyExtractionTestCase):
+    """Matches are only extracted when read, or when handed to an artifact reading directly."""
+
+    def test_lazy_artifact_extracts_what_it_reads(self):
+        for name, seeker in self._seekers():
+            with self.subTest(archive=name):
+                with seeker.artifact_scope(lazy_extraction=True):
+                    found = seeker.search('*/Recordings/*')
+                    self.assertEqual(len(found), len(MEMBERS))
+                    self.assertFalse(any(os.path.exists(path) for path in found))
+                    Context.set_seeker(seeker)
+                    db_path = get_file_path(found, 'Recordings.db')
+                self.assertEqual(pathlib.Path(db_path).read_bytes(), b'database')
+                self.assertTrue(os.path.exists(db_path + '-wal'))
+                self.assertFalse(any(os.path.exists(path) for path in found if path.endswith('.m4a')))
+                seeker.cleanup()
+
+    def test_direct_artifact_gets_deferred_matches_extracted(self):
+        for name, seeker in self._seekers():
+            with self.subTest(archive=name):
+                with seeker.artifact_scope(lazy_extraction=True):
+                    seeker.search('*/Recordings/*.m4a')
+                with seeker.artifact_scope(lazy_extraction=False):
+                    found = seeker.search('*/Recordings/*.m4a')
+                self.assertEqual(sorted(pathlib.Path(path).read_bytes() for path in found),
+                                 [b'audio one', b'audio one', b'audio two'])
+                seeker.cleanup()
+
+    def test_paths_match_eager_extraction(self):
+        data_folder = os.path.join(self.tmpdir, 'eager')
+        eager = FileSeekerZip(self.zip_path, data_folder)
+        lazy = FileSeekerZip(self.zip_path, data_folder)
+        lazy.enable_lazy_extraction(os.path.join(self.tmpdir, 'cache'))
+        with lazy.artifact_scope(lazy_extraction=True):
+            self.assertEqual(lazy.search('*/Recordings/*'), eager.search('*/Recordings/*'))
+        eager.cleanup()
+        lazy.cleanup()
+
+    def test_workers_share_the_cache_size(self):
+        for name, seeker in self._seekers(max_size=3000):
+            with self.subTest(archive=name):
+                seeker.share_extraction_cache(4)
+                self.assertEqual(seeker._extraction_cache.max_size, 750)  # pylint: disable=protected-access
+                seeker.cleanup()
+
+
+class TestExtractionCache(unittest.TestCase):
+    """The store deduplicates content and only evicts members no artifact is reading."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.evicted = []
+        self.cache = ExtractionCache(os.path.join(self.tmpdir, 'cache'), max_size=10,
+                                     on_evict=self.evicted.append)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _target(self, name):
+        return os.path.join(self.tmpdir, 'data', name)
+
+    def test_same_content_is_stored_once(self):
+        first = self.cache.store(io.BytesIO(b'12345'), self._target('a'))
+        second = self.cache.store(io.BytesIO(b'12345'), self._target('b'))
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.size, 5)
+
+    def test_pinned_members_survive_until_unpinned(self):
+        self.cache.store(io.BytesIO(b'123456'), self._target('a'))
+        self.cache.store(io.BytesIO(b'abcdef'), self._target('b'))
+        self.assertTrue(os.path.exists(self._target('a')))
+        self.cache.unpin()
+        self.assertEqual(self.evicted, [self._target('a')])
+        self.assertFalse(os.path.exists(self._target('a')))
+        self.assertTrue(os.path.exists(self._target('b')))
+
+    def test_permanent_members_are_never_evicted(self):
+        self.cache.store(io.BytesIO(b'123456'), self._target('a'), evictable=False)
+        self.cache.store(io.BytesIO(b'abcdef'), self._target('b'))
+        self.cache.unpin()
+        self.assertTrue(os.path.exists(self._target('a')))
+        self.assertEqual(self.evicted, [self._target('b')])
+
+
+if __name__ == '__main__':
+    unittest.main()
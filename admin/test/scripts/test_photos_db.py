@@ -0,0 +1,100 @@
+"""Guard the Photos.sqlite working copies of scripts/photos_db.py.
+
+The Ph0xx artifacts run their queries on a working copy of Photos.sqlite, to which the
+first query joining on a column without an index adds one. The records have to be those
+the query returns on the evidence, with the columns a version lacks reported empty, the
+evidence must never be written to, and a working copy written to the output folder,
+for a database too large to copy to memory, has to be deleted when it is closed.
+"""
+import os
+import pathlib
+import shutil
+import sqlite3
+import sys
+import tempfile
+import types
+import unittest
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import ilapfuncs, photos_db  # pylint: disable=wrong-import-position
+from scripts.context import Context  # pylint: disable=wrong-import-position
+
+QUERY = '''
+SELECT zAsset.Z_PK, zAsset.ZFILENAME, zAddAssetAttr.ZORIGINALFILENAME, zIntResou.ZDATALENGTH,
+    zAsset.ZNOTINTHISVERSION
+FROM ZASSET zAsset
+    LEFT JOIN ZADDITIONALASSETATTRIBUTES zAddAssetAttr ON zAddAssetAttr.ZASSET = zAsset.Z_PK
+    LEFT JOIN ZINTERNALRESOURCE zIntResou ON zIntResou.ZASSET = zAsset.Z_PK AND zIntResou.ZRESOURCETYPE = 0
+ORDER BY zAsset.Z_PK
+'''
+
+
+class TestPhotosWorkingCopy(unittest.TestCase):
+    """Queries on the working copy return the records of the evidence, and leave it untouched."""
+
+    def setUp(self):
+        ilapfuncs.close_sqlite_pool()
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, 'Photos.sqlite')
+        with sqlite3.connect(self.db_path) as db:
+            db.execute('CREATE TABLE ZASSET (Z_PK INTEGER PRIMARY KEY, ZFILENAME TEXT)')
+            db.execute('CREATE TABLE ZADDITIONALASSETATTRIBUTES (Z_PK INTEGER PRIMARY KEY, ZASSET INTEGER, '
+                       'ZORIGINALFILENAME TEXT)')
+            db.execute('CREATE TABLE ZINTERNALRESOURCE (Z_PK INTEGER PRIMARY KEY, ZASSET INTEGER, '
+                       'ZRESOURCETYPE INTEGER, ZDATALENGTH INTEGER)')
+            db.execute('CREATE INDEX ZINTERNALRESOURCE_ZASSET ON ZINTERNALRESOURCE (ZASSET)')
+            for pk in range(1, 51):
+                db.execute('INSERT INTO ZASSET VALUES (?, ?)', (pk, f'IMG_{pk:04}.HEIC'))
+                db.execute('INSERT INTO ZADDITIONALASSETATTRIBUTES VALUES (?, ?, ?)', (pk, pk, f'IMG_{pk}.JPG'))
+                for resource_type in (0, 1):
+                    db.execute('INSERT INTO ZINTERNALRESOURCE (ZASSET, ZRESOURCETYPE, ZDATALENGTH) VALUES (?, ?, ?)',
+                               (pk, resource_type, pk * 1000 + resource_type))
+        db.close()
+        Context.set_output_params(types.SimpleNamespace(output_folder_base=self.tmpdir))
+
+    def tearDown(self):
+        photos_db.close_photos_working_copies()
+        ilapfuncs.close_sqlite_pool()
+        Context.clear()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _indexes(self, db):
+        return {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+    def test_records_match_the_evidence(self):
+        expected = [tuple(row) for row in
+                    ilapfuncs.get_sqlite_db_records(self.db_path, ilapfuncs.null_absent_columns(self.db_path, QUERY))]
+        records = list(photos_db.get_photos_db_records(self.db_path, QUERY))
+        self.assertEqual([tuple(row) for row in records], expected)
+        self.assertEqual(len(records), 50)
+        self.assertEqual(records[0]['ZORIGINALFILENAME'], 'IMG_1.JPG')
+        self.assertEqual(records[0]['ZDATALENGTH'], 1000)
+        self.assertIsNone(records[0]['ZNOTINTHISVERSION'])
+
+    def test_missing_join_index_is_added_to_the_working_copy_only(self):
+        list(photos_db.get_photos_db_records(self.db_path, QUERY))
+        working_copy = photos_db.get_photos_working_copy(self.db_path)
+        self.assertIsNone(working_copy.path)
+        self.assertEqual(self._indexes(working_copy.db) - self._indexes(sqlite3.connect(self.db_path)),
+                         {'ileapp_ZADDITIONALASSETATTRIBUTES_ZASSET'})
+        list(photos_db.get_photos_db_records(self.db_path, QUERY))
+        self.assertIs(photos_db.get_photos_working_copy(self.db_path), working_copy)
+        with sqlite3.connect(self.db_path) as evidence:
+            self.assertEqual(self._indexes(evidence), {'ZINTERNALRESOURCE_ZASSET'})
+        evidence.close()
+
+    def test_large_database_is_copied_to_the_output_folder(self):
+        self.addCleanup(setattr, photos_db, 'PHOTOS_MEMORY_LIMIT', photos_db.PHOTOS_MEMORY_LIMIT)
+        photos_db.PHOTOS_MEMORY_LIMIT = 0
+        self.assertEqual(len(list(photos_db.get_photos_db_records(self.db_path, QUERY))), 50)
+        working_copy_path = photos_db.get_photos_working_copy(self.db_path).path
+        self.assertEqual(os.path.dirname(working_copy_path),
+                         os.path.join(self.tmpdir, photos_db.WORKING_COPY_FOLDER_NAME))
+        photos_db.close_photos_working_copies()
+        self.assertFalse(os.path.exists(working_copy_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
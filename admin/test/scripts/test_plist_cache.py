@@ -0,0 +1,126 @@
+"""Guard the plist loader of ilapfuncs.
+
+get_plist_file_content() parses each plist once, passes what plistlib parsed to the
+NSKeyedArchiver decoder instead of having nska_deserialize read the file again, and
+keeps the result for the run. The deserialized archives have to be those
+nska_deserialize gives, a file changed since it was read has to be read again, and every
+caller gets its own copy, so an artifact changing what it was given cannot change what
+the next one reads.
+"""
+import datetime
+import os
+import pathlib
+import plistlib
+import shutil
+import struct
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import nska_deserialize
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import ilapfuncs  # pylint: disable=wrong-import-position
+
+ARCHIVE = {
+    '$archiver': 'NSKeyedArchiver', '$version': 100000, '$top': {'root': plistlib.UID(1)},
+    '$objects': [
+        '$null',
+        {'$class': plistlib.UID(6), 'NS.keys': [plistlib.UID(2), plistlib.UID(3)],
+         'NS.objects': [plistlib.UID(4), plistlib.UID(5)]},
+        'name', 'visits', 'Home', 42,
+        {'$classname': 'NSDictionary', '$classes': ['NSDictionary', 'NSObject']},
+    ],
+}
+
+
+def as_xml_archive(value):
+    """XML plists have no UID type, archives write {'CF$UID': n} instead."""
+    if isinstance(value, plistlib.UID):
+        return {'CF$UID': value.data}
+    if isinstance(value, dict):
+        return {key: as_xml_archive(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [as_xml_archive(item) for item in value]
+    return value
+
+
+class TestPlistCache(unittest.TestCase):
+    """Plists are parsed once per file version and handed out as copies."""
+
+    def setUp(self):
+        ilapfuncs.clear_plist_cache()
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        ilapfuncs.clear_plist_cache()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def test_archives_match_nska_deserialize(self):
+        for fmt in (plistlib.PlistFormat.FMT_BINARY, plistlib.PlistFormat.FMT_XML):
+            data = plistlib.dumps(ARCHIVE if fmt == plistlib.PlistFormat.FMT_BINARY else as_xml_archive(ARCHIVE), fmt=fmt)
+            path = self._write(f'archive{fmt}.plist', data)
+            expected = nska_deserialize.deserialize_plist_from_string(data)
+            self.assertEqual(expected, {'name': 'Home', 'visits': 42})
+            with mock.patch.object(ilapfuncs.plistlib, 'loads', wraps=plistlib.loads) as loads:
+                self.assertEqual(ilapfuncs.get_plist_file_content(path), expected)
+                self.assertEqual(ilapfuncs.get_plist_content(data), expected)
+            if fmt == plistlib.PlistFormat.FMT_BINARY:
+                self.assertEqual(loads.call_count, 2)  # once per call, not again by nska_deserialize
+
+    def test_parsed_once_and_copied(self):
+        path = self._write('prefs.plist', plistlib.dumps({'items': [{'id': 1}], 'date': datetime.datetime(2024, 1, 2)},
+                                                         fmt=plistlib.PlistFormat.FMT_BINARY))
+        with mock.patch.object(ilapfuncs.plistlib, 'loads', wraps=plistlib.loads) as loads:
+            first = ilapfuncs.get_plist_file_content(path)
+            first['items'][0]['id'] = 99
+            first['extra'] = True
+            second = ilapfuncs.get_plist_file_content(pathlib.Path(path))
+        self.assertEqual(loads.call_count, 1)
+        self.assertEqual(second, {'items': [{'id': 1}], 'date': datetime.datetime(2024, 1, 2)})
+
+        self._write('prefs.plist', plistlib.dumps({'items': []}))
+        os.utime(path, ns=(0, 10 ** 9))
+        self.assertEqual(ilapfuncs.get_plist_file_content(path), {'items': []})
+
+    def test_least_recently_read_are_evicted(self):
+        paths = [self._write(f'{index}.plist', plistlib.dumps({'index': index, 'pad': 'x' * 400}))
+                 for index in range(4)]
+        size = os.path.getsize(paths[0])
+        self.addCleanup(setattr, ilapfuncs, 'PLIST_CACHE_MAX_BYTES', ilapfuncs.PLIST_CACHE_MAX_BYTES)
+        ilapfuncs.PLIST_CACHE_MAX_BYTES = 3 * size
+        for path in paths[:3]:
+            ilapfuncs.get_plist_file_content(path)
+        ilapfuncs.get_plist_file_content(paths[0])
+        ilapfuncs.get_plist_file_content(paths[3])
+        self.assertEqual(list(ilapfuncs._plist_cache), [paths[2], paths[0], paths[3]])  # pylint: disable=protected-access
+        self.assertEqual(ilapfuncs._plist_cache_bytes, 3 * size)  # pylint: disable=protected-access
+
+    def test_unreadable_plists(self):
+        self.assertEqual(ilapfuncs.get_plist_file_content(os.path.join(self.tmpdir, 'absent.plist')), {})
+        self.assertEqual(ilapfuncs.get_plist_file_content(self._write('junk.plist', b'not a plist')), {})
+        self.assertEqual(ilapfuncs._plist_cache, {})  # pylint: disable=protected-access
+
+        # A date past datetime's range: plistlib rejects the file, the tolerant read keeps the rest
+        data = bytearray(plistlib.dumps({'a': 'kept', 'b': datetime.datetime(2000, 1, 1)}, fmt=plistlib.PlistFormat.FMT_BINARY))
+        date_offset = bytes(data).index(b'\x33') + 1
+        data[date_offset:date_offset + 8] = struct.pack('>d', 1e18)
+        path = self._write('dates.plist', bytes(data))
+        with mock.patch.object(ilapfuncs, 'logfunc') as logfunc:
+            self.assertEqual(ilapfuncs.get_plist_file_content(path), {'a': 'kept', 'b': None})
+            self.assertEqual(ilapfuncs.get_plist_file_content(path), {'a': 'kept', 'b': None})
+        self.assertEqual(logfunc.call_count, 2)  # the cached copy is reported as the first
+        self.assertIn('1 value(s)', logfunc.call_args.args[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+"""Guard the shared database sessions of the PowerLog artifacts.
+
+The powerlog artifacts used to resolve their table, probe optional columns and reload the
+clock corrections of every database on each run, and convert the rows one by one. Each
+database is now opened once for the module, with its tables, columns and offsets read
+once, the rotated archives are decompressed together, and the offsets are applied to a
+whole column at a time. The rows have to be exactly those the per-row correction gave,
+including rows older than the oldest offset entry, rows without a timestamp and logs
+without an offset table.
+"""
+import gzip
+import os
+import pathlib
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.artifacts import powerlog  # pylint: disable=wrong-import-position
+
+
+def make_powerlog(path, seed, offsets=True, in_call_columns=True):
+    """A small PowerLog database with an offset table and the battery and runtime tables."""
+    rng = random.Random(seed)
+    db = sqlite3.connect(path)
+    if offsets:
+        db.execute('CREATE TABLE PLStorageOperator_EventForward_TimeOffset (timestamp REAL, system REAL)')
+        db.executemany('INSERT INTO PLStorageOperator_EventForward_TimeOffset VALUES (?, ?)',
+                       [(1.7e9 + index * 3600, rng.uniform(-3e6, 3e6)) for index in range(20)]
+                       + [(None, 5.0), (1.8e9, None)])
+    db.execute('CREATE TABLE PLBatteryAgent_EventBackward_BatteryUI (timestamp REAL, Level REAL, IsCharging INTEGER)')
+    db.executemany('INSERT INTO PLBatteryAgent_EventBackward_BatteryUI VALUES (?, ?, ?)',
+                   [(None if index % 50 == 0 else 1.7e9 - 7200 + rng.random() * 86400, rng.random() * 100, index % 2)
+                    for index in range(500)])
+    columns = ', InCallBackgroundTime, InCallScreenOnTime' if in_call_columns else ''
+    db.execute(f'CREATE TABLE PLAppTimeService_Aggregate_AppRunTime_1_2 '
+               f'(timestamp REAL, BundleID TEXT, BackgroundTime REAL, ScreenOnTime REAL{columns})')
+    db.execute('CREATE TABLE PLAppTimeService_Aggregate_AppRunTime_Array_1 (timestamp REAL)')
+    db.executemany(f'INSERT INTO PLAppTimeService_Aggregate_AppRunTime_1_2 VALUES '
+                   f'(?, ?, ?, ?{", ?, ?" if in_call_columns else ""})',
+                   [(1.7e9 + rng.random() * 86400, f'com.example.app{index % 7}', 1.5, 2.5)
+                    + ((0.5, 0.25) if in_call_columns else ()) for index in range(300)])
+    db.commit()
+    db.close()
+
+
+class StubContext:
+    """The parts of Context that the powerlog artifacts read."""
+
+    def __init__(self, files_found, root):
+        self.files_found = files_found
+        self.root = root
+
+    def get_files_found(self):
+        return self.files_found
+
+    def get_relative_path(self, path):
+        return os.path.relpath(path, self.root)
+
+
+class TestPowerlogEngine(unittest.TestCase):
+    """Every artifact reads the same open databases and gets the rows of the per-row correction."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, True)
+        self.addCleanup(powerlog._remove_gz_temp)  # pylint: disable=protected-access
+        folder = os.path.join(self.tmpdir, 'PowerLog')
+        os.makedirs(folder)
+        current = os.path.join(folder, 'CurrentPowerlog.PLSQL')
+        make_powerlog(current, 1)
+        no_offsets = os.path.join(folder, 'NoOffsets.PLSQL')
+        make_powerlog(no_offsets, 2, offsets=False, in_call_columns=False)
+        archives = []
+        for index, name in enumerate(('Archives/powerlog_A.PLSQL.gz', 'Older/powerlog_A.PLSQL.gz')):
+            archive = os.path.join(folder, name)
+            os.makedirs(os.path.dirname(archive))
+            plain = os.path.join(self.tmpdir, f'{index}.PLSQL')
+            make_powerlog(plain, index + 3)
+            with open(plain, 'rb') as src, gzip.open(archive, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            archives.append((archive, plain))
+        self.broken = os.path.join(folder, 'powerlog_B.PLSQL.gz')
+        with open(self.broken, 'wb') as file:
+            file.write(b'not gzip data')
+        self.context = StubContext([current, no_offsets, self.broken] + [archive for archive, _ in archives],
+                                   self.tmpdir)
+        # The databases the artifacts query, with the path each is reported under
+        self.sources = [(current, current), (no_offsets, no_offsets)]
+        self.sources += [(plain, archive) for archive, plain in archives]
+
+    def expected_rows(self, table, columns, row_builder):
+        """The rows as the artifacts built them before, one bisect and conversion per row."""
+        rows = []
+        for db_path, evidence_path in self.sources:
+            db = sqlite3.connect(db_path)
+            offset_rows = []
+            if db.execute(f"SELECT 1 FROM sqlite_master WHERE name = '{powerlog.TIME_OFFSET_TABLE}'").fetchone():
+                offset_rows = db.execute(f'SELECT timestamp, system FROM {powerlog.TIME_OFFSET_TABLE} '
+                                         'WHERE timestamp IS NOT NULL AND system IS NOT NULL '
+                                         'ORDER BY timestamp').fetchall()
+            stamps = [stamp for stamp, _ in offset_rows]
+            offsets = [offset for _, offset in offset_rows]
+            existing = {row[1] for row in db.execute(f"PRAGMA table_info('{table}')")}
+            select = ', '.join(f'"{column}"' if column in existing else f'NULL AS "{column}"' for column in columns)
+            for row in db.execute(f'SELECT {select} FROM "{table}" ORDER BY timestamp'):
+                ts, offset = powerlog._corrected_utc(row[0], stamps, offsets)  # pylint: disable=protected-access
+                rows.append(row_builder(ts, offset, row, os.path.relpath(evidence_path, self.tmpdir)))
+            db.close()
+        return rows
+
+    def test_rows_match_the_per_row_correction(self):
+        with mock.patch.object(powerlog, 'logfunc') as logged:
+            _, battery, source = powerlog.powerlogBatteryLevel.__wrapped__(self.context)
+            _, runtime, _ = powerlog.powerlogApplicationRuntime.__wrapped__(self.context)
+        self.assertEqual(source, 'See source paths in data')
+        self.assertEqual(battery, self.expected_rows(
+            'PLBatteryAgent_EventBackward_BatteryUI', ('timestamp', 'Level', 'IsCharging'),
+            lambda ts, offset, row, rel: (
+                ts, row[1], powerlog._yes_no(row[2]), offset, rel)))  # pylint: disable=protected-access
+        self.assertEqual(runtime, self.expected_rows(
+            'PLAppTimeService_Aggregate_AppRunTime_1_2',
+            ('timestamp', 'BundleID', 'BackgroundTime', 'ScreenOnTime', 'InCallBackgroundTime', 'InCallScreenOnTime'),
+            lambda ts, offset, row, rel: (ts, row[1], row[2], row[3], row[4], row[5], offset, rel)))
+        self.assertTrue(any(row[0] is None for row in battery))
+        self.assertTrue(any(row[3] is None and row[0] is not None for row in battery))
+        self.assertEqual(len(logged.call_args_list), 1)
+        self.assertIn(self.broken, logged.call_args.args[0])
+
+    def test_databases_are_opened_and_read_once(self):
+        with mock.patch.object(powerlog, 'open_sqlite_db_readonly',
+                               wraps=powerlog.open_sqlite_db_readonly) as opened, \
+                mock.patch.object(powerlog, '_decompress_gz',
+                                  wraps=powerlog._decompress_gz) as decompressed, \
+                mock.patch.object(powerlog, 'logfunc'):  # pylint: disable=protected-access
+            for artifact in (powerlog.powerlogBatteryLevel, powerlog.powerlogApplicationRuntime,
+                             powerlog.powerlogDeviceLock):
+                artifact.__wrapped__(self.context)
+        self.assertEqual(opened.call_count, len(self.sources))
+        self.assertEqual(decompressed.call_count, 3)
+        current = powerlog._DATABASES[self.sources[0][0]]  # pylint: disable=protected-access
+        with mock.patch.object(current, 'records') as records:
+            stamps, offsets = current.time_offsets()
+        records.assert_not_called()
+        self.assertEqual((len(stamps), len(offsets)), (20, 20))
+
+        powerlog._remove_gz_temp()  # pylint: disable=protected-access
+        self.assertEqual(powerlog._DATABASES, {})  # pylint: disable=protected-access
+        with self.assertRaises(sqlite3.ProgrammingError):
+            current._db.execute('SELECT 1')  # pylint: disable=protected-access
+
+    def test_archives_of_the_same_name_are_kept_apart(self):
+        archives = [archive for _, archive in self.sources[2:]]
+        with mock.patch.object(powerlog, '_GZ_THREADS', 2):
+            materialized = powerlog._materialize_gzs(archives + [archives[0]])  # pylint: disable=protected-access
+        self.assertEqual(list(materialized), archives)
+        self.assertEqual(len(set(materialized.values())), 2)
+        for (plain, _), copy in zip(self.sources[2:], materialized.values()):
+            with open(plain, 'rb') as original, open(copy, 'rb') as decompressed:
+                self.assertEqual(original.read(), decompressed.read())
+        again = powerlog._materialize_gz(archives[1])  # pylint: disable=protected-access
+        self.assertEqual(again, materialized[archives[1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,6 +24,7 @@ from unittest import mock
 REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
 sys.path.insert(0, str(REPO_ROOT))
 
+from scripts import ilapfuncs  # pylint: disable=wrong-import-position
 from scripts.artifacts import powerlog  # pylint: disable=wrong-import-position
 
 
@@ -67,11 +68,9 @@ class GzTempRemovalTests(unittest.TestCase):
         self.assertEqual(powerlog._GZ_TEMP, {})  # pylint: disable=protected-access
 
     def test_cleanup_is_registered_with_atexit(self):
-        # The whole fix is worthless if nothing calls it. atexit stores the callback in a
-        # private registry, so assert against the module's own attribute instead.
-        self.assertTrue(callable(powerlog._remove_gz_temp))  # pylint: disable=protected-access
-        source = pathlib.Path(powerlog.__file__).read_text(encoding='utf-8')
-        self.assertIn('atexit.register(_remove_gz_temp)', source)
+        # The whole fix is worthless if nothing calls it. register_cleanup() hands it to
+        # atexit and to the pool workers, which exit without running atexit.
+        self.assertIn(powerlog._remove_gz_temp, ilapfuncs._cleanups)  # pylint: disable=protected-access
 
     def test_cleanup_on_an_untouched_module_does_nothing(self):
         powerlog._remove_gz_temp()  # pylint: disable=protected-access
@@ -0,0 +1,129 @@
+"""Guard the lazy reading of Realm files in scripts/realm_parser.py.
+
+realm_rows() maps the file instead of reading it, decodes only the columns of the
+class asked for, a ClusterTree leaf at a time, and keeps the header, schema and table
+layouts per path. The rows have to be those parse_realm_file() decodes, across leaves,
+the other classes of the file must not be decoded, and a file changed since it was
+first read must be read again rather than through its old layout.
+"""
+import os
+import pathlib
+import shutil
+import struct
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import realm_parser  # pylint: disable=wrong-import-position
+
+REFS = 0x40 | 7  # has_refs, 64-bit elements
+INNER = 0x80 | REFS
+INTS = 7  # 64-bit integers
+FIXED_16 = 1 << 3 | 5  # 16 bytes per element
+
+
+class RealmBuilder:
+    """Writes the arrays of a minimal Realm file, each 8-byte aligned after the header."""
+
+    def __init__(self):
+        self.data = bytearray(24)
+
+    def array(self, flags, count, payload):
+        offset = len(self.data)
+        self.data += b'AAAA' + bytes([flags]) + count.to_bytes(3, 'big') + payload
+        self.data += b'\x00' * (-len(self.data) % 8)
+        return offset
+
+    def refs(self, values, flags=REFS):
+        return self.array(flags, len(values), b''.join(struct.pack('<q', value) for value in values))
+
+    def ints(self, values):
+        return self.refs(values, INTS)
+
+    def names(self, names):
+        return self.array(FIXED_16, len(names), b''.join(name.encode().ljust(16, b'\x00') for name in names))
+
+    def table(self, column_names, leaves, table_key):
+        """leaves: one list of rows per leaf, each row a tuple of ints"""
+        colkeys = [index | (index + 1) << 30 for index in range(len(column_names))]  # Int, not nullable
+        spec = self.refs([0, self.names(column_names), 0, 0, 0, self.ints(colkeys)])
+        leaf_refs = [self.refs([len(rows) << 1 | 1] + [self.ints([row[index] for row in rows])
+                                                        for index in range(len(column_names))])
+                     for rows in leaves]
+        if len(leaf_refs) == 1:
+            cluster_root = leaf_refs[0]
+        else:
+            cluster_root = self.refs([0, 1 << 1 | 1, sum(map(len, leaves)) << 1 | 1] + leaf_refs, INNER)
+        return self.refs([spec, 0, cluster_root, table_key << 1 | 1])
+
+    def finish(self, tables):
+        """tables: {class name: table ref}"""
+        root = self.refs([self.names(list(tables)), self.refs(list(tables.values()))])
+        self.data[0:24] = struct.pack('<QQ', root, root) + b'T-DB' + bytes([22, 22, 0, 0])
+        return bytes(self.data)
+
+
+class TestRealmRows(unittest.TestCase):
+    """realm_rows() streams the rows parse_realm_file() decodes, for one class only."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'default.realm')
+        self.write([[(1, 10), (2, 20), (3, 30)], [(4, 40), (5, 50)]])
+
+    def tearDown(self):
+        realm_parser._realm_files.clear()  # pylint: disable=protected-access
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def write(self, place_leaves):
+        builder = RealmBuilder()
+        places = builder.table(['id', 'visits'], place_leaves, 0)
+        profiles = builder.table(['age'], [[(41,), (42,)]], 1)
+        with open(self.path, 'wb') as file:
+            file.write(builder.finish({'class_Place': places, 'class_Profile': profiles}))
+
+    def eager_rows(self, class_name):
+        table = realm_parser.parse_realm_file(self.path)['active'][class_name]
+        return [{name: table['columns'][index][row] for index, name in enumerate(table['column_names'])}
+                for row in range(table['row_count'])]
+
+    def test_rows_match_parse_realm_file(self):
+        rows = list(realm_parser.realm_rows(self.path, 'class_Place'))
+        self.assertEqual(rows, [{'id': number, 'visits': number * 10} for number in range(1, 6)])
+        self.assertEqual(rows, self.eager_rows('class_Place'))
+        self.assertEqual(list(realm_parser.realm_rows(self.path, 'class_Profile')), self.eager_rows('class_Profile'))
+        self.assertEqual(realm_parser.realm_table_names(self.path), ['class_Place', 'class_Profile'])
+
+    def test_only_the_class_asked_for_is_decoded(self):
+        with mock.patch.object(realm_parser, '_decode_column_values',
+                               wraps=realm_parser._decode_column_values) as decode:  # pylint: disable=protected-access
+            self.assertEqual(len(list(realm_parser.realm_rows(self.path, 'class_Profile'))), 2)
+        self.assertEqual(decode.call_count, 1)
+
+    def test_schema_is_read_once_per_file_version(self):
+        with mock.patch.object(realm_parser, '_extract_schema', wraps=realm_parser._extract_schema) as extract:  # pylint: disable=protected-access
+            list(realm_parser.realm_rows(self.path, 'class_Place'))
+            list(realm_parser.realm_rows(self.path, 'class_Profile'))
+            realm_parser.realm_table_names(self.path)
+            self.assertEqual(extract.call_count, 2)  # the active and the inactive top refs
+            self.write([[(7, 70)]])
+            os.utime(self.path, ns=(0, 10 ** 9))
+            self.assertEqual(list(realm_parser.realm_rows(self.path, 'class_Place')), [{'id': 7, 'visits': 70}])
+            self.assertEqual(extract.call_count, 4)
+
+    def test_missing_class_or_file_yields_nothing(self):
+        self.assertEqual(list(realm_parser.realm_rows(self.path, 'class_Missing')), [])
+        self.assertEqual(list(realm_parser.realm_rows('', 'class_Place')), [])
+        self.assertEqual(realm_parser.realm_table_names(os.path.join(self.tmpdir, 'absent.realm')), [])
+        empty = os.path.join(self.tmpdir, 'empty.realm')
+        open(empty, 'wb').close()
+        self.assertEqual(list(realm_parser.realm_rows(empty, 'class_Place')), [])
+        self.assertIsNone(realm_parser.parse_realm_file(empty)['header'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Guard the shared sidebar of the HTML report.
+
+generate_report() used to write a full copy of the sidebar, one entry per artifact
+page, into every artifact page, so the report grew with the square of the number of
+artifacts. The sidebar is now written once, in _HTML/_elements/sidebar_data.js, which
+every page loads, and the artifact pages are moved to their final names as they were
+written. A page left behind under its temporary name, an entry missing from the shared
+sidebar, or a page that does not load it would leave the report without navigation.
+"""
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import unittest
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.artifact_report import ArtifactHtmlReport  # pylint: disable=wrong-import-position
+from scripts.html_parts import body_sidebar_data_script  # pylint: disable=wrong-import-position
+from scripts.report import generate_report  # pylint: disable=wrong-import-position
+
+ARTIFACTS = {
+    'Installed Apps': ['Applications', 'App State'],
+    'SMS & iMessage': ['SMS - Messages'],
+}
+
+
+class TestSharedSidebar(unittest.TestCase):
+    """Every page loads the one sidebar, which lists every artifact page once."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.html_folder = os.path.join(self.tmpdir, '_HTML')
+        for category, artifact_names in ARTIFACTS.items():
+            report_folder = os.path.join(self.html_folder, category)
+            os.makedirs(report_folder)
+            for artifact_name in artifact_names:
+                report = ArtifactHtmlReport(artifact_name)
+                report.start_artifact_report(report_folder, artifact_name)
+                report.add_script()
+                report.write_artifact_data_table(['Name'], [('row',)], 'private/var/db')
+                report.end_artifact_report()
+        script_logs = os.path.join(self.html_folder, '_Script_Logs')
+        os.makedirs(script_logs)
+        for log_name in ('DeviceInfo.html', 'Screen_Output.html', 'ProcessedFilesLog.html'):
+            pathlib.Path(script_logs, log_name).touch()
+        generate_report(self.tmpdir, 0, '0:00:00', 'fs', self.tmpdir, {}, None, {}, False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_pages_are_moved_and_load_the_sidebar(self):
+        page_names = [name.replace(' ', '_') + '.html' for names in ARTIFACTS.values() for name in names]
+        for page_name in page_names + ['index.html']:
+            with self.subTest(page=page_name):
+                page = pathlib.Path(self.html_folder, page_name).read_text(encoding='utf8')
+                self.assertEqual(page.count(body_sidebar_data_script), 1)
+                for linked_page_name in page_names:
+                    self.assertNotIn(f'href="{linked_page_name}"', page)
+        for category in ARTIFACTS:
+            self.assertFalse(os.path.exists(os.path.join(self.html_folder, category)))
+
+    def test_sidebar_lists_every_page_once(self):
+        sidebar_data = pathlib.Path(self.html_folder, '_elements', 'sidebar_data.js').read_text(encoding='utf8')
+        for category, artifact_names in ARTIFACTS.items():
+            self.assertEqual(sidebar_data.count(category), 1)
+            for artifact_name in artifact_names:
+                self.assertEqual(sidebar_data.count(f'href=\\"{artifact_name.replace(" ", "_")}.html\\"'), 1)
+        self.assertIn('href=\\"index.html\\"', sidebar_data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Guard the buffered screen log of ilapfuncs.
+
+logfunc() hands each line to a writer thread that keeps Screen_Output.html open,
+instead of opening the file for every message, and the log pane of the GUI is redrawn
+at most GUI_LOG_FRAMES_PER_SECOND times a second instead of for every line. Every line
+has to reach its file in order once flush_screen_log() or close_screen_log() returns,
+including when the file the lines go to changes, as it does for each artifact run in a
+worker process.
+"""
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import ilapfuncs  # pylint: disable=wrong-import-position
+
+
+class FakeLogText:
+    """Stands for the Tk text widget of the log pane."""
+
+    def __init__(self):
+        self.text = ''
+        self.updates = 0
+
+    def insert(self, _index, string):
+        self.text += string
+
+    def see(self, _index):
+        pass
+
+    def update(self):
+        self.updates += 1
+
+
+class TestScreenLog(unittest.TestCase):
+    """Logged lines are written by one long-lived handle, in order, and flushed on demand."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'Screen_Output.html')
+        self.addCleanup(shutil.rmtree, self.tmpdir, True)
+        patcher = mock.patch.object(ilapfuncs.OutputParameters, 'screen_output_file_path', self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(ilapfuncs.close_screen_log)
+
+    def read(self, path=None):
+        with open(path or self.path, encoding='utf8') as file:
+            return file.read()
+
+    def test_lines_are_written_in_order(self):
+        with mock.patch('builtins.open', wraps=open) as opened, mock.patch('builtins.print'):
+            for number in range(1000):
+                ilapfuncs.logfunc(f'line {number}')
+            ilapfuncs.flush_screen_log()
+        self.assertEqual(self.read(), ''.join(f'line {number}<br>\n' for number in range(1000)))
+        self.assertEqual(opened.call_count, 1)
+
+        with mock.patch('builtins.print'):
+            ilapfuncs.logfunc('last')
+        ilapfuncs.close_screen_log()
+        self.assertTrue(self.read().endswith('line 999<br>\nlast<br>\n'))
+
+    def test_lines_follow_the_screen_output_path(self):
+        staged = os.path.join(self.tmpdir, 'staged.html')
+        with mock.patch('builtins.print'):
+            ilapfuncs.logfunc('main')
+            with mock.patch.object(ilapfuncs.OutputParameters, 'screen_output_file_path', staged):
+                ilapfuncs.logfunc('worker')
+            ilapfuncs.logfunc('main again')
+            with mock.patch.object(ilapfuncs.OutputParameters, 'screen_output_file_path', ''):
+                ilapfuncs.logfunc('console only')
+        ilapfuncs.flush_screen_log()
+        self.assertEqual(self.read(), 'main<br>\nmain again<br>\n')
+        self.assertEqual(self.read(staged), 'worker<br>\n')
+
+    def test_queue_is_bounded(self):
+        with mock.patch.object(ilapfuncs, 'SCREEN_LOG_QUEUE_SIZE', 2), mock.patch('builtins.print'):
+            ilapfuncs.close_screen_log()
+            for number in range(50):
+                ilapfuncs.logfunc(str(number))
+            self.assertEqual(ilapfuncs._screen_log._queue.maxsize, 2)  # pylint: disable=protected-access
+        ilapfuncs.close_screen_log()
+        self.assertEqual(self.read().count('<br>'), 50)
+
+    def test_unwritable_file_does_not_stop_logging(self):
+        with mock.patch('builtins.print'), mock.patch.object(ilapfuncs, '_console_write') as console:
+            with mock.patch.object(ilapfuncs.OutputParameters, 'screen_output_file_path',
+                                   os.path.join(self.tmpdir, 'missing', 'Screen_Output.html')):
+                ilapfuncs.logfunc('lost')
+            ilapfuncs.logfunc('kept')
+            ilapfuncs.flush_screen_log()
+        self.assertEqual(self.read(), 'kept<br>\n')
+        self.assertIn('Could not write the log', console.call_args_list[0].args[0])
+
+    def test_gui_log_pane_is_redrawn_at_the_frame_rate(self):
+        log_text = FakeLogText()
+        window = mock.Mock()
+        window.nametowidget.return_value = log_text
+        write = sys.stdout.write
+        self.addCleanup(setattr, sys.stdout, 'write', write)
+        clock = mock.Mock(side_effect=[100.0 + number / 1000 for number in range(100)]
+                          + [100.5, 100.7, 100.71, 100.72, 100.72])
+        with mock.patch.object(ilapfuncs.GuiWindow, 'window_handle', window), \
+                mock.patch.object(ilapfuncs, '_console_write'), \
+                mock.patch.object(ilapfuncs, 'monotonic', clock), \
+                mock.patch.object(ilapfuncs, '_gui_log_drawn', 0.0):
+            for number in range(50):  # two writes per print, 1 ms apart, all within one frame
+                ilapfuncs.logfunc(str(number))
+            self.assertEqual(log_text.updates, 1)
+            ilapfuncs.logfunc('later')  # the line and its newline are a frame apart
+            self.assertEqual(log_text.updates, 3)
+            ilapfuncs.logfunc('skipped')  # within a frame of the last redraw
+            self.assertEqual(log_text.updates, 3)
+            # crunch_artifacts flushes before each artifact's work, which draws it whatever the time
+            ilapfuncs.flush_screen_log()
+            self.assertEqual(log_text.updates, 4)
+        self.assertEqual(log_text.text, ''.join(f'{number}\n' for number in range(50)) + 'later\nskipped\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
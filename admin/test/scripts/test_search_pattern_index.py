@@ -0,0 +1,136 @@
+"""Guard the pattern and path indexes against drifting from a full scan of the listing.
+
+crunch_artifacts() hands every selected artifact's search patterns to
+FileSeekerDir.index_patterns() up front, and search() then returns what the index
+matched instead of running the pattern over the whole file listing. The index only
+tests a path against the patterns filed under its file name, extension or directory
+names, so a pattern filed under a part that a matching path does not actually need to
+contain would silently lose files, and the artifact would just report nothing found.
+PathIndex narrows each search of the directory, zip and tar seekers the same way from
+the other side, to the paths filed under a literal part of the pattern.
+"""
+import os
+import pathlib
+import shutil
+import sys
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+# pylint: disable-next=wrong-import-position
+from scripts.search_files import FileSeekerDir, FileSeekerTar, FileSeekerZip, PathIndex, PatternIndex, \
+    _compile_pattern, normcase
+
+FILES = [
+    'private/var/mobile/Library/SMS/sms.db',
+    'private/var/mobile/Library/SMS/sms.db-wal',
+    'private/var/mobile/Library/SMS/Attachments/ab/01/IMG_0001.HEIC',
+    'private/var/mobile/Library/Preferences/com.apple.Preferences.plist',
+    'private/var/mobile/Media/PhotoData/Photos.sqlite',
+    'private/var/mobile/Media/PhotoData/Photos.sqlite-shm',
+    'private/var/mobile/Containers/Data/Application/UUID/Library/Caches/Cache.db',
+    'private/var/mobile/Containers/Data/Application/UUID/Library/Caches/Cache.db.d/nested',
+    'private/var/mobile/Containers/Data/Application/UUID/Documents/notes.txt',
+]
+
+PATTERNS = [
+    '*/Library/SMS/sms.db',
+    '*/Library/SMS/sms.db*',
+    '*/SMS/Attachments/*.HEIC',
+    '*/Library/Preferences/*',
+    '*/Preferences/com.apple.*.plist',
+    '*/PhotoData/Photos.sqlite*',
+    '*/Library/Caches/Cache.db*',
+    '*/Documents/*.txt',
+    '*.db*',
+    '*/SMS/*[.]db',
+    '*/mobile/*/Caches/*',
+    '**/nested',
+    '*/Library/SMS/missing.db',
+    '**/*-wal',
+    '*/Library/*/*.db',
+    '*/Caches/Cache.db.d/*',
+    '*/[Pp]hotoData/*',
+    '*/mobile/Library/SMS',
+    '*sms.db',
+]
+
+
+class TestPatternIndex(unittest.TestCase):
+    """The index finds what a full scan per pattern finds, in the same order."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.extraction = os.path.join(self.tmpdir, 'extraction')
+        for relative_path in FILES:
+            file_path = os.path.join(self.extraction, *relative_path.split('/'))
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            pathlib.Path(file_path).write_bytes(b'data')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_index_matches_full_scan(self):
+        paths = ['/evidence/' + relative_path for relative_path in FILES]
+        matches = PatternIndex(PATTERNS).match_all(paths)
+        for pattern in PATTERNS:
+            with self.subTest(pattern=pattern):
+                pat = _compile_pattern(normcase(pattern))
+                expected = [path for path in paths if pat(normcase('root/') + normcase(path)) is not None]
+                self.assertEqual(matches[pattern], expected)
+
+    def test_path_index_candidates_hold_every_match(self):
+        paths = ['/evidence/' + relative_path for relative_path in FILES]
+        paths += ['private/var/mobile/Library/SMS/', 'private/var/mobile/Library/SMS', 'sms.db']
+        index = PathIndex(paths)
+        for pattern in PATTERNS:
+            with self.subTest(pattern=pattern):
+                pat = _compile_pattern(normcase(pattern))
+                expected = [position for position, path in enumerate(paths)
+                            if pat(normcase('root/') + normcase(path)) is not None]
+                candidates = list(index.candidates(pattern))
+                self.assertEqual(candidates, sorted(candidates))
+                self.assertEqual([position for position in candidates if position in expected], expected)
+        self.assertEqual(list(index.candidates('*/Library/SMS/sms.db')), [0, 11])
+        self.assertEqual(list(index.candidates('*/PhotoData/*')), [4, 5])
+        self.assertEqual(list(index.candidates('*.db*')), list(range(len(paths))))
+
+    def test_archive_searches_match_full_scan(self):
+        zip_path = os.path.join(self.tmpdir, 'extraction.zip')
+        tar_path = os.path.join(self.tmpdir, 'extraction.tar')
+        with zipfile.ZipFile(zip_path, 'w') as archive, tarfile.open(tar_path, 'w') as tar:
+            for relative_path in FILES:
+                archive.writestr(relative_path, b'data')
+                tar.add(os.path.join(self.extraction, *relative_path.split('/')), arcname=relative_path)
+        for seeker_class, archive_path, names in ((FileSeekerZip, zip_path, FILES), (FileSeekerTar, tar_path, None)):
+            seeker = seeker_class(archive_path, os.path.join(self.tmpdir, seeker_class.__name__))
+            if names is None:
+                names = [member.name for member in seeker.members]
+            try:
+                for pattern in PATTERNS:
+                    with self.subTest(seeker=seeker_class.__name__, pattern=pattern):
+                        pat = _compile_pattern(normcase(pattern))
+                        expected = [name for name in names if pat(normcase('root/') + normcase(name)) is not None]
+                        found = [os.path.relpath(path, seeker.data_folder).replace(os.sep, '/')
+                                 for path in seeker.search(pattern)]
+                        self.assertEqual(found, expected)
+            finally:
+                seeker.cleanup()
+
+    def test_indexed_search_returns_same_paths(self):
+        plain = FileSeekerDir(self.extraction, os.path.join(self.tmpdir, 'plain'))
+        indexed = FileSeekerDir(self.extraction, os.path.join(self.tmpdir, 'indexed'))
+        indexed.index_patterns(PATTERNS)
+        for pattern in PATTERNS:
+            with self.subTest(pattern=pattern):
+                expected = [os.path.relpath(path, plain.data_folder) for path in plain.search(pattern)]
+                found = [os.path.relpath(path, indexed.data_folder) for path in indexed.search(pattern)]
+                self.assertEqual(found, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
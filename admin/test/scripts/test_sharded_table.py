@@ -0,0 +1,110 @@
+"""Guard the sharded tables of the HTML report.
+
+A table with more than SHARDED_TABLE_THRESHOLD rows is not written in its page: its rows
+are written in shards beside the page, which _elements/sharded_table.js loads as the
+examiner pages through the table. The cells in the shards have to be escaped exactly as
+they would be in the page, the shards have to follow the page when report.py moves it,
+and a page with its own script, which builds its own table, has to keep its rows.
+"""
+import json
+import os
+import pathlib
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import artifact_report  # pylint: disable=wrong-import-position
+from scripts.artifact_report import ArtifactHtmlReport  # pylint: disable=wrong-import-position
+from scripts.report import generate_report  # pylint: disable=wrong-import-position
+
+HEADERS = ['Number', 'Message', 'Media']
+ROWS = [(number, f'<message {number}>', f'<img src="media/{number}.png">' if number % 2 else None)
+        for number in range(25)]
+
+
+class TestShardedTable(unittest.TestCase):
+    """Rows over the threshold are in shards that decode to the cells of an inline table."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.report_folder = os.path.join(self.tmpdir, '_HTML', 'Messages')
+        os.makedirs(self.report_folder)
+        for name, value in (('SHARDED_TABLE_THRESHOLD', 20), ('SHARD_SIZE', 10)):
+            self.addCleanup(setattr, artifact_report, name, getattr(artifact_report, name))
+            setattr(artifact_report, name, value)
+        self.addCleanup(artifact_report.shard_folders.clear)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write(self, artifact_name, rows, script=''):
+        report = ArtifactHtmlReport(artifact_name)
+        report.start_artifact_report(self.report_folder, artifact_name)
+        report.add_script(script)
+        report.write_artifact_data_table(HEADERS, rows, 'private/var/sms.db', html_no_escape=['Media'])
+        report.end_artifact_report()
+        return pathlib.Path(self.report_folder, f'{artifact_name}.temphtml').read_text(encoding='utf8')
+
+    @staticmethod
+    def _inline_cells(page):
+        return [re.findall(r'<td>(.*?)</td>', row) for row in re.findall(r'<tr><td>.*?</tr>', page)]
+
+    def _shard_cells(self, shard_folder):
+        cells = []
+        for shard_number in range(len(os.listdir(shard_folder))):
+            shard = pathlib.Path(shard_folder, f'{shard_number}.js').read_text(encoding='utf8')
+            url, number, rows = json.loads('[' + shard[len('leappShardLoaded('):-len(');')] + ']')
+            self.assertEqual((url, number), ('Sms_Messages_dtBasicExample_data', shard_number))
+            cells.extend(rows)
+        return cells
+
+    def test_shards_hold_the_inline_cells(self):
+        page = self._write('Sms Messages', ROWS)
+        self.assertEqual(self._inline_cells(page), [])
+        self.assertIn('data-row-count="25"', page)
+        self.assertIn('_elements/sharded_table.js', page)
+        inline_page = self._write('Sms Messages inline', ROWS[:20])
+        inline_cells = self._inline_cells(inline_page)
+        self.assertEqual(len(inline_cells), 20)
+        shard_folder = os.path.join(self.report_folder, 'Sms Messages_dtBasicExample_data')
+        self.assertEqual(self._shard_cells(shard_folder)[:20], inline_cells)
+
+    def test_custom_script_keeps_rows_inline(self):
+        page = self._write('Sms Chat', ROWS, script='<script></script>')
+        self.assertEqual(len(self._inline_cells(page)), len(ROWS))
+        self.assertNotIn('_elements/sharded_table.js', page)
+
+    def test_shards_follow_the_page(self):
+        self._write('Sms Messages', ROWS)
+        script_logs = os.path.join(self.tmpdir, '_HTML', '_Script_Logs')
+        os.makedirs(script_logs)
+        for log_name in ('DeviceInfo.html', 'Screen_Output.html', 'ProcessedFilesLog.html'):
+            pathlib.Path(script_logs, log_name).touch()
+        generate_report(self.tmpdir, 0, '0:00:00', 'fs', self.tmpdir, {}, None, {}, False)
+        html_folder = os.path.join(self.tmpdir, '_HTML')
+        self.assertTrue(os.path.isfile(os.path.join(html_folder, 'Sms_Messages.html')))
+        self.assertEqual(len(self._shard_cells(os.path.join(html_folder, 'Sms_Messages_dtBasicExample_data'))),
+                         len(ROWS))
+        self.assertFalse(os.path.exists(self.report_folder))
+        self.assertTrue(os.path.isfile(os.path.join(html_folder, '_elements', 'sharded_table.js')))
+
+    def test_other_folders_stay_in_place(self):
+        self._write('Sms Messages', ROWS)
+        os.makedirs(os.path.join(self.report_folder, 'Attachments_data'))
+        script_logs = os.path.join(self.tmpdir, '_HTML', '_Script_Logs')
+        os.makedirs(script_logs)
+        for log_name in ('DeviceInfo.html', 'Screen_Output.html', 'ProcessedFilesLog.html'):
+            pathlib.Path(script_logs, log_name).touch()
+        generate_report(self.tmpdir, 0, '0:00:00', 'fs', self.tmpdir, {}, None, {}, False)
+        self.assertTrue(os.path.isdir(os.path.join(self.report_folder, 'Attachments_data')))
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir, '_HTML', 'Attachments_data')))
+        self.assertEqual(artifact_report.shard_folders, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
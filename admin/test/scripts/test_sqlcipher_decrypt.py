@@ -27,6 +27,7 @@ if str(REPO_ROOT) not in sys.path:
 
 from Crypto.Cipher import AES  # noqa: E402  pylint: disable=wrong-import-position
 
+from scripts import sqlcipher_decrypt  # noqa: E402  pylint: disable=wrong-import-position
 from scripts.sqlcipher_decrypt import decrypt_sqlcipher_db  # noqa: E402  pylint: disable=wrong-import-position
 
 PAGE_SIZE = 4096
@@ -81,6 +82,14 @@ def encrypt_like_sqlcipher(content, out_path, key, salt, hmac_name='sha1',
     pathlib.Path(out_path).write_bytes(bytes(out))
 
 
+def write_wal(out_path, frames, salts=b'S' * 8):
+    """Write a WAL of (page_number, encrypted page, commit size) frames."""
+    out = struct.pack('>I', 0x377F0682) + b'\x00' * 12 + salts + b'\x00' * 8
+    for page_number, page, commit_size in frames:
+        out += struct.pack('>II', page_number, commit_size) + salts + b'\x00' * 8 + page
+    pathlib.Path(out_path).write_bytes(out)
+
+
 class TestSqlcipherDecrypt(unittest.TestCase):
 
     def _roundtrip(self, hmac_name, plaintext_header_size, pages=6):
@@ -150,6 +159,48 @@ class TestSqlcipherDecrypt(unittest.TestCase):
             self.assertEqual(pages, verified)
             self.assertEqual(pathlib.Path(recovered).read_bytes(), content)
 
+    def test_wal_frames_are_written_over_their_pages(self):
+        """Committed frames replace, extend and truncate the image; uncommitted ones do not."""
+        reserve = reserve_for('sha1')
+        content = build_page_content(4, reserve)
+        updated = build_page_content(6, reserve)
+        updated = updated[:PAGE_SIZE] + b'\x07' * (PAGE_SIZE - reserve) + b'\x00' * reserve + updated[2 * PAGE_SIZE:]
+        key, salt = os.urandom(32), os.urandom(16)
+        with tempfile.TemporaryDirectory() as folder:
+            encrypted = os.path.join(folder, 'enc.db')
+            recovered = os.path.join(folder, 'out.db')
+            encrypt_like_sqlcipher(content, encrypted, key, salt)
+            encrypt_like_sqlcipher(updated, os.path.join(folder, 'new.db'), key, salt)
+            new_pages = pathlib.Path(folder, 'new.db').read_bytes()
+
+            def frame(page_number, commit_size=0):
+                return page_number, new_pages[(page_number - 1) * PAGE_SIZE:page_number * PAGE_SIZE], commit_size
+
+            # Page 2 is rewritten and page 6 added, leaving page 5 zero filled, then a
+            # later commit drops page 6 again and an unfinished transaction is ignored
+            write_wal(encrypted + '-wal', [frame(2), frame(6, 6), frame(3, 5), frame(4)])
+            pages, verified = decrypt_sqlcipher_db(encrypted, key, recovered, raw_key=True)
+            self.assertEqual((pages, verified), (7, 7))
+            expected = (content[:PAGE_SIZE] + updated[PAGE_SIZE:3 * PAGE_SIZE] + content[3 * PAGE_SIZE:]
+                        + b'\x00' * PAGE_SIZE)
+            self.assertEqual(pathlib.Path(recovered).read_bytes(), expected)
+
+    def test_chunks_and_threads_give_the_same_file(self):
+        """Pages split across chunks and threads must come out in order."""
+        reserve = reserve_for('sha256')
+        content = build_page_content(23, reserve)
+        key, salt = os.urandom(32), os.urandom(16)
+        self.addCleanup(setattr, sqlcipher_decrypt, 'CHUNK_PAGES', sqlcipher_decrypt.CHUNK_PAGES)
+        sqlcipher_decrypt.CHUNK_PAGES = 5
+        with tempfile.TemporaryDirectory() as folder:
+            encrypted = os.path.join(folder, 'enc.db')
+            encrypt_like_sqlcipher(content, encrypted, key, salt, 'sha256')
+            for workers in (1, 2, 3):
+                recovered = os.path.join(folder, f'out{workers}.db')
+                self.assertEqual(decrypt_sqlcipher_db(encrypted, key, recovered, raw_key=True, workers=workers,
+                                                      hmac_algorithm='sha256', kdf_algorithm='sha256'), (23, 23))
+                self.assertEqual(pathlib.Path(recovered).read_bytes(), content)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,10 +1,12 @@
-"""The sqlite existence-check helpers must close the database they open.
+"""The sqlite existence-check helpers must not leave connections open.
 
-does_table_exist_in_db, does_view_exist_in_db and does_column_exist_in_db each open a
-connection through open_sqlite_db_readonly and return a bool, so nothing escapes for the
-caller to close. They used to leave the connection to the garbage collector, which shows
-up as `ResourceWarning: unclosed database` and, on a full extraction, means one held
-handle per probe - artifacts probe the same NoteStore.sqlite several times over.
+does_table_exist_in_db, does_view_exist_in_db and does_column_exist_in_db each return a
+bool, so nothing escapes for the caller to close. They used to leave the connection to
+the garbage collector, which shows up as `ResourceWarning: unclosed database` and, on a
+full extraction, means one held handle per probe - artifacts probe the same
+NoteStore.sqlite several times over. They now read the schema through the connection
+pool, which holds one connection per database until it is evicted as the least recently
+used or close_sqlite_pool() closes them at the end of the run.
 
 get_sqlite_db_records is deliberately not covered here: it returns its cursor for the
 caller to iterate, so closing the connection inside it would break every caller.
@@ -19,7 +21,6 @@ import shutil
 import sys
 import tempfile
 import unittest
-from unittest import mock
 
 REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
 sys.path.insert(0, str(REPO_ROOT))
@@ -28,9 +29,10 @@ from scripts import ilapfuncs  # pylint: disable=wrong-import-position
 
 
 class TestSqliteHelpersCloseDb(unittest.TestCase):
-    """Every helper that opens a connection and returns a bool must close it."""
+    """Every helper that returns a bool leaves at most the pooled connection, which the pool closes."""
 
     def setUp(self):
+        ilapfuncs.close_sqlite_pool()
         self.tmpdir = tempfile.mkdtemp()
         self.db_path = pathlib.Path(self.tmpdir) / 'probe.sqlite'
         db = sqlite3.connect(self.db_path)
@@ -40,20 +42,15 @@ class TestSqliteHelpersCloseDb(unittest.TestCase):
         db.close()
 
     def tearDown(self):
+        ilapfuncs.close_sqlite_pool()
         shutil.rmtree(self.tmpdir, ignore_errors=True)
 
     def _call_and_capture(self, func, *args):
-        """Run a helper, returning its result plus the connections it opened."""
-        real_open = ilapfuncs.open_sqlite_db_readonly
-        opened = []
-
-        def spy(path):
-            db = real_open(path)
-            opened.append(db)
-            return db
-
-        with mock.patch.object(ilapfuncs, 'open_sqlite_db_readonly', spy):
-            result = func(*args)
+        """Run a helper, returning its result plus the connections it left open."""
+        result = func(*args)
+        opened = list(ilapfuncs._sqlite_pool.values())  # pylint: disable=protected-access
+        self.assertLessEqual(len(opened), 1, 'helper opened more than one connection')
+        ilapfuncs.close_sqlite_pool()
         return result, opened
 
     def _assert_all_closed(self, opened):
@@ -0,0 +1,146 @@
+"""Guard the read-only sqlite connection pool of ilapfuncs.
+
+The existence checks, null_absent_columns and get_sqlite_db_records share one read-only
+connection per database for the run, and the checks answer from a snapshot of
+sqlite_master and table_info taken once. The LAVA db is checked while it is still being
+written, so a snapshot that outlives a change to the schema would report a table created
+since as missing. An attach query must not leave its database attached to the shared
+connection, and close_sqlite_pool() has to close every connection it handed out. The pool
+keeps at most SQLITE_POOL_MAX_SIZE connections, so a run touching many databases does not
+run out of file descriptors; the least recently used one is closed first, unless an artifact
+still holds a cursor of it, as when it runs a query on another database per row.
+"""
+import pathlib
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import ilapfuncs  # pylint: disable=wrong-import-position
+
+
+class TestSqlitePool(unittest.TestCase):
+    """The helpers share one connection per database and see changes to its schema."""
+
+    def setUp(self):
+        ilapfuncs.close_sqlite_pool()
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = str(pathlib.Path(self.tmpdir, 'store.sqlite'))
+        self.other_path = str(pathlib.Path(self.tmpdir, 'other.sqlite'))
+        with sqlite3.connect(self.db_path) as db:
+            db.execute('CREATE TABLE ZMESSAGE (Z_PK INTEGER, ZTEXT TEXT)')
+            db.execute("INSERT INTO ZMESSAGE VALUES (1, 'hello')")
+        with sqlite3.connect(self.other_path) as db:
+            db.execute('CREATE TABLE ZHANDLE (Z_PK INTEGER, ZID TEXT)')
+        db.close()
+
+    def tearDown(self):
+        ilapfuncs.close_sqlite_pool()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_one_connection_per_database(self):
+        with mock.patch.object(ilapfuncs.sqlite3, 'connect', wraps=sqlite3.connect) as connect:
+            self.assertTrue(ilapfuncs.does_table_exist_in_db(self.db_path, 'ZMESSAGE'))
+            self.assertFalse(ilapfuncs.does_view_exist_in_db(self.db_path, 'ZMESSAGE'))
+            self.assertTrue(ilapfuncs.does_column_exist_in_db(self.db_path, 'zmessage', 'ztext'))
+            self.assertFalse(ilapfuncs.does_column_exist_in_db(self.db_path, 'ZMESSAGE', 'ZDATE'))
+            rows = list(ilapfuncs.get_sqlite_db_records(self.db_path, 'SELECT Z_PK, ZTEXT FROM ZMESSAGE'))
+        self.assertEqual(connect.call_count, 1)
+        self.assertEqual([(row['Z_PK'], row['ZTEXT']) for row in rows], [(1, 'hello')])
+
+    def test_schema_change_is_seen(self):
+        self.assertFalse(ilapfuncs.does_table_exist_in_db(self.db_path, 'ZATTACHMENT'))
+        self.assertFalse(ilapfuncs.does_column_exist_in_db(self.db_path, 'ZMESSAGE', 'ZDATE'))
+        with sqlite3.connect(self.db_path) as db:
+            db.execute('CREATE TABLE ZATTACHMENT (Z_PK INTEGER)')
+            db.execute('ALTER TABLE ZMESSAGE ADD COLUMN ZDATE REAL')
+        db.close()
+        self.assertTrue(ilapfuncs.does_table_exist_in_db(self.db_path, 'ZATTACHMENT'))
+        self.assertTrue(ilapfuncs.does_column_exist_in_db(self.db_path, 'ZMESSAGE', 'ZDATE'))
+
+    def test_nulled_query_is_reused_and_logged_each_time(self):
+        query = 'SELECT Z_PK, ZDATE FROM ZMESSAGE'
+        null_out_column = ilapfuncs._null_out_column  # pylint: disable=protected-access
+        with mock.patch.object(ilapfuncs, 'logfunc') as logfunc, \
+                mock.patch.object(ilapfuncs, '_null_out_column', wraps=null_out_column) as null_out:
+            first = ilapfuncs.null_absent_columns(self.db_path, query)
+            second = ilapfuncs.null_absent_columns(self.db_path, query)
+        self.assertEqual(first, 'SELECT Z_PK, NULL AS ZDATE FROM ZMESSAGE')
+        self.assertEqual(second, first)
+        self.assertEqual(null_out.call_count, 1)
+        self.assertEqual(logfunc.call_count, 2)
+
+    def test_attach_query_leaves_the_pooled_connection_alone(self):
+        attach_query = ilapfuncs.attach_sqlite_db_readonly(self.other_path, 'other')
+        rows = list(ilapfuncs.get_sqlite_db_records(
+            self.db_path, 'SELECT ZTEXT FROM ZMESSAGE, other.ZHANDLE', attach_query))
+        self.assertEqual(rows, [])
+        ilapfuncs.get_sqlite_db_records(self.db_path, 'SELECT 1')
+        databases = [row[1] for row in ilapfuncs.get_pooled_sqlite_db(self.db_path).execute('PRAGMA database_list')]
+        self.assertEqual(databases, ['main'])
+
+    def test_close_closes_every_connection(self):
+        ilapfuncs.does_table_exist_in_db(self.db_path, 'ZMESSAGE')
+        ilapfuncs.does_table_exist_in_db(self.other_path, 'ZHANDLE')
+        opened = list(ilapfuncs._sqlite_pool.values())  # pylint: disable=protected-access
+        self.assertEqual(len(opened), 2)
+        ilapfuncs.close_sqlite_pool()
+        for db in opened:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                db.execute('SELECT 1')
+        self.assertTrue(ilapfuncs.does_table_exist_in_db(self.db_path, 'ZMESSAGE'))
+
+    def test_least_recently_used_connection_is_closed_past_the_cap(self):
+        paths = [self.db_path, self.other_path]
+        for index in range(3):
+            paths.append(str(pathlib.Path(self.tmpdir, f'extra{index}.sqlite')))
+            sqlite3.connect(paths[-1]).close()
+        with mock.patch.object(ilapfuncs, 'SQLITE_POOL_MAX_SIZE', 3):
+            self.assertTrue(ilapfuncs.does_table_exist_in_db(self.db_path, 'ZMESSAGE'))
+            oldest = ilapfuncs.get_pooled_sqlite_db(self.db_path)
+            kept = ilapfuncs.get_pooled_sqlite_db(self.other_path)
+            for path in paths[2:]:
+                ilapfuncs.get_pooled_sqlite_db(path)
+                ilapfuncs.get_pooled_sqlite_db(self.other_path)  # used again, so not the oldest
+            pool = ilapfuncs._sqlite_pool  # pylint: disable=protected-access
+            self.assertEqual(len(pool), 3)
+            self.assertNotIn(self.db_path, pool)
+            self.assertNotIn(self.db_path, ilapfuncs._sqlite_schemas)  # pylint: disable=protected-access
+            with self.assertRaises(sqlite3.ProgrammingError):
+                oldest.execute('SELECT 1')
+            self.assertIs(ilapfuncs.get_pooled_sqlite_db(self.other_path), kept)
+            kept.execute('SELECT 1')
+            self.assertTrue(ilapfuncs.does_table_exist_in_db(self.db_path, 'ZMESSAGE'))
+
+    def test_connection_with_a_cursor_in_use_is_not_closed(self):
+        with sqlite3.connect(self.db_path) as db:
+            db.executemany('INSERT INTO ZMESSAGE VALUES (?, ?)', [(number, 'row') for number in range(2, 41)])
+        db.close()
+        rows = []
+        cursor = ilapfuncs.get_sqlite_db_records(self.db_path, 'SELECT Z_PK FROM ZMESSAGE ORDER BY Z_PK')
+        for record in cursor:  # one query per row against a database of its own, past the cap
+            path = str(pathlib.Path(self.tmpdir, f'document{record["Z_PK"]}.sqlite'))
+            with sqlite3.connect(path) as db:
+                db.execute('CREATE TABLE doc (id INTEGER)')
+                db.execute('INSERT INTO doc VALUES (?)', (record['Z_PK'],))
+            db.close()
+            rows.extend(row['id'] for row in ilapfuncs.get_sqlite_db_records(path, 'SELECT id FROM doc'))
+        self.assertEqual(rows, list(range(1, 41)))
+        pool = ilapfuncs._sqlite_pool  # pylint: disable=protected-access
+        self.assertGreater(40, ilapfuncs.SQLITE_POOL_MAX_SIZE)
+        self.assertEqual(len(pool), ilapfuncs.SQLITE_POOL_MAX_SIZE)
+        self.assertIn(self.db_path, pool)
+        # Once the cursor is gone, its connection is evicted like any other
+        del cursor, record
+        ilapfuncs.get_pooled_sqlite_db(self.other_path)
+        self.assertNotIn(self.db_path, pool)
+        self.assertEqual(len(pool), ilapfuncs.SQLITE_POOL_MAX_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()
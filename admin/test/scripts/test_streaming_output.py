@@ -0,0 +1,127 @@
+"""Guard the HTML, TSV and timeline output of artifact_processor_streaming.
+
+artifact_processor_streaming writes each batch of rows to every output as it arrives,
+and splits the HTML report into pages of HTML_PAGE_SIZE rows. A row lost or written
+twice where a batch or a page ends, a TSV header repeated for each batch, or a total on
+the first page that is not filled in would go unnoticed: the report still opens. The
+pages after the first must not get their own sidebar entry, and have to link to each
+other under the names report.py gives them.
+"""
+import datetime
+import os
+import pathlib
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import artifact_report, ilapfuncs, lavafuncs  # pylint: disable=wrong-import-position
+from scripts.context import Context  # pylint: disable=wrong-import-position
+from scripts.ilapfuncs import artifact_processor_streaming  # pylint: disable=wrong-import-position
+from scripts.report import generate_report  # pylint: disable=wrong-import-position
+
+__artifacts_v2__ = {
+    'streaming_probe': {
+        'name': 'Streaming Probe',
+        'description': 'Rows produced by a generator',
+        'category': 'Probes',
+        'paths': None,
+        'output_types': 'standard',
+        'artifact_icon': 'database',
+    },
+}
+
+PAGE_SIZE = 1000
+BATCH_SIZE = 300
+
+
+class TestStreamingOutput(unittest.TestCase):
+    """Every row reaches every output once, over as many HTML pages as it takes."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.report_folder = os.path.join(self.tmpdir, '_HTML', 'Probes')
+        os.makedirs(self.report_folder)
+        lavafuncs.initialize_lava(self.tmpdir, self.tmpdir, 'fs')
+        for module, name, value in ((artifact_report, 'HTML_PAGE_SIZE', PAGE_SIZE),
+                                    (ilapfuncs, 'STREAMING_BATCH_SIZE', BATCH_SIZE)):
+            self.addCleanup(setattr, module, name, getattr(module, name))
+            setattr(module, name, value)
+
+    def tearDown(self):
+        lavafuncs.lava_db.close()
+        lavafuncs.lava_db = None
+        lavafuncs.lava_data = None
+        Context.clear()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _run(self, row_count):
+        headers = (('Timestamp', 'datetime'), 'Row Number', 'Event Message')
+
+        @artifact_processor_streaming
+        def streaming_probe(context):  # pylint: disable=unused-argument
+            return headers, ((datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc), index,
+                              f'<message {index}>') for index in range(row_count)), 'private/var/probe.db'
+
+        streaming_probe.__globals__['__artifacts_v2__'] = __artifacts_v2__
+        streaming_probe([], self.report_folder, None, False, 0)  # pylint: disable=too-many-function-args
+
+    def _pages(self):
+        return sorted(os.listdir(self.report_folder), key=lambda name: (len(name), name))
+
+    def test_rows_are_paged(self):
+        row_count = 2 * PAGE_SIZE + 1
+        self._run(row_count)
+        pages = self._pages()
+        self.assertEqual(pages, ['Streaming Probe.temphtml', 'Streaming Probe__page2.temphtml',
+                                 'Streaming Probe__page3.temphtml'])
+        row_numbers = []
+        for page in pages:
+            content = pathlib.Path(self.report_folder, page).read_text(encoding='utf8')
+            row_numbers.extend(int(number) for number in re.findall(r'<tr><td>[^<]*</td><td>(\d+)</td>', content))
+            self.assertNotIn('<message', content)
+        self.assertEqual(row_numbers, list(range(row_count)))
+        first_page = pathlib.Path(self.report_folder, pages[0]).read_text(encoding='utf8')
+        self.assertRegex(first_page, rf'<h6>Total number of entries: {row_count}\s*</h6>')
+        self.assertIn('href="Streaming_Probe__page2.html"', first_page)
+        last_page = pathlib.Path(self.report_folder, pages[-1]).read_text(encoding='utf8')
+        self.assertIn('href="Streaming_Probe__page2.html">Previous page', last_page)
+        self.assertNotIn('Next page', last_page)
+
+    def test_exports_have_every_row_once(self):
+        row_count = 2 * BATCH_SIZE + 7
+        self._run(row_count)
+        tsv_path = os.path.join(self.tmpdir, '_TSV Exports', 'Streaming Probe.tsv')
+        lines = pathlib.Path(tsv_path).read_text(encoding='utf-8-sig').splitlines()
+        self.assertEqual(lines[0], 'Timestamp\tRow Number\tEvent Message')
+        self.assertEqual(len(lines), row_count + 1)
+        with sqlite3.connect(os.path.join(self.tmpdir, '_Timeline', 'tl.db')) as db:
+            self.assertEqual(db.execute('SELECT COUNT(*) FROM data').fetchone()[0], row_count)
+        lavafuncs.lava_commit()
+        self.assertEqual(lavafuncs.lava_db.execute('SELECT COUNT(*) FROM streaming_probe').fetchone()[0], row_count)
+        artifact = next(artifact for artifact in lavafuncs.lava_data['artifacts']['Probes']
+                        if artifact['tablename'] == 'streaming_probe')
+        self.assertEqual(artifact['record_count'], row_count)
+
+    def test_only_the_first_page_is_in_the_sidebar(self):
+        self._run(PAGE_SIZE + 1)
+        script_logs = os.path.join(self.tmpdir, '_HTML', '_Script_Logs')
+        os.makedirs(script_logs)
+        for log_name in ('DeviceInfo.html', 'Screen_Output.html', 'ProcessedFilesLog.html'):
+            pathlib.Path(script_logs, log_name).touch()
+        generate_report(self.tmpdir, 0, '0:00:00', 'fs', self.tmpdir, {}, None, ilapfuncs.icons, False)
+        html_folder = os.path.join(self.tmpdir, '_HTML')
+        self.assertEqual(sorted(name for name in os.listdir(html_folder) if name.startswith('Streaming')),
+                         ['Streaming_Probe.html', 'Streaming_Probe__page2.html'])
+        self.assertFalse(os.path.exists(self.report_folder))
+        sidebar_data = pathlib.Path(html_folder, '_elements', 'sidebar_data.js').read_text(encoding='utf8')
+        self.assertIn('href=\\"Streaming_Probe.html\\"', sidebar_data)
+        self.assertNotIn('Streaming_Probe__page2.html', sidebar_data)
+
+if __name__ == '__main__':
+    unittest.main()
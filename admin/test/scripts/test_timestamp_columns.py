@@ -0,0 +1,107 @@
+"""Guard the column conversions of scripts/timestamps.py.
+
+Each function converts a whole column in one call, with NumPy when it is installed,
+and has to give for every value exactly what its counterpart in ilapfuncs gives a value
+at a time: the same datetime for seconds, milliseconds, microseconds and nanoseconds,
+before and after 1970, and the same value back for the empty values and the text it
+cannot convert. Without NumPy, the functions fall back to a loop over ilapfuncs.
+"""
+import pathlib
+import sqlite3
+import sys
+import unittest
+from unittest import mock
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import ilapfuncs, timestamps  # pylint: disable=wrong-import-position
+
+UNIX_VALUES = [
+    None, 0, 0.0, '', 'not a time', '1700000000', b'1',
+    1, -1, 1700000000, 1700000000.75, -1700000000, 9999999999, -9999999999,
+    1700000000123, 1700000000123456, 1700000000123456789, -1700000000123456789,
+    10 ** 10, 10 ** 13, 10 ** 16, 2 ** 53 + 1, 2 ** 62, 2 ** 63 + 5, -(2 ** 63) - 5,
+    253402300799, 253402300800, -62135596800, -62135596801,
+]
+
+COCOA_VALUES = UNIX_VALUES + [-978307200, -978307200.0, 700000000, 700000000.5, -978307201]
+
+INT_VALUES = [0, 1, -1, 1700000000, -1700000000, 1700000000.0, 1700000000.4, 1700000000.6, 2.5,
+              253402300799, -62135596800, True]
+
+
+def outcome(function, *args):
+    """The value a function returns, or the type of the exception it raises."""
+    try:
+        return function(*args)
+    except Exception as ex:  # pylint: disable=broad-except
+        return type(ex)
+
+
+class TestTimestampColumns(unittest.TestCase):
+    """Each column conversion gives what its ilapfuncs counterpart gives per value."""
+
+    def assert_matches(self, column_function, scalar_function, values, *args):
+        for value in values:
+            expected = outcome(scalar_function, value, *args)
+            converted = outcome(column_function, [value], *args)
+            if isinstance(expected, type) and issubclass(expected, Exception):
+                self.assertIs(converted, expected, value)
+            else:
+                self.assertEqual(converted, [expected], value)
+                self.assertIs(type(converted[0]), type(expected), value)
+                if hasattr(expected, 'tzinfo'):
+                    self.assertEqual(converted[0].tzinfo, expected.tzinfo, value)
+        convertible = [value for value in values if not isinstance(outcome(scalar_function, value, *args), type)]
+        self.assertEqual(column_function(convertible, *args), [scalar_function(value, *args) for value in convertible])
+        self.assertEqual(column_function(tuple(convertible), *args), column_function(convertible, *args))
+
+    def test_unix_column(self):
+        self.assert_matches(timestamps.convert_unix_ts_column, ilapfuncs.convert_unix_ts_to_utc, UNIX_VALUES)
+
+    def test_cocoa_column(self):
+        self.assert_matches(timestamps.convert_cocoa_ts_column, ilapfuncs.convert_cocoa_core_data_ts_to_utc,
+                            COCOA_VALUES)
+        # A Cocoa time of -978307200 is the epoch, given back as the sum as convert_unix_ts_to_utc() does
+        self.assertEqual(timestamps.convert_cocoa_ts_column([-978307200, 1]),
+                         [0, ilapfuncs.convert_cocoa_core_data_ts_to_utc(1)])
+
+    def test_webkit_column(self):
+        self.assert_matches(timestamps.webkit_timestamps_column, ilapfuncs.webkit_timestampsconv,
+                            [0, 1, 700000000.123456, -700000000.5, 2 ** 53 + 1, None, 'text', float('nan')])
+
+    def test_timezone_column(self):
+        for time_offset in ('UTC', 'America/New_York', 'Asia/Kolkata'):
+            self.assert_matches(timestamps.convert_ts_int_column_to_timezone, ilapfuncs.convert_ts_int_to_timezone,
+                                INT_VALUES + [None, 'text', float('nan'), 2 ** 40], time_offset)
+
+    def test_without_numpy(self):
+        with mock.patch.object(timestamps, 'np', None):
+            self.test_unix_column()
+            self.test_cocoa_column()
+            self.test_webkit_column()
+            self.test_timezone_column()
+
+    def test_empty_and_iterable_columns(self):
+        self.assertEqual(timestamps.convert_unix_ts_column([]), [])
+        self.assertEqual(timestamps.convert_unix_ts_column(value for value in (1, None)),
+                         [ilapfuncs.convert_unix_ts_to_utc(1), None])
+        self.assertEqual(timestamps.convert_ts_int_column_to_timezone([], 'UTC'), [])
+
+    def test_convert_columns(self):
+        db = sqlite3.connect(':memory:')
+        db.execute('CREATE TABLE visits (url TEXT, visited REAL, created INTEGER)')
+        rows = [('a', 700000000.5, 1700000000123), ('b', None, None), ('c', 0, 1)]
+        db.executemany('INSERT INTO visits VALUES (?, ?, ?)', rows)
+        converted = timestamps.convert_columns(db.execute('SELECT * FROM visits'),
+                                               {1: timestamps.convert_cocoa_ts_column,
+                                                2: timestamps.convert_unix_ts_column})
+        db.close()
+        self.assertEqual(converted, [[url, ilapfuncs.convert_cocoa_core_data_ts_to_utc(visited),
+                                      ilapfuncs.convert_unix_ts_to_utc(created)] for url, visited, created in rows])
+        self.assertEqual(timestamps.convert_columns([], {0: timestamps.convert_unix_ts_column}), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
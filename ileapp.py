@@ -4,6 +4,7 @@ import pathlib
 import json
 import argparse
 import io
+import multiprocessing
 import pytz
 import os.path
 import typing
@@ -14,7 +15,7 @@ import sys
 import scripts.plugin_loader as plugin_loader
 import leapp_functions.app.history as history
 
-from shutil import copy2
+from shutil import copy2, rmtree
 from getpass import getpass
 from scripts.search_files import *  # pylint: disable=wildcard-import,unused-wildcard-import
 from scripts.ilapfuncs import *  # pylint: disable=wildcard-import,unused-wildcard-import
@@ -23,7 +24,16 @@ from scripts.version_info import leapp_name, leapp_version, check_runtime_depend
 from time import process_time, gmtime, strftime, perf_counter
 from scripts.lavafuncs import *  # pylint: disable=wildcard-import,unused-wildcard-import
 from scripts.context import Context
+from scripts.artifact_pool import ArtifactPool, runs_in_pool
+from scripts.ascii_strings import set_strings_workers
+from scripts.biome_reader import set_biome_workers
+from scripts.extraction_cache import CACHE_FOLDER_NAME, DEFAULT_MAX_SIZE
+from scripts.evidence_index import get_index_folder
 from scripts.ios_keychain import report_supplied_keychain
+from scripts.ktx_snapshots import SNAPSHOT_FORMATS, get_snapshot_cache_folder, prune_snapshot_cache, \
+    set_snapshot_options, set_snapshot_workers
+from scripts.photos_db import WORKING_COPY_FOLDER_NAME, close_photos_working_copies
+from scripts.sqlcipher_decrypt import set_sqlcipher_workers
 from scripts.lavafuncs import lava_json_name
 
 
@@ -77,6 +87,12 @@ def validate_args(args):
     if args.keychain and not os.path.isfile(args.keychain):
         raise argparse.ArgumentError(None, 'Keychain file not found! Run the program again.')
 
+    if args.workers < 1:
+        raise argparse.ArgumentError(None, 'The number of workers must be at least 1. Run the program again.')
+
+    if args.extraction_cache_size < 1:
+        raise argparse.ArgumentError(None, 'The extraction cache size must be at least 1 MB. Run the program again.')
+
     try:
         pytz.timezone(args.timezone)
     except pytz.UnknownTimeZoneError as ex:
@@ -203,6 +219,29 @@ def main():
                         help=("Path to a keychain file captured from the device. Some apps keep "
                               "their database key in the keychain, which is collected separately "
                               "from the file system extraction."))
+    parser.add_argument('--workers', required=False, action="store", type=int, default=1,
+                        help=("Number of worker processes used to run artifacts in parallel "
+                              "(default: 1, runs every artifact in turn)."))
+    parser.add_argument('--lazy_extraction', required=False, action="store_true",
+                        help=("For tar and zip inputs, only extract the files an artifact reads rather "
+                              "than everything its search paths match. Applies to artifacts that "
+                              "support it."))
+    parser.add_argument('--extraction_cache_size', required=False, action="store", type=int, default=4096,
+                        help=("With --lazy_extraction, size in MB above which the least recently read "
+                              "files are removed again from the data folder (default: 4096). With "
+                              "--workers, the size is split between the processes."))
+    parser.add_argument('--evidence_index', required=False, action="store_true",
+                        help=("Keep an index of the input in the LEAPP shared directory and reuse it "
+                              "when the same input is processed again, instead of listing its files "
+                              "again. Applies to fs, tar and unencrypted iTunes inputs."))
+    parser.add_argument('--snapshot_cache', required=False, action="store_true",
+                        help=("Keep app snapshots converted from KTX in the LEAPP shared directory and "
+                              "reuse them instead of decoding them again on later runs. The least "
+                              "recently used are removed to keep the cache under 1 GB."))
+    parser.add_argument('--snapshot_format', required=False, action="store", choices=list(SNAPSHOT_FORMATS),
+                        default='png',
+                        help=("Image format app snapshots stored as KTX are converted to (default: png). "
+                              "webp is lossless and saves about twice as fast."))
 
     # Check if no arguments were provided
     if len(sys.argv) == 1:
@@ -359,13 +398,111 @@ def main():
     history.record_output_path(output_path)
 
     crunch_artifacts(selected_plugins, extracttype, input_path, out_params, wrap_text, loader, casedata, time_offset,
-        profile_filename, itunes_backup_password)
+        profile_filename, itunes_backup_password, workers=args.workers, lazy_extraction=args.lazy_extraction,
+        extraction_cache_size=args.extraction_cache_size * 1024 * 1024, evidence_index=args.evidence_index,
+        snapshot_cache=args.snapshot_cache, snapshot_format=args.snapshot_format)
 
     lava_finalize_output(out_params.output_folder_base)
 
+def search_artifact_files(plugin, seeker, extracttype, input_path, out_params, log, search_state):
+    '''Runs the search patterns of an artifact, recording each pattern and the files it
+    matched in LAVA and in the processed files log. search_state carries the pattern ids
+    and recorded file path ids across the artifacts of the run. Returns files_found.'''
+    if isinstance(plugin.search, list) or isinstance(plugin.search, tuple):
+        search_regexes = plugin.search
+    elif plugin.search is None:
+        search_regexes = plugin.search
+    else:
+        search_regexes = [plugin.search]
+    files_found = []
+    log.write(f'<b>For {plugin.name} artifact</b>')
+    if search_regexes is None:
+        log.write(f'<ul><li>No search regexes provided for {plugin.name} artifact.')
+        log.write("<ul><li><i>'_lava_artifacts.db'</i> used as source file.</li></ul></li></ul>")
+        files_found = [os.path.join(out_params.output_folder_base, '_lava_artifacts.db')]
+    else:
+        file_path_ids = search_state['file_path_ids']
+        for artifact_search_regex in search_regexes:
+            search_state['artifact_search_pattern_id'] += 1
+            artifact_search_pattern_id = search_state['artifact_search_pattern_id']
+            lava_insert_sqlite_artifact_search_pattern(
+                artifact_search_pattern_id, plugin.module_name, plugin.name, artifact_search_regex)
+            pattern_already_searched = artifact_search_regex in seeker.searched
+            with seeker.artifact_scope(plugin.artifact_info.get('lazy_extraction', False)):
+                found = seeker.search(artifact_search_regex)
+            if not found:
+                if plugin.name == 'logarchive' and extracttype != 'fs' and extracttype != 'file':
+                    src = os.path.join(os.path.dirname(input_path), "logarchive.json")
+                    dst = os.path.join(out_params.data_folder, "logarchive.json")
+                    # The artifact declares several search patterns, so this branch is
+                    # reached once per pattern that misses; only pick the export up once.
+                    if os.path.exists(src) and dst not in files_found:
+                        copy2(src, dst)
+                        files_found.append(dst)
+                log.write(f'<ul><li>No file found for regex <i>{artifact_search_regex}</i></li></ul>')
+            else:
+                log.write(f'<ul><li>{len(found)} {"files" if len(found) > 1 else "file"} for regex <i>{artifact_search_regex}</i> located at:')
+                for pathh in found:
+                    # Strip \\?\ only for log display; file_infos is keyed with the
+                    # original long-path form on Windows.
+                    display_path = pathh[4:] if pathh.startswith('\\\\?\\') else pathh
+                    log.write(f'<ul><li>{display_path}</li></ul>')
+                    if seeker.file_infos.get(pathh):
+                        file_path_id = id(seeker.file_infos.get(pathh))
+                        if not pattern_already_searched and file_path_id not in file_path_ids:
+                            lava_insert_sqlite_file_path(file_path_id, seeker.file_infos.get(pathh).source_path)
+                            file_path_ids.add(file_path_id)
+                        lava_insert_sqlite_artifact_link_pattern_to_file(artifact_search_pattern_id, file_path_id)
+                log.write('</li></ul>')
+                files_found.extend(found)
+    return files_found
+
+def get_category_folder(plugin, out_params):
+    '''Creates the report folder of the artifact's category. Returns its path, or None
+    if it could not be created.'''
+    category_folder = os.path.join(out_params.output_folder_base, '_HTML',
+                                   sanitize_report_name(plugin.category, 'category'))
+    if not os.path.exists(category_folder):
+        try:
+            os.makedirs(category_folder)
+        except (FileExistsError, FileNotFoundError) as ex:
+            logfunc('Error creating {} report directory at path {}'.format(plugin.name, category_folder))
+            logfunc('Error was {}'.format(str(ex)))
+            return None
+    return category_folder
+
+def run_artifact(plugin, files_found, category_folder, seeker, wrap_text, time_offset, loader, out_params):
+    '''Runs an artifact in this process. Returns the status recorded by lava_add_module.'''
+    flush_screen_log()  # the lines of the search are drawn in the GUI before the parse
+    try:
+        with seeker.artifact_scope(plugin.artifact_info.get('lazy_extraction', False)):
+            plugin.method(files_found, category_folder, seeker, wrap_text, time_offset)
+        if plugin.name == 'logarchive':
+            # The unified log artifacts read what logarchive wrote through their own connection
+            lava_commit()
+            lava_db_path = os.path.join(out_params.output_folder_base, '_lava_artifacts.db')
+            if does_table_exist_in_db(lava_db_path, 'logarchive'):
+                loader["logarchive_artifacts"].method([lava_db_path], category_folder, seeker, wrap_text, time_offset)
+            if does_table_exist_in_db(lava_db_path, 'logarchive_artifacts'):
+                unifed_logs_artifacts = []
+                unifed_logs_artifacts = [plugin.name for plugin in loader.plugins
+                                         if plugin.module_name=='logarchive'
+                                         and plugin.name != 'logarchive'
+                                         and plugin.name != 'logarchive_artifacts']
+                for unifed_log_artifact in unifed_logs_artifacts:
+                    loader[unifed_log_artifact].method([lava_db_path], category_folder, seeker, wrap_text, time_offset)
+    except Exception as ex:  # pylint: disable=broad-exception-caught
+        logfunc('Reading {} artifact had errors!'.format(plugin.name))
+        logfunc('Error was {}'.format(str(ex)))
+        logfunc('Exception Traceback: {}'.format(traceback.format_exc()))
+        return "Error"
+    return "Complete"
+
 def crunch_artifacts(
         plugins: typing.Sequence[plugin_loader.PluginSpec], extracttype, input_path, out_params, wrap_text,
-        loader: plugin_loader.PluginLoader, casedata, time_offset, profile_filename, itunes_backup_password=None, decryption_keys=None):
+        loader: plugin_loader.PluginLoader, casedata, time_offset, profile_filename, itunes_backup_password=None, decryption_keys=None,
+        workers=1, lazy_extraction=False, extraction_cache_size=DEFAULT_MAX_SIZE, evidence_index=False,
+        snapshot_cache=False, snapshot_format='png'):
     start = process_time()
     start_wall = perf_counter()
 
@@ -379,15 +516,16 @@ def crunch_artifacts(
     report_supplied_keychain()
     seeker = None
     password = itunes_backup_password
+    index_folder = get_index_folder() if evidence_index else None
     try:
         if extracttype == 'fs':
-            seeker = FileSeekerDir(input_path, out_params.data_folder)
+            seeker = FileSeekerDir(input_path, out_params.data_folder, index_folder)
 
         elif extracttype == 'file':
             seeker = FileSeekerFile(input_path, out_params.data_folder)
 
         elif extracttype in ('tar', 'gz'):
-            seeker = FileSeekerTar(input_path, out_params.data_folder)
+            seeker = FileSeekerTar(input_path, out_params.data_folder, index_folder)
 
         elif extracttype == 'zip':
             seeker = FileSeekerZip(input_path, out_params.data_folder)
@@ -412,7 +550,7 @@ def crunch_artifacts(
                 logfunc('Input folder is not a valid iTunes backup!')
                 return False
             seeker = FileSeekerItunes(input_path, out_params.data_folder,
-                                    itunes_backup_type, decryption_keys)
+                                    itunes_backup_type, decryption_keys, index_folder)
 
         else:
             logfunc('Error on argument -o (input type)')
@@ -425,6 +563,14 @@ def crunch_artifacts(
         temp_file.close()
         return False
 
+    if lazy_extraction:
+        if seeker.supports_lazy_extraction:
+            seeker.enable_lazy_extraction(os.path.join(out_params.output_folder_base, CACHE_FOLDER_NAME),
+                                          extraction_cache_size)
+            logfunc('Lazy extraction enabled: artifacts that support it extract files when they read them')
+        else:
+            logfunc('Lazy extraction is only available for tar and zip inputs, files are extracted as usual')
+
     # Now ready to run
     # add last_build at the start except for iTunes backups
     if extracttype != 'itunes':
@@ -469,95 +615,53 @@ def crunch_artifacts(
             logfunc('Info.plist not found for iTunes Backup!')
             log.write('Info.plist not found for iTunes Backup!')
 
+    # Match the search patterns of all the selected artifacts against the extraction at once
+    search_patterns = []
+    for plugin in plugins:
+        if isinstance(plugin.search, (list, tuple)):
+            search_patterns.extend(plugin.search)
+        elif plugin.search is not None:
+            search_patterns.append(plugin.search)
+    seeker.index_patterns(search_patterns)
+
     # Search for the files per the arguments
     parsed_modules = 0
     lava_only = False
-    artifact_search_pattern_id = 0
-    file_path_ids = set()
-
-    for plugin_number, plugin in enumerate(plugins, start=1):
+    search_state = {'artifact_search_pattern_id': 0, 'file_path_ids': set()}
+
+    set_biome_workers(workers)
+    set_sqlcipher_workers(workers)
+    set_snapshot_workers(workers)
+    set_strings_workers(workers)
+    set_snapshot_options(get_snapshot_cache_folder() if snapshot_cache else None, snapshot_format)
+    if workers > 1 and plugins:
+        # last_build records the iOS version the other artifacts read, so it has to
+        # finish before the workers take their snapshot of the run
+        serial_plugins = plugins[:1] if plugins[0].name == 'last_build' else []
+        pool = ArtifactPool(workers, loader, seeker, out_params, input_path, extracttype, profile_filename,
+                            wrap_text, time_offset)
+    else:
+        serial_plugins = plugins
+        pool = None
+
+    for plugin_number, plugin in enumerate(serial_plugins, start=1):
         logfunc()
         logfunc('[{}/{}] {} [{}] artifact started'.format(plugin_number, len(plugins),
                                                               plugin.name, plugin.module_name))
-        output_types = plugin.artifact_info.get('output_types', '')
-        if isinstance(plugin.search, list) or isinstance(plugin.search, tuple):
-            search_regexes = plugin.search
-        elif plugin.search is None:
-            search_regexes = plugin.search
-        else:
-            search_regexes = [plugin.search]
-        files_found = []
-        log.write(f'<b>For {plugin.name} artifact</b>')
-        if search_regexes is None:
-            log.write(f'<ul><li>No search regexes provided for {plugin.name} artifact.')
-            log.write("<ul><li><i>'_lava_artifacts.db'</i> used as source file.</li></ul></li></ul>")
-            files_found = [os.path.join(out_params.output_folder_base, '_lava_artifacts.db')]
-        else:
-            for artifact_search_regex in search_regexes:
-                artifact_search_pattern_id += 1
-                lava_insert_sqlite_artifact_search_pattern(
-                    artifact_search_pattern_id, plugin.module_name, plugin.name, artifact_search_regex)
-                pattern_already_searched = artifact_search_regex in seeker.searched
-                found = seeker.search(artifact_search_regex)
-                if not found:
-                    if plugin.name == 'logarchive' and extracttype != 'fs' and extracttype != 'file':
-                        src = os.path.join(os.path.dirname(input_path), "logarchive.json")
-                        dst = os.path.join(out_params.data_folder, "logarchive.json")
-                        # The artifact declares several search patterns, so this branch is
-                        # reached once per pattern that misses; only pick the export up once.
-                        if os.path.exists(src) and dst not in files_found:
-                            copy2(src, dst)
-                            files_found.append(dst)
-                    log.write(f'<ul><li>No file found for regex <i>{artifact_search_regex}</i></li></ul>')
-                else:
-                    log.write(f'<ul><li>{len(found)} {"files" if len(found) > 1 else "file"} for regex <i>{artifact_search_regex}</i> located at:')
-                    for pathh in found:
-                        # Strip \\?\ only for log display; file_infos is keyed with the
-                        # original long-path form on Windows.
-                        display_path = pathh[4:] if pathh.startswith('\\\\?\\') else pathh
-                        log.write(f'<ul><li>{display_path}</li></ul>')
-                        if seeker.file_infos.get(pathh):
-                            file_path_id = id(seeker.file_infos.get(pathh))
-                            if not pattern_already_searched and file_path_id not in file_path_ids:
-                                lava_insert_sqlite_file_path(file_path_id, seeker.file_infos.get(pathh).source_path)
-                                file_path_ids.add(file_path_id)
-                            lava_insert_sqlite_artifact_link_pattern_to_file(artifact_search_pattern_id, file_path_id)
-                    log.write('</li></ul>')
-                    files_found.extend(found)
+        flush_screen_log()  # drawn in the GUI before the search and the parse
+        files_found = search_artifact_files(plugin, seeker, extracttype, input_path, out_params, log, search_state)
         if files_found:
-            if not lava_only and 'lava_only' in output_types:
+            if not lava_only and 'lava_only' in plugin.artifact_info.get('output_types', ''):
                 lava_only = True
-            category_folder = os.path.join(out_params.output_folder_base, '_HTML',
-                                           sanitize_report_name(plugin.category, 'category'))
-            if not os.path.exists(category_folder):
-                try:
-                    os.makedirs(category_folder)
-                except (FileExistsError, FileNotFoundError) as ex:
-                    logfunc('Error creating {} report directory at path {}'.format(plugin.name, category_folder))
-                    logfunc('Error was {}'.format(str(ex)))
-                    lava_add_module(plugin.module_name, "Error", len(files_found), plugin.name)
-                    continue  # cannot do work
-            try:
-                plugin.method(files_found, category_folder, seeker, wrap_text, time_offset)
-                if plugin.name == 'logarchive':
-                    lava_db_path = os.path.join(out_params.output_folder_base, '_lava_artifacts.db')
-                    if does_table_exist_in_db(lava_db_path, 'logarchive'):
-                        loader["logarchive_artifacts"].method([lava_db_path], category_folder, seeker, wrap_text, time_offset)
-                    if does_table_exist_in_db(lava_db_path, 'logarchive_artifacts'):
-                        unifed_logs_artifacts = []
-                        unifed_logs_artifacts = [plugin.name for plugin in loader.plugins
-                                                 if plugin.module_name=='logarchive'
-                                                 and plugin.name != 'logarchive'
-                                                 and plugin.name != 'logarchive_artifacts']
-                        for unifed_log_artifact in unifed_logs_artifacts:
-                            loader[unifed_log_artifact].method([lava_db_path], category_folder, seeker, wrap_text, time_offset)
-            except Exception as ex:  # pylint: disable=broad-exception-caught
-                logfunc('Reading {} artifact had errors!'.format(plugin.name))
-                logfunc('Error was {}'.format(str(ex)))
-                logfunc('Exception Traceback: {}'.format(traceback.format_exc()))
+            category_folder = get_category_folder(plugin, out_params)
+            if not category_folder:
                 lava_add_module(plugin.module_name, "Error", len(files_found), plugin.name)
+                continue  # cannot do work
+            status = run_artifact(plugin, files_found, category_folder, seeker, wrap_text, time_offset,
+                                  loader, out_params)
+            lava_add_module(plugin.module_name, status, len(files_found), plugin.name)
+            if status == 'Error':
                 continue  # nope
-            lava_add_module(plugin.module_name, "Complete", len(files_found), plugin.name)
         else:
             lava_add_module(plugin.module_name, "No files found", 0, plugin.name)
             logfunc("No file found")
@@ -565,7 +669,61 @@ def crunch_artifacts(
         parsed_modules += 1
         GuiWindow.SetProgressBar(parsed_modules, len(plugins))
         log.flush()
+
+    if pool:
+        # Every artifact searches first, so that the workers start with all matched
+        # files already copied, then the results are merged back in selection order
+        pooled_plugins = []
+        for plugin in plugins[len(serial_plugins):]:
+            files_found = search_artifact_files(plugin, seeker, extracttype, input_path, out_params, log,
+                                                search_state)
+            category_folder = get_category_folder(plugin, out_params) if files_found else None
+            pooled_plugins.append((plugin, files_found, category_folder))
+        log.flush()
+        for plugin, files_found, category_folder in pooled_plugins:
+            if category_folder and runs_in_pool(plugin):
+                pool.submit(plugin, files_found, category_folder)
+        pool.start()
+        try:
+            for plugin_number, (plugin, files_found, category_folder) in enumerate(
+                    pooled_plugins, start=len(serial_plugins) + 1):
+                logfunc()
+                logfunc('[{}/{}] {} [{}] artifact started'.format(plugin_number, len(plugins),
+                                                                      plugin.name, plugin.module_name))
+                flush_screen_log()  # drawn in the GUI while the artifact runs or is merged
+                if files_found:
+                    if not lava_only and 'lava_only' in plugin.artifact_info.get('output_types', ''):
+                        lava_only = True
+                    if not category_folder:
+                        lava_add_module(plugin.module_name, "Error", len(files_found), plugin.name)
+                        continue  # cannot do work
+                    if pool.is_submitted(plugin):
+                        status = pool.merge(plugin)
+                    else:
+                        status = run_artifact(plugin, files_found, category_folder, seeker, wrap_text,
+                                              time_offset, loader, out_params)
+                    lava_add_module(plugin.module_name, status, len(files_found), plugin.name)
+                    if status == 'Error':
+                        continue  # nope
+                else:
+                    lava_add_module(plugin.module_name, "No files found", 0, plugin.name)
+                    logfunc("No file found")
+                logfunc('{} [{}] artifact completed'.format(plugin.name, plugin.module_name))
+                parsed_modules += 1
+                GuiWindow.SetProgressBar(parsed_modules, len(plugins))
+        finally:
+            pool.shutdown()
+    close_sqlite_pool()
+    clear_plist_cache()
+    close_photos_working_copies()
+    seeker.cleanup()
     log.close()
+    if snapshot_cache:
+        prune_snapshot_cache(get_snapshot_cache_folder())
+    rmtree(os.path.join(out_params.output_folder_base, WORKING_COPY_FOLDER_NAME), ignore_errors=True)
+    if lazy_extraction:
+        # The data folder holds hard links or copies of what was read, the store is no longer needed
+        rmtree(os.path.join(out_params.output_folder_base, CACHE_FOLDER_NAME), ignore_errors=True)
 
     write_device_info()
     if lava_only:
@@ -590,6 +748,7 @@ def crunch_artifacts(
         if input_path.startswith('\\\\?\\'):
             input_path = input_path[4:]
 
+    flush_screen_log()  # the report embeds Screen_Output.html
     report.generate_report(out_params.output_folder_base, run_time_secs, run_time_HMS, extracttype, input_path, casedata, profile_filename, icons, lava_only)
     logfunc('Report generation Completed.')
 
@@ -599,8 +758,10 @@ def crunch_artifacts(
 
     logfunc('')
     logfunc(f'Report location: {out_params.output_folder_base}')
+    close_screen_log()
 
     return True
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     main()
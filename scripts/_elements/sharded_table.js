@@ -0,0 +1,144 @@
+// Fills the tables that ArtifactHtmlReport.write_table_shards() wrote in shards beside
+// the page. Only the shards holding the rows on display are loaded, and only a few are
+// kept, so that a table of millions of rows still opens. A search goes through all the
+// shards, one at a time, and keeps the indexes of the matching rows.
+(function () {
+    var MAX_CACHED_SHARDS = 8;
+    var SEARCH_REPLACED = new Error('Search replaced by a newer one');
+    var cache = {};
+    var cacheOrder = [];
+    var pending = {};
+
+    // Called by each shard file as it loads
+    window.leappShardLoaded = function (url, index, rows) {
+        var key = url + '/' + index;
+        if (!(key in cache)) {
+            cache[key] = rows;
+            cacheOrder.push(key);
+            if (cacheOrder.length > MAX_CACHED_SHARDS)
+                delete cache[cacheOrder.shift()];
+        }
+        (pending[key] || []).forEach(function (resolve) { resolve(rows); });
+        delete pending[key];
+    };
+
+    function loadShard(url, index) {
+        var key = url + '/' + index;
+        if (key in cache)
+            return Promise.resolve(cache[key]);
+        return new Promise(function (resolve, reject) {
+            if (key in pending) {
+                pending[key].push(resolve);
+                return;
+            }
+            pending[key] = [resolve];
+            // Pages are opened from disk, where a page cannot fetch files, but can load scripts
+            var script = document.createElement('script');
+            script.src = key + '.js';
+            script.onload = function () { script.remove(); };
+            script.onerror = function () {
+                script.remove();
+                delete pending[key];
+                reject(new Error('Could not load ' + script.src));
+            };
+            document.head.appendChild(script);
+        });
+    }
+
+    function getRows(url, shardSize, indexes) {
+        // Shard by shard, in order, so that a page of search results spread over many
+        // shards does not need them all in the cache at once
+        var rows = [];
+        var chain = Promise.resolve();
+        indexes.forEach(function (rowIndex, position) {
+            chain = chain.then(function () {
+                return loadShard(url, Math.floor(rowIndex / shardSize)).then(function (shard) {
+                    rows[position] = shard[rowIndex % shardSize];
+                });
+            });
+        });
+        return chain.then(function () { return rows; });
+    }
+
+    function cellText(cell) {
+        return cell.replace(/<[^>]*>/g, '').toLowerCase();
+    }
+
+    function searchRows(url, shardSize, shardCount, term, state) {
+        var matches = [];
+        var chain = Promise.resolve();
+        for (var index = 0; index < shardCount; index++) {
+            chain = chain.then((function (shardIndex) {
+                return function () {
+                    if (state.term !== term)
+                        return Promise.reject(SEARCH_REPLACED);
+                    return loadShard(url, shardIndex).then(function (shard) {
+                        shard.forEach(function (row, rowIndex) {
+                            if (row.some(function (cell) { return cellText(cell).indexOf(term) !== -1; }))
+                                matches.push(shardIndex * shardSize + rowIndex);
+                        });
+                    });
+                };
+            })(index));
+        }
+        return chain.then(function () { return matches; });
+    }
+
+    $(document).ready(function () {
+        $('table.table-sharded').each(function () {
+            var table = $(this);
+            var url = table.data('shard-url');
+            var shardSize = table.data('shard-size');
+            var shardCount = table.data('shard-count');
+            var rowCount = table.data('row-count');
+            var state = { term: '', matches: null };
+
+            table.DataTable({
+                serverSide: true,
+                processing: true,
+                ordering: false,
+                searchDelay: 1000,
+                "aLengthMenu": [[ 15, 50, 100 ], [ 15, 50, 100 ]],
+                ajax: function (request, callback) {
+                    var term = request.search.value.toLowerCase();
+                    var matching;
+                    if (!term) {
+                        state.term = '';
+                        matching = Promise.resolve(null);
+                    } else if (term === state.term && state.matches) {
+                        matching = Promise.resolve(state.matches);
+                    } else {
+                        state.term = term;
+                        state.matches = null;
+                        matching = searchRows(url, shardSize, shardCount, term, state).then(function (matches) {
+                            state.matches = matches;
+                            return matches;
+                        });
+                    }
+                    matching.then(function (matches) {
+                        var filteredCount = matches ? matches.length : rowCount;
+                        var indexes = [];
+                        var end = Math.min(request.start + request.length, filteredCount);
+                        for (var position = request.start; position < end; position++)
+                            indexes.push(matches ? matches[position] : position);
+                        return getRows(url, shardSize, indexes).then(function (rows) {
+                            callback({
+                                draw: request.draw,
+                                recordsTotal: rowCount,
+                                recordsFiltered: filteredCount,
+                                data: rows
+                            });
+                        });
+                    }).catch(function (error) {
+                        // A search replaced by a newer one leaves the drawing to it
+                        if (error === SEARCH_REPLACED)
+                            return;
+                        console.error(error);
+                        callback({ draw: request.draw, recordsTotal: rowCount, recordsFiltered: 0, data: [] });
+                    });
+                }
+            });
+        });
+        $('#mySpinner').remove();
+    });
+})();
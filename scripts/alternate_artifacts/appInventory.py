@@ -283,7 +283,7 @@ def _iter_extraction_files(seeker):
         return
     tar_file = getattr(seeker, 'tar_file', None)
     if tar_file is not None:
-        for member in tar_file.getmembers():
+        for member in getattr(seeker, 'members', None) or tar_file.getmembers():
             if not member.isfile():
                 continue
             yield member.name, member.size, _format_utc(member.mtime)
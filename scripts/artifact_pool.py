@@ -0,0 +1,288 @@
+"""
+Runs independent artifacts across a pool of worker processes.
+
+crunch_artifacts() runs every selected artifact one after another on the main thread.
+Most of them are independent SQLite and plist parsers, so on a full file system
+extraction the run is bound by a single core. With --workers N the artifacts are
+scheduled across N processes instead, and the report is assembled so that it reads the
+same as a serial run.
+
+Artifacts of the same module may share module level state (burnerCache builds an id to
+phone number map across its artifacts, for instance), so a task is one module: its
+artifacts run one after another in the same worker, in selection order. The modules that
+query Photos.sqlite through scripts/photos_db.py all share one task, so that its working
+copy of the database, and the indexes their queries add to it, are made once.
+
+Each artifact runs against its own staging folder under <report>/_parallel/<task>:
+    - a private _lava_artifacts.db, created by initialize_lava(), which the artifact
+      writes its table, media items and media references into
+    - a private Screen_Output.html that logfunc() appends to
+    - private timeline and KML location databases (see OutputParameters.staging_folder)
+HTML pages, TSV and KML files have one file per artifact and are written to their
+final location directly, as are media files, which are named after their content.
+
+The main process merges the tasks back in the order the artifacts were selected, so the
+log, the LAVA tables, device info and the sidebar icons come out in the serial order.
+
+Ordering constraints are kept by running some artifacts in the main process instead:
+    - last_build runs before the pool starts, since it records the iOS version the
+      other artifacts read
+    - the logarchive artifact, whose dependents read what it wrote to the LAVA database
+    - any artifact without search paths, as those read _lava_artifacts.db itself; by
+      the time one runs, every artifact selected before it has been merged
+"""
+
+import contextlib
+import inspect
+import io
+import os
+import shutil
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor
+
+import scripts.lavafuncs as lavafuncs
+import scripts.plugin_loader as plugin_loader
+from scripts.artifact_report import shard_folders
+from scripts.ascii_strings import set_strings_workers
+from scripts.biome_reader import set_biome_workers
+from scripts.context import Context
+from scripts.ilapfuncs import OutputParameters, close_screen_log, close_sqlite_pool, flush_screen_log, iOS, icons, \
+    identifiers, lava_only_artifacts, logfunc, merge_device_info, merge_staged_exports, run_cleanups
+from scripts.ktx_snapshots import get_snapshot_options, set_snapshot_options, set_snapshot_workers
+from scripts.photos_db import close_photos_working_copies, get_photos_db_records
+from scripts.sqlcipher_decrypt import set_sqlcipher_workers
+
+STAGING_FOLDER_NAME = '_parallel'
+PHOTOS_TASK = 'photos_db'
+
+# Set in each worker process by _initialize_worker()
+_worker_state = {}
+
+
+def runs_in_pool(plugin):
+    """
+    Returns True if the artifact can run in a worker process.
+
+    Artifacts without search paths read _lava_artifacts.db and the logarchive module
+    feeds its own dependents through the same database, so both need every earlier
+    artifact to be merged first and run in the main process instead.
+    """
+    if plugin.search is None:
+        return False
+    if plugin.module_name == 'logarchive':
+        return False
+    return plugin.name != 'last_build'
+
+
+def _task_key(plugin):
+    """Returns the key of the task an artifact runs in, its module name or PHOTOS_TASK."""
+    method_globals = getattr(inspect.unwrap(plugin.method), '__globals__', {})
+    if method_globals.get('get_photos_db_records') is get_photos_db_records:
+        return PHOTOS_TASK
+    return plugin.module_name
+
+
+def _initialize_worker(state):
+    """Rebuilds the run level state of the main process in a worker process."""
+    loader = plugin_loader.PluginLoader(plugin_paths=state['plugin_paths'])
+    _worker_state.update(state)
+    _worker_state['loader'] = loader
+    out_params = state['out_params']
+    Context.set_output_params(out_params)
+    Context.set_keychain_path(state['keychain_path'])
+    Context.set_installed_os_version(state['installed_os_version'])
+    if state['ios_version']:
+        iOS.set_version(state['ios_version'])
+    # A forked worker inherits the archive handles of the main process, file offset included
+    state['seeker'].reopen()
+    # The pool already runs one artifact per core, so an artifact spreading its own work over
+    # --workers processes or threads here would start workers * workers of them
+    set_biome_workers(1)
+    set_sqlcipher_workers(1)
+    set_snapshot_workers(1)
+    set_strings_workers(1)
+    set_snapshot_options(**state['snapshot_options'])
+
+
+def _run_artifact(staging_folder, plugin_name, files_found, category_folder):
+    """
+    Runs one artifact in a worker process and returns what the main process needs
+    to merge it into the report.
+    """
+    state = _worker_state
+    plugin = state['loader'][plugin_name]
+    seeker = state['seeker']
+
+    os.makedirs(staging_folder, exist_ok=True)
+    OutputParameters.screen_output_file_path = os.path.join(staging_folder, 'Screen_Output.html')
+    OutputParameters.staging_folder = staging_folder
+    lavafuncs.initialize_lava(state['input_path'], staging_folder, state['extracttype'],
+                              state['profile_filename'])
+    icons.clear()
+    identifiers.clear()
+    lava_only_artifacts.clear()
+    shard_folders.clear()
+    known_file_infos = set(seeker.file_infos)
+
+    status = 'Complete'
+    console = io.StringIO()
+    with contextlib.redirect_stdout(console):
+        try:
+            with seeker.artifact_scope(plugin.artifact_info.get('lazy_extraction', False)):
+                plugin.method(files_found, category_folder, seeker, state['wrap_text'], state['time_offset'])
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            logfunc('Reading {} artifact had errors!'.format(plugin.name))
+            logfunc('Error was {}'.format(str(ex)))
+            logfunc('Exception Traceback: {}'.format(traceback.format_exc()))
+            status = 'Error'
+    lavafuncs.lava_commit()
+    lavafuncs.lava_db.close()
+    close_sqlite_pool()
+    close_screen_log()  # the main process reads the staged log once the result is back
+
+    return {
+        'status': status,
+        'staging_folder': staging_folder,
+        'console': console.getvalue(),
+        'lava_artifacts': lavafuncs.lava_data['artifacts'],
+        'lava_modules': lavafuncs.lava_data['meta']['modules'],
+        'icons': dict(icons),
+        'identifiers': dict(identifiers),
+        'lava_only_artifacts': dict(lava_only_artifacts),
+        'shard_folders': sorted(shard_folders),
+        'file_infos': {path: info for path, info in seeker.file_infos.items() if path not in known_file_infos},
+        'ios_version': iOS.get_version(),
+    }
+
+
+def _run_task(task_folder, artifacts):
+    """
+    Runs the artifacts of one module in a worker process, in the order given.
+    Returns:
+        dict: The result of each artifact, keyed by artifact name.
+    """
+    results = {}
+    try:
+        for index, (plugin_name, files_found, category_folder) in enumerate(artifacts, start=1):
+            staging_folder = os.path.join(task_folder, str(index))
+            results[plugin_name] = _run_artifact(staging_folder, plugin_name, files_found, category_folder)
+    finally:
+        # Worker processes exit without running atexit, so the module cleanups run here
+        run_cleanups()
+    return results
+
+
+class ArtifactPool:
+    """
+    Schedules artifacts on a process pool and merges their output in selection order.
+    Attributes:
+        workers (int): The number of worker processes.
+        seeker: The seeker of the main process. Workers get a copy of it, taken once
+            every artifact has searched for its files.
+        out_params (OutputParameters): The output parameters of the run.
+    Methods:
+        submit(plugin, files_found, category_folder): Queues an artifact.
+        start(): Starts the worker processes on the queued artifacts.
+        merge(plugin): Waits for a queued artifact, merges its output and returns its status.
+        shutdown(): Stops the workers and removes the staging folders.
+    """
+
+    def __init__(self, workers, loader, seeker, out_params, input_path, extracttype, profile_filename,
+                 wrap_text, time_offset):
+        self.workers = workers
+        self.loader = loader
+        self.seeker = seeker
+        self.out_params = out_params
+        self.input_path = input_path
+        self.extracttype = extracttype
+        self.profile_filename = profile_filename
+        self.wrap_text = wrap_text
+        self.time_offset = time_offset
+        self._executor = None
+        self._tasks = {}
+        self._futures = {}
+
+    def submit(self, plugin, files_found, category_folder):
+        """Queues an artifact to run in a worker process, after those of its task queued before it."""
+        self._tasks.setdefault(_task_key(plugin), []).append((plugin.name, files_found, category_folder))
+
+    def is_submitted(self, plugin):
+        """Returns True if the artifact was queued with submit()."""
+        return any(plugin.name == queued[0] for queued in self._tasks.get(_task_key(plugin), ()))
+
+    def start(self):
+        """Starts the worker processes with a snapshot of the run level state and the queued artifacts."""
+        state = {
+            'plugin_paths': self.loader.plugin_paths,
+            'seeker': self.seeker,
+            'out_params': self.out_params,
+            'input_path': self.input_path,
+            'extracttype': self.extracttype,
+            'profile_filename': self.profile_filename,
+            'wrap_text': self.wrap_text,
+            'time_offset': self.time_offset,
+            'keychain_path': Context.get_keychain_path(),
+            'installed_os_version': Context.get_installed_os_version(),
+            'ios_version': iOS.get_version(),
+            'snapshot_options': get_snapshot_options(),
+        }
+        # A forked worker must not inherit the open sqlite connections of the main process
+        close_sqlite_pool()
+        close_photos_working_copies()
+        # The workers and the main process all extract into the same cache folder
+        self.seeker.share_extraction_cache(self.workers + 1)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_initialize_worker,
+                                             initargs=(state,))
+        staging_base = os.path.join(self.out_params.output_folder_base, STAGING_FOLDER_NAME)
+        for task_id, (task_key, artifacts) in enumerate(self._tasks.items(), start=1):
+            self._futures[task_key] = self._executor.submit(
+                _run_task, os.path.join(staging_base, str(task_id)), artifacts)
+
+    def merge(self, plugin):
+        """
+        Waits for a queued artifact and merges its output into the report.
+        Returns:
+            str: 'Complete' or 'Error', as recorded by lava_add_module().
+        """
+        try:
+            result = self._futures[_task_key(plugin)].result()[plugin.name]
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            # The worker itself died (e.g. out of memory), so there is nothing to merge
+            logfunc('Reading {} artifact had errors!'.format(plugin.name))
+            logfunc('Error was {}'.format(str(ex)))
+            return 'Error'
+
+        staging_folder = result['staging_folder']
+        print(result['console'], end='')
+        staged_log = os.path.join(staging_folder, 'Screen_Output.html')
+        if os.path.exists(staged_log) and OutputParameters.screen_output_file_path:
+            flush_screen_log()  # the lines logged before this artifact go first
+            with open(staged_log, 'r', encoding='utf8') as src, \
+                    open(OutputParameters.screen_output_file_path, 'a', encoding='utf8') as dst:
+                shutil.copyfileobj(src, dst)
+
+        lavafuncs.lava_merge_staged_output(os.path.join(staging_folder, lavafuncs.lava_db_name),
+                                           result['lava_artifacts'], result['lava_modules'])
+        merge_staged_exports(staging_folder, self.out_params.output_folder_base)
+
+        for category, artifact_icons in result['icons'].items():
+            icons.setdefault(category, {}).update(artifact_icons)
+        merge_device_info(result['identifiers'])
+        for category, artifacts in result['lava_only_artifacts'].items():
+            lava_only_artifacts.setdefault(category, []).extend(artifacts)
+        shard_folders.update(result['shard_folders'])
+        self.seeker.file_infos.update(result['file_infos'])
+        if result['ios_version']:
+            iOS.set_version(result['ios_version'])
+
+        shutil.rmtree(staging_folder, ignore_errors=True)
+        return result['status']
+
+    def shutdown(self):
+        """Stops the worker processes and removes the staging folders."""
+        if self._executor:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        shutil.rmtree(os.path.join(self.out_params.output_folder_base, STAGING_FOLDER_NAME),
+                      ignore_errors=True)
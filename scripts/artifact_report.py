@@ -1,16 +1,34 @@
 import html
+import json
 import os
+import re
 import sys
 from scripts.html_parts import *
 #from scripts.ilapfuncs import is_platform_windows
 from scripts.version_info import leapp_version
 
+# A table with more rows than this is not written in the page, a browser cannot open a
+# page with that many rows. Its rows are written in shards of SHARD_SIZE rows beside the
+# page, which _elements/sharded_table.js loads as the examiner pages through the table.
+SHARDED_TABLE_THRESHOLD = 50000
+SHARD_SIZE = 10000
+# The shard folders written during the run, which report.py moves with their pages
+shard_folders = set()
+
+def _cell_html(value, escape):
+    text = str(value) if value not in [None, 'N/A'] else ''
+    return html.escape(text) if escape else text
+
+
 class ArtifactHtmlReport:
 
     def __init__(self, artifact_name, artifact_category=''):
         self.report_file = None
         self.report_file_path = ''
+        self.report_folder = ''
+        self.artifact_file_name = ''
         self.script_code = ''
+        self.custom_script = False
         self.artifact_name = artifact_name
         self.artifact_category = artifact_category # unused
 
@@ -21,11 +39,13 @@ class ArtifactHtmlReport:
     def start_artifact_report(self, report_folder, artifact_file_name, artifact_description=''):
         '''Creates the report HTML file and writes the artifact name as a heading'''
         # artifact_file_name =  artifact_file_name.replace(" ", "_") # Replace " " with "_" in HTML filenames
+        self.report_folder = report_folder
+        self.artifact_file_name = artifact_file_name
         self.report_file = open(os.path.join(report_folder, f'{artifact_file_name}.temphtml'), 'w', encoding='utf8')
         self.report_file.write(page_header.format(f'iLEAPP - {self.artifact_name} report'))
         self.report_file.write(body_start.format(f'iLEAPP {leapp_version}'))
         self.report_file.write(body_sidebar_setup)
-        self.report_file.write(body_sidebar_dynamic_data_placeholder) # placeholder for sidebar data
+        self.report_file.write(body_sidebar_data)
         self.report_file.write(body_sidebar_trailer)
         self.report_file.write(body_main_header)
         self.report_file.write(body_main_data_title.format(f'{self.artifact_name} report', artifact_description))
@@ -35,6 +55,7 @@ class ArtifactHtmlReport:
     def add_script(self, script=''):
         '''Adds a default script or the script supplied'''
         if script:
+            self.custom_script = True
             self.script_code += script + nav_bar_script_footer
         else:
             self.script_code += default_responsive_table_script + nav_bar_script_footer
@@ -77,6 +98,9 @@ class ArtifactHtmlReport:
             table_id       : Specify an identifier string, which will be referenced in javascript
 
             html_no_escape  : if html_escape=True, list of columns not to escape
+
+            A table with more than SHARDED_TABLE_THRESHOLD rows is written with
+            write_table_shards(), unless the page has its own script.
         '''
         if (not self.report_file):
             raise ValueError('Output report file is closed/unavailable!')
@@ -85,24 +109,41 @@ class ArtifactHtmlReport:
         if write_total:
             self.write_minor_header(f'Total number of entries: {num_entries}', 'h6')
         if write_location:
-            if sys.platform == 'win32':
-                source_path = source_path.replace('/', '\\')
-            if source_path.startswith('\\\\?\\'):
-                source_path = source_path[4:]
-            self.write_lead_text(f'{self.artifact_name} located at: {source_path}')
+            self.write_source_location(source_path)
 
         self.report_file.write('<br />')
+        if num_entries > SHARDED_TABLE_THRESHOLD and not self.custom_script:
+            self.write_table_shards(data_headers, data_list, html_escape, html_no_escape,
+                                    table_responsive, table_style, table_id)
+            self.write_table_end(data_headers, cols_repeated_at_bottom, table_responsive)
+            return
+        self.write_table_start(data_headers, table_responsive, table_style, table_id)
+        self.write_table_rows(data_headers, data_list, html_escape, html_no_escape)
+        self.write_table_end(data_headers, cols_repeated_at_bottom, table_responsive)
 
+    def write_source_location(self, source_path):
+        if sys.platform == 'win32':
+            source_path = source_path.replace('/', '\\')
+        if source_path.startswith('\\\\?\\'):
+            source_path = source_path[4:]
+        self.write_lead_text(f'{self.artifact_name} located at: {source_path}')
+
+    def write_table_start(self, data_headers, table_responsive=True, table_style='', table_id='dtBasicExample',
+                          table_class='', table_data=None):
         if table_responsive:
             self.report_file.write("<div class='table-responsive'>")
 
-        table_head = '<table id="{}" class="table table-striped table-bordered table-xsm" cellspacing="0" {}>' \
-                     '<thead>'.format(table_id, (f'style="{table_style}"') if table_style else '')
+        table_attributes = (f'style="{table_style}"') if table_style else ''
+        for name, value in (table_data or {}).items():
+            table_attributes += f' data-{name}="{html.escape(str(value))}"'
+        table_head = '<table id="{}" class="table table-striped table-bordered table-xsm{}" cellspacing="0" {}>' \
+                     '<thead>'.format(table_id, f' {table_class}' if table_class else '', table_attributes)
         self.report_file.write(table_head)
         self.report_file.write(
             '<tr>' + ''.join(('<th class="th-sm">{}</th>'.format(html.escape(str(x))) for x in data_headers)) + '</tr>')
         self.report_file.write('</thead><tbody>')
 
+    def write_table_rows(self, data_headers, data_list, html_escape=True, html_no_escape=()):
         if html_escape:
             for row in data_list:
                 if html_no_escape:
@@ -116,7 +157,34 @@ class ArtifactHtmlReport:
         else:
             for row in data_list:
                 self.report_file.write('<tr>' + ''.join( ('<td>{}</td>'.format(str(x) if x not in [None, 'N/A'] else '') for x in row) ) + '</tr>')
-        
+
+    def write_table_shards(self, data_headers, data_list, html_escape=True, html_no_escape=(),
+                           table_responsive=True, table_style='', table_id='dtBasicExample'):
+        '''Writes the rows of a table in shards beside the page, and the empty table that
+        _elements/sharded_table.js fills from them. The shards are JavaScript, not JSON, as
+        a browser does not let a page fetch local files; report.py moves them with the page.
+        '''
+        shard_folder_name = f'{self.artifact_file_name}_{table_id}_data'
+        shard_folder = os.path.join(self.report_folder, shard_folder_name)
+        os.makedirs(shard_folder, exist_ok=True)
+        shard_folders.add(shard_folder)
+        # The page is moved up to _HTML, with spaces in its name replaced, by report.py
+        shard_url = shard_folder_name.replace(' ', '_')
+        escape_columns = [html_escape and h not in html_no_escape for h in data_headers]
+        shard_count = 0
+        for start in range(0, len(data_list), SHARD_SIZE):
+            rows = [[_cell_html(x, escape) for x, escape in zip(row, escape_columns)]
+                    for row in data_list[start:start + SHARD_SIZE]]
+            with open(os.path.join(shard_folder, f'{shard_count}.js'), 'w', encoding='utf8') as shard_file:
+                shard_file.write(f'leappShardLoaded({json.dumps(shard_url)}, {shard_count}, {json.dumps(rows)});')
+            shard_count += 1
+
+        self.write_table_start(data_headers, table_responsive, table_style, table_id, 'table-sharded', {
+            'shard-url': shard_url, 'shard-size': SHARD_SIZE, 'shard-count': shard_count, 'row-count': len(data_list)})
+        if sharded_table_script not in self.script_code:
+            self.script_code += sharded_table_script
+
+    def write_table_end(self, data_headers, cols_repeated_at_bottom=True, table_responsive=True):
         self.report_file.write('</tbody>')
         if cols_repeated_at_bottom:
             self.report_file.write('<tfoot><tr>' + ''.join(
@@ -151,4 +219,108 @@ class ArtifactHtmlReport:
             self.report_file.close()
             self.report_file = None
 
-        
+
+# Rows per page of a paged artifact report. DataTables still has to build every row of a
+# page in the browser, so a page is kept to the rows a table is written inline with.
+HTML_PAGE_SIZE = SHARDED_TABLE_THRESHOLD
+# The pages after the first are named <artifact>__page<n>; only the first is in the sidebar
+PAGE_SUFFIX = '__page'
+_page_name_re = re.compile(rf'(.*){PAGE_SUFFIX}(\d+)$')
+# Wide enough for any row count, the padding is collapsed as HTML whitespace
+TOTAL_WIDTH = 20
+
+
+def get_page_file_name(artifact_file_name, page_number):
+    '''Returns the file name, without extension, of a page of a paged artifact report'''
+    if page_number == 1:
+        return artifact_file_name
+    return f'{artifact_file_name}{PAGE_SUFFIX}{page_number}'
+
+
+def get_page_base_name(file_name):
+    '''Returns the artifact file name of a page after the first of a paged report, or None'''
+    match = _page_name_re.match(file_name)
+    return match.group(1) if match else None
+
+
+class PagedArtifactHtmlReport:
+    '''Writes the rows of an artifact as they come, over as many pages of HTML_PAGE_SIZE
+    rows as needed, so that neither the rows nor a page have to be held whole.
+
+    The first page carries the total number of entries, which is only known once the
+    last row is written, so close() fills it in. Each page links to the previous and next
+    pages.
+    '''
+
+    def __init__(self, artifact_name, report_folder, artifact_file_name, artifact_description, data_headers,
+                 source_path, html_no_escape=(), page_size=None):
+        self.artifact_name = artifact_name
+        self.report_folder = report_folder
+        self.artifact_file_name = artifact_file_name
+        self.artifact_description = artifact_description
+        self.data_headers = data_headers
+        self.source_path = source_path
+        self.html_no_escape = html_no_escape
+        self.page_size = page_size or HTML_PAGE_SIZE
+        self.page = None
+        self.page_number = 0
+        self.page_rows = 0
+        self.total = 0
+        self.total_offset = None
+
+    def _page_link(self, page_number):
+        # The pages are moved up to _HTML, with spaces in their names replaced, by report.py
+        return get_page_file_name(self.artifact_file_name, page_number).replace(' ', '_') + '.html'
+
+    def _start_page(self):
+        self.page_number += 1
+        self.page_rows = 0
+        self.page = ArtifactHtmlReport(self.artifact_name)
+        self.page.start_artifact_report(self.report_folder, get_page_file_name(
+            self.artifact_file_name, self.page_number), self.artifact_description)
+        self.page.add_script()
+        if self.page_number == 1:
+            self.page.write_raw_html('<h6>Total number of entries: ')
+            self.total_offset = self.page.report_file.tell()
+            self.page.write_raw_html(' ' * TOTAL_WIDTH + '</h6>')
+            self.page.write_source_location(self.source_path)
+        else:
+            self.page.write_lead_text(
+                f'<a href="{self._page_link(1)}">First page</a> | '
+                f'<a href="{self._page_link(self.page_number - 1)}">Previous page</a> | '
+                f'Page {self.page_number}')
+        self.page.write_raw_html('<br />')
+        self.page.write_table_start(self.data_headers)
+
+    def _end_page(self, has_next_page):
+        self.page.write_table_end(self.data_headers)
+        if has_next_page:
+            self.page.write_lead_text(f'<a href="{self._page_link(self.page_number + 1)}">Next page</a>')
+        self.page.end_artifact_report()
+        self.page = None
+
+    def write_rows(self, data_list):
+        '''Writes rows to the current page, starting new pages as pages fill up'''
+        position = 0
+        while position < len(data_list):
+            if self.page is None:
+                self._start_page()
+            elif self.page_rows >= self.page_size:
+                self._end_page(True)
+                self._start_page()
+            rows = data_list[position:position + self.page_size - self.page_rows]
+            self.page.write_table_rows(self.data_headers, rows, html_no_escape=self.html_no_escape)
+            self.page_rows += len(rows)
+            self.total += len(rows)
+            position += len(rows)
+
+    def close(self):
+        '''Ends the last page and writes the total number of entries on the first one'''
+        if self.page is None:
+            return self.total
+        self._end_page(False)
+        first_page = os.path.join(self.report_folder, f'{self.artifact_file_name}.temphtml')
+        with open(first_page, 'r+b') as page_file:
+            page_file.seek(self.total_offset)
+            page_file.write(str(self.total).ljust(TOTAL_WIDTH).encode('utf8'))
+        return self.total
@@ -101,7 +101,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
@@ -268,7 +269,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -325,7 +326,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         'zAddAssetAttr-zPK-45',
         'zAsset-UUID = store.cloudphotodb-46',
         'zAddAssetAttr-Master Fingerprint-47')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -477,7 +478,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -534,7 +535,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         'zAddAssetAttr-zPK-45',
         'zAsset-UUID = store.cloudphotodb-46',
         'zAddAssetAttr-Master Fingerprint-47')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -750,7 +751,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -827,7 +828,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         'zAddAssetAttr-zPK-63',
         'zAsset-UUID = store.cloudphotodb-64',
         'zAddAssetAttr-Master Fingerprint-65')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1057,7 +1058,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1141,7 +1142,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         'zAddAssetAttr-zPK-70',
         'zAsset-UUID = store.cloudphotodb-71',
         'zAddAssetAttr-Master Fingerprint-72')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1392,7 +1393,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1482,7 +1483,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         'zAddAssetAttr-zPK-75',
         'zAsset-UUID = store.cloudphotodb-76',
         'zAddAssetAttr-Master Fingerprint-77')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1739,7 +1740,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1831,7 +1832,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         'zAddAssetAttr-zPK-77',
         'zAsset-UUID = store.cloudphotodb-78',
         'zAddAssetAttr-Master Fingerprint-79')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2089,7 +2090,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -2182,7 +2183,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         'zAddAssetAttr-zPK-78',
         'zAsset-UUID = store.cloudphotodb-79',
         'zAddAssetAttr-Master Fingerprint-80')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2440,7 +2441,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -2533,7 +2534,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         'zAddAssetAttr-zPK-78',
         'zAsset-UUID = store.cloudphotodb-79',
         'zAddAssetAttr-Master Fingerprint-80')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2798,7 +2799,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -2895,7 +2896,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         'zAsset-UUID = store.cloudphotodb-81',
         'zAddAssetAttr-Original Stable Hash-82',
         'zAddAssetAttr.Adjusted Stable Hash-83')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -3160,19 +3161,6 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
-            row[19], row[20], row[21], row[22], row[23], row[24], row[25], row[26], row[27],
-            row[28], row[29], row[30], row[31], row[32], row[33], row[34], row[35], row[36],
-            row[37], row[38], row[39], row[40], row[41], row[42], row[43], row[44], row[45],
-            row[46], row[47], row[48], row[49], row[50], row[51], row[52], row[53], row[54],
-            row[55], row[56], row[57], row[58], row[59], row[60], row[61], row[62], row[63],
-            row[64], row[65], row[66], row[67], row[68], row[69], row[70], row[71], row[72],
-            row[73], row[74], row[75], row[76], row[77], row[78], row[79], row[80], row[81],
-            row[82], row[83]))
-
         data_headers = (('zAsset-Date Created-0', 'datetime'),
         ('zAsset- SortToken -CameraRoll-1', 'datetime'),
         ('zAsset-Added Date-2', 'datetime'),
@@ -3257,7 +3245,7 @@ def Ph002_1AssetBasicGenAlbumDataPhDaPsql(context):
         'zAsset-UUID = store.cloudphotodb-81',
         'zAddAssetAttr-Original Stable Hash-82',
         'zAddAssetAttr.Adjusted Stable Hash-83')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -3427,7 +3415,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -3484,7 +3472,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         'zAddAssetAttr-zPK-45',
         'zAsset-UUID = store.cloudphotodb-46',
         'zAddAssetAttr-Master Fingerprint-47')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -3637,7 +3625,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -3694,7 +3682,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         'zAddAssetAttr-zPK-45',
         'zAsset-UUID = store.cloudphotodb-46',
         'zAddAssetAttr-Master Fingerprint-47')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -3911,7 +3899,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -3988,7 +3976,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         'zAddAssetAttr-zPK-63',
         'zAsset-UUID = store.cloudphotodb-64',
         'zAddAssetAttr-Master Fingerprint-65')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -4218,7 +4206,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
             LEFT JOIN ZGENERICALBUM zGenAlbum ON zGenAlbum.Z_PK = z26Assets.Z_26ALBUMS
         ORDER BY zAsset.ZDATECREATED
         '''
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -4302,7 +4290,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         'zAddAssetAttr-zPK-70',
         'zAsset-UUID = store.cloudphotodb-71',
         'zAddAssetAttr-Master Fingerprint-72')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -4554,7 +4542,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -4644,7 +4632,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         'zAddAssetAttr-zPK-75',
         'zAsset-UUID = store.cloudphotodb-76',
         'zAddAssetAttr-Master Fingerprint-77')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -4902,7 +4890,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -4994,7 +4982,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         'zAddAssetAttr-zPK-77',
         'zAsset-UUID = store.cloudphotodb-78',
         'zAddAssetAttr-Master Fingerprint-79')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -5252,7 +5240,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -5345,7 +5333,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         'zAddAssetAttr-zPK-78',
         'zAsset-UUID = store.cloudphotodb-79',
         'zAddAssetAttr-Master Fingerprint-80')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -5603,7 +5591,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -5696,7 +5684,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         'zAddAssetAttr-zPK-78',
         'zAsset-UUID = store.cloudphotodb-79',
         'zAddAssetAttr-Master Fingerprint-80')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -5961,19 +5949,6 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
-            row[19], row[20], row[21], row[22], row[23], row[24], row[25], row[26], row[27],
-            row[28], row[29], row[30], row[31], row[32], row[33], row[34], row[35], row[36],
-            row[37], row[38], row[39], row[40], row[41], row[42], row[43], row[44], row[45],
-            row[46], row[47], row[48], row[49], row[50], row[51], row[52], row[53], row[54],
-            row[55], row[56], row[57], row[58], row[59], row[60], row[61], row[62], row[63],
-            row[64], row[65], row[66], row[67], row[68], row[69], row[70], row[71], row[72],
-            row[73], row[74], row[75], row[76], row[77], row[78], row[79], row[80], row[81],
-            row[82], row[83]))
-
         data_headers = (('zAsset-Date Created-0', 'datetime'),
         ('zAsset- SortToken -CameraRoll-1', 'datetime'),
         ('zAsset-Added Date-2', 'datetime'),
@@ -6058,7 +6033,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         'zAsset-UUID = store.cloudphotodb-81',
         'zAddAssetAttr-Original Stable Hash-82',
         'zAddAssetAttr.Adjusted Stable Hash-83')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -6323,19 +6298,6 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
-            row[19], row[20], row[21], row[22], row[23], row[24], row[25], row[26], row[27],
-            row[28], row[29], row[30], row[31], row[32], row[33], row[34], row[35], row[36],
-            row[37], row[38], row[39], row[40], row[41], row[42], row[43], row[44], row[45],
-            row[46], row[47], row[48], row[49], row[50], row[51], row[52], row[53], row[54],
-            row[55], row[56], row[57], row[58], row[59], row[60], row[61], row[62], row[63],
-            row[64], row[65], row[66], row[67], row[68], row[69], row[70], row[71], row[72],
-            row[73], row[74], row[75], row[76], row[77], row[78], row[79], row[80], row[81],
-            row[82], row[83]))
-
         data_headers = (('zAsset-Date Created-0', 'datetime'),
         ('zAsset- SortToken -CameraRoll-1', 'datetime'),
         ('zAsset-Added Date-2', 'datetime'),
@@ -6420,7 +6382,7 @@ def Ph002_2AssetBasicConversationDataSyndPL(context):
         'zAsset-UUID = store.cloudphotodb-81',
         'zAddAssetAttr-Original Stable Hash-82',
         'zAddAssetAttr.Adjusted Stable Hash-83')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -6702,7 +6664,7 @@ def Ph002_3AssetBasicGenAlbumGenPlayPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -6799,7 +6761,7 @@ def Ph002_3AssetBasicGenAlbumGenPlayPsql(context):
         'zAsset-UUID = store.cloudphotodb-81',
         'zAddAssetAttr-Original Stable Hash-82',
         'zAddAssetAttr.Adjusted Stable Hash-83')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -7064,7 +7026,7 @@ def Ph002_3AssetBasicGenAlbumGenPlayPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -7161,6 +7123,6 @@ def Ph002_3AssetBasicGenAlbumGenPlayPsql(context):
         'zAsset-UUID = store.cloudphotodb-81',
         'zAddAssetAttr-Original Stable Hash-82',
         'zAddAssetAttr.Adjusted Stable Hash-83')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
@@ -92,7 +92,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph003_1TrashedRecentlyDeletedPhDaPsql(context):
@@ -142,7 +143,7 @@ def Ph003_1TrashedRecentlyDeletedPhDaPsql(context):
         ORDER BY zAsset.ZTRASHEDSTATE      
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10]))
@@ -158,7 +159,7 @@ def Ph003_1TrashedRecentlyDeletedPhDaPsql(context):
         'zAddAssetAttr-zPK-8',
         'zAsset-UUID = store.cloudphotodb-9',
         'zAddAssetAttr-Master Fingerprint-10')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -193,7 +194,7 @@ def Ph003_1TrashedRecentlyDeletedPhDaPsql(context):
         ORDER BY zAsset.ZTRASHEDSTATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10]))
@@ -209,7 +210,7 @@ def Ph003_1TrashedRecentlyDeletedPhDaPsql(context):
         'zAddAssetAttr-zPK-8',
         'zAsset-UUID = store.cloudphotodb-9',
         'zAddAssetAttr-Master Fingerprint-10')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -255,7 +256,7 @@ def Ph003_1TrashedRecentlyDeletedPhDaPsql(context):
         ORDER BY zAsset.ZTRASHEDSTATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12]))
@@ -273,7 +274,7 @@ def Ph003_1TrashedRecentlyDeletedPhDaPsql(context):
         'zAddAssetAttr-zPK-10',
         'zAsset-UUID = store.cloudphotodb-11',
         'zAddAssetAttr-Master Fingerprint-12')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -326,7 +327,7 @@ def Ph003_1TrashedRecentlyDeletedPhDaPsql(context):
         ORDER BY zAsset.ZTRASHEDSTATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16]))
@@ -348,7 +349,7 @@ def Ph003_1TrashedRecentlyDeletedPhDaPsql(context):
         'zAddAssetAttr-zPK-14',
         'zAsset-UUID = store.cloudphotodb-15',
         'zAddAssetAttr-Master Fingerprint-16')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -402,7 +403,7 @@ def Ph003_1TrashedRecentlyDeletedPhDaPsql(context):
         ORDER BY zAsset.ZTRASHEDSTATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17]))
@@ -425,7 +426,7 @@ def Ph003_1TrashedRecentlyDeletedPhDaPsql(context):
         'zAsset-UUID = store.cloudphotodb-15',
         'zAddAssetAttr-Original Stable Hash-16',
         'zAddAssetAttr.Adjusted Stable Hash-17')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -490,7 +491,7 @@ def Ph003_2RemovedfromCameraRollSyndPL(context):
         ORDER BY zAddAssetAttr.ZLASTUPLOADATTEMPTDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13]))
@@ -509,7 +510,7 @@ def Ph003_2RemovedfromCameraRollSyndPL(context):
         'zAddAssetAttr-zPK-11',
         'zAsset-UUID = store.cloudphotodb-12',
         'zAddAssetAttr-Master Fingerprint-13')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -564,7 +565,7 @@ def Ph003_2RemovedfromCameraRollSyndPL(context):
         ORDER BY zAddAssetAttr.ZLASTUPLOADATTEMPTDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17]))
@@ -587,7 +588,7 @@ def Ph003_2RemovedfromCameraRollSyndPL(context):
         'zAddAssetAttr-zPK-15',
         'zAsset-UUID = store.cloudphotodb-16',
         'zAddAssetAttr-Master Fingerprint-17')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -641,7 +642,7 @@ def Ph003_2RemovedfromCameraRollSyndPL(context):
         ORDER BY zAsset.ZTRASHEDSTATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17]))
@@ -664,7 +665,7 @@ def Ph003_2RemovedfromCameraRollSyndPL(context):
         'zAsset-UUID = store.cloudphotodb-15',
         'zAddAssetAttr-Original Stable Hash-16',
         'zAddAssetAttr.Adjusted Stable Hash-17')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -735,7 +736,7 @@ def Ph003_3TrashedRecentlyDeletedGenPlayPsql(context):
         ORDER BY zAsset.ZTRASHEDSTATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17]))
@@ -758,6 +759,6 @@ def Ph003_3TrashedRecentlyDeletedGenPlayPsql(context):
         'zAsset-UUID = store.cloudphotodb-15',
         'zAddAssetAttr-Original Stable Hash-16',
         'zAddAssetAttr.Adjusted Stable Hash-17')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
\ No newline at end of file
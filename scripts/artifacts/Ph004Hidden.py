@@ -59,7 +59,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph004_1HiddenPhDaPsql(context):
@@ -109,7 +110,7 @@ def Ph004_1HiddenPhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10]))
@@ -125,7 +126,7 @@ def Ph004_1HiddenPhDaPsql(context):
         'zAddAssetAttr-zPK-8',
         'zAsset-UUID = store.cloudphotodb-9',
         'zAddAssetAttr-Master Fingerprint-10')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -160,7 +161,7 @@ def Ph004_1HiddenPhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10]))
@@ -176,7 +177,7 @@ def Ph004_1HiddenPhDaPsql(context):
         'zAddAssetAttr-zPK-8',
         'zAsset-UUID = store.cloudphotodb-9',
         'zAddAssetAttr-Master Fingerprint-10')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -212,7 +213,7 @@ def Ph004_1HiddenPhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11]))
@@ -229,7 +230,7 @@ def Ph004_1HiddenPhDaPsql(context):
         'zAddAssetAttr-zPK-9',
         'zAsset-UUID = store.cloudphotodb-10',
         'zAddAssetAttr-Master Fingerprint-11')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -266,7 +267,7 @@ def Ph004_1HiddenPhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12]))
@@ -284,7 +285,7 @@ def Ph004_1HiddenPhDaPsql(context):
         'zAsset-UUID = store.cloudphotodb-10',
         'zAddAssetAttr-Original Stable Hash-11',
         'zAddAssetAttr.Adjusted Stable Hash-12')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -338,7 +339,7 @@ def Ph004_3HiddenGenPlayPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12]))
@@ -356,6 +357,6 @@ def Ph004_3HiddenGenPlayPsql(context):
         'zAsset-UUID = store.cloudphotodb-10',
         'zAddAssetAttr-Original Stable Hash-11',
         'zAddAssetAttr.Adjusted Stable Hash-12')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
\ No newline at end of file
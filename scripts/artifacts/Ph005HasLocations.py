@@ -96,7 +96,8 @@ import os
 import plistlib
 import nska_deserialize as nd
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph005_1AssetshavevalidlocationsPhDaPsql(context):
@@ -169,7 +170,7 @@ def Ph005_1AssetshavevalidlocationsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zAddAssetAttr.ZSHIFTEDLOCATIONDATA-PLIST
             aaashiftedlocation_geoplaceresult = ''
@@ -224,7 +225,7 @@ def Ph005_1AssetshavevalidlocationsPhDaPsql(context):
         'zAddAssetAttr-zPK-15',
         'zAsset-UUID = store.cloudphotodb-16',
         'zAddAssetAttr-Master Fingerprint-17')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -312,7 +313,7 @@ def Ph005_1AssetshavevalidlocationsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zAddAssetAttr.ZSHIFTEDLOCATIONDATA-PLIST
             aaashiftedlocation_postal_address = ''
@@ -384,7 +385,7 @@ def Ph005_1AssetshavevalidlocationsPhDaPsql(context):
         'zAddAssetAttr-zPK-21',
         'zAsset-UUID = store.cloudphotodb-22',
         'zAddAssetAttr-Master Fingerprint-23')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -480,7 +481,7 @@ def Ph005_1AssetshavevalidlocationsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zAddAssetAttr.ZSHIFTEDLOCATIONDATA-PLIST
             aaashiftedlocation_postal_address = ''
@@ -556,7 +557,7 @@ def Ph005_1AssetshavevalidlocationsPhDaPsql(context):
         'zAddAssetAttr-zPK-24',
         'zAsset-UUID = store.cloudphotodb-25',
         'zAddAssetAttr-Master Fingerprint-26')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -653,7 +654,7 @@ def Ph005_1AssetshavevalidlocationsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zAddAssetAttr.ZSHIFTEDLOCATIONDATA-PLIST
             aaashiftedlocation_postal_address = ''
@@ -730,7 +731,7 @@ def Ph005_1AssetshavevalidlocationsPhDaPsql(context):
         'zAddAssetAttr-zPK-25',
         'zAsset-UUID = store.cloudphotodb-26',
         'zAddAssetAttr-Master Fingerprint-27')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -828,7 +829,7 @@ def Ph005_1AssetshavevalidlocationsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zAddAssetAttr.ZSHIFTEDLOCATIONDATA-PLIST
             aaashiftedlocation_postal_address = ''
@@ -906,7 +907,7 @@ def Ph005_1AssetshavevalidlocationsPhDaPsql(context):
         'zAsset-UUID = store.cloudphotodb-26',
         'zAddAssetAttr-Original Stable Hash-27',
         'zAddAssetAttr.Adjusted Stable Hash-28')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -981,7 +982,7 @@ def Ph005_2AssetshavevalidlocationsSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zAddAssetAttr.ZSHIFTEDLOCATIONDATA-PLIST
             aaashiftedlocation_geoplaceresult = ''
@@ -1036,7 +1037,7 @@ def Ph005_2AssetshavevalidlocationsSyndPL(context):
         'zAddAssetAttr-zPK-15',
         'zAsset-UUID = store.cloudphotodb-16',
         'zAddAssetAttr-Master Fingerprint-17')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1124,7 +1125,7 @@ def Ph005_2AssetshavevalidlocationsSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zAddAssetAttr.ZSHIFTEDLOCATIONDATA-PLIST
             aaashiftedlocation_postal_address = ''
@@ -1196,7 +1197,7 @@ def Ph005_2AssetshavevalidlocationsSyndPL(context):
         'zAddAssetAttr-zPK-21',
         'zAsset-UUID = store.cloudphotodb-22',
         'zAddAssetAttr-Master Fingerprint-23')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1292,7 +1293,7 @@ def Ph005_2AssetshavevalidlocationsSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zAddAssetAttr.ZSHIFTEDLOCATIONDATA-PLIST
             aaashiftedlocation_postal_address = ''
@@ -1368,7 +1369,7 @@ def Ph005_2AssetshavevalidlocationsSyndPL(context):
         'zAddAssetAttr-zPK-24',
         'zAsset-UUID = store.cloudphotodb-25',
         'zAddAssetAttr-Master Fingerprint-26')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1465,7 +1466,7 @@ def Ph005_2AssetshavevalidlocationsSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zAddAssetAttr.ZSHIFTEDLOCATIONDATA-PLIST
             aaashiftedlocation_postal_address = ''
@@ -1542,7 +1543,7 @@ def Ph005_2AssetshavevalidlocationsSyndPL(context):
         'zAddAssetAttr-zPK-25',
         'zAsset-UUID = store.cloudphotodb-26',
         'zAddAssetAttr-Master Fingerprint-27')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1640,7 +1641,7 @@ def Ph005_2AssetshavevalidlocationsSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zAddAssetAttr.ZSHIFTEDLOCATIONDATA-PLIST
             aaashiftedlocation_postal_address = ''
@@ -1718,7 +1719,7 @@ def Ph005_2AssetshavevalidlocationsSyndPL(context):
         'zAsset-UUID = store.cloudphotodb-26',
         'zAddAssetAttr-Original Stable Hash-27',
         'zAddAssetAttr.Adjusted Stable Hash-28')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1833,7 +1834,7 @@ def Ph005_3AssetshavevalidlocationsGenPlayPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zAddAssetAttr.ZSHIFTEDLOCATIONDATA-PLIST
             aaashiftedlocation_postal_address = ''
@@ -1911,6 +1912,6 @@ def Ph005_3AssetshavevalidlocationsGenPlayPsql(context):
         'zAsset-UUID = store.cloudphotodb-26',
         'zAddAssetAttr-Original Stable Hash-27',
         'zAddAssetAttr.Adjusted Stable Hash-28')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
\ No newline at end of file
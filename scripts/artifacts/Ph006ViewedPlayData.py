@@ -83,7 +83,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, does_column_exist_in_db, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, does_column_exist_in_db, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph006_1ViewandPlayDataPhDaPsql(context):
@@ -139,7 +140,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13]))
@@ -158,7 +159,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         'zAddAssetAttr-zPK',
         'zAsset-UUID = store.cloudphotodb',
         'zAddAssetAttr-Master Fingerprint')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -195,7 +196,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14]))
@@ -215,7 +216,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         'zAddAssetAttr-zPK',
         'zAsset-UUID = store.cloudphotodb',
         'zAddAssetAttr-Master Fingerprint')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -252,7 +253,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14]))
@@ -272,7 +273,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         'zAddAssetAttr-zPK',
         'zAsset-UUID = store.cloudphotodb',
         'zAddAssetAttr-Master Fingerprint')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -310,7 +311,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15]))
@@ -331,7 +332,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         'zAddAssetAttr-zPK',
         'zAsset-UUID = store.cloudphotodb',
         'zAddAssetAttr-Master Fingerprint')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -369,7 +370,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15]))
@@ -390,7 +391,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         'zAddAssetAttr-zPK',
         'zAsset-UUID = store.cloudphotodb',
         'zAddAssetAttr-Master Fingerprint')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -429,7 +430,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16]))
@@ -451,7 +452,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         'zAddAssetAttr-zPK-14',
         'zAsset-UUID = store.cloudphotodb-15',
         'zAddAssetAttr-Master Fingerprint-16')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -496,7 +497,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18]))
@@ -520,7 +521,7 @@ def Ph006_1ViewandPlayDataPhDaPsql(context):
         'zAsset-UUID = store.cloudphotodb-16',
         'zAddAssetAttr-Original Stable Hash-17',
         'zAddAssetAttr.Adjusted Stable Hash-18')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -578,11 +579,6 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13]))
-
         data_headers = (('zAsset-Modification Date', 'datetime'),
         'zAddAssetAttr- Pending View Count',
         'zAddAssetAttr- View Count',
@@ -597,7 +593,7 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         'zAddAssetAttr-zPK',
         'zAsset-UUID = store.cloudphotodb',
         'zAddAssetAttr-Master Fingerprint')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -634,11 +630,6 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14]))
-
         data_headers = (('zAsset-Modification Date', 'datetime'),
         'zAsset-Analysis State Modification Date',
         'zAddAssetAttr- Pending View Count',
@@ -654,7 +645,7 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         'zAddAssetAttr-zPK',
         'zAsset-UUID = store.cloudphotodb',
         'zAddAssetAttr-Master Fingerprint')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -691,11 +682,6 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14]))
-
         data_headers = (('zAsset-Modification Date', 'datetime'),
         'zAsset-Analysis State Modification Date',
         'zAddAssetAttr- Pending View Count',
@@ -711,7 +697,7 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         'zAddAssetAttr-zPK',
         'zAsset-UUID = store.cloudphotodb',
         'zAddAssetAttr-Master Fingerprint')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -749,11 +735,6 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15]))
-
         data_headers = (('zAsset-Modification Date', 'datetime'),
         'zAsset-Analysis State Modification Date',
         'zAddAssetAttr- Pending View Count',
@@ -770,7 +751,7 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         'zAddAssetAttr-zPK',
         'zAsset-UUID = store.cloudphotodb',
         'zAddAssetAttr-Master Fingerprint')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -808,11 +789,6 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15]))
-
         data_headers = (('zAsset-Modification Date', 'datetime'),
         'zAsset-Analysis State Modification Date',
         'zAddAssetAttr- Pending View Count',
@@ -829,7 +805,7 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         'zAddAssetAttr-zPK',
         'zAsset-UUID = store.cloudphotodb',
         'zAddAssetAttr-Master Fingerprint')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -868,11 +844,6 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16]))
-
         data_headers = (('zAddAssetAttr-Last Viewed Date-0', 'datetime'),
         'zAsset-Modification Date-1',
         ('zAsset-Analysis State Modification Date-2', 'datetime'),
@@ -890,7 +861,7 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         'zAddAssetAttr-zPK-14',
         'zAsset-UUID = store.cloudphotodb-15',
         'zAddAssetAttr-Master Fingerprint-16')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -935,11 +906,6 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18]))
-
         data_headers = (('zAddAssetAttr-Last Viewed Date-0', 'datetime'),
         'zAsset-Modification Date-1',
         ('zAsset-Analysis State Modification Date-2', 'datetime'),
@@ -959,7 +925,7 @@ def Ph006_2ViewandPlayDataSyndPL(context):
         'zAsset-UUID = store.cloudphotodb-16',
         'zAddAssetAttr-Original Stable Hash-17',
         'zAddAssetAttr.Adjusted Stable Hash-18')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -1027,7 +993,7 @@ def Ph006_3ViewandPlayDataGenPlayPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18]))
@@ -1051,6 +1017,6 @@ def Ph006_3ViewandPlayDataGenPlayPsql(context):
         'zAsset-UUID = store.cloudphotodb-16',
         'zAddAssetAttr-Original Stable Hash-17',
         'zAddAssetAttr.Adjusted Stable Hash-18')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
\ No newline at end of file
@@ -59,7 +59,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph007_1FavoritePhDaPsql(context):
@@ -108,7 +109,7 @@ def Ph007_1FavoritePhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10]))
@@ -124,7 +125,7 @@ def Ph007_1FavoritePhDaPsql(context):
         'zAddAssetAttr-zPK-8',
         'zAsset-UUID = store.cloudphotodb-9',
         'zAddAssetAttr-Master Fingerprint-10')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -158,7 +159,7 @@ def Ph007_1FavoritePhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10]))
@@ -174,7 +175,7 @@ def Ph007_1FavoritePhDaPsql(context):
         'zAddAssetAttr-zPK-8',
         'zAsset-UUID = store.cloudphotodb-9',
         'zAddAssetAttr-Master Fingerprint-10')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -209,7 +210,7 @@ def Ph007_1FavoritePhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11]))
@@ -226,7 +227,7 @@ def Ph007_1FavoritePhDaPsql(context):
         'zAddAssetAttr-zPK-9',
         'zAsset-UUID = store.cloudphotodb-10',
         'zAddAssetAttr-Master Fingerprint-11')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -262,7 +263,7 @@ def Ph007_1FavoritePhDaPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12]))
@@ -280,7 +281,7 @@ def Ph007_1FavoritePhDaPsql(context):
         'zAsset-UUID = store.cloudphotodb-10',
         'zAddAssetAttr-Original Stable Hash-11',
         'zAddAssetAttr.Adjusted Stable Hash-12')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -333,7 +334,7 @@ def Ph007_3FavoriteGenPlayPsql(context):
         ORDER BY zAsset.ZMODIFICATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12]))
@@ -351,6 +352,6 @@ def Ph007_3FavoriteGenPlayPsql(context):
         'zAsset-UUID = store.cloudphotodb-10',
         'zAddAssetAttr-Original Stable Hash-11',
         'zAddAssetAttr.Adjusted Stable Hash-12')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
\ No newline at end of file
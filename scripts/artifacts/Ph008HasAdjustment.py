@@ -59,7 +59,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph008_1HasAdjustmentPhDaPsql(context):
@@ -135,7 +136,7 @@ def Ph008_1HasAdjustmentPhDaPsql(context):
         ORDER BY zUnmAdj.ZADJUSTMENTTIMESTAMP
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15]))
@@ -156,7 +157,7 @@ def Ph008_1HasAdjustmentPhDaPsql(context):
         'zAddAssetAttr-zPK',
         'zAsset-UUID = store.cloudphotodb',
         'zAddAssetAttr-Master Fingerprint')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -218,7 +219,7 @@ def Ph008_1HasAdjustmentPhDaPsql(context):
         ORDER BY zUnmAdj.ZADJUSTMENTTIMESTAMP
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16]))
@@ -240,7 +241,7 @@ def Ph008_1HasAdjustmentPhDaPsql(context):
         'zAsset-UUID = store.cloudphotodb-14',
         'zAddAssetAttr-Master Fingerprint-15',
         'zAddAssetAttr.Adjusted Fingerprint-16')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -337,7 +338,7 @@ def Ph008_1HasAdjustmentPhDaPsql(context):
         ORDER BY zUnmAdj.ZADJUSTMENTTIMESTAMP
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -377,7 +378,7 @@ def Ph008_1HasAdjustmentPhDaPsql(context):
         'zCompSyncAttr-Cloud_Compute_State_Adjustment_Fingerprint-30',
         'zExtAttr-Generative_AI_Type-31',
         'zExtAttr-Credit-32')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -491,7 +492,7 @@ def Ph008_3HasAdjustmentGenPlayPsql(context):
         ORDER BY zUnmAdj.ZADJUSTMENTTIMESTAMP
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -531,6 +532,6 @@ def Ph008_3HasAdjustmentGenPlayPsql(context):
         'zCompSyncAttr-Cloud_Compute_State_Adjustment_Fingerprint-30',
         'zExtAttr-Generative_AI_Type-31',
         'zExtAttr-Credit-32')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
\ No newline at end of file
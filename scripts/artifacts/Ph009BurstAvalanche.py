@@ -59,7 +59,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph009_1BurstAvalanchePhDaPsql(context):
@@ -130,7 +131,7 @@ def Ph009_1BurstAvalanchePhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED    
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12]))
@@ -148,7 +149,7 @@ def Ph009_1BurstAvalanchePhDaPsql(context):
         'zAddAssetAttr-zPK-10',
         'zAsset-UUID = store.cloudphotodb-11',
         'zAddAssetAttr-Master Fingerprint-12')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -204,7 +205,7 @@ def Ph009_1BurstAvalanchePhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED    
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12]))
@@ -222,7 +223,7 @@ def Ph009_1BurstAvalanchePhDaPsql(context):
         'zAddAssetAttr-zPK-10',
         'zAsset-UUID = store.cloudphotodb-11',
         'zAddAssetAttr-Master Fingerprint-12')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -284,7 +285,7 @@ def Ph009_1BurstAvalanchePhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED    
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14]))
@@ -304,7 +305,7 @@ def Ph009_1BurstAvalanchePhDaPsql(context):
         'zAsset-UUID = store.cloudphotodb-12',
         'zAddAssetAttr-Original Stable Hash-13',
         'zAddAssetAttr.Adjusted Stable Hash-14')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -383,7 +384,7 @@ def Ph009_3BurstAvalancheGenPlayPsql(context):
         ORDER BY zAsset.ZDATECREATED    
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14]))
@@ -403,6 +404,6 @@ def Ph009_3BurstAvalancheGenPlayPsql(context):
         'zAsset-UUID = store.cloudphotodb-12',
         'zAddAssetAttr-Original Stable Hash-13',
         'zAddAssetAttr.Adjusted Stable Hash-14')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
\ No newline at end of file
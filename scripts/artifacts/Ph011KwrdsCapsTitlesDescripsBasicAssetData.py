@@ -71,7 +71,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
@@ -240,7 +241,7 @@ def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -322,7 +323,7 @@ def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
         'zAddAssetAttr-zPK-68',
         'zAsset-UUID = store.cloudphotodb-69',
         'zAddAssetAttr-Master Fingerprint-70')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -500,7 +501,7 @@ def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -588,7 +589,7 @@ def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
         'zAddAssetAttr-zPK-73',
         'zAsset-UUID = store.cloudphotodb-74',
         'zAddAssetAttr-Master Fingerprint-75')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -772,7 +773,7 @@ def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -862,7 +863,7 @@ def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
         'zAddAssetAttr-zPK-75',
         'zAsset-UUID = store.cloudphotodb-76',
         'zAddAssetAttr-Master Fingerprint-77')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1046,7 +1047,7 @@ def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1136,7 +1137,7 @@ def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
         'zAddAssetAttr-zPK-75',
         'zAsset-UUID = store.cloudphotodb-76',
         'zAddAssetAttr-Master Fingerprint-77')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1326,7 +1327,7 @@ def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED       
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1418,7 +1419,7 @@ def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
         'zAsset-UUID = store.cloudphotodb-77',
         'zAddAssetAttr-Original Stable Hash-78',
         'zAddAssetAttr.Adjusted Stable Hash-79')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1608,18 +1609,6 @@ def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED       
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
-            row[19], row[20], row[21], row[22], row[23], row[24], row[25], row[26], row[27],
-            row[28], row[29], row[30], row[31], row[32], row[33], row[34], row[35], row[36],
-            row[37], row[38], row[39], row[40], row[41], row[42], row[43], row[44], row[45],
-            row[46], row[47], row[48], row[49], row[50], row[51], row[52], row[53], row[54],
-            row[55], row[56], row[57], row[58], row[59], row[60], row[61], row[62], row[63],
-            row[64], row[65], row[66], row[67], row[68], row[69], row[70], row[71], row[72],
-            row[73], row[74], row[75], row[76], row[77], row[78], row[79]))
-
         data_headers = (('zAsset-Date Created-0', 'datetime'),
         ('zAsset- SortToken -CameraRoll-1', 'datetime'),
         ('zAsset-Added Date-2', 'datetime'),
@@ -1700,7 +1689,7 @@ def Ph011_1KwrdsCapsTitlesDescripsLikesBasicAsstDataPhDaPsql(context):
         'zAsset-UUID = store.cloudphotodb-77',
         'zAddAssetAttr-Original Stable Hash-78',
         'zAddAssetAttr.Adjusted Stable Hash-79')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -1907,7 +1896,7 @@ def Ph011_3KwrdsCapsTitlesDescripsLikesBasicAsstDataGenPlayPsql(context):
         ORDER BY zAsset.ZDATECREATED       
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1999,7 +1988,7 @@ def Ph011_3KwrdsCapsTitlesDescripsLikesBasicAsstDataGenPlayPsql(context):
         'zAsset-UUID = store.cloudphotodb-77',
         'zAddAssetAttr-Original Stable Hash-78',
         'zAddAssetAttr.Adjusted Stable Hash-79')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2189,18 +2178,6 @@ def Ph011_3KwrdsCapsTitlesDescripsLikesBasicAsstDataGenPlayPsql(context):
         ORDER BY zAsset.ZDATECREATED       
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
-            row[19], row[20], row[21], row[22], row[23], row[24], row[25], row[26], row[27],
-            row[28], row[29], row[30], row[31], row[32], row[33], row[34], row[35], row[36],
-            row[37], row[38], row[39], row[40], row[41], row[42], row[43], row[44], row[45],
-            row[46], row[47], row[48], row[49], row[50], row[51], row[52], row[53], row[54],
-            row[55], row[56], row[57], row[58], row[59], row[60], row[61], row[62], row[63],
-            row[64], row[65], row[66], row[67], row[68], row[69], row[70], row[71], row[72],
-            row[73], row[74], row[75], row[76], row[77], row[78], row[79]))
-
         data_headers = (('zAsset-Date Created-0', 'datetime'),
         ('zAsset- SortToken -CameraRoll-1', 'datetime'),
         ('zAsset-Added Date-2', 'datetime'),
@@ -2281,6 +2258,6 @@ def Ph011_3KwrdsCapsTitlesDescripsLikesBasicAsstDataGenPlayPsql(context):
         'zAsset-UUID = store.cloudphotodb-77',
         'zAddAssetAttr-Original Stable Hash-78',
         'zAddAssetAttr.Adjusted Stable Hash-79')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
\ No newline at end of file
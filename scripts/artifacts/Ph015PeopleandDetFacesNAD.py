@@ -70,7 +70,8 @@ __artifacts_v2__ = {
 import os
 import nska_deserialize as nd
 from packaging import version
-from scripts.ilapfuncs import media_to_html, artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import media_to_html, artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph015_1PeopleFacesNADPhDaPsql(context):
@@ -366,7 +367,7 @@ def Ph015_1PeopleFacesNADPhDaPsql(context):
         ORDER BY zDetFace.Z_PK
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -504,7 +505,7 @@ def Ph015_1PeopleFacesNADPhDaPsql(context):
         'zPerson-Person UUID-89',
         'zPerson-Person URI-90',
         'zDetFaceGroup-UUID-91')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -873,7 +874,7 @@ def Ph015_1PeopleFacesNADPhDaPsql(context):
         ORDER BY zDetFace.Z_PK
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -1028,7 +1029,7 @@ def Ph015_1PeopleFacesNADPhDaPsql(context):
         'zPerson-Person UUID-105',
         'zPerson-Person URI-106',
         'zDetFaceGroup-UUID-107')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1399,7 +1400,7 @@ def Ph015_1PeopleFacesNADPhDaPsql(context):
         ORDER BY zDetFace.Z_PK
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -1557,7 +1558,7 @@ def Ph015_1PeopleFacesNADPhDaPsql(context):
         'zPerson-Person UUID-107',
         'zPerson-Person URI-108',
         'zDetFaceGroup-UUID-109')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1932,7 +1933,7 @@ def Ph015_1PeopleFacesNADPhDaPsql(context):
         ORDER BY zDetFace.Z_PK
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -2094,7 +2095,7 @@ def Ph015_1PeopleFacesNADPhDaPsql(context):
         'zPerson-Person UUID-111',
         'zPerson-Person URI-112',
         'zDetFaceGroup-UUID-113')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2470,7 +2471,7 @@ def Ph015_1PeopleFacesNADPhDaPsql(context):
         ORDER BY zDetFace.Z_PK
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -2633,7 +2634,7 @@ def Ph015_1PeopleFacesNADPhDaPsql(context):
         'zPerson-Person UUID-112',
         'zPerson-Person URI-113',
         'zDetFaceGroup-UUID-114')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2931,7 +2932,7 @@ def Ph015_2PeopleFacesNADSyndPL(context):
         ORDER BY zDetFace.Z_PK
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -3069,7 +3070,7 @@ def Ph015_2PeopleFacesNADSyndPL(context):
         'zPerson-Person UUID-89',
         'zPerson-Person URI-90',
         'zDetFaceGroup-UUID-91')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -3438,7 +3439,7 @@ def Ph015_2PeopleFacesNADSyndPL(context):
         ORDER BY zDetFace.Z_PK
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -3593,7 +3594,7 @@ def Ph015_2PeopleFacesNADSyndPL(context):
         'zPerson-Person UUID-105',
         'zPerson-Person URI-106',
         'zDetFaceGroup-UUID-107')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -3964,7 +3965,7 @@ def Ph015_2PeopleFacesNADSyndPL(context):
         ORDER BY zDetFace.Z_PK
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -4122,7 +4123,7 @@ def Ph015_2PeopleFacesNADSyndPL(context):
         'zPerson-Person UUID-107',
         'zPerson-Person URI-108',
         'zDetFaceGroup-UUID-109')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -4497,7 +4498,7 @@ def Ph015_2PeopleFacesNADSyndPL(context):
         ORDER BY zDetFace.Z_PK
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -4659,7 +4660,7 @@ def Ph015_2PeopleFacesNADSyndPL(context):
         'zPerson-Person UUID-111',
         'zPerson-Person URI-112',
         'zDetFaceGroup-UUID-113')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -5035,7 +5036,7 @@ def Ph015_2PeopleFacesNADSyndPL(context):
         ORDER BY zDetFace.Z_PK
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -5199,7 +5200,7 @@ def Ph015_2PeopleFacesNADSyndPL(context):
         'zPerson-Person UUID-112',
         'zPerson-Person URI-113',
         'zDetFaceGroup-UUID-114')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
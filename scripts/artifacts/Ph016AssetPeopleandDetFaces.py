@@ -71,7 +71,8 @@ __artifacts_v2__ = {
 import os
 import nska_deserialize as nd
 from packaging import version
-from scripts.ilapfuncs import media_to_html, artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import media_to_html, artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph016_1PeopleFacesAssetDataPhDaPsql(context):
@@ -416,7 +417,7 @@ def Ph016_1PeopleFacesAssetDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -582,7 +583,7 @@ def Ph016_1PeopleFacesAssetDataPhDaPsql(context):
         'zAddAssetAttr-zPK-114',
         'zAsset-UUID = store.cloudphotodb-115',
         'zAddAssetAttr-Master Fingerprint-116')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1003,7 +1004,7 @@ def Ph016_1PeopleFacesAssetDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -1191,7 +1192,7 @@ def Ph016_1PeopleFacesAssetDataPhDaPsql(context):
         'zAddAssetAttr-zPK-133',
         'zAsset-UUID = store.cloudphotodb-134',
         'zAddAssetAttr-Master Fingerprint-135')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1615,7 +1616,7 @@ def Ph016_1PeopleFacesAssetDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -1805,7 +1806,7 @@ def Ph016_1PeopleFacesAssetDataPhDaPsql(context):
         'zAddAssetAttr-zPK-136',
         'zAsset-UUID = store.cloudphotodb-137',
         'zAddAssetAttr-Master Fingerprint-138')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2233,7 +2234,7 @@ def Ph016_1PeopleFacesAssetDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -2428,7 +2429,7 @@ def Ph016_1PeopleFacesAssetDataPhDaPsql(context):
         'zAddAssetAttr-zPK-140',
         'zAsset-UUID = store.cloudphotodb-141',
         'zAddAssetAttr-Master Fingerprint-142')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2863,7 +2864,7 @@ def Ph016_1PeopleFacesAssetDataPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -3060,7 +3061,7 @@ def Ph016_1PeopleFacesAssetDataPhDaPsql(context):
         'zAsset-UUID = store.cloudphotodb-143',
         'zAddAssetAttr-Original Stable Hash-144',
         'zAddAssetAttr.Adjusted Stable Hash-145')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -3407,7 +3408,7 @@ def Ph016_2PeopleFacesAssetDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -3573,7 +3574,7 @@ def Ph016_2PeopleFacesAssetDataSyndPL(context):
         'zAddAssetAttr-zPK-114',
         'zAsset-UUID = store.cloudphotodb-115',
         'zAddAssetAttr-Master Fingerprint-116')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -3994,7 +3995,7 @@ def Ph016_2PeopleFacesAssetDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -4182,7 +4183,7 @@ def Ph016_2PeopleFacesAssetDataSyndPL(context):
         'zAddAssetAttr-zPK-133',
         'zAsset-UUID = store.cloudphotodb-134',
         'zAddAssetAttr-Master Fingerprint-135')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -4606,7 +4607,7 @@ def Ph016_2PeopleFacesAssetDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -4796,7 +4797,7 @@ def Ph016_2PeopleFacesAssetDataSyndPL(context):
         'zAddAssetAttr-zPK-136',
         'zAsset-UUID = store.cloudphotodb-137',
         'zAddAssetAttr-Master Fingerprint-138')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -5224,7 +5225,7 @@ def Ph016_2PeopleFacesAssetDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -5419,7 +5420,7 @@ def Ph016_2PeopleFacesAssetDataSyndPL(context):
         'zAddAssetAttr-zPK-140',
         'zAsset-UUID = store.cloudphotodb-141',
         'zAddAssetAttr-Master Fingerprint-142')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -5854,7 +5855,7 @@ def Ph016_2PeopleFacesAssetDataSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             # zPerson.ZCONTACTMATCHINGDICTIONARY-PLIST
             personcontactmatchingdictionary = ''
@@ -6051,6 +6052,6 @@ def Ph016_2PeopleFacesAssetDataSyndPL(context):
         'zAsset-UUID = store.cloudphotodb-143',
         'zAddAssetAttr-Original Stable Hash-144',
         'zAddAssetAttr.Adjusted Stable Hash-145')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
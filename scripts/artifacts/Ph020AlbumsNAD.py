@@ -100,7 +100,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph020_1AlbumRecordswithNADPhDaPsql(context):
@@ -162,7 +163,7 @@ def Ph020_1AlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZSTARTDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
             row[8], row[9], row[10], row[11]))
@@ -179,7 +180,7 @@ def Ph020_1AlbumRecordswithNADPhDaPsql(context):
         ('zGenAlbum-Trash Date', 'datetime'),
         'zGenAlbum-UUID',
         'zGenAlbum-Cloud GUID')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -228,7 +229,7 @@ def Ph020_1AlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
             row[8], row[9], row[10], row[11], row[12], row[13]))
@@ -247,7 +248,7 @@ def Ph020_1AlbumRecordswithNADPhDaPsql(context):
         ('zGenAlbum-Trash Date', 'datetime'),
         'zGenAlbum-UUID',
         'zGenAlbum-Cloud GUID')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -296,7 +297,7 @@ def Ph020_1AlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
             row[8], row[9], row[10], row[11], row[12], row[13]))
@@ -315,7 +316,7 @@ def Ph020_1AlbumRecordswithNADPhDaPsql(context):
         ('zGenAlbum-Trash Date', 'datetime'),
         'zGenAlbum-UUID',
         'zGenAlbum-Cloud GUID')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -364,7 +365,7 @@ def Ph020_1AlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
             row[8], row[9], row[10], row[11], row[12], row[13]))
@@ -383,7 +384,7 @@ def Ph020_1AlbumRecordswithNADPhDaPsql(context):
         ('zGenAlbum-Trash Date-11', 'datetime'),
         'zGenAlbum-UUID-12',
         'zGenAlbum-Cloud GUID-13')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -447,7 +448,7 @@ def Ph020_2AlbumRecordswithNADSyndPL(context):
         ORDER BY zGenAlbum.ZSTARTDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
             row[8], row[9], row[10], row[11]))
@@ -464,7 +465,7 @@ def Ph020_2AlbumRecordswithNADSyndPL(context):
         ('zGenAlbum-Trash Date', 'datetime'),
         'zGenAlbum-UUID',
         'zGenAlbum-Cloud GUID')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -513,7 +514,7 @@ def Ph020_2AlbumRecordswithNADSyndPL(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
             row[8], row[9], row[10], row[11], row[12], row[13]))
@@ -532,7 +533,7 @@ def Ph020_2AlbumRecordswithNADSyndPL(context):
         ('zGenAlbum-Trash Date', 'datetime'),
         'zGenAlbum-UUID',
         'zGenAlbum-Cloud GUID')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -581,7 +582,7 @@ def Ph020_2AlbumRecordswithNADSyndPL(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
             row[8], row[9], row[10], row[11], row[12], row[13]))
@@ -600,7 +601,7 @@ def Ph020_2AlbumRecordswithNADSyndPL(context):
         ('zGenAlbum-Trash Date', 'datetime'),
         'zGenAlbum-UUID',
         'zGenAlbum-Cloud GUID')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -649,7 +650,7 @@ def Ph020_2AlbumRecordswithNADSyndPL(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
             row[8], row[9], row[10], row[11], row[12], row[13]))
@@ -668,7 +669,7 @@ def Ph020_2AlbumRecordswithNADSyndPL(context):
         ('zGenAlbum-Trash Date-11', 'datetime'),
         'zGenAlbum-UUID-12',
         'zGenAlbum-Cloud GUID-13')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -734,7 +735,7 @@ def Ph020_3AlbumRecordswithNADGenPlayPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
             row[8], row[9], row[10], row[11], row[12], row[13]))
@@ -753,6 +754,6 @@ def Ph020_3AlbumRecordswithNADGenPlayPsql(context):
         ('zGenAlbum-Trash Date-11', 'datetime'),
         'zGenAlbum-UUID-12',
         'zGenAlbum-Cloud GUID-13')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
\ No newline at end of file
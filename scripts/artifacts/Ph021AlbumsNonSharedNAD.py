@@ -38,7 +38,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
@@ -207,7 +208,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZSTARTDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -250,7 +251,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         'zGenAlbum-Custom Query Type',
         'zGenAlbum-Trashed State',
         ('zGenAlbum-Trash Date', 'datetime'))
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -414,7 +415,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZSTARTDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -460,7 +461,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         'zGenAlbum-Trashed State',
         ('zGenAlbum-Trash Date', 'datetime'),
         'zGenAlbum-Cloud Delete State')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -634,7 +635,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -683,7 +684,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         'zGenAlbum-Trashed State',
         ('zGenAlbum-Trash Date', 'datetime'),
         'zGenAlbum-Cloud Delete State')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -868,7 +869,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -921,7 +922,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         'zGenAlbum-Trashed State',
         ('zGenAlbum-Trash Date', 'datetime'),
         'zGenAlbum-Cloud Delete State')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1106,7 +1107,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1159,7 +1160,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         'zGenAlbum-Trashed State',
         ('zGenAlbum-Trash Date', 'datetime'),
         'zGenAlbum-Cloud Delete State')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1362,7 +1363,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1419,7 +1420,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         'zGenAlbum-Search Index Rebuild State-45',
         'zGenAlbum-Duplicate Type-46',
         'zGenAlbum-Privacy State-47')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1622,7 +1623,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1679,7 +1680,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         'zGenAlbum-Search Index Rebuild State-45',
         'zGenAlbum-Duplicate Type-46',
         'zGenAlbum-Privacy State-47')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1882,7 +1883,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1939,7 +1940,7 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         'zGenAlbum-Search Index Rebuild State-45',
         'zGenAlbum-Duplicate Type-46',
         'zGenAlbum-Privacy State-47')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2142,15 +2143,6 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
-            row[19], row[20], row[21], row[22], row[23], row[24], row[25], row[26], row[27],
-            row[28], row[29], row[30], row[31], row[32], row[33], row[34], row[35], row[36],
-            row[37], row[38], row[39], row[40], row[41], row[42], row[43], row[44], row[45],
-            row[46], row[47]))
-
         data_headers = (('zGenAlbum-Creation Date-0', 'datetime'),
         ('zGenAlbum-Start Date-1', 'datetime'),
         ('zGenAlbum-End Date-2', 'datetime'),
@@ -2199,6 +2191,6 @@ def Ph021NonSharedAlbumRecordswithNADPhDaPsql(context):
         'zGenAlbum-Search Index Rebuild State-45',
         'zGenAlbum-Duplicate Type-46',
         'zGenAlbum-Privacy State-47')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
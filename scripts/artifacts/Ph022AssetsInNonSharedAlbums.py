@@ -37,7 +37,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
@@ -244,7 +245,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -310,7 +311,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         'zGenAlbum-Custom Query Type-53',
         'zGenAlbum-Trashed State-54',
         ('zGenAlbum-Trash Date-55', 'datetime'))
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -512,7 +513,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -580,7 +581,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         'zGenAlbum-Trashed State-55',
         ('zGenAlbum-Trash Date-56', 'datetime'),
         'zGenAlbum-Cloud Delete State-57')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -792,7 +793,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -863,7 +864,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         'zGenAlbum-Trashed State-58',
         ('zGenAlbum-Trash Date-59', 'datetime'),
         'zGenAlbum-Cloud Delete State-60')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1092,7 +1093,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1170,7 +1171,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         'zGenAlbum-Trashed State-64',
         ('zGenAlbum-Trash Date-65', 'datetime'),
         'zGenAlbum-Cloud Delete State-66')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1418,7 +1419,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1499,7 +1500,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         'zGenAlbum-Trashed State-67',
         ('zGenAlbum-Trash Date-68', 'datetime'),
         'zGenAlbum-Cloud Delete State-69')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1770,7 +1771,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1857,7 +1858,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         'zGenAlbum-Search Index Rebuild State-72',
         'zGenAlbum-Duplicate Type-73',
         'zGenAlbum-Privacy State-74')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2128,7 +2129,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -2215,7 +2216,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         'zGenAlbum-Search Index Rebuild State-72',
         'zGenAlbum-Duplicate Type-73',
         'zGenAlbum-Privacy State-74')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2492,7 +2493,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -2581,7 +2582,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         'zGenAlbum-Search Index Rebuild State-74',
         'zGenAlbum-Duplicate Type-75',
         'zGenAlbum-Privacy State-76')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2858,18 +2859,6 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
-            row[19], row[20], row[21], row[22], row[23], row[24], row[25], row[26], row[27],
-            row[28], row[29], row[30], row[31], row[32], row[33], row[34], row[35], row[36],
-            row[37], row[38], row[39], row[40], row[41], row[42], row[43], row[44], row[45],
-            row[46], row[47], row[48], row[49], row[50], row[51], row[52], row[53], row[54],
-            row[55], row[56], row[57], row[58], row[59], row[60], row[61], row[62], row[63],
-            row[64], row[65], row[66], row[67], row[68], row[69], row[70], row[71], row[72],
-            row[73], row[74], row[75], row[76]))
-
         data_headers = (('zAsset-Date Created-0', 'datetime'),
         'zAsset-zPK-1',
         'zAsset-Directory-Path-2',
@@ -2947,7 +2936,7 @@ def Ph022AssetsinNonSharedAlbumsPhDaPsql(context):
         'zGenAlbum-Search Index Rebuild State-74',
         'zGenAlbum-Duplicate Type-75',
         'zGenAlbum-Privacy State-76')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -38,7 +38,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
@@ -247,7 +248,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZSTARTDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -315,7 +316,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         'zCldShareAlbumInvRec-Album GUID-55',
         'zCldShareAlbumInvRec-Cloud GUID-56',
         'zAlbumList-Needs Reordering Number-57')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -513,7 +514,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZSTARTDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -581,7 +582,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         'zCldShareAlbumInvRec-Album GUID-55',
         'zCldShareAlbumInvRec-Cloud GUID-56',
         'zAlbumList-Needs Reordering Number-57')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -788,7 +789,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -862,7 +863,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         'zCldShareAlbumInvRec-Cloud GUID-61',
         'zGenAlbum-Project Render UUID-62',
         'zAlbumList-Needs Reordering Number-63')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1075,7 +1076,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1152,7 +1153,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         'zCldShareAlbumInvRec-Cloud GUID-63',
         'zGenAlbum-Project Render UUID-64',
         'zAlbumList-Needs Reordering Number-65')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1365,7 +1366,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1442,7 +1443,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         'zCldShareAlbumInvRec-Cloud GUID-63',
         'zGenAlbum-Project Render UUID-64',
         'zAlbumList-Needs Reordering Number-65')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1674,7 +1675,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1755,7 +1756,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         'zCldShareAlbumInvRec-Cloud GUID-67',
         'zGenAlbum-Project Render UUID-68',
         'zAlbumList-Needs Reordering Number-69')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1987,7 +1988,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -2068,7 +2069,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         'zCldShareAlbumInvRec-Cloud GUID-67',
         'zGenAlbum-Project Render UUID-68',
         'zAlbumList-Needs Reordering Number-69')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2300,7 +2301,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         ORDER BY zGenAlbum.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -2381,7 +2382,7 @@ def Ph023SharedAlbumRecordsInviteswithNADPhDaPsql(context):
         'zCldShareAlbumInvRec-Cloud GUID-67',
         'zGenAlbum-Project Render UUID-68',
         'zAlbumList-Needs Reordering Number-69')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -37,7 +37,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
@@ -286,7 +287,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -376,7 +377,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         'zCldShareAlbumInvRec-Album GUID-75',
         'zCldShareAlbumInvRec-Cloud GUID-76',
         'zAlbumList-Needs Reordering Number-77')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -614,7 +615,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -704,7 +705,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         'zCldShareAlbumInvRec-Album GUID-75',
         'zCldShareAlbumInvRec-Cloud GUID-76',
         'zAlbumList-Needs Reordering Number-77')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -951,7 +952,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1048,7 +1049,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         'zCldShareAlbumInvRec-Cloud GUID-81',
         'zGenAlbum-Project Render UUID-82',
         'zAlbumList-Needs Reordering Number-83')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1307,7 +1308,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1408,7 +1409,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         'zCldShareAlbumInvRec-Cloud GUID-85',
         'zGenAlbum-Project Render UUID-86',
         'zAlbumList-Needs Reordering Number-87')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1685,7 +1686,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1789,7 +1790,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         'zCldShareAlbumInvRec-Cloud GUID-88',
         'zGenAlbum-Project Render UUID-89',
         'zAlbumList-Needs Reordering Number-90')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2091,7 +2092,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -2202,7 +2203,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         'zCldShareAlbumInvRec-Cloud GUID-94',
         'zGenAlbum-Project Render UUID-95',
         'zAlbumList-Needs Reordering Number-96')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2504,7 +2505,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -2615,7 +2616,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         'zCldShareAlbumInvRec-Cloud GUID-94',
         'zGenAlbum-Project Render UUID-95',
         'zAlbumList-Needs Reordering Number-96')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2918,7 +2919,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -3030,7 +3031,7 @@ def Ph024AssetinSharedAlbumsInvitesPhDaPsql(context):
         'zCldShareAlbumInvRec-Cloud GUID-95',
         'zGenAlbum-Project Render UUID-96',
         'zAlbumList-Needs Reordering Number-97')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
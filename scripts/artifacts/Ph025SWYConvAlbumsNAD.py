@@ -70,7 +70,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph025_1SWYConversationRecordswithNADPhDaPsql(context):
@@ -182,7 +183,7 @@ def Ph025_1SWYConversationRecordswithNADPhDaPsql(context):
         ORDER BY SWYConverszGenAlbum.ZCREATIONDATE        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18]))
@@ -206,7 +207,7 @@ def Ph025_1SWYConversationRecordswithNADPhDaPsql(context):
         'SWYConverszGenAlbum-Trashed State',
         ('SWYConverszGenAlbum-Trash Date', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -309,7 +310,7 @@ def Ph025_1SWYConversationRecordswithNADPhDaPsql(context):
         ORDER BY SWYConverszGenAlbum.ZCREATIONDATE        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -335,7 +336,7 @@ def Ph025_1SWYConversationRecordswithNADPhDaPsql(context):
         ('SWYConverszGenAlbum-Trash Date-17', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-18',
         'SWYConverszGenAlbum-Privacy State-19')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -438,7 +439,7 @@ def Ph025_1SWYConversationRecordswithNADPhDaPsql(context):
         ORDER BY SWYConverszGenAlbum.ZCREATIONDATE        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -464,7 +465,7 @@ def Ph025_1SWYConversationRecordswithNADPhDaPsql(context):
         ('SWYConverszGenAlbum-Trash Date-17', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-18',
         'SWYConverszGenAlbum-Privacy State-19')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -567,7 +568,7 @@ def Ph025_1SWYConversationRecordswithNADPhDaPsql(context):
         ORDER BY SWYConverszGenAlbum.ZCREATIONDATE        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -593,7 +594,7 @@ def Ph025_1SWYConversationRecordswithNADPhDaPsql(context):
         ('SWYConverszGenAlbum-Trash Date-17', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-18',
         'SWYConverszGenAlbum-Privacy State-19')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -696,12 +697,6 @@ def Ph025_1SWYConversationRecordswithNADPhDaPsql(context):
         ORDER BY SWYConverszGenAlbum.ZCREATIONDATE        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
-            row[19]))
-
         data_headers = (('SWYConverszGenAlbum-Creation Date-0', 'datetime'),
         ('SWYConverszGenAlbum-Start Date-1', 'datetime'),
         ('SWYConverszGenAlbum-End Date-2', 'datetime'),
@@ -722,7 +717,7 @@ def Ph025_1SWYConversationRecordswithNADPhDaPsql(context):
         ('SWYConverszGenAlbum-Trash Date-17', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-18',
         'SWYConverszGenAlbum-Privacy State-19')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -836,7 +831,7 @@ def Ph025_2SWYConversationRecordswithNADSyndPL(context):
         ORDER BY SWYConverszGenAlbum.ZCREATIONDATE        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18]))
@@ -860,7 +855,7 @@ def Ph025_2SWYConversationRecordswithNADSyndPL(context):
         'SWYConverszGenAlbum-Trashed State',
         ('SWYConverszGenAlbum-Trash Date', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -963,7 +958,7 @@ def Ph025_2SWYConversationRecordswithNADSyndPL(context):
         ORDER BY SWYConverszGenAlbum.ZCREATIONDATE        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -989,7 +984,7 @@ def Ph025_2SWYConversationRecordswithNADSyndPL(context):
         ('SWYConverszGenAlbum-Trash Date-17', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-18',
         'SWYConverszGenAlbum-Privacy State-19')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1092,7 +1087,7 @@ def Ph025_2SWYConversationRecordswithNADSyndPL(context):
         ORDER BY SWYConverszGenAlbum.ZCREATIONDATE        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1118,7 +1113,7 @@ def Ph025_2SWYConversationRecordswithNADSyndPL(context):
         ('SWYConverszGenAlbum-Trash Date-17', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-18',
         'SWYConverszGenAlbum-Privacy State-19')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1221,7 +1216,7 @@ def Ph025_2SWYConversationRecordswithNADSyndPL(context):
         ORDER BY SWYConverszGenAlbum.ZCREATIONDATE        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1247,7 +1242,7 @@ def Ph025_2SWYConversationRecordswithNADSyndPL(context):
         ('SWYConverszGenAlbum-Trash Date-17', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-18',
         'SWYConverszGenAlbum-Privacy State-19')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1350,12 +1345,6 @@ def Ph025_2SWYConversationRecordswithNADSyndPL(context):
         ORDER BY SWYConverszGenAlbum.ZCREATIONDATE        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
-            row[19]))
-
         data_headers = (('SWYConverszGenAlbum-Creation Date-0', 'datetime'),
         ('SWYConverszGenAlbum-Start Date-1', 'datetime'),
         ('SWYConverszGenAlbum-End Date-2', 'datetime'),
@@ -1376,6 +1365,6 @@ def Ph025_2SWYConversationRecordswithNADSyndPL(context):
         ('SWYConverszGenAlbum-Trash Date-17', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-18',
         'SWYConverszGenAlbum-Privacy State-19')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
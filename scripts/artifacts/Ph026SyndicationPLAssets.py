@@ -88,7 +88,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph026_1SyndicationIDAssetsPhDaPsql(context):
@@ -258,7 +259,7 @@ def Ph026_1SyndicationIDAssetsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -310,7 +311,7 @@ def Ph026_1SyndicationIDAssetsPhDaPsql(context):
         'SWYConverszGenAlbum-Trashed State-41',
         ('SWYConverszGenAlbum-Trash Date-42', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-43')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -477,7 +478,7 @@ def Ph026_1SyndicationIDAssetsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -533,7 +534,7 @@ def Ph026_1SyndicationIDAssetsPhDaPsql(context):
         ('SWYConverszGenAlbum-Trash Date-44', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-45',
         'SWYConverszGenAlbum-Privacy State-46')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -700,7 +701,7 @@ def Ph026_1SyndicationIDAssetsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -756,7 +757,7 @@ def Ph026_1SyndicationIDAssetsPhDaPsql(context):
         ('SWYConverszGenAlbum-Trash Date-44', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-45',
         'SWYConverszGenAlbum-Privacy State-46')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -924,7 +925,7 @@ def Ph026_1SyndicationIDAssetsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -981,7 +982,7 @@ def Ph026_1SyndicationIDAssetsPhDaPsql(context):
         ('SWYConverszGenAlbum-Trash Date-45', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-46',
         'SWYConverszGenAlbum-Privacy State-47')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1149,15 +1150,6 @@ def Ph026_1SyndicationIDAssetsPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
-            row[19], row[20], row[21], row[22], row[23], row[24], row[25], row[26], row[27],
-            row[28], row[29], row[30], row[31], row[32], row[33], row[34], row[35], row[36],
-            row[37], row[38], row[39], row[40], row[41], row[42], row[43], row[44], row[45],
-            row[46], row[47]))
-
         data_headers = (('zAsset-Date Created-0', 'datetime'),
         ('SWYConverszGenAlbum-Creation Date-1', 'datetime'),
         ('SWYConverszGenAlbum-Start Date-2', 'datetime'),
@@ -1206,7 +1198,7 @@ def Ph026_1SyndicationIDAssetsPhDaPsql(context):
         ('SWYConverszGenAlbum-Trash Date-45', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-46',
         'SWYConverszGenAlbum-Privacy State-47')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -1378,7 +1370,7 @@ def Ph026_2SyndicationPLAssetsSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1430,7 +1422,7 @@ def Ph026_2SyndicationPLAssetsSyndPL(context):
         'SWYConverszGenAlbum-Trashed State-41',
         ('SWYConverszGenAlbum-Trash Date-42', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-43')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1597,7 +1589,7 @@ def Ph026_2SyndicationPLAssetsSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1653,7 +1645,7 @@ def Ph026_2SyndicationPLAssetsSyndPL(context):
         ('SWYConverszGenAlbum-Trash Date-44', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-45',
         'SWYConverszGenAlbum-Privacy State-46')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1820,7 +1812,7 @@ def Ph026_2SyndicationPLAssetsSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1876,7 +1868,7 @@ def Ph026_2SyndicationPLAssetsSyndPL(context):
         ('SWYConverszGenAlbum-Trash Date-44', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-45',
         'SWYConverszGenAlbum-Privacy State-46')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2044,7 +2036,7 @@ def Ph026_2SyndicationPLAssetsSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -2101,7 +2093,7 @@ def Ph026_2SyndicationPLAssetsSyndPL(context):
         ('SWYConverszGenAlbum-Trash Date-45', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-46',
         'SWYConverszGenAlbum-Privacy State-47')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -2269,15 +2261,6 @@ def Ph026_2SyndicationPLAssetsSyndPL(context):
         ORDER BY zAsset.ZDATECREATED
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
-            row[19], row[20], row[21], row[22], row[23], row[24], row[25], row[26], row[27],
-            row[28], row[29], row[30], row[31], row[32], row[33], row[34], row[35], row[36],
-            row[37], row[38], row[39], row[40], row[41], row[42], row[43], row[44], row[45],
-            row[46], row[47]))
-
         data_headers = (('zAsset-Date Created-0', 'datetime'),
         ('SWYConverszGenAlbum-Creation Date-1', 'datetime'),
         ('SWYConverszGenAlbum-Start Date-2', 'datetime'),
@@ -2326,6 +2309,6 @@ def Ph026_2SyndicationPLAssetsSyndPL(context):
         ('SWYConverszGenAlbum-Trash Date-45', 'datetime'),
         'SWYConverszGenAlbum-Cloud Delete State-46',
         'SWYConverszGenAlbum-Privacy State-47')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
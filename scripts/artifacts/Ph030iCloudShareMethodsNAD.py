@@ -40,7 +40,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph030iCloudSharedMethodswithNADPhDaPsql(context):
@@ -155,7 +156,7 @@ def Ph030iCloudSharedMethodswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -194,7 +195,7 @@ def Ph030iCloudSharedMethodswithNADPhDaPsql(context):
         'zShare-Trashed State-29',
         'zShare-Cloud Delete State-30',
         'zShare-zENT-31')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -347,7 +348,7 @@ def Ph030iCloudSharedMethodswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -406,7 +407,7 @@ def Ph030iCloudSharedMethodswithNADPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-47', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-48', 'datetime'),
         'zShare-zENT-49')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -559,7 +560,7 @@ def Ph030iCloudSharedMethodswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -618,7 +619,7 @@ def Ph030iCloudSharedMethodswithNADPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-47', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-48', 'datetime'),
         'zShare-zENT-49')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -771,7 +772,7 @@ def Ph030iCloudSharedMethodswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -830,7 +831,7 @@ def Ph030iCloudSharedMethodswithNADPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-47', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-48', 'datetime'),
         'zShare-zENT-49')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -982,15 +983,6 @@ def Ph030iCloudSharedMethodswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
-        for row in db_records:
-            data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
-            row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
-            row[19], row[20], row[21], row[22], row[23], row[24], row[25], row[26], row[27],
-            row[28], row[29], row[30], row[31], row[32], row[33], row[34], row[35], row[36],
-            row[37], row[38], row[39], row[40], row[41], row[42], row[43], row[44], row[45],
-            row[46], row[47], row[48]))
-
         data_headers = (('zShare-Creation Date-0', 'datetime'),
         ('zShare-Start Date-1', 'datetime'),
         ('zShare-End Date-2', 'datetime'),
@@ -1040,7 +1032,7 @@ def Ph030iCloudSharedMethodswithNADPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-46', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-47', 'datetime'),
         'zShare-zENT-48')
-        data_list = list(get_sqlite_db_records(source_path, null_absent_columns(source_path, query)))
+        data_list = list(get_photos_db_records(source_path, query))
 
         return data_headers, data_list, source_path
 
@@ -38,7 +38,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph031iCloudSPLwithParticipantswithNADPhDaPsql(context):
@@ -148,7 +149,7 @@ def Ph031iCloudSPLwithParticipantswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -180,7 +181,7 @@ def Ph031iCloudSPLwithParticipantswithNADPhDaPsql(context):
         'zShare-Trashed State-23',
         'zShare-Cloud Delete State-24',
         'zShare-zENT-25')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -328,7 +329,7 @@ def Ph031iCloudSPLwithParticipantswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -380,7 +381,7 @@ def Ph031iCloudSPLwithParticipantswithNADPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-41', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-42', 'datetime'),
         'zShare-zENT-43')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -528,7 +529,7 @@ def Ph031iCloudSPLwithParticipantswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -580,7 +581,7 @@ def Ph031iCloudSPLwithParticipantswithNADPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-41', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-42', 'datetime'),
         'zShare-zENT-43')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -728,7 +729,7 @@ def Ph031iCloudSPLwithParticipantswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -780,7 +781,7 @@ def Ph031iCloudSPLwithParticipantswithNADPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-41', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-42', 'datetime'),
         'zShare-zENT-43')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -40,7 +40,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph032iCloudSPLAssetswithContributorPhDaPsql(context):
@@ -233,7 +234,7 @@ def Ph032iCloudSPLAssetswithContributorPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED     
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -293,7 +294,7 @@ def Ph032iCloudSPLAssetswithContributorPhDaPsql(context):
         'SPLzSharePartic-z54SHARE-48',
         'SPLzShare-Status-49',
         'SPLzShare-Scope Type-50')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -471,7 +472,7 @@ def Ph032iCloudSPLAssetswithContributorPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED     
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -531,7 +532,7 @@ def Ph032iCloudSPLAssetswithContributorPhDaPsql(context):
         'SPLzSharePartic-z55SHARE-48',
         'SPLzShare-Status-49',
         'SPLzShare-Scope Type-50')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -719,7 +720,7 @@ def Ph032iCloudSPLAssetswithContributorPhDaPsql(context):
         ORDER BY zAsset.ZDATECREATED     
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -782,6 +783,6 @@ def Ph032iCloudSPLAssetswithContributorPhDaPsql(context):
         'SPLzShare-Cloud Video Count-SPL-51',
         'zExtAttr-Generative_AI_Type-52',
         'zExtAttr-Credit-53')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
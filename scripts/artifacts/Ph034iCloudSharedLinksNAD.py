@@ -37,7 +37,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph034iCloudSharedLinkRecordswithNADPhDaPsql(context):
@@ -151,7 +152,7 @@ def Ph034iCloudSharedLinkRecordswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -190,7 +191,7 @@ def Ph034iCloudSharedLinkRecordswithNADPhDaPsql(context):
         'zShare-Trashed State-29',
         'zShare-Cloud Delete State-30',
         'zShare-zENT-31')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -341,7 +342,7 @@ def Ph034iCloudSharedLinkRecordswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
             row[8], row[9], row[10], row[11], row[12], row[13], row[14], row[15], row[16],
@@ -397,7 +398,7 @@ def Ph034iCloudSharedLinkRecordswithNADPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-44', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-45', 'datetime'),
         'zShare-zENT-46')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -548,7 +549,7 @@ def Ph034iCloudSharedLinkRecordswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
             row[8], row[9], row[10], row[11], row[12], row[13], row[14], row[15], row[16],
@@ -604,7 +605,7 @@ def Ph034iCloudSharedLinkRecordswithNADPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-44', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-45', 'datetime'),
         'zShare-zENT-46')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -755,7 +756,7 @@ def Ph034iCloudSharedLinkRecordswithNADPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
             row[8], row[9], row[10], row[11], row[12], row[13], row[14], row[15], row[16],
@@ -811,6 +812,6 @@ def Ph034iCloudSharedLinkRecordswithNADPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-44', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-45', 'datetime'),
         'zShare-zENT-46')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
@@ -37,7 +37,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
@@ -197,7 +198,7 @@ def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE        
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -260,7 +261,7 @@ def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
         'zShare-Trashed State-51',
         'zShare-Cloud Delete State-52',
         'zShare-zENT-53')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -423,7 +424,7 @@ def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -490,7 +491,7 @@ def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
         'zShare-Trashed State-54',
         'zShare-Cloud Delete State-55',
         'zShare-zENT-56')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -739,7 +740,7 @@ def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -828,7 +829,7 @@ def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-74', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-75', 'datetime'),
         'zShare-zENT-76')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1098,7 +1099,7 @@ def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1192,7 +1193,7 @@ def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-79', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-80', 'datetime'),
         'zShare-zENT-81')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1462,7 +1463,7 @@ def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1556,7 +1557,7 @@ def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-79', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-80', 'datetime'),
         'zShare-zENT-81')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -1826,7 +1827,7 @@ def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
         ORDER BY zShare.ZCREATIONDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -1920,6 +1921,6 @@ def Ph035iCloudSharedLinkAssetsPhDaPsql(context):
         ('zShare-LastParticipant Asset Trash Notification Date-79', 'datetime'),
         ('zShare-Last Participant Asset Trash Notification View Date-80', 'datetime'),
         'zShare-zENT-81')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
@@ -74,7 +74,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph094_1iOS14RefforAssetAnalysisPhDaPsql(context):
@@ -3158,7 +3159,7 @@ def Ph094_1iOS14RefforAssetAnalysisPhDaPsql(context):
 		ORDER BY zAsset.ZADDEDDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -4594,7 +4595,7 @@ def Ph094_1iOS14RefforAssetAnalysisPhDaPsql(context):
         'z26Assets-26Albums= zGenAlbum-zPK-1267',
         'z26Assets-3Asset Key= zAsset-zPK in the Album-1268',
         'z26Asset-FOK-3Assets= zAsset.Z_FOK_CLOUDFEEDASSETSENTRY-1269')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -7680,7 +7681,7 @@ def Ph094_2iOS14RefforAssetAnalysisSyndPL(context):
 		ORDER BY zAsset.ZADDEDDATE
 		'''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -9116,6 +9117,6 @@ def Ph094_2iOS14RefforAssetAnalysisSyndPL(context):
         'z26Assets-26Albums= zGenAlbum-zPK-1267',
         'z26Assets-3Asset Key= zAsset-zPK in the Album-1268',
         'z26Asset-FOK-3Assets= zAsset.Z_FOK_CLOUDFEEDASSETSENTRY-1269')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
@@ -74,7 +74,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph096_1iOS16RefforAssetAnalysisPhDaPsql(context):
@@ -2696,7 +2697,7 @@ def Ph096_1iOS16RefforAssetAnalysisPhDaPsql(context):
 		ORDER BY zAsset.ZADDEDDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -3918,7 +3919,7 @@ def Ph096_1iOS16RefforAssetAnalysisPhDaPsql(context):
         'z3MemoryBCAs-44Memories Being Custom User Assets-1080',
         'z3MemoryBCAs-3Custom User Assets-1081',
         'z3MemoryBCAs-FOK-3Custom User Assets-1082')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -6542,7 +6543,7 @@ def Ph096_2iOS16RefforAssetAnalysisSyndPL(context):
 		ORDER BY zAsset.ZADDEDDATE
 		'''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -7764,6 +7765,6 @@ def Ph096_2iOS16RefforAssetAnalysisSyndPL(context):
         'z3MemoryBCAs-44Memories Being Custom User Assets-1080',
         'z3MemoryBCAs-3Custom User Assets-1081',
         'z3MemoryBCAs-FOK-3Custom User Assets-1082')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
@@ -74,7 +74,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph097_1iOS17RefforAssetAnalysisPhDaPsql(context):
@@ -2724,7 +2725,7 @@ def Ph097_1iOS17RefforAssetAnalysisPhDaPsql(context):
 		ORDER BY zAsset.ZADDEDDATE
 		'''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -3958,7 +3959,7 @@ def Ph097_1iOS17RefforAssetAnalysisPhDaPsql(context):
         'z3MemoryBCAs-44Memories Being Custom User Assets-1091',
         'z3MemoryBCAs-3Custom User Assets-1092',
         'z3MemoryBCAs-FOK-3Custom User Assets-1093')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -6593,7 +6594,7 @@ def Ph097_1iOS17RefforAssetAnalysisPhDaPsql(context):
 		ORDER BY zAsset.ZADDEDDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -7827,7 +7828,7 @@ def Ph097_1iOS17RefforAssetAnalysisPhDaPsql(context):
         'z3MemoryBCAs-45Memories Being Custom User Assets-1091',
         'z3MemoryBCAs-3Custom User Assets-1092',
         'z3MemoryBCAs-FOK-3Custom User Assets-1093')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -10478,7 +10479,7 @@ def Ph097_2iOS17RefforAssetAnalysisSyndPL(context):
 		ORDER BY zAsset.ZADDEDDATE
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -11712,7 +11713,7 @@ def Ph097_2iOS17RefforAssetAnalysisSyndPL(context):
         'z3MemoryBCAs-44Memories Being Custom User Assets-1091',
         'z3MemoryBCAs-3Custom User Assets-1092',
         'z3MemoryBCAs-FOK-3Custom User Assets-1093')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -14347,7 +14348,7 @@ def Ph097_2iOS17RefforAssetAnalysisSyndPL(context):
 		ORDER BY zAsset.ZADDEDDATE
 		'''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -15581,6 +15582,6 @@ def Ph097_2iOS17RefforAssetAnalysisSyndPL(context):
         'z3MemoryBCAs-45Memories Being Custom User Assets-1091',
         'z3MemoryBCAs-3Custom User Assets-1092',
         'z3MemoryBCAs-FOK-3Custom User Assets-1093')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
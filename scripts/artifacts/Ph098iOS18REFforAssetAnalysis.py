@@ -94,7 +94,8 @@ __artifacts_v2__ = {
 
 import os
 from packaging import version
-from scripts.ilapfuncs import artifact_processor, get_file_path, get_sqlite_db_records, null_absent_columns, logfunc, iOS
+from scripts.ilapfuncs import artifact_processor, get_file_path, logfunc, iOS
+from scripts.photos_db import get_photos_db_records
 
 @artifact_processor
 def Ph098_1iOS18RefforAssetAnalysisPhDaPsql(context):
@@ -2843,7 +2844,7 @@ def Ph098_1iOS18RefforAssetAnalysisPhDaPsql(context):
 		ORDER BY zAsset.ZADDEDDATE			
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -4153,7 +4154,7 @@ def Ph098_1iOS18RefforAssetAnalysisPhDaPsql(context):
         'z3MemoryBCAs-51Memories Being Custom User Assets-1157',
         'z3MemoryBCAs-3Custom User Assets-1158',
         'z3MemoryBCAs-FOK-3Custom User Assets-1159')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -6907,7 +6908,7 @@ def Ph098_2iOS18RefforAssetAnalysisSyndPL(context):
 		ORDER BY zAsset.ZADDEDDATE		
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -8217,7 +8218,7 @@ def Ph098_2iOS18RefforAssetAnalysisSyndPL(context):
         'z3MemoryBCAs-51Memories Being Custom User Assets-1157',
         'z3MemoryBCAs-3Custom User Assets-1158',
         'z3MemoryBCAs-FOK-3Custom User Assets-1159')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
 
@@ -10968,7 +10969,7 @@ def Ph098_3iOS18RefforAssetAnalysisGenPlayPsql(context):
 		ORDER BY zAsset.ZADDEDDATE			
         '''
 
-        db_records = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+        db_records = get_photos_db_records(source_path, query)
         for row in db_records:
             data_list.append((row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9],
             row[10], row[11], row[12], row[13], row[14], row[15], row[16], row[17], row[18],
@@ -12278,6 +12279,6 @@ def Ph098_3iOS18RefforAssetAnalysisGenPlayPsql(context):
         'z3MemoryBCAs-51Memories Being Custom User Assets-1157',
         'z3MemoryBCAs-3Custom User Assets-1158',
         'z3MemoryBCAs-FOK-3Custom User Assets-1159')
-# data_list = get_sqlite_db_records(source_path, null_absent_columns(source_path, query))
+# data_list = get_photos_db_records(source_path, query)
 
         return data_headers, data_list, source_path
\ No newline at end of file
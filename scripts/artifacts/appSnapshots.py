@@ -1,9 +1,9 @@
 __artifacts_v2__ = {
     "applicationSnapshots": {
         "name": "App Snapshots",
-        "description": "Snapshots saved by iOS for individual apps. KTX images are converted to PNG for display, and \
-            XBApplicationSnapshotManifest metadata is joined when applicationState.db is available. KTX files smaller \
-            than 2500 bytes are skipped.",
+        "description": "Snapshots saved by iOS for individual apps. KTX images are converted to PNG, or WebP with \
+            --snapshot_format webp, for display, and XBApplicationSnapshotManifest metadata is joined when \
+            applicationState.db is available. KTX files smaller than 2500 bytes are skipped.",
         "author": "@ydkhatri - @AlexisBrignoni",
         "creation_date": "2020-07-23",
         "last_update_date": "2026-08-21",
@@ -50,36 +50,11 @@ from pathlib import Path
 import re
 import sqlite3
 
-from PIL import Image
 from scripts.artifacts.applicationStateDB import _get_snapshots
-from scripts.ktx.ios_ktx2png import KTX_reader
+from scripts.ktx_snapshots import convert_ktx_snapshots, get_snapshot_extension, get_snapshot_mime_type
 from scripts.ilapfuncs import artifact_processor, check_in_media, lava_get_full_media_info, logfunc, convert_unix_ts_to_utc
 
 
-def save_ktx_to_png_if_valid(ktx_path, save_to_path):
-    '''Convert a valid iOS KTX image to PNG.'''
-
-    with open(ktx_path, 'rb') as f:
-        ktx = KTX_reader()
-        try:
-            if ktx.validate_header(f):
-                data = ktx.get_uncompressed_texture_data(f)
-                dec_img = Image.frombytes('RGBA', (ktx.pixelWidth, ktx.pixelHeight), data, 'astc', (4, 4, False))
-                # either all black or all white https://stackoverflow.com/questions/14041562/python-pil-detect-if-an-image-is-completely-black-or-white
-                # if sum(dec_img.convert("L").getextrema()) in (0, 2):
-                #     logfunc('Skipping image as it is blank')
-                #     return False
-                    
-                dec_img.save(save_to_path, "PNG", compress_type=3)
-                #                                    ^
-                # as per https://github.com/python-pillow/Pillow/issues/5986
-
-                return True
-        except (OSError, ValueError) as ex:
-            logfunc(f'Had an exception - {str(ex)}')
-    return False
-
-
 def _bundle_id_from_path(media_path):
     """Return the bundle directory immediately below a Snapshots directory."""
 
@@ -153,6 +128,8 @@ def applicationSnapshots(context): #files_found, report_folder, seeker, wrap_tex
     files_found = context.get_files_found()
     manifest_index = _manifest_index(files_found)
 
+    snapshots = []
+    conversions = []
     for file_found in files_found:
         media_path = Path(file_found)
         suffix = media_path.suffix.lower()
@@ -166,22 +143,29 @@ def applicationSnapshots(context): #files_found, report_folder, seeker, wrap_tex
         if manifest and manifest.bundleID:
             bundle_id = manifest.bundleID
 
+        image_path = None
         if suffix == '.ktx':
             # Preserve the artifact's established lower-size threshold. Some
             # very small files are incomplete or do not contain a useful image.
             if media_path.stat().st_size < 2500:
                 continue
-            png_path = media_path.with_suffix((".png"))
-            if save_ktx_to_png_if_valid(media_path, png_path):
-                media_item = check_in_media(
-                    file_found,
-                    bundle_id,
-                    png_path,
-                    force_type='image/png',
-                    force_extension='png',
-                )
-            else:
+            image_path = media_path.with_suffix('.' + get_snapshot_extension())
+            conversions.append((media_path, image_path))
+        snapshots.append((file_found, media_path, bundle_id, snapshot_group, variant, manifest, image_path))
+
+    # The KTX images are converted together, across processes with --workers
+    converted = iter(convert_ktx_snapshots(conversions))
+    for file_found, media_path, bundle_id, snapshot_group, variant, manifest, image_path in snapshots:
+        if image_path:
+            if not next(converted):
                 continue
+            media_item = check_in_media(
+                file_found,
+                bundle_id,
+                image_path,
+                force_type=get_snapshot_mime_type(),
+                force_extension=get_snapshot_extension(),
+            )
         else:
             media_item = check_in_media(
                 file_found,
@@ -28,9 +28,8 @@ import struct
 from datetime import datetime as _dt
 from datetime import timezone
 
-from scripts import blackboxprotobuf
 from google.protobuf.message import DecodeError
-from scripts.ccl_segb.ccl_segb import read_segb_file
+from scripts.biome_reader import read_biome_batches
 from scripts.ccl_segb.ccl_segb_common import EntryState
 from scripts.ilapfuncs import (artifact_processor, convert_time_obj_to_utc, get_plist_content,
                                logfunc)
@@ -84,24 +83,16 @@ def get_biomeAppRelevantShortcuts(context):
 
     data_list = []
     source_dirs = set()
-    for file_found in sorted(context.get_files_found()):
-        file_found = str(file_found)
+    for batch in read_biome_batches(sorted(context.get_files_found()), {}):
+        file_found = batch.file_path
         filename = os.path.basename(file_found)
-        if filename.startswith('.'):
-            continue
-        if os.path.isfile(file_found):
-            if 'tombstone' in file_found:
-                continue
-        else:
-            continue
-
         source_dirs.add(os.path.dirname(file_found))
-        for record in read_segb_file(file_found):
+        for record in batch:
             ts = record.timestamp1.replace(tzinfo=timezone.utc)
 
             if record.state == EntryState.Written:
                 try:
-                    protostuff, _ = blackboxprotobuf.decode_message(record.data)
+                    protostuff = record.decode()
                     plist = get_plist_content(protostuff.get('3'))
                 except _DECODE_ERRORS as ex:
                     logfunc(f'App Relevant Shortcuts: could not decode record at offset '
@@ -30,9 +30,8 @@ __artifacts_v2__ = {
 import os
 import struct
 from datetime import timezone
-from scripts import blackboxprotobuf
 from google.protobuf.message import DecodeError
-from scripts.ccl_segb.ccl_segb import read_segb_file
+from scripts.biome_reader import read_biome_batches
 from scripts.ccl_segb.ccl_segb_common import EntryState
 from scripts.ilapfuncs import artifact_processor, webkit_timestampsconv, logfunc
 
@@ -108,27 +107,17 @@ def get_biomeAppinstall(context):
     data_list = []
     source_dirs = set()
 
-    for file_found in context.get_files_found():
-        file_found = str(file_found)
+    for batch in read_biome_batches(context.get_files_found(), typess):
+        file_found = batch.file_path
         filename = os.path.basename(file_found)
-
-        if filename.startswith('.'):
-            continue
-
-        if not os.path.isfile(file_found):
-            continue
-
-        if 'tombstone' in file_found:
-            continue
-
         source_dirs.add(os.path.dirname(file_found))
-        for record in read_segb_file(file_found):
+        for record in batch:
             ts = record.timestamp1
             ts = ts.replace(tzinfo=timezone.utc)
 
             if record.state == EntryState.Written:
                 try:
-                    protostuff, _ = blackboxprotobuf.decode_message(record.data, typess)
+                    protostuff = record.decode()
 
                     activity = protostuff['1']['1']
                     timestart = webkit_timestampsconv(protostuff['2'])
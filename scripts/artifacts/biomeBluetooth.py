@@ -32,9 +32,8 @@ __artifacts_v2__ = {
 
 
 import os
-from scripts import blackboxprotobuf
 from datetime import timezone
-from scripts.ccl_segb.ccl_segb import read_segb_file
+from scripts.biome_reader import read_biome_batches
 from scripts.ccl_segb.ccl_segb_common import EntryState
 from scripts.ilapfuncs import artifact_processor
 
@@ -44,24 +43,16 @@ def get_biomeBluetooth(context):
 
     data_list = []
     source_dirs = set()
-    for file_found in context.get_files_found():
-        file_found = str(file_found)
+    for batch in read_biome_batches(context.get_files_found(), {}):
+        file_found = batch.file_path
         filename = os.path.basename(file_found)
-        if filename.startswith('.'):
-            continue
-        if os.path.isfile(file_found):
-            if 'tombstone' in file_found:
-                continue
-        else:
-            continue
-
         source_dirs.add(os.path.dirname(file_found))
-        for record in read_segb_file(file_found):
+        for record in batch:
             ts = record.timestamp1
             ts = ts.replace(tzinfo=timezone.utc)
 
             if record.state == EntryState.Written:
-                protostuff, _ = blackboxprotobuf.decode_message(record.data)
+                protostuff = record.decode()
                 
                 mac = protostuff['1'].decode()
                 if isinstance(protostuff['2'], dict):
@@ -318,7 +318,6 @@ __artifacts_v2__ = {
     },
 }
 
-import atexit
 import glob
 import os
 import sqlite3
@@ -327,7 +326,7 @@ import tempfile
 import time
 import zlib
 
-from scripts.ilapfuncs import artifact_processor, logfunc
+from scripts.ilapfuncs import artifact_processor, logfunc, register_cleanup
 
 
 _FLAGS = (
@@ -468,7 +467,7 @@ def _remove_cache():
     _CACHE["path"] = None
 
 
-atexit.register(_remove_cache)
+register_cleanup(_remove_cache)
 
 
 def _remove_stale_caches():
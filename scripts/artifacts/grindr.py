@@ -139,7 +139,7 @@ __artifacts_v2__ = {
 import os
 import plistlib
 
-from scripts.realm_parser import parse_realm_file, realm_rows
+from scripts.realm_parser import realm_rows, realm_table_names
 from scripts.ilapfuncs import artifact_processor, logfunc
 
 _STORE = 'PersistenceStore.bin'
@@ -184,12 +184,11 @@ _OWN_CLASSES = ('class_GRChatMessage', 'class_GRConversation', 'class_GRProfile'
 def _is_own_store(path):
     '''Whether a Realm database declares this app's own classes.'''
     try:
-        parsed = parse_realm_file(path)
+        sections = [realm_table_names(path, section) for section in ('active', 'inactive')]
     except Exception as ex:                      # pylint: disable=broad-except
         logfunc(f'Grindr: could not read {os.path.basename(path)} as a Realm database: {ex}')
         return False
-    for section in ('active', 'inactive'):
-        tables = parsed.get(section) or {}
+    for tables in sections:
         if any(name in tables for name in _OWN_CLASSES):
             return True
     logfunc(f'Grindr: {os.path.basename(path)} is a Realm database but declares none of this '
@@ -121,7 +121,7 @@ from scripts.ilapfuncs import (
     convert_plist_date_to_utc,
     get_file_path,
 )
-from scripts.realm_parser import parse_realm_file, realm_rows
+from scripts.realm_parser import realm_rows, realm_table_names
 
 # Preference keys reported by the settings artifact, in the order shown, with readable labels.
 _SETTINGS = [
@@ -229,7 +229,7 @@ def ornet_browser_settings(context):
 def _is_ornet_realm(path):
     """The default.realm glob is shared by several apps, so confirm this Realm
     carries OrNET Browser classes before reporting rows."""
-    tables = parse_realm_file(path).get("active", {})
+    tables = realm_table_names(path)
     return any(name in tables for name in
                ('class_BookmarkItem', 'class_FavouriteModel', 'class_BrowsingHistoryItem'))
 
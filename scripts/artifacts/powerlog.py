@@ -1168,33 +1168,49 @@ __artifacts_v2__ = {
     },
 }
 
-import atexit
 import glob
 import gzip
+import itertools
 import os
 import shutil
+import sqlite3
 import tempfile
 import time
 from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from scripts.ilapfuncs import (
     artifact_processor,
     convert_unix_ts_to_utc,
-    does_column_exist_in_db,
-    does_table_exist_in_db,
-    get_sqlite_db_records,
     logfunc,
+    open_sqlite_db_readonly,
+    register_cleanup,
 )
+from scripts.timestamps import convert_unix_ts_column
 
 TIME_OFFSET_TABLE = "PLStorageOperator_EventForward_TimeOffset"
 
 # Rotated archives are decompressed once per session and reused by every
-# artifact in this module; maps original .PLSQL.gz path -> decompressed copy.
+# artifact in this module; maps original .PLSQL.gz path -> decompressed copy,
+# or None for an archive that could not be read, so it is tried and logged once.
 _GZ_CACHE = {}
 # 'dir' -> session temp directory for the decompressed copies, first use only.
 _GZ_TEMP = {}
 _GZ_TEMP_PREFIX = "ileapp_powerlog_gz_"
+# Numbers the decompressed copies, so archives of the same name never collide.
+_GZ_NUMBERS = itertools.count()
+# Archives are decompressed on threads: zlib releases the GIL while it inflates.
+_GZ_THREADS = min(8, os.cpu_count() or 1)
+
+# Every database this module reads stays open for the run, with its tables, columns
+# and clock corrections read once; maps queryable path -> _PowerlogDatabase or None.
+_DATABASES = {}
 
 # How long an abandoned directory must have gone untouched before another run reclaims it.
 # Generous on purpose: the cost of waiting is disk space, the cost of being wrong is
@@ -1210,13 +1226,15 @@ def _remove_gz_temp():
     used to remove them: 135 directories totalling 12 GB were found in the system temp
     directory of one machine, from two days of ordinary runs that all completed normally.
     """
+    # The copies cannot be deleted on Windows while a connection holds them open.
+    _close_databases()
     temp_dir = _GZ_TEMP.pop("dir", None)
     _GZ_CACHE.clear()
     if temp_dir:
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
-atexit.register(_remove_gz_temp)
+register_cleanup(_remove_gz_temp)
 
 
 def _remove_stale_gz_temps():
@@ -1236,95 +1254,189 @@ def _remove_stale_gz_temps():
             continue
 
 
-def _materialize_gz(gz_path):
-    """Decompress a rotated PowerLog archive to a session temp dir, once.
-
-    Returns the decompressed path, or None when the archive cannot be read.
-    The original file is only ever opened for reading.
-    """
-    cached = _GZ_CACHE.get(gz_path)
-    if cached and os.path.exists(cached):
-        return cached
+def _gz_temp_dir():
     temp_dir = _GZ_TEMP.get("dir")
     if not temp_dir:
         _remove_stale_gz_temps()
         temp_dir = tempfile.mkdtemp(prefix=_GZ_TEMP_PREFIX)
         _GZ_TEMP["dir"] = temp_dir
-    out_name = f"{len(_GZ_CACHE):04d}_{os.path.basename(gz_path)[:-3]}"
-    out_path = os.path.join(temp_dir, out_name)
+    return temp_dir
+
+
+def _decompress_gz(gz_path, out_path):
+    """Decompress one archive to out_path. Returns the error, or None."""
     try:
         with gzip.open(gz_path, "rb") as src, open(out_path, "wb") as dst:
-            shutil.copyfileobj(src, dst)
+            shutil.copyfileobj(src, dst, 1024 * 1024)
     except (OSError, EOFError, gzip.BadGzipFile) as e:
-        logfunc(f"Could not decompress {gz_path}: {e}")
-        return None
-    _GZ_CACHE[gz_path] = out_path
-    return out_path
+        try:
+            os.remove(out_path)
+        except OSError:
+            pass
+        return e
+    return None
+
+
+def _materialize_gzs(gz_paths):
+    """Decompress the rotated PowerLog archives not decompressed yet, in parallel.
+
+    Returns {archive path: decompressed path}, without the archives that cannot
+    be read. The original files are only ever opened for reading.
+    """
+    pending = []
+    for gz_path in dict.fromkeys(gz_paths):
+        if gz_path not in _GZ_CACHE:
+            pending.append(gz_path)
+        elif _GZ_CACHE[gz_path] and not os.path.exists(_GZ_CACHE[gz_path]):
+            pending.append(gz_path)
+    if pending:
+        temp_dir = _gz_temp_dir()
+        out_paths = [
+            os.path.join(temp_dir, f"{next(_GZ_NUMBERS):04d}_{os.path.basename(gz_path)[:-3]}")
+            for gz_path in pending]
+        threads = min(_GZ_THREADS, len(pending))
+        if threads > 1:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                errors = list(executor.map(_decompress_gz, pending, out_paths))
+        else:
+            errors = list(map(_decompress_gz, pending, out_paths))
+        for gz_path, out_path, error in zip(pending, out_paths, errors):
+            if error:
+                logfunc(f"Could not decompress {gz_path}: {error}")
+            _GZ_CACHE[gz_path] = None if error else out_path
+    return {gz_path: _GZ_CACHE[gz_path] for gz_path in gz_paths if _GZ_CACHE.get(gz_path)}
+
+
+def _materialize_gz(gz_path):
+    """Decompress a rotated PowerLog archive to a session temp dir, once.
+
+    Returns the decompressed path, or None when the archive cannot be read.
+    """
+    return _materialize_gzs([gz_path]).get(gz_path)
 
 
 def _powerlog_sources(context, extension=".PLSQL"):
     """(queryable path, evidence path) for every matching telemetry db found.
 
     Plain database files are used in place; .PLSQL.gz rotated archives are
-    decompressed to a temp dir but keep their original path for reporting.
-    -wal/-shm sidecars ride along on disk for SQLite and are not listed.
-    A file matched by more than one glob is returned once.
+    decompressed to a temp dir, all in one go, but keep their original path
+    for reporting. -wal/-shm sidecars ride along on disk for SQLite and are
+    not listed. A file matched by more than one glob is returned once.
     """
-    sources = []
+    paths = []
     for path in dict.fromkeys(str(p) for p in context.get_files_found()):
         if os.path.basename(path).startswith('._'):
             # AppleDouble metadata written when an extraction is handled on macOS.
             # ._CurrentPowerlog.PLSQL sits beside the real database and matches the
             # same glob, and opening it raises "file is not a database".
             continue
-        if path.endswith(extension):
+        if path.endswith(extension) or (extension == ".PLSQL" and path.endswith(".PLSQL.gz")):
+            paths.append(path)
+    materialized = _materialize_gzs([path for path in paths if path.endswith(".gz")])
+    sources = []
+    for path in paths:
+        if not path.endswith(".gz"):
             sources.append((path, path))
-        elif extension == ".PLSQL" and path.endswith(".PLSQL.gz"):
-            materialized = _materialize_gz(path)
-            if materialized:
-                sources.append((materialized, path))
+        elif path in materialized:
+            sources.append((materialized[path], path))
     return sources
 
 
-def _resolve_table(source_path, prefix):
-    """Actual table name for a family whose retention suffix varies by iOS.
+class _PowerlogDatabase:
+    """One telemetry db, opened once and queried by every artifact of the module.
 
-    Matches the exact name first, then prefix + '_' (skipping _Array_ side
-    tables). Returns None when the db has no such table.
+    The table names are read from sqlite_master when it is opened, the columns
+    of a table and the clock corrections of an offset family the first time
+    they are asked for, so each further artifact costs its own query only.
     """
-    if does_table_exist_in_db(source_path, prefix):
-        return prefix
-    for row in get_sqlite_db_records(source_path, '''
-            SELECT name FROM sqlite_master
-            WHERE type = 'table'
-            ORDER BY name
-        '''):
-        name = row[0]
-        if name.startswith(prefix + "_") and "_Array_" not in name:
-            return name
-    return None
-
 
-def _load_time_offsets(source_path, offset_prefix=TIME_OFFSET_TABLE):
-    """Read the log's clock corrections as parallel timestamp-sorted lists.
+    def __init__(self, path, db):
+        self.path = path
+        self._db = db
+        self._tables = sorted(row[0] for row in db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"))
+        self._columns = {}
+        self._time_offsets = {}
+
+    def resolve_table(self, prefix):
+        """Actual table name for a family whose retention suffix varies by iOS.
+
+        Matches the exact name first, then prefix + '_' (skipping _Array_ side
+        tables). Returns None when the db has no such table.
+        """
+        if prefix in self._tables:
+            return prefix
+        for name in self._tables:
+            if name.startswith(prefix + "_") and "_Array_" not in name:
+                return name
+        return None
 
-    Returns ([raw timestamp], [offset seconds]); empty lists when the table
-    is missing or holds no usable rows.
-    """
-    offset_table = _resolve_table(source_path, offset_prefix)
-    if not offset_table:
-        return [], []
-    stamps = []
-    offsets = []
-    for row in get_sqlite_db_records(source_path, f'''
-            SELECT timestamp, system
-            FROM "{offset_table}"
-            WHERE timestamp IS NOT NULL AND system IS NOT NULL
-            ORDER BY timestamp
-        '''):
-        stamps.append(row[0])
-        offsets.append(row[1])
-    return stamps, offsets
+    def has_column(self, table, column):
+        if table not in self._columns:
+            self._columns[table] = {
+                row[1].lower() for row in self._db.execute(f"PRAGMA table_info('{table}')")}
+        return column.lower() in self._columns[table]
+
+    def time_offsets(self, offset_prefix=TIME_OFFSET_TABLE):
+        """The log's clock corrections as parallel timestamp-sorted arrays.
+
+        Returns (raw timestamps, offset seconds), NumPy float arrays when NumPy
+        is installed and lists otherwise; empty when the table is missing or
+        holds no usable rows.
+        """
+        if offset_prefix not in self._time_offsets:
+            stamps = []
+            offsets = []
+            offset_table = self.resolve_table(offset_prefix)
+            if offset_table:
+                for stamp, offset in self.records(f'''
+                        SELECT timestamp, system
+                        FROM "{offset_table}"
+                        WHERE timestamp IS NOT NULL AND system IS NOT NULL
+                        ORDER BY timestamp
+                    '''):
+                    stamps.append(stamp)
+                    offsets.append(offset)
+            if np is not None:
+                stamps = np.array(stamps, dtype=np.float64)
+                offsets = np.array(offsets, dtype=np.float64)
+            self._time_offsets[offset_prefix] = stamps, offsets
+        return self._time_offsets[offset_prefix]
+
+    def records(self, query):
+        """All rows of a query, or none if it fails."""
+        try:
+            return self._db.execute(query).fetchall()
+        except sqlite3.DatabaseError as e:
+            logfunc(f"Error with {self.path}:")
+            logfunc(f" - {str(e)}")
+        return []
+
+    def close(self):
+        self._db.close()
+
+
+def _powerlog_database(source_path):
+    """The open _PowerlogDatabase of a path, or None when it cannot be read."""
+    if source_path not in _DATABASES:
+        database = None
+        db = open_sqlite_db_readonly(source_path)
+        if db:
+            try:
+                database = _PowerlogDatabase(source_path, db)
+            except sqlite3.DatabaseError as e:
+                db.close()
+                logfunc(f"Error with {source_path}:")
+                logfunc(f" - {str(e)}")
+        _DATABASES[source_path] = database
+    return _DATABASES[source_path]
+
+
+def _close_databases():
+    for database in _DATABASES.values():
+        if database:
+            database.close()
+    _DATABASES.clear()
 
 
 def _corrected_utc(raw_ts, stamps, offsets):
@@ -1336,7 +1448,7 @@ def _corrected_utc(raw_ts, stamps, offsets):
     """
     if raw_ts is None:
         return None, None
-    if not stamps:
+    if not len(stamps):
         return convert_unix_ts_to_utc(raw_ts), None
     idx = bisect_right(stamps, raw_ts) - 1
     if idx < 0:
@@ -1345,6 +1457,28 @@ def _corrected_utc(raw_ts, stamps, offsets):
     return convert_unix_ts_to_utc(raw_ts + offset), int(round(offset))
 
 
+def _corrected_column(raw_values, stamps, offsets):
+    """Apply _corrected_utc() to a whole column of raw timestamps.
+
+    The offset entries are looked up with one searchsorted() call and the
+    corrected values converted with one convert_unix_ts_column() call.
+    Returns ([aware datetime], [applied offset in whole seconds]).
+    """
+    if np is None or not len(stamps):
+        pairs = [_corrected_utc(raw_ts, stamps, offsets) for raw_ts in raw_values]
+        return [pair[0] for pair in pairs], [pair[1] for pair in pairs]
+    present = [index for index, raw_ts in enumerate(raw_values) if raw_ts is not None]
+    raw = np.array([raw_values[index] for index in present], dtype=np.float64)
+    applied = offsets[np.maximum(np.searchsorted(stamps, raw, side="right") - 1, 0)]
+    timestamps = [None] * len(raw_values)
+    applied_seconds = [None] * len(raw_values)
+    for index, ts, offset in zip(present, convert_unix_ts_column((raw + applied).tolist()),
+                                 np.round(applied).astype(np.int64).tolist()):
+        timestamps[index] = ts
+        applied_seconds[index] = offset
+    return timestamps, applied_seconds
+
+
 def _parse_powerlog_table(context, table, columns, row_builder, optional=(),
                           extension=".PLSQL", offset_prefix=TIME_OFFSET_TABLE):
     """Run one query shape over every matching telemetry db found.
@@ -1358,25 +1492,25 @@ def _parse_powerlog_table(context, table, columns, row_builder, optional=(),
     data_list = []
     sources = _powerlog_sources(context, extension)
     for db_path, evidence_path in sources:
-        actual_table = _resolve_table(db_path, table)
+        database = _powerlog_database(db_path)
+        actual_table = database.resolve_table(table) if database else None
         if not actual_table:
             continue
         select_parts = []
         for col in columns:
-            if col in optional and not does_column_exist_in_db(
-                    db_path, actual_table, col):
+            if col in optional and not database.has_column(actual_table, col):
                 select_parts.append(f'NULL AS "{col}"')
             else:
                 select_parts.append(f'"{col}"')
-        stamps, offsets = _load_time_offsets(db_path, offset_prefix)
-        relative_path = context.get_relative_path(evidence_path)
-        for row in get_sqlite_db_records(db_path, f'''
+        rows = database.records(f'''
                 SELECT {", ".join(select_parts)}
                 FROM "{actual_table}"
                 ORDER BY timestamp
-            '''):
-            ts, offset = _corrected_utc(row[0], stamps, offsets)
-            data_list.append(row_builder(ts, offset, row, relative_path))
+            ''')
+        stamps, offsets = database.time_offsets(offset_prefix)
+        timestamps, applied = _corrected_column([row[0] for row in rows], stamps, offsets)
+        relative_path = context.get_relative_path(evidence_path)
+        data_list.extend(map(row_builder, timestamps, applied, rows, itertools.repeat(relative_path)))
     source = "See source paths in data" if sources else ""
     return data_list, source
 
@@ -11,6 +11,7 @@ __artifacts_v2__ = {
         "paths": ('*/Library/SMS/sms.db*',
                   '*/Library/SMS/Attachments/*'),
         "output_types": "standard",
+        "lazy_extraction": True,
         "artifact_icon": "message",
         "sample_data": {
             "ctf2020_ios12": "iOS 12.4 | 107 rows",
@@ -18,6 +18,7 @@ __artifacts_v2__ = {
             "*/Recordings/*.qta",
             ),
         "output_types": "standard",
+        "lazy_extraction": True,
         "artifact_icon": "microphone",
         "sample_data": {
             "fsfull002_ios17": "iOS 17.1 | 5 rows",
@@ -63,47 +63,25 @@ __artifacts_v2__ = {
 }
 
 import os
-import re
 from pathlib import Path
+from scripts.ascii_strings import read_strings_file, write_strings_files
 from scripts.ilapfuncs import (
     artifact_processor,
+    artifact_processor_streaming,
     logfunc
     )
 from scripts.html_safe import safe_local_link
 
-ASCII_STRINGS_RE = re.compile(rb'[\x20-\x7e]{4,}')
 _extraction_cache = {}
 
 
-def extract_strings(file_path):
-    with open(file_path, 'rb') as file:
-        data = file.read()
-
-    strings = {}
-    total_matches = 0
-
-    for match in ASCII_STRINGS_RE.finditer(data):
-        raw_value = match.group()
-        value = raw_value.decode('ascii').strip()
-        if len(value) < 4:
-            continue
-
-        total_matches += 1
-        leading_spaces = len(raw_value) - len(raw_value.lstrip())
-        offset = match.start() + leading_spaces
-
-        if value in strings:
-            strings[value]['count'] += 1
-        else:
-            strings[value] = {
-                'offset': offset,
-                'count': 1
-            }
-
-    return strings, total_matches
-
-
 def process_journal_files(context):
+    """
+    Writes the strings of each journal to a text file of the report folder, once per run.
+    Returns:
+        tuple: (summary rows, summary rows for HTML, (text file, journal name, source path)
+            of each file written, source path)
+    """
     files_found = context.get_files_found()
     report_folder = context.get_report_folder()
     cache_key = (
@@ -115,10 +93,11 @@ def process_journal_files(context):
 
     summary_data = []
     summary_html_data = []
-    detail_data = []
+    strings_files = []
     source_path_ref = ''
     report_number = 1
 
+    journals = []
     for file_found in files_found:
         file_found = str(file_found)
         source_path = context.get_relative_path(file_found)
@@ -129,12 +108,20 @@ def process_journal_files(context):
         try:
             if Path(file_found).stat().st_size == 0:
                 continue
-            strings, total_matches = extract_strings(file_found)
         except OSError as error:
             logfunc(f"Error reading {file_found}: {error}")
             continue
+        temp_path = os.path.join(report_folder, f'.{len(journals)}.strings')
+        journals.append((file_found, source_path, temp_path))
+
+    # The journals are read across processes with --workers, each writing its own text file
+    results = write_strings_files([(file_found, temp_path) for file_found, _, temp_path in journals])
+    for (file_found, source_path, temp_path), (total_matches, unique_strings, error) in zip(journals, results):
+        if error:
+            logfunc(f"Error reading {file_found}: {error}")
+            continue
 
-        if not strings:
+        if not unique_strings:
             continue
 
         journal_name = os.path.basename(file_found)
@@ -142,12 +129,7 @@ def process_journal_files(context):
         output_path = os.path.join(report_folder, output_filename)
 
         try:
-            with open(output_path, 'w', encoding='utf-8') as output_file:
-                for value, string_info in strings.items():
-                    output_file.write(
-                        f"{string_info['offset']}\t"
-                        f"{string_info['count']}\t{value}\n"
-                    )
+            os.replace(temp_path, output_path)
         except OSError as error:
             logfunc(f"Error writing report file {output_path}: {error}")
             continue
@@ -163,34 +145,39 @@ def process_journal_files(context):
             relative_output_path,
             journal_name,
             total_matches,
-            len(strings),
+            unique_strings,
             source_path
         )
         summary_data.append(summary_row)
         summary_html_data.append((report_link, *summary_row[1:]))
-
-        for value, string_info in strings.items():
-            detail_data.append((
-                value,
-                len(value),
-                string_info['offset'],
-                string_info['count'],
-                journal_name,
-                source_path
-            ))
+        strings_files.append((output_path, journal_name, source_path))
 
         report_number += 1
 
     result = (
         summary_data,
         summary_html_data,
-        detail_data,
+        strings_files,
         source_path_ref
     )
     _extraction_cache[cache_key] = result
     return result
 
 
+def _detail_rows(strings_files):
+    """The strings of each text file written by process_journal_files(), read back one by one"""
+    for output_path, journal_name, source_path in strings_files:
+        for value, offset, count in read_strings_file(output_path):
+            yield (
+                value,
+                len(value),
+                offset,
+                count,
+                journal_name,
+                source_path
+            )
+
+
 @artifact_processor
 def walStrings(context):
     data_list, html_data_list, _, source_path = process_journal_files(context)
@@ -209,9 +196,9 @@ def walStrings(context):
     return data_headers, (data_list, html_data_list), source_path
 
 
-@artifact_processor
+@artifact_processor_streaming
 def walStringsDetails(context):
-    _, _, data_list, source_path = process_journal_files(context)
+    _, _, strings_files, source_path = process_journal_files(context)
     data_headers = (
         'String',
         'Length',
@@ -221,4 +208,5 @@ def walStringsDetails(context):
         'Source File'
     )
 
-    return data_headers, data_list, source_path
+    # Over a million rows on a full extraction, streamed to LAVA rather than held in memory
+    return data_headers, _detail_rows(strings_files), source_path
@@ -57,7 +57,7 @@ __artifacts_v2__ = {
 from datetime import datetime, timezone
 
 from scripts.ilapfuncs import artifact_processor
-from scripts.realm_parser import parse_realm_file, realm_rows
+from scripts.realm_parser import realm_rows, realm_table_names
 
 
 def _realm_ts(value):
@@ -74,7 +74,7 @@ def _realm_ts(value):
 def _is_what3words_realm(path):
     """Guard: the default.realm glob is shared by several apps, so confirm this
     Realm actually carries what3words classes before reporting rows."""
-    tables = parse_realm_file(path).get("active", {})
+    tables = realm_table_names(path)
     return 'class_DataPlace' in tables or 'class_DataProfile' in tables or 'class_DataSearchItem' in tables
 
 
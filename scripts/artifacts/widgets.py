@@ -31,28 +31,8 @@ __artifacts_v2__ = {
 
 from pathlib import Path
 
-from PIL import Image
-from scripts.ktx.ios_ktx2png import KTX_reader
-from scripts.ilapfuncs import artifact_processor, check_in_media, lava_get_full_media_info, logfunc, convert_unix_ts_to_utc
-
-
-def save_ktx_to_png_if_valid(ktx_path, save_to_path):
-    '''Excludes all white or all black blank images'''
-
-    with open(ktx_path, 'rb') as f:
-        ktx = KTX_reader()
-        try:
-            if ktx.validate_header(f):
-                data = ktx.get_uncompressed_texture_data(f)
-                dec_img = Image.frombytes(
-                    'RGBA', (ktx.pixelWidth, ktx.pixelHeight), data, 'astc', (4, 4, False))
-
-                dec_img.save(save_to_path, "PNG", compress_type=3)
-
-                return True
-        except (OSError, ValueError) as ex:
-            logfunc(f'Had an exception - {str(ex)}')
-    return False
+from scripts.ktx_snapshots import convert_ktx_snapshots, get_snapshot_extension
+from scripts.ilapfuncs import artifact_processor, check_in_media, lava_get_full_media_info, convert_unix_ts_to_utc
 
 
 @artifact_processor
@@ -60,6 +40,7 @@ def widgets(context):
     data_list = []
     source_dirs = set()
 
+    snapshots = []
     for file_found in context.get_files_found():
         media_path = Path(file_found)
         parts = media_path.parts
@@ -70,12 +51,13 @@ def widgets(context):
         dash_pos = app_name.find('-')
         if dash_pos > 0:
             app_name = app_name[0:dash_pos]
+        snapshots.append((file_found, media_path, app_name, media_path.with_suffix('.' + get_snapshot_extension())))
 
-        png_path = media_path.with_suffix((".png"))
-        if save_ktx_to_png_if_valid(media_path, png_path):
-            media_item = check_in_media(file_found, app_name, png_path)
-        else:
+    converted = convert_ktx_snapshots([(media_path, image_path) for _, media_path, _, image_path in snapshots])
+    for (file_found, media_path, app_name, image_path), saved in zip(snapshots, converted):
+        if not saved:
             continue
+        media_item = check_in_media(file_found, app_name, image_path)
 
         if not media_item:
             continue
@@ -0,0 +1,202 @@
+"""
+Extraction of the ASCII strings of large binary files, such as SQLite journals.
+
+The strings of a file are the runs of at least four printable ASCII characters, without
+their leading and trailing spaces. For each distinct string, the offset it is first
+found at and the number of times it is found are kept.
+
+A file is memory-mapped and the regular expression runs over the map, so only the
+strings found are copied, whatever the size of the file. The distinct strings are
+counted in a StringCounts, a dict from string to an index in two arrays of integers.
+Past STRINGS_MAX_IN_MEMORY distinct strings, the counts move to a temporary SQLite
+database and the dict starts again, so memory stays bounded for files of any size.
+
+write_strings_files() writes the strings of a list of files to text files, one line per
+distinct string, across --workers processes when the files are larger than
+STRINGS_PARALLEL_MIN_BYTES in total. read_strings_file() reads such a file back, one
+string at a time.
+"""
+
+import contextlib
+import mmap
+import os
+import re
+import sqlite3
+import tempfile
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+ASCII_STRINGS_RE = re.compile(rb'[\x20-\x7e]{4,}')
+STRINGS_MAX_IN_MEMORY = 1_000_000
+STRINGS_PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+# Set from --workers by crunch_artifacts() and in each worker process of the artifact pool
+_workers = 1
+
+
+def set_strings_workers(workers):
+    """Sets the number of processes the strings of large files are extracted across"""
+    global _workers  # pylint: disable=global-statement
+    _workers = max(1, workers)
+
+
+class StringCounts:
+    """
+    The distinct strings of a file, with the offset each is first found at and its count.
+    Strings must be added in the order of their offsets.
+    Methods:
+        add(value, offset): Counts a string found at offset.
+        items(): Yields (string, first offset, count), in the order the strings were first found.
+        close(): Deletes the temporary database, if the counts were moved to one.
+    """
+
+    def __init__(self, max_in_memory=None):
+        self.max_in_memory = max_in_memory or STRINGS_MAX_IN_MEMORY
+        self._index = {}
+        self._offsets = array('q')
+        self._counts = array('q')
+        self._db = None
+        self._db_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        if self._db is None:
+            return len(self._index)
+        self._spill()
+        return self._db.execute('SELECT COUNT(*) FROM strings').fetchone()[0]
+
+    def add(self, value, offset):
+        index = self._index.get(value)
+        if index is None:
+            self._index[value] = len(self._offsets)
+            self._offsets.append(offset)
+            self._counts.append(1)
+            if len(self._index) >= self.max_in_memory:
+                self._spill()
+        else:
+            self._counts[index] += 1
+
+    def _spill(self):
+        """Adds the counts in memory to those of the temporary database, and clears them"""
+        if self._db is None:
+            handle, self._db_path = tempfile.mkstemp(prefix='strings_', suffix='.db')
+            os.close(handle)
+            self._db = sqlite3.connect(self._db_path)
+            self._db.execute('PRAGMA journal_mode = OFF')
+            self._db.execute('PRAGMA synchronous = OFF')
+            self._db.execute('CREATE TABLE strings (value TEXT PRIMARY KEY, offset INTEGER, count INTEGER) '
+                             'WITHOUT ROWID')
+        # A string counted before keeps the offset it was first found at
+        self._db.executemany(
+            'INSERT INTO strings VALUES (?, ?, ?) ON CONFLICT (value) DO UPDATE SET count = count + excluded.count',
+            zip(self._index, self._offsets, self._counts))
+        self._db.commit()
+        self._index = {}
+        self._offsets = array('q')
+        self._counts = array('q')
+
+    def items(self):
+        if self._db is None:
+            yield from zip(self._index, self._offsets, self._counts)
+            return
+        self._spill()
+        yield from self._db.execute('SELECT value, offset, count FROM strings ORDER BY offset')
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            os.remove(self._db_path)
+
+
+def extract_strings(file_path, max_in_memory=None):
+    """
+    Returns the StringCounts of the strings of a file, to be closed by the caller, and the
+    number of strings found. Raises OSError if the file cannot be read.
+    """
+    strings = StringCounts(max_in_memory)
+    total_matches = 0
+    try:
+        with open(file_path, 'rb') as file:
+            if not os.fstat(file.fileno()).st_size:
+                return strings, 0
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for match in ASCII_STRINGS_RE.finditer(data):
+                    raw_value = match.group()
+                    value = raw_value.strip()
+                    if len(value) < 4:
+                        continue
+                    total_matches += 1
+                    leading_spaces = len(raw_value) - len(raw_value.lstrip())
+                    strings.add(value.decode('ascii'), match.start() + leading_spaces)
+    except BaseException:
+        strings.close()
+        raise
+    return strings, total_matches
+
+
+def write_strings(file_path, output_path):
+    """
+    Writes the distinct strings of a file to output_path, one 'offset<TAB>count<TAB>string'
+    line each, in the order they were first found. Nothing is written if there are none.
+    Returns:
+        tuple: (number of strings found, number of distinct strings)
+    Raises:
+        OSError: If the file cannot be read or the output written.
+    """
+    strings, total_matches = extract_strings(file_path)
+    with strings:
+        distinct = len(strings)
+        if distinct:
+            with open(output_path, 'w', encoding='utf-8') as output_file:
+                for value, offset, count in strings.items():
+                    output_file.write(f'{offset}\t{count}\t{value}\n')
+    return total_matches, distinct
+
+
+def _write_strings(arguments):
+    try:
+        return (*write_strings(*arguments), None)
+    except OSError as error:
+        with contextlib.suppress(OSError):
+            os.remove(arguments[1])  # what was written before the error
+        return None, None, error
+
+
+def _file_size(job):
+    try:
+        return os.path.getsize(job[0])
+    except OSError:
+        return 0  # reported by _write_strings()
+
+
+def write_strings_files(jobs, workers=None):
+    """
+    Writes the strings of files to text files, as write_strings() does.
+    Args:
+        jobs (list): (file path, output path) tuples.
+        workers (int): The number of processes to extract across, the --workers value if None.
+    Returns:
+        list: For each job, (number of strings found, number of distinct strings, None), or
+            (None, None, the OSError raised) if the file could not be read or the output written.
+    """
+    jobs = [(str(file_path), str(output_path)) for file_path, output_path in jobs]
+    workers = min(workers or _workers, len(jobs))
+    if workers > 1 and sum(map(_file_size, jobs)) >= STRINGS_PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_write_strings, jobs))
+    return [_write_strings(job) for job in jobs]
+
+
+def read_strings_file(output_path):
+    """Yields (string, first offset, count) from a file written by write_strings()"""
+    with open(output_path, encoding='utf-8') as output_file:
+        for line in output_file:
+            offset, count, value = line.rstrip('\n').split('\t', 2)
+            yield value, int(offset), int(count)
@@ -0,0 +1,246 @@
+"""
+Batch reading of the SEGB files of Biome streams.
+
+A Biome stream directory holds up to thousands of small SEGB files, and the biome*
+artifacts used to read each one through ccl_segb.read_segb_file(), which reads a file
+record by record through a file object, builds a dataclass per record and leaves the
+artifact to decode each protobuf payload with blackboxprotobuf.
+
+read_biome_batches() reads the files of a stream instead. Each file is memory-mapped
+and parsed in one pass, the SEGB v2 trailer with a single struct.iter_unpack(), and the
+payloads of the written records are decoded against the typedef of the stream in one
+blackboxprotobuf.decode_messages() call, which compiles the typedef once. The result
+is a SegbBatch per file, holding the records column by column. Iterating a batch gives
+SegbRecord objects with the attributes of the ccl_segb entries the artifacts already
+read (timestamp1, state, data_start_offset, data), so the loop that turns records into
+rows is unchanged.
+
+With --workers N, the files of a stream larger than BIOME_PARALLEL_MIN_BYTES in total
+are read and decoded across N processes. The records come out in the same order either
+way. ccl_segb is kept for the artifacts that read a single SEGB file.
+"""
+
+import mmap
+import os
+import struct
+
+from concurrent.futures import ProcessPoolExecutor
+
+from scripts import blackboxprotobuf
+from scripts.ccl_segb import ccl_segb1, ccl_segb2
+from scripts.ccl_segb.ccl_segb_common import EntryState, decode_cocoa_time
+
+BIOME_PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+_SEGB1_RECORD_HEADER = struct.Struct('<iiddIi')
+_SEGB2_HEADER = struct.Struct('<4sid16s')
+_SEGB2_TRAILER_ENTRY = struct.Struct('<2id')
+_SEGB2_ENTRY_HEADER = struct.Struct('Ii')
+
+# Set from --workers by crunch_artifacts() and in each worker process of the artifact pool
+_workers = 1
+
+
+def set_biome_workers(workers):
+    """Sets the number of processes the files of a large stream are read across"""
+    global _workers  # pylint: disable=global-statement
+    _workers = max(1, workers)
+
+
+class SegbRecord:
+    """
+    A record of a SEGB file, as iterated from a SegbBatch.
+    Attributes:
+        timestamp1 (datetime): The timestamp of the record, naive UTC, as ccl_segb gives it.
+        state (EntryState): The state of the record.
+        data_start_offset (int): The offset of the record in its file.
+        data (bytes): The payload of the record.
+    Methods:
+        decode(): Returns the decoded payload.
+    """
+    __slots__ = ('timestamp1', 'state', 'data_start_offset', 'data', '_message', '_error')
+
+    def __init__(self, timestamp1, state, data_start_offset, data, message, error):
+        self.timestamp1 = timestamp1
+        self.state = state
+        self.data_start_offset = data_start_offset
+        self.data = data
+        self._message = message
+        self._error = error
+
+    def decode(self):
+        """
+        Returns the payload decoded against the typedef given to read_biome_batches(), as
+        blackboxprotobuf.decode_message() does, or raises the exception it raised.
+        """
+        if self._error is not None:
+            raise self._error
+        if self._message is None:
+            raise ValueError('Record payload was not decoded')
+        return self._message
+
+
+class SegbBatch:
+    """
+    The records of one SEGB file, column by column.
+    Attributes:
+        file_path (str): The path of the file.
+        timestamps (list): The timestamp1 of each record.
+        states (list): The EntryState of each record.
+        offsets (list): The data_start_offset of each record.
+        payloads (list): The payload bytes of each record.
+        messages (list): The decoded payload of each written record, None for the others
+            or if it could not be decoded.
+        errors (list): The exception decoding the payload raised, None if it did not.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.timestamps = []
+        self.states = []
+        self.offsets = []
+        self.payloads = []
+        self.messages = []
+        self.errors = []
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __iter__(self):
+        return map(SegbRecord, self.timestamps, self.states, self.offsets, self.payloads, self.messages,
+                   self.errors)
+
+    def append(self, timestamp, state, offset, payload):
+        """Adds a record"""
+        self.timestamps.append(timestamp)
+        self.states.append(state)
+        self.offsets.append(offset)
+        self.payloads.append(payload)
+
+
+def _read_segb1(buffer, batch):
+    """Reads the records of a SEGB v1 file the way ccl_segb1.read_segb1_stream() does"""
+    end_of_data_offset, = struct.unpack_from('<I', buffer, 0)
+    size = len(buffer)
+    position = ccl_segb1.HEADER_LENGTH
+    while position < end_of_data_offset:
+        record_length, entry_state_raw, timestamp1_raw, _, _, _ = _SEGB1_RECORD_HEADER.unpack(
+            buffer[position:position + ccl_segb1.RECORD_HEADER_LENGTH])
+        record_offset = position + ccl_segb1.RECORD_HEADER_LENGTH
+        timestamp1 = decode_cocoa_time(timestamp1_raw)
+        record_end = size if record_length < 0 else min(record_offset + record_length, size)
+        batch.append(timestamp1, EntryState(entry_state_raw), record_offset, buffer[record_offset:record_end])
+        position = max(record_end, record_offset)
+        if remainder := position % ccl_segb1.ALIGNMENT_BYTES_LENGTH:
+            position += ccl_segb1.ALIGNMENT_BYTES_LENGTH - remainder
+
+
+def _read_segb2(buffer, batch):
+    """Reads the records of a SEGB v2 file the way ccl_segb2.read_segb2_stream() does"""
+    _, entries_count, _, _ = _SEGB2_HEADER.unpack(buffer[:ccl_segb2.HEADER_LENGTH])
+    size = len(buffer)
+    trailer_offset = size - ccl_segb2.TRAILER_ENTRY_LENGTH * entries_count
+    if trailer_offset < 0:
+        raise OSError(22, 'Invalid argument')  # what seeking before the start of the file raises
+    trailer = []
+    for end_offset, entry_state_raw, entry_timestamp_raw in _SEGB2_TRAILER_ENTRY.iter_unpack(
+            buffer[trailer_offset:trailer_offset + ccl_segb2.TRAILER_ENTRY_LENGTH * max(entries_count, 0)]):
+        try:
+            entry_state = EntryState(entry_state_raw)
+        except ValueError:
+            continue  # a zeroed or unused trailer slot
+        trailer.append((end_offset, entry_state, decode_cocoa_time(entry_timestamp_raw)))
+    trailer.sort(key=lambda entry: entry[0])
+
+    position = ccl_segb2.HEADER_LENGTH
+    # The end offset, data start offset and payload of the record read last
+    previous_end, previous_start, previous_payload = None, None, None
+    for end_offset, entry_state, timestamp in trailer:
+        if entry_state == EntryState.Unknown:
+            continue  # an empty record
+        if previous_end is not None and end_offset == previous_end:
+            # A second trailer entry for the data of the record read last
+            batch.append(timestamp, entry_state, previous_start, previous_payload)
+            continue
+        entry_length = end_offset - position + ccl_segb2.HEADER_LENGTH
+        if entry_length < ccl_segb2.ENTRY_HEADER_LENGTH:
+            continue  # points inside a record read already, its own data is gone
+        entry_raw = buffer[position:position + entry_length]
+        # Raises on a truncated record, as ccl_segb does
+        _SEGB2_ENTRY_HEADER.unpack(entry_raw[:ccl_segb2.ENTRY_HEADER_LENGTH])
+        previous_end, previous_start = end_offset, position
+        previous_payload = entry_raw[ccl_segb2.ENTRY_HEADER_LENGTH:]
+        batch.append(timestamp, entry_state, position, previous_payload)
+        position += len(entry_raw)
+        if remainder := end_offset % 4:
+            position += 4 - remainder
+
+
+def read_segb_batch(file_path, typedef=None):
+    """
+    Reads a SEGB v1 or v2 file into a SegbBatch. If a typedef is given, the payloads of
+    the written records are decoded against it. Raises ValueError if the file is not a
+    SEGB file, as ccl_segb.read_segb_file() does.
+    """
+    batch = SegbBatch(file_path)
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+    try:
+        if len(buffer) >= ccl_segb1.HEADER_LENGTH and buffer[52:56] == ccl_segb1.MAGIC:
+            _read_segb1(buffer, batch)
+        elif len(buffer) >= ccl_segb2.HEADER_LENGTH and buffer[:4] == ccl_segb2.MAGIC:
+            _read_segb2(buffer, batch)
+        else:
+            raise ValueError('File is not a SEGB File', file_path)
+    finally:
+        if size:
+            buffer.close()
+
+    batch.messages = [None] * len(batch)
+    batch.errors = [None] * len(batch)
+    if typedef is not None:
+        written = [index for index, state in enumerate(batch.states) if state == EntryState.Written]
+        errors = []  # the artifact decides what to do with a payload that does not decode
+        messages = blackboxprotobuf.decode_messages([batch.payloads[index] for index in written], typedef, errors)
+        for index, message, error in zip(written, messages, errors):
+            batch.messages[index] = message
+            batch.errors[index] = error
+    return batch
+
+
+def _read_segb_batch(arguments):
+    return read_segb_batch(*arguments)
+
+
+def get_stream_files(files_found):
+    """
+    Returns the SEGB files among the files found for a Biome stream, as str, in the order
+    given: hidden files, folders and the files of the tombstone folders are left out.
+    """
+    stream_files = []
+    for file_found in map(str, files_found):
+        if os.path.basename(file_found).startswith('.'):
+            continue
+        if not os.path.isfile(file_found) or 'tombstone' in file_found:
+            continue
+        stream_files.append(file_found)
+    return stream_files
+
+
+def read_biome_batches(files_found, typedef=None, workers=None):
+    """
+    Reads the SEGB files among the files found for a Biome stream (see get_stream_files())
+    and yields a SegbBatch per file, in the order given, so that only the batches being
+    read are held in memory. If a typedef is given, the payloads of the written records
+    are decoded against it.
+    """
+    stream_files = get_stream_files(files_found)
+    workers = min(workers or _workers, len(stream_files))
+    if workers > 1 and sum(os.path.getsize(file_path) for file_path in stream_files) >= BIOME_PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(_read_segb_batch, [(file_path, typedef) for file_path in stream_files],
+                                    chunksize=max(1, len(stream_files) // (workers * 4)))
+        return
+    for file_path in stream_files:
+        yield read_segb_batch(file_path, typedef)
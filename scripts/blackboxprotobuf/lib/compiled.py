@@ -0,0 +1,240 @@
+"""LEAPP addition: typedefs compiled once for decode_message() and decode_messages().
+
+length_delim.decode_message() walks its typedef for every message: it deep copies
+it, converts each field number it reads to a string to look it up, then builds and
+checks the typedef of every field again. Artifacts decode thousands to millions of
+messages against the same typedef, so most of the time goes into that walk.
+
+CompiledTypedef walks a typedef once instead, into a table from the tag of each typed
+field (field number and wire type, as read from the buffer) to its decoder, nested
+message typedefs included. Fields the typedef lacks are decoded the way decode_message()
+decodes them, guessing included. decode() only takes the cases it reproduces exactly.
+For anything else (groups, packed or named fields that repeat, a field of another wire
+type than its typedef, a nested message that does not decode against its typedef) and
+for any error, it decodes the buffer again with length_delim.decode_message(). The
+values, the typedef returned and the exception raised are always those of
+decode_message().
+
+Compiled typedefs are cached by identity, so a typedef must not be changed once it
+has been used.
+"""
+
+import copy
+
+from google.protobuf.internal import decoder, wire_format
+
+from scripts.blackboxprotobuf.lib.types import decoders, length_delim, varint, wiretypes
+
+CACHE_SIZE = 256
+
+_SIMPLE = 0
+_MESSAGE = 1
+
+# The types decode_message() gives the fields the typedef lacks, by wire type
+_DEFAULT_TYPES = {
+    wire_format.WIRETYPE_VARINT: 'int',
+    wire_format.WIRETYPE_FIXED64: 'fixed64',
+    wire_format.WIRETYPE_FIXED32: 'fixed32',
+}
+
+_decode_varint = decoder._DecodeVarint  # pylint: disable=protected-access
+
+_cache = {}
+
+
+# Decoders for the most common types that read a one byte varint inline, and leave
+# longer ones to the decoder of the type
+def _decode_int(buf, pos):
+    value = buf[pos]
+    if value & 0x80:
+        return varint.decode_varint(buf, pos)
+    return value, pos + 1
+
+
+def _decode_uint(buf, pos):
+    value = buf[pos]
+    if value & 0x80:
+        return varint.decode_uvarint(buf, pos)
+    return value, pos + 1
+
+
+def _decode_bytes(buf, pos):
+    length = buf[pos]
+    if length & 0x80:
+        return length_delim.decode_bytes(buf, pos)
+    pos += 1
+    return buf[pos:pos + length], pos + length
+
+
+def _decode_str(buf, pos):
+    length = buf[pos]
+    if length & 0x80:
+        return length_delim.decode_str(buf, pos)
+    pos += 1
+    return buf[pos:pos + length].decode('utf-8', 'backslashreplace'), pos + length
+
+
+_decoders = dict(decoders, int=_decode_int, uint=_decode_uint, bytes=_decode_bytes, str=_decode_str)
+
+
+class _Unsupported(Exception):
+    """Raised for a case left to length_delim.decode_message()"""
+
+
+class CompiledTypedef:
+    """
+    The decoders of the typed fields of a typedef, by tag.
+    Attributes:
+        typedef (dict): The typedef compiled.
+        fields (dict): (field number, output key, kind, decoder, CompiledTypedef of a
+            nested message) by tag.
+        known (set): The field numbers the typedef has, compiled or not.
+        template (dict): A copy of the typedef, copied again for the typedef returned.
+    """
+    __slots__ = ('typedef', 'fields', 'known', 'template')
+
+    def __init__(self, typedef):
+        self.typedef = typedef
+        self.template = copy.deepcopy(typedef)
+        self.fields = {}
+        self.known = set()
+        for field_number, field_typedef in typedef.items():
+            # decode_message() looks fields up by str(number), other keys never match
+            if not isinstance(field_number, str) or not field_number.isdigit() \
+                    or str(int(field_number)) != field_number:
+                continue
+            number = int(field_number)
+            self.known.add(number)
+            if not isinstance(field_typedef, dict):
+                continue
+            field_type = field_typedef.get('type')
+            name = field_typedef.get('name', '')
+            key = name if name != '' else field_number
+            if field_type in decoders:
+                self.fields[number << 3 | wiretypes[field_type]] = (
+                    field_number, key, _SIMPLE, _decoders[field_type], None)
+            elif field_type == 'message' and isinstance(field_typedef.get('message_typedef'), dict):
+                self.fields[number << 3 | wire_format.WIRETYPE_LENGTH_DELIMITED] = (
+                    field_number, key, _MESSAGE, None, CompiledTypedef(field_typedef['message_typedef']))
+
+
+_EMPTY = CompiledTypedef({})
+
+
+def compile_typedef(typedef):
+    """Returns the CompiledTypedef of a typedef, compiled on first use"""
+    if not typedef:
+        return _EMPTY
+    compiled = _cache.get(id(typedef))
+    if compiled is None or compiled.typedef is not typedef:
+        if len(_cache) >= CACHE_SIZE:
+            _cache.clear()
+        compiled = _cache[id(typedef)] = CompiledTypedef(typedef)
+    return compiled
+
+
+def _copy_typedef(value):
+    if isinstance(value, dict):
+        return {key: _copy_typedef(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_typedef(item) for item in value]
+    return value
+
+
+def _decode(buf, compiled, pos, end, with_typedef):
+    """
+    Decodes a message the way length_delim.decode_message() does.
+    Returns (values, typedef or None, position, whether the typedef was extended).
+    """
+    length_delim._work_count += 1  # pylint: disable=protected-access  # the guessing budget counts every message
+    fields = compiled.fields
+    output = {}
+    seen = {}  # the typed fields read: field number -> (typedef of the nested message, whether extended)
+    discovered = {}  # the fields the typedef lacks: field number -> their typedef
+    extended = False
+    while pos < end:
+        tag = buf[pos]
+        if tag & 0x80:
+            tag, pos = _decode_varint(buf, pos)
+        else:
+            pos += 1
+        field = fields.get(tag)
+        if field is not None:
+            number, key, kind, field_decoder, inner = field
+            if kind == _SIMPLE:
+                value, pos = field_decoder(buf, pos)
+                seen[number] = (None, False)
+            else:
+                if seen.get(number, (None, False))[1]:
+                    # decode_message() decodes it against the typedef the previous one extended
+                    raise _Unsupported()
+                length, pos = _decode_int(buf, pos)
+                value, inner_typedef, pos, inner_extended = _decode(buf, inner, pos, pos + length, with_typedef)
+                seen[number] = (inner_typedef, inner_extended)
+                extended = extended or inner_extended
+        else:
+            field_number, wire_type = tag >> 3, tag & 7
+            if field_number in compiled.known:
+                raise _Unsupported()
+            number = key = str(field_number)
+            field_typedef = discovered.get(number)
+            if field_typedef is None:
+                if wire_type == wire_format.WIRETYPE_LENGTH_DELIMITED:
+                    out, field_type = length_delim.decode_guess(buf, pos)
+                    if field_type == 'message':
+                        value, message_typedef, pos = out
+                        field_typedef = {'type': 'message', 'message_typedef': message_typedef, 'name': ''}
+                    else:
+                        value, pos = out
+                        field_typedef = {'type': 'bytes', 'name': ''}
+                elif wire_type in _DEFAULT_TYPES:
+                    value, pos = _decoders[_DEFAULT_TYPES[wire_type]](buf, pos)
+                    field_typedef = {'type': _DEFAULT_TYPES[wire_type], 'name': ''}
+                else:
+                    raise _Unsupported()
+                discovered[number] = field_typedef
+                extended = True
+            else:
+                # decode_message() reads it against the type it found the first time
+                field_type = field_typedef['type']
+                if field_type == 'message' or wiretypes[field_type] != wire_type:
+                    raise _Unsupported()
+                value, pos = _decoders[field_type](buf, pos)
+
+        if key in output:
+            if key != number or isinstance(value, list):
+                raise _Unsupported()
+            if isinstance(output[key], list):
+                output[key].append(value)
+            else:
+                output[key] = [output[key], value]
+        else:
+            output[key] = value
+    if pos > end:
+        raise _Unsupported()
+
+    if not with_typedef:
+        return output, None, pos, extended
+    typedef = _copy_typedef(compiled.template)
+    for number, (inner_typedef, _) in seen.items():
+        field_typedef = typedef[number]
+        if inner_typedef is not None:
+            field_typedef['message_typedef'] = inner_typedef
+        field_typedef.setdefault('name', '')
+    typedef.update(discovered)
+    return output, typedef, pos, extended
+
+
+def decode(buf, typedef, with_typedef=True):
+    """
+    Decodes a message against a typedef. Returns (values, typedef) as
+    length_delim.decode_message() does, the typedef None unless with_typedef.
+    """
+    try:
+        values, typedef_out, _, _ = _decode(buf, compile_typedef(typedef), 0, len(buf), with_typedef)
+        return values, typedef_out
+    except Exception:  # pylint: disable=broad-exception-caught
+        pass  # decode_message() raises it again, outside of this handler
+    length_delim.reset_guess_budget()
+    values, typedef_out, _ = length_delim.decode_message(buf, typedef)
+    return values, typedef_out
@@ -1,8 +1,10 @@
 # pylint: skip-file
-# Vendored third-party code (blackboxprotobuf 1.0.1) - kept as released.
+# Vendored third-party code (blackboxprotobuf 1.0.1) - kept as released,
+# except for the LEAPP additions marked below.
 """Methods for easy encoding and decoding of messages"""
 
 import json
+import scripts.blackboxprotobuf.lib.compiled
 import scripts.blackboxprotobuf.lib.types.length_delim
 import scripts.blackboxprotobuf.lib.types.type_maps
 
@@ -65,8 +67,37 @@ def decode_message(buf, message_type=None):
     # (see the note above decode_guess in types/length_delim.py).
     scripts.blackboxprotobuf.lib.types.length_delim.reset_guess_budget()
 
-    value, typedef, _ = scripts.blackboxprotobuf.lib.types.length_delim.decode_message(buf, message_type)
-    return value, typedef
+    # LEAPP addition: the typedef is compiled once and reused (see lib/compiled.py)
+    return scripts.blackboxprotobuf.lib.compiled.decode(buf, message_type)
+
+def decode_messages(buffers, message_type=None, errors=None):
+    """LEAPP addition: decode a list of messages against the same message type.
+    Returns the list of values, as decode_message returns them, without the types.
+    If errors is a list, it gets the exception each message raised (None if it
+    did not) and the value of a message that raised is None. Otherwise the
+    first exception is raised.
+    """
+    if message_type is None or isinstance(message_type, str):
+        if message_type not in known_messages:
+            message_type = {}
+        else:
+            message_type = known_messages[message_type]
+
+    values = []
+    for buf in buffers:
+        scripts.blackboxprotobuf.lib.types.length_delim.reset_guess_budget()
+        try:
+            value, _ = scripts.blackboxprotobuf.lib.compiled.decode(buf, message_type, with_typedef=False)
+        except Exception as exc:
+            if errors is None:
+                raise
+            errors.append(exc)
+            values.append(None)
+        else:
+            if errors is not None:
+                errors.append(None)
+            values.append(value)
+    return values
 
 #TODO add explicit validation of values to message type
 def encode_message(value, message_type):
@@ -0,0 +1,199 @@
+"""
+Indexes of an evidence source kept between runs.
+
+Examiners often process the same extraction several times, with different profiles or
+after an update. With --evidence_index, what a seeker learns about the evidence on its
+first run is saved in the LEAPP shared directory and loaded on the next run instead of
+being read from the evidence again.
+
+Each evidence source gets its own SQLite database, named after its identity: the
+absolute path, size and modification time of the evidence. An evidence file that is
+replaced or modified gets a new identity, so a stale index is never used, and the old
+one is simply left unused. A folder has no meaningful size and its modification time
+only changes with its direct entries, so the identity of a folder also covers the names
+and modification times of its direct entries. A change deeper in a folder that is still
+being added to is not noticed; evidence is expected to stay as it was acquired.
+
+Tables:
+    files: the file listing of a folder or an iTunes backup, with the size,
+        modification and creation time of each file, and a reference to where the
+        file is stored for seekers that need one (the hashed name in an iTunes
+        backup)
+    tar_members: the member headers of a tar archive, with their offsets in the
+        uncompressed archive, so that FileSeekerTar does not have to read through the
+        whole archive, inflating it if it is gzipped, just to list it
+"""
+
+import hashlib
+import os
+import sqlite3
+import tarfile
+
+from collections import namedtuple
+
+from leapp_functions.app import history
+
+INDEX_FOLDER_NAME = 'evidence_index'
+SCHEMA_VERSION = 2
+
+IndexedFile = namedtuple('IndexedFile', ['path', 'size', 'mtime', 'ctime', 'ref'])
+
+
+def get_index_folder():
+    """Returns the folder of the evidence indexes in the LEAPP shared directory."""
+    return str(history.get_shared_directory() / INDEX_FOLDER_NAME)
+
+
+def evidence_identity(evidence_path):
+    """
+    Identifies an evidence source by its absolute path, size and modification time.
+    Args:
+        evidence_path (str): The path to the evidence file or folder.
+    Returns:
+        str: A hex digest that changes whenever the evidence does.
+    """
+    evidence_path = os.path.abspath(evidence_path)
+    stat = os.stat(evidence_path)
+    hasher = hashlib.sha1(f'{evidence_path}|{stat.st_size}|{stat.st_mtime_ns}'.encode('utf-8', 'surrogateescape'))
+    if os.path.isdir(evidence_path):
+        with os.scandir(evidence_path) as entries:
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                entry_mtime = entry.stat(follow_symlinks=False).st_mtime_ns
+                hasher.update(f'|{entry.name}|{entry_mtime}'.encode('utf-8', 'surrogateescape'))
+    return hasher.hexdigest()
+
+
+def get_index_path(evidence_path, index_folder, suffix='.db'):
+    """
+    Returns the path of an index file for an evidence source.
+    Args:
+        evidence_path (str): The path to the evidence file or folder.
+        index_folder (str): The folder holding the indexes.
+        suffix (str): The extension of the index file.
+    """
+    return os.path.join(index_folder, evidence_identity(evidence_path) + suffix)
+
+
+def _connect(index_path):
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    db = sqlite3.connect(index_path)
+    if db.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+        db.execute('DROP TABLE IF EXISTS files')
+        db.execute('DROP TABLE IF EXISTS tar_members')
+        db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT, size INTEGER, mtime NUMERIC, ctime NUMERIC, ref TEXT)''')
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS tar_members (
+            name TEXT, type BLOB, size INTEGER, mtime NUMERIC, mode INTEGER, linkname TEXT,
+            offset INTEGER, offset_data INTEGER)''')
+    return db
+
+
+def _read(evidence_path, index_folder, query, parameters=()):
+    """Runs a query on the index of an evidence source. Returns None if it is not indexed."""
+    index_path = get_index_path(evidence_path, index_folder)
+    if not os.path.isfile(index_path):
+        return None
+    try:
+        db = _connect(index_path)
+        try:
+            return db.execute(query, parameters).fetchall()
+        finally:
+            db.close()
+    except sqlite3.Error:
+        return None
+
+
+def _write(evidence_path, index_folder, table, rows):
+    """Replaces the rows of a table in the index of an evidence source."""
+    index_path = get_index_path(evidence_path, index_folder)
+    try:
+        db = _connect(index_path)
+        try:
+            with db:
+                db.execute(f'DELETE FROM {table}')
+                db.executemany(f'INSERT INTO {table} VALUES ({", ".join("?" * len(rows[0]))})', rows)
+        finally:
+            db.close()
+    except (OSError, sqlite3.Error):
+        return False
+    return True
+
+
+def load_files(evidence_path, index_folder):
+    """
+    Loads the file listing of an evidence source saved by save_files().
+    Args:
+        evidence_path (str): The path to the evidence folder.
+        index_folder (str): The folder holding the indexes.
+    Returns:
+        list: An IndexedFile for each file in listing order, or None if not indexed.
+    """
+    rows = _read(evidence_path, index_folder, 'SELECT path, size, mtime, ctime, ref FROM files ORDER BY rowid')
+    if not rows:
+        return None
+    return [IndexedFile._make(row) for row in rows]
+
+
+def save_files(evidence_path, index_folder, files):
+    """
+    Saves the file listing of an evidence source for the next run.
+    Args:
+        evidence_path (str): The path to the evidence folder.
+        index_folder (str): The folder holding the indexes.
+        files (list): An IndexedFile, or a tuple in the same order, for each file.
+    Returns:
+        bool: True if the listing was saved.
+    """
+    if not files:
+        return False
+    return _write(evidence_path, index_folder, 'files', files)
+
+
+def load_tar_members(evidence_path, index_folder):
+    """
+    Loads the member headers of a tar archive saved by save_tar_members().
+    Args:
+        evidence_path (str): The path to the tar archive.
+        index_folder (str): The folder holding the indexes.
+    Returns:
+        list: The tarfile.TarInfo of each member in archive order, or None if not indexed.
+    """
+    rows = _read(evidence_path, index_folder, '''
+        SELECT name, type, size, mtime, mode, linkname, offset, offset_data
+        FROM tar_members ORDER BY rowid''')
+    if not rows:
+        return None
+    members = []
+    for name, member_type, size, mtime, mode, linkname, offset, offset_data in rows:
+        member = tarfile.TarInfo(name)
+        member.type = member_type
+        member.size = size
+        member.mtime = mtime
+        member.mode = mode
+        member.linkname = linkname
+        member.offset = offset
+        member.offset_data = offset_data
+        members.append(member)
+    return members
+
+
+def save_tar_members(evidence_path, index_folder, members):
+    """
+    Saves the member headers of a tar archive for the next run.
+    Archives with sparse members are not indexed, their data map is not kept.
+    Args:
+        evidence_path (str): The path to the tar archive.
+        index_folder (str): The folder holding the indexes.
+        members (list): The tarfile.TarInfo of each member in archive order.
+    Returns:
+        bool: True if the members were saved.
+    """
+    if not members or any(member.sparse is not None for member in members):
+        return False
+    return _write(evidence_path, index_folder, 'tar_members', [
+        (member.name, member.type, member.size, member.mtime, member.mode,
+         member.linkname, member.offset, member.offset_data)
+        for member in members])
@@ -0,0 +1,162 @@
+"""
+On-disk store for archive members extracted on demand.
+
+With --lazy_extraction, FileSeekerZip and FileSeekerTar return the paths their matches
+would be extracted to without writing them, and a member is only extracted when an
+artifact first reads it (see FileSeekerArchive.materialize()). Each extracted member is
+written once to this store, named after its content, and the path in the data folder is
+a hard link to it:
+    - members with the same content, common for thumbnails and attachments that are
+      sent more than once, take the disk space of one
+    - a member read again after its data folder copy was evicted is linked back from
+      the store instead of being extracted again, if the store still has it
+
+The store is capped in size. When it grows past the cap, the least recently used members
+are evicted: the store copy and the data folder links are deleted and the members go back
+to waiting for their next read. Members extracted for the artifact that is running are
+pinned, so an artifact never loses a file it is reading, and members extracted for an
+artifact that reads files directly are never evicted. Each process of a run keeps its own
+count of the store size, so with --workers the cap is split evenly between the main process
+and the workers (see FileSeekerBase.share_extraction_cache()).
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+from collections import OrderedDict
+
+CACHE_FOLDER_NAME = '_extraction_cache'
+DEFAULT_MAX_SIZE = 4 * 1024 * 1024 * 1024
+_CHUNK_SIZE = 1024 * 1024
+
+
+class ExtractionCache:
+    """
+    Content-addressed store of extracted archive members with a size cap and LRU eviction.
+    Attributes:
+        folder (str): The folder holding the stored members.
+        max_size (int): The size in bytes the store is kept under, pinned members aside.
+        size (int): The size in bytes of the stored members.
+    Methods:
+        link(key, target_path, evictable): Links a stored member to target_path, if it is stored.
+        store(source, target_path, evictable): Stores a member read from source and links it.
+        unpin(): Makes the evictable members stored or linked so far available for eviction.
+    """
+
+    def __init__(self, folder, max_size=DEFAULT_MAX_SIZE, on_evict=None):
+        """
+        Args:
+            folder (str): The folder holding the stored members, created if needed.
+            max_size (int): The size cap in bytes.
+            on_evict (callable): Called with each data folder path removed by an eviction.
+        """
+        self.folder = folder
+        self.max_size = max_size
+        self.size = 0
+        self._on_evict = on_evict
+        # key -> [blob path, size, data folder links], least recently used first
+        self._entries = OrderedDict()
+        self._pinned = set()
+        self._permanent = set()
+        os.makedirs(folder, exist_ok=True)
+
+    def _blob_path(self, key):
+        return os.path.join(self.folder, key[:2], key)
+
+    def link(self, key, target_path, evictable=True):
+        """
+        Links a stored member to target_path.
+        Args:
+            key (str): The content address of the member.
+            target_path (str): The data folder path of the member.
+            evictable (bool): False to keep the member for the rest of the run.
+        Returns:
+            bool: True if the member was stored and target_path now holds it.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            blob_path = self._blob_path(key)
+            if not os.path.isfile(blob_path):
+                return False
+            # Stored by another process of the run
+            entry = self._entries[key] = [blob_path, os.path.getsize(blob_path), set()]
+            self.size += entry[1]
+        self._link_blob(entry[0], target_path)
+        entry[2].add(target_path)
+        self._entries.move_to_end(key)
+        (self._pinned if evictable else self._permanent).add(key)
+        self._evict()
+        return True
+
+    def store(self, source, target_path, evictable=True):
+        """
+        Stores a member under the SHA-1 of its content and links it to target_path.
+        Args:
+            source: A binary file object the member is read from.
+            target_path (str): The data folder path of the member.
+            evictable (bool): False to keep the member for the rest of the run.
+        Returns:
+            str: The content address of the member.
+        """
+        hasher = hashlib.sha1()
+        fd, temp_path = tempfile.mkstemp(dir=self.folder, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                while True:
+                    chunk = source.read(_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    temp_file.write(chunk)
+            key = hasher.hexdigest()
+            if key in self._entries:
+                os.remove(temp_path)
+            else:
+                blob_path = self._blob_path(key)
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.replace(temp_path, blob_path)
+                self._entries[key] = [blob_path, os.path.getsize(blob_path), set()]
+                self.size += self._entries[key][1]
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.link(key, target_path, evictable)
+        return key
+
+    def unpin(self):
+        """Makes the evictable members stored or linked so far available for eviction."""
+        self._pinned.clear()
+        self._evict()
+
+    @staticmethod
+    def _link_blob(blob_path, target_path):
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        if os.path.lexists(target_path):
+            os.remove(target_path)
+        try:
+            os.link(blob_path, target_path)
+        except OSError:
+            shutil.copyfile(blob_path, target_path)
+
+    def _evict(self):
+        for key in list(self._entries):
+            if self.size <= self.max_size:
+                break
+            if key in self._pinned or key in self._permanent:
+                continue
+            blob_path, size, links = self._entries.pop(key)
+            self.size -= size
+            for target_path in links:
+                try:
+                    os.remove(target_path)
+                except OSError:
+                    continue  # still open elsewhere; it just stays on disk
+                if self._on_evict:
+                    self._on_evict(target_path)
+            try:
+                os.remove(blob_path)
+            except OSError:
+                pass
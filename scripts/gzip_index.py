@@ -0,0 +1,218 @@
+"""
+Random access to the uncompressed content of a gzip file.
+
+gzip has no random access of its own: a reader that wants the byte at some offset has to
+inflate everything before it. tarfile opens a .tar.gz through gzip.GzipFile, which
+rewinds to the start of the file on every backward seek, so extracting the members an
+artifact matched after a search had already passed them means inflating the archive
+from the beginning again, once per search on a full file system extraction.
+
+GzipIndexedReader keeps a checkpoint of the inflate state every DEFAULT_SPACING bytes of
+uncompressed data while it reads, the approach of zlib's zran.c example. A seek resumes
+inflating from the nearest checkpoint at or before its target instead of from the start,
+so the cost of a seek is bounded by the spacing rather than by the size of the archive.
+
+zlib cannot save an inflate state to disk, so these checkpoints only live as long as the
+reader. When the indexed_gzip package is installed, open_indexed_gzip() uses it instead
+and saves its index next to the member index of scripts/evidence_index.py, so a second
+run on the same evidence can seek without inflating anything first.
+"""
+
+import io
+import os
+import zlib
+
+from bisect import bisect_right
+
+try:
+    import indexed_gzip
+except ImportError:
+    indexed_gzip = None
+
+DEFAULT_SPACING = 32 * 1024 * 1024
+_READ_SIZE = 256 * 1024
+_MAX_OUTPUT = 1024 * 1024
+
+
+class _Checkpoint:
+    """Inflate state at an uncompressed offset, and the compressed offset its input resumes at."""
+    __slots__ = ('offset', 'compressed_offset', 'decompressor')
+
+    def __init__(self, offset, compressed_offset, decompressor):
+        self.offset = offset
+        self.compressed_offset = compressed_offset
+        self.decompressor = decompressor
+
+
+class GzipIndexedReader(io.RawIOBase):
+    """
+    Seekable read-only file object over the uncompressed content of a gzip file.
+    Attributes:
+        path (str): The path to the gzip file.
+        spacing (int): The number of uncompressed bytes between two checkpoints.
+    Methods:
+        read(size): Reads up to size bytes from the current position.
+        seek(offset, whence): Moves to an uncompressed offset, resuming from a checkpoint.
+        tell(): Returns the current uncompressed offset.
+        reopen(): Opens the file again, in a process forked after it was opened.
+    """
+
+    def __init__(self, path, spacing=DEFAULT_SPACING):
+        super().__init__()
+        self.path = path
+        self.spacing = spacing
+        self._file = open(path, 'rb')
+        self._checkpoints = [_Checkpoint(0, 0, None)]
+        self._offsets = [0]
+        self._size = None
+        self._restore(self._checkpoints[0])
+
+    def __getstate__(self):
+        raise TypeError(f'cannot pickle {self.__class__.__name__}; reopen {self.path} instead')
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+    def reopen(self):
+        """
+        Opens a handle of its own on the file, keeping the checkpoints and the position. A
+        process forked after the reader was opened calls it, since the inherited handle
+        shares its offset with the parent process.
+        """
+        position = self._position
+        self._file = open(self.path, 'rb')
+        self._restore(self._checkpoints[bisect_right(self._offsets, position) - 1])
+        self._skip_to(position)
+
+    def _restore(self, checkpoint):
+        self._decompressor = checkpoint.decompressor.copy() if checkpoint.decompressor else None
+        self._file.seek(checkpoint.compressed_offset)
+        self._pending = b''
+        self._position = checkpoint.offset
+        self._output = b''
+        self._output_offset = checkpoint.offset
+
+    def _inflate(self):
+        """Inflates the next chunk into self._output. Returns False at the end of the file."""
+        while True:
+            if self._decompressor is not None and self._decompressor.eof:
+                # Concatenated gzip members, as written by pigz or by appending
+                self._pending = self._decompressor.unused_data
+                self._decompressor = None
+            if not self._pending:
+                self._pending = self._file.read(_READ_SIZE)
+                if not self._pending:
+                    if self._decompressor is not None:
+                        raise EOFError(f'{self.path} ends before the end of its gzip stream')
+                    self._size = self._output_offset
+                    return False
+            if self._decompressor is None:
+                # Zero padding after the last member is allowed, as in gzip.GzipFile
+                self._pending = self._pending.lstrip(b'\x00')
+                if not self._pending:
+                    continue
+                self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            data = self._decompressor.decompress(self._pending, _MAX_OUTPUT)
+            self._pending = self._decompressor.unconsumed_tail
+            if data:
+                self._output = data
+                self._output_offset += len(data)
+                self._add_checkpoint()
+                return True
+
+    def _add_checkpoint(self):
+        offset = self._output_offset
+        if offset - self._offsets[-1] < self.spacing:
+            return
+        # The input read but not inflated yet is read again from the file on a restore
+        if self._decompressor.eof:
+            unread = self._decompressor.unused_data
+            checkpoint = _Checkpoint(offset, self._file.tell() - len(unread), None)
+        else:
+            checkpoint = _Checkpoint(offset, self._file.tell() - len(self._pending), self._decompressor.copy())
+        self._checkpoints.append(checkpoint)
+        self._offsets.append(offset)
+
+    def readinto(self, buffer):
+        view = memoryview(buffer).cast('B')
+        written = 0
+        while written < len(view):
+            available = self._output_offset - self._position
+            if available <= 0:
+                if not self._inflate():
+                    break
+                continue
+            start = len(self._output) - available
+            count = min(available, len(view) - written)
+            view[written:written + count] = self._output[start:start + count]
+            written += count
+            self._position += count
+        return written
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            if self._size is None:
+                self._skip_to(float('inf'))
+            offset += self._size
+        elif whence != io.SEEK_SET:
+            raise ValueError(f'invalid whence ({whence})')
+        if offset < 0:
+            raise ValueError(f'negative seek position {offset}')
+        output_start = self._output_offset - len(self._output)
+        if offset < output_start or offset > self._position + self.spacing:
+            checkpoint = self._checkpoints[bisect_right(self._offsets, offset) - 1]
+            if offset < output_start or checkpoint.offset > self._output_offset:
+                self._restore(checkpoint)
+        self._skip_to(offset)
+        return self._position
+
+    def _skip_to(self, offset):
+        while self._output_offset < offset:
+            if not self._inflate():
+                break
+        self._position = min(offset, self._output_offset)
+
+
+def open_indexed_gzip(path, index_path=None, spacing=DEFAULT_SPACING):
+    """
+    Opens a gzip file for random access.
+    Args:
+        path (str): The path to the gzip file.
+        index_path (str): Where indexed_gzip keeps its seek points between runs, if installed.
+        spacing (int): The number of uncompressed bytes between two seek points.
+    Returns:
+        A seekable binary file object over the uncompressed content.
+    """
+    if indexed_gzip is None:
+        return GzipIndexedReader(path, spacing)
+    if index_path and os.path.isfile(index_path):
+        return indexed_gzip.IndexedGzipFile(path, spacing=spacing, index_file=index_path)
+    return indexed_gzip.IndexedGzipFile(path, spacing=spacing)
+
+
+def save_gzip_index(reader, index_path):
+    """
+    Saves the seek points of a reader opened by open_indexed_gzip() for the next run.
+    Only indexed_gzip can do this; a GzipIndexedReader is left as it is.
+    Args:
+        reader: The file object returned by open_indexed_gzip().
+        index_path (str): The path to save the seek points to.
+    """
+    if indexed_gzip is None or not isinstance(reader, indexed_gzip.IndexedGzipFile):
+        return
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    reader.build_full_index()
+    reader.export_index(index_path)
@@ -52,9 +52,11 @@ body_sidebar_setup = \
                 <div class="sidebar-sticky" id="sidebar_id">
                     <ul class="nav flex-column">
 """
-# The 'active' class must be set only for the current page, it will highlight that entry in blue
+# The sidebar entries are written once for the whole report, in _elements/sidebar_data.js,
+# which every page loads here. The script also sets the 'active' class on the entry of
+# the current page, which highlights it in blue
 #   class="nav-link active"
-body_sidebar_dynamic_data_placeholder = '<!--__INSERT-NAV-BAR-DATA-HERE__-->'
+body_sidebar_data_script = '<script src="_elements/sidebar_data.js"></script>'
 body_sidebar_trailer = \
 """
                     </ul>
@@ -249,6 +251,24 @@ nav_bar_script = \
     </script>
 """
 
+# Written in the sidebar of every page, after the sidebar entries
+body_sidebar_data = body_sidebar_data_script + nav_bar_script
+
+# Variable {nav_list_data}, the sidebar entries as a JavaScript string literal
+sidebar_data_js = \
+"""// The sidebar entries of the report, shared by all its pages
+(function () {{
+    var sidebar = document.currentScript.parentNode;
+    sidebar.insertAdjacentHTML('beforeend', {0});
+    // The later pages of a paged artifact report highlight their first page
+    var page = decodeURIComponent(window.location.pathname.split('/').pop()).replace(/__page\\d+\\.html$/, '.html');
+    sidebar.querySelectorAll('a.nav-link').forEach(function (link) {{
+        if (link.getAttribute('href') === (page || 'index.html'))
+            link.classList.add('active');
+    }});
+}})();
+"""
+
 nav_bar_script_footer = \
 """
     <script>
@@ -269,7 +289,7 @@ default_responsive_table_script = \
 """
     <script>
         $(document).ready(function() {
-            $('.table').DataTable({
+            $('.table').not('.table-sharded').DataTable({
                 //"scrollY": "60vh",
                 //"scrollX": "10%",
                 //"scrollCollapse": true,
@@ -282,6 +302,12 @@ default_responsive_table_script = \
     </script>
 """
 
+# Renders the tables written in shards beside the page by write_table_shards()
+sharded_table_script = \
+"""
+    <script type="text/javascript" src="_elements/sharded_table.js"></script>
+"""
+
 page_footer = \
 """
     </body>
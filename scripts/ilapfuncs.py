@@ -1,4 +1,5 @@
 # common standard imports
+import atexit
 import codecs  # pylint: disable=unused-import  # re-exported
 import contextlib
 import csv
@@ -11,12 +12,17 @@ import math
 import nska_deserialize
 import os
 import plistlib
+import queue
 import re  # pylint: disable=unused-import  # re-exported for modules importing it from here
 import shutil
 import sqlite3
 import sys
+import threading
+import weakref
+from time import monotonic
 import xml
 
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
 from functools import lru_cache
 from pathlib import Path
@@ -52,7 +58,7 @@ _console_write = sys.stdout.write
 # common third party imports
 import pytz
 import simplekml
-from scripts.filetype import guess_mime, guess_extension
+from scripts.filetype import guess_mime, guess_extension, get_signature_bytes
 from functools import wraps
 
 # LEAPP version unique imports
@@ -60,9 +66,10 @@ import binascii
 from PIL import Image
 
 from scripts.html_safe import esc, safe_local_path
-from scripts.lavafuncs import lava_process_artifact, lava_insert_sqlite_data, lava_get_media_item, \
-    lava_insert_sqlite_media_item, lava_insert_sqlite_media_references, lava_get_media_references, \
-    lava_get_full_media_info, lava_update_record_count
+from scripts.lavafuncs import lava_process_artifact, lava_insert_sqlite_data, lava_has_media_item, \
+    lava_insert_sqlite_media_item, lava_insert_sqlite_media_references, lava_has_media_reference, \
+    lava_get_full_media_infos, lava_update_record_count
+from scripts.lavafuncs import lava_get_full_media_info  # pylint: disable=unused-import  # re-exported
 
 os.path.basename = lru_cache(maxsize=None)(os.path.basename)
 
@@ -94,6 +101,10 @@ class OutputParameters:
     # static parameters
     nl = '\n'
     screen_output_file_path = ''
+    # Set in worker processes only (see scripts/artifact_pool.py). The timeline and KML
+    # location databases are shared by every artifact, so a worker writes its rows to a
+    # private copy here and the main process merges them in artifact order.
+    staging_folder = ''
 
     def __init__(self, output_folder, custom_folder_name=None):
         self.output_folder_base = get_output_folder_base(output_folder, custom_folder_name)
@@ -159,20 +170,138 @@ class MediaReferences():
         self.name = media_ref_info[4]
 
 
+# The lines logfunc() has not yet handed to the writer thread wait in a queue of this size
+SCREEN_LOG_QUEUE_SIZE = 4096
+# How often per second the log pane of the GUI is redrawn at most
+GUI_LOG_FRAMES_PER_SECOND = 10
+
+
+class _ScreenLog:
+    '''
+    Appends the lines of logfunc() to the screen output file from a background thread.
+    The file is held open across messages and flushed whenever the queue is empty.
+    '''
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+
+    def write(self, path, text):
+        with self._lock:
+            if self._thread is None:
+                self._queue = queue.Queue(SCREEN_LOG_QUEUE_SIZE)
+                self._thread = threading.Thread(target=self._run, args=(self._queue,), name='screen-log',
+                                                daemon=True)
+                self._thread.start()
+            self._queue.put((path, text))
+
+    def flush(self):
+        '''Waits until every line logged so far is written and flushed to its file'''
+        log_queue = self._queue
+        if log_queue is not None:
+            log_queue.join()
+
+    def close(self):
+        '''Flushes and closes the file, the next line logged starts a new writer thread'''
+        with self._lock:
+            thread, log_queue = self._thread, self._queue
+            self._thread = self._queue = None
+        if thread is not None:
+            log_queue.put((None, None))
+            thread.join()
+
+    @staticmethod
+    def _run(log_queue):
+        handle = None
+        handle_path = None
+        while True:
+            path, text = log_queue.get()
+            try:
+                if path is None:
+                    break
+                if path != handle_path:
+                    if handle is not None:
+                        handle.close()
+                        handle = None
+                    handle_path = None
+                    handle = open(path, 'a', encoding='utf8')  # pylint: disable=consider-using-with
+                    handle_path = path
+                handle.write(text)
+                if log_queue.empty():
+                    handle.flush()
+            except OSError as ex:
+                _console_write(f'Could not write the log to {path}: {ex}\n')
+            finally:
+                log_queue.task_done()
+        if handle is not None:
+            handle.close()
+
+
+_screen_log = _ScreenLog()
+atexit.register(_screen_log.close)
+_cleanups = []
+
+
+def register_cleanup(function):
+    '''
+    Registers a function removing what a module keeps on disk for the run. It runs at
+    exit, and after each task of a worker process of the artifact pool, since worker
+    processes exit without running atexit.
+    '''
+    _cleanups.append(function)
+    atexit.register(function)
+    return function
+
+
+def run_cleanups():
+    '''Runs the functions registered with register_cleanup()'''
+    for function in _cleanups:
+        function()
+
+# A forked worker process starts without the writer thread of its parent
+os.register_at_fork(after_in_child=_screen_log._reset)  # pylint: disable=protected-access
+_gui_log_drawn = 0.0
+
+
+def _draw_gui_log(log_text, force=False):
+    # Lines logged within a frame of the last redraw are drawn by the next one, and
+    # crunch_artifacts forces one with flush_screen_log() before each artifact's work
+    global _gui_log_drawn  # pylint: disable=global-statement
+    now = monotonic()
+    if force or now - _gui_log_drawn >= 1 / GUI_LOG_FRAMES_PER_SECOND:
+        _gui_log_drawn = now
+        log_text.see('end')
+        log_text.update()
+
+
+def flush_screen_log():
+    '''Writes out every line logged so far, and redraws the log pane of the GUI'''
+    _screen_log.flush()
+    if GuiWindow.window_handle:
+        _draw_gui_log(GuiWindow.window_handle.nametowidget('logs_frame.log_text'), force=True)
+
+
+def close_screen_log():
+    '''Writes out every line logged so far and closes the screen output file'''
+    _screen_log.close()
+
+
 def logfunc(message=""):
     def redirect_logs(string):
         _console_write(string)
         log_text.insert('end', string)  # pylint: disable=used-before-assignment
-        log_text.see('end')
-        log_text.update()
+        _draw_gui_log(log_text)
 
     if GuiWindow.window_handle:
         log_text = GuiWindow.window_handle.nametowidget('logs_frame.log_text')
         sys.stdout.write = redirect_logs
 
     if OutputParameters.screen_output_file_path:
-        with open(OutputParameters.screen_output_file_path, 'a', encoding='utf8') as a:
-            a.write(message + '<br>' + OutputParameters.nl)
+        _screen_log.write(OutputParameters.screen_output_file_path, message + '<br>' + OutputParameters.nl)
     print(message)
 
 
@@ -247,11 +376,11 @@ def _check_in_media(media_id, source_path, is_embedded, name, media_data=None, c
     seeker = Context.get_seeker()
 
     media_ref_id = get_media_references_id(media_id, Context.get_artifact_name(), name)
-    if lava_get_media_references(media_ref_id):
+    if lava_has_media_reference(media_ref_id):
         return media_ref_id # Reference already exists, we're done.
 
     # If media item doesn't exist, create it.
-    if not lava_get_media_item(media_id):
+    if not lava_has_media_item(media_id):
         media_item = MediaItem(media_id)
 
         if force_type:
@@ -304,7 +433,11 @@ def _check_in_media(media_id, source_path, is_embedded, name, media_data=None, c
 
         # 1. Create the canonical media file
         canonical_media_path = Path(output_params.media_folder).joinpath(media_id).with_suffix(suffix)
-        if is_embedded:
+        if canonical_media_path.exists():
+            # The media id is derived from the content or source path, so an existing file
+            # is this same media, checked in by an artifact running in another process
+            pass
+        elif is_embedded:
             canonical_media_path.write_bytes(media_data)
         else:
             try:
@@ -352,8 +485,12 @@ def check_in_media(file_path, name="", converted_file_path=False, force_type=Non
     file_info = Context.get_seeker().file_infos.get(extraction_path)
     if file_info:
         media_id = hashlib.sha1(f"{file_info.source_path}".encode()).hexdigest()
-        with open(extraction_path, "rb") as f:
-            file_data = f.read()
+        media_ref_id = get_media_references_id(media_id, Context.get_artifact_name(), name)
+        if lava_has_media_reference(media_ref_id):
+            return media_ref_id  # Already checked in by this artifact, nothing to read
+        materialize_file(extraction_path)
+        # Only the header is read, to sniff the type; the file itself is linked, not copied
+        file_data = get_signature_bytes(extraction_path)
         return _check_in_media(media_id, file_path, False, name, media_data=file_data, converted_file_path=converted_file_path,
                                force_type=force_type, force_extension=force_extension,
                                force_creation_date=force_creation_date, force_modification_date=force_modification_date)
@@ -422,6 +559,15 @@ def get_data_list_with_media(media_header_info, data_list):
     # Get the correct output paths from the context
     output_params = Context.get_output_params()
 
+    # Resolve the media references of all the rows at once rather than one query per cell
+    media_infos = lava_get_full_media_infos(
+        ref_id
+        for data in data_list
+        for idx in media_header_info
+        if data[idx]
+        for ref_id in (data[idx] if isinstance(data[idx], list) else [data[idx]]))
+    linked_html_paths = set()
+
     for data in data_list:
         html_row = list(data)
         txt_row = list(data)
@@ -440,7 +586,7 @@ def get_data_list_with_media(media_header_info, data_list):
             media_ref_ids = media_ref_id_cell if isinstance(media_ref_id_cell, list) else [media_ref_id_cell]
 
             for ref_id in media_ref_ids:
-                media_item = lava_get_full_media_info(ref_id)
+                media_item = media_infos.get(ref_id)
                 if not (media_item and media_item['extraction_path']):
                     continue
 
@@ -450,10 +596,14 @@ def get_data_list_with_media(media_header_info, data_list):
                 # Construct the full, absolute path for the HTML link destination
                 html_path = os.path.join(output_params.html_media_folder, Path(canonical_path).name)
 
-                # Create the link/copy for the HTML report if it doesn't exist
-                if os.path.exists(canonical_path) and not os.path.exists(html_path):
+                # Create the link/copy for the HTML report if it doesn't exist. check_in_media()
+                # usually made it already, so try the link once per file rather than stat both
+                if html_path not in linked_html_paths:
+                    linked_html_paths.add(html_path)
                     try:
                         os.link(canonical_path, html_path)
+                    except (FileExistsError, FileNotFoundError):
+                        pass
                     except OSError:
                         shutil.copy2(canonical_path, html_path)
 
@@ -622,20 +772,23 @@ def _batched(iterable, size):
 
 
 def artifact_processor_streaming(func):
-    """LAVA-only artifact_processor for artifacts too large to hold in memory.
-
-    artifact_processor() needs a materialized data_list: it takes len() of it, hands it to
-    the HTML/TSV/timeline writers, and lava_insert_sqlite_data() then builds a second full
-    list of converted rows before executemany(). At roughly 617 bytes per row that is
-    ~19 GB for a 31M row Unified Log import, and ~39 GB at peak with both lists live.
-
-    A function decorated here returns an *iterator* of rows instead of a list, and the
-    rows are written to SQLite in batches as they arrive; peak memory stays flat at the
-    batch size regardless of how many records the artifact produces.
-
-    The trade-off is that nothing which needs the whole result set is available, so this
-    is restricted to lava_only artifacts: no HTML, TSV, timeline or KML output, and the
-    record count is known only once the stream ends.
+    """artifact_processor for artifacts too large to hold in memory.
+
+    artifact_processor() needs a materialized data_list: it takes len() of it, builds an
+    HTML and a TSV copy of it for media columns, hands it to the HTML/TSV/timeline
+    writers, and lava_insert_sqlite_data() then builds another full list of converted rows
+    before executemany(). At roughly 617 bytes per row that is ~19 GB for a 31M row
+    Unified Log import, and a multiple of that at peak with the copies live.
+
+    A function decorated here returns an *iterator* of rows instead of a list, and each
+    batch of rows is written to the HTML report, the TSV export, the timeline and LAVA
+    as it arrives; peak memory stays flat at the batch size regardless of how many
+    records the artifact produces. The HTML report is split into pages of HTML_PAGE_SIZE
+    rows (see PagedArtifactHtmlReport), so that a browser can still open it.
+
+    The trade-off is that nothing which needs the whole result set is available: there
+    is no KML output, simplekml builds the whole document in memory, and the record
+    count is known only once the stream ends. lava_only artifacts only write to LAVA.
     """
     @wraps(func)
     def wrapper(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -648,13 +801,13 @@ def artifact_processor_streaming(func):
 
         artifact_name = artifact_info.get('name', func_name)
         category = artifact_info.get('category', '')
+        description = artifact_info.get('description', '')
         icon = artifact_info.get('artifact_icon', '')
-        output_types = artifact_info.get('output_types', [])
+        output_types = artifact_info.get('output_types', ['html', 'tsv', 'timeline', 'lava'])
+        is_lava_only = 'lava_only' in output_types
 
-        if 'lava_only' not in output_types:
-            logfunc(f"{artifact_name} uses artifact_processor_streaming but is not declared "
-                    f"lava_only; no output will be produced")
-            return None, iter(()), None
+        if 'kml' in output_types:
+            logfunc(f"{artifact_name} uses artifact_processor_streaming, which does not produce KML output")
 
         Context.clear()
         Context.set_report_folder(report_folder)
@@ -678,8 +831,10 @@ def artifact_processor_streaming(func):
         # would read as "parsed, found nothing" rather than "did not run".
         first_batch = next(_batched(rows, STREAMING_BATCH_SIZE), None)
         if not first_batch:
-            logfunc(f"No data found for {artifact_name}")
-            lava_only_info(category, artifact_name, artifact_name, 0)
+            if output_types != 'none':
+                logfunc(f"No data found for {artifact_name}")
+                if is_lava_only:
+                    lava_only_info(category, artifact_name, artifact_name, 0)
             return data_headers, iter(()), source_path
 
         if source_path:
@@ -690,19 +845,45 @@ def artifact_processor_streaming(func):
         safe_category = sanitize_report_name(category, 'category')
         icons.setdefault(safe_category, {safe_artifact_name: icon}).update({safe_artifact_name: icon})
 
-        table_name, object_columns, column_map = lava_process_artifact(
-            category, module_name, artifact_name, data_headers,
-            record_count=0, func_name=func_name,
-            data_views=artifact_info.get("data_views"),
-            artifact_icon=icon, source_path=source_path)
+        stripped_headers = strip_tuple_from_headers(data_headers)
+        media_header_info = get_media_header_info(data_headers)
+        html_columns = list(artifact_info.get('html_columns', [])) + [data_headers[idx][0] for idx in media_header_info]
+
+        html_report = None
+        if check_output_types('html', output_types):
+            html_report = artifact_report.PagedArtifactHtmlReport(
+                artifact_name, report_folder, safe_artifact_name, description, stripped_headers,
+                source_path or '', html_no_escape=html_columns)
+
+        if check_output_types('lava', output_types):
+            table_name, object_columns, column_map = lava_process_artifact(
+                category, module_name, artifact_name, data_headers,
+                record_count=0, func_name=func_name,
+                data_views=artifact_info.get("data_views"),
+                artifact_icon=icon, source_path=source_path)
 
         record_count = 0
         for batch in itertools.chain([first_batch], _batched(rows, STREAMING_BATCH_SIZE)):
-            lava_insert_sqlite_data(table_name, batch, object_columns, data_headers, column_map)
+            if media_header_info:
+                html_batch, txt_batch = get_data_list_with_media(media_header_info, batch)
+            else:
+                html_batch = txt_batch = batch
+            if html_report:
+                html_report.write_rows(html_batch)
+            if check_output_types('tsv', output_types):
+                tsv(report_folder, stripped_headers, txt_batch, safe_artifact_name, write_headers=not record_count)
+            if check_output_types('timeline', output_types):
+                timeline(report_folder, artifact_name, txt_batch, stripped_headers)
+            if check_output_types('lava', output_types):
+                lava_insert_sqlite_data(table_name, batch, object_columns, data_headers, column_map)
             record_count += len(batch)
 
-        lava_update_record_count(category, table_name, record_count)
-        lava_only_info(category, artifact_name, table_name, record_count)
+        if html_report:
+            html_report.close()
+        if check_output_types('lava', output_types):
+            lava_update_record_count(category, table_name, record_count)
+            if is_lava_only:
+                lava_only_info(category, artifact_name, table_name, record_count)
         logfunc(f"Found {record_count:,} {'records' if record_count > 1 else 'record'} for {artifact_name}")
 
         return data_headers, iter(()), source_path
@@ -748,6 +929,23 @@ def get_next_unused_name(path):
     return os.path.join(folder, new_name)
 
 
+def materialize_file(path):
+    """
+    Makes sure a file matched by the seeker is on disk before it is read. With
+    --lazy_extraction, the files of artifacts that declare "lazy_extraction" are only
+    extracted from the archive here, when first read (see FileSeekerArchive.materialize()).
+    Returns the path.
+    """
+    if path:
+        try:
+            seeker = Context.get_seeker()
+        except ValueError:
+            return path
+        materialize = getattr(seeker, 'materialize', None)
+        if materialize:
+            materialize(str(path))
+    return path
+
 def get_file_path(files_found, filename, skip=False):
     """Returns the path of the searched filename if exists or returns None"""
     try:
@@ -755,12 +953,13 @@ def get_file_path(files_found, filename, skip=False):
             if skip and skip in file_found:
                 continue
             if Path(file_found).match(filename):
-                return file_found
+                return materialize_file(file_found)
     except Exception as e:  # pylint: disable=broad-exception-caught
         logfunc(f"Error: {str(e)}")
     return None        
 
 def get_txt_file_content(file_path):
+    materialize_file(file_path)
     try:
         with open(file_path, "r", encoding="utf-8") as file:
             file_content = file.readlines()
@@ -787,12 +986,33 @@ def _deserialize_nska(data):
         return nska_deserialize.deserialize_plist_from_string(data)
 
 
+def _deserialize_parsed_nska(data, plist_content):
+    """Deserialize an NSKeyedArchiver plist that plistlib has parsed already.
+
+    nska_deserialize parses the plist again with plistlib before handing it to
+    ccl_bplist. For a binary plist without CF$UID strings, the object plistlib
+    returned is the one it would get, so it is passed straight to the step that
+    unpacks the archive. XML archives, which it converts to binary first, and
+    versions of nska_deserialize without that step go through the public call.
+    """
+    unpack_top_level = getattr(nska_deserialize, '_unpack_top_level', None)
+    if unpack_top_level is None or data[:6] != b'bplist' or b'CF$UID' in data:
+        return _deserialize_nska(data)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return unpack_top_level(io.BytesIO(data), plist_content)
+
+
+def _load_plist(data):
+    """Parse plist bytes once, deserializing NSKeyedArchiver plists. Raises as plistlib does."""
+    plist_content = plistlib.loads(data)
+    if isinstance(plist_content, dict) and plist_content.get('$archiver', '') == 'NSKeyedArchiver':
+        return _deserialize_parsed_nska(data, plist_content)
+    return plist_content
+
+
 def get_plist_content(data):
     try:
-        plist_content = plistlib.loads(data)
-        if isinstance(plist_content, dict) and plist_content.get('$archiver', '') == 'NSKeyedArchiver':
-            return _deserialize_nska(data)
-        return plist_content
+        return _load_plist(data)
     except plistlib.InvalidFileException:
         logfunc("Error: Invalid plist data")
     except xml.parsers.expat.ExpatError:
@@ -809,23 +1029,20 @@ def get_plist_content(data):
         logfunc(f"Unexpected error reading plist data: {str(e)}")
     return {}
 
-def _read_binary_plist_tolerantly(file_path):
+def _read_binary_plist_tolerantly(data):
     """Parse a binary plist that plistlib rejects outright for one bad value.
 
     A single CFDate outside datetime's range makes plistlib raise for the whole
     file, so every key is lost even though the rest is well formed and Apple's
     own plutil reads it. Overriding the per-object read means only the offending
-    value is dropped. Returns None when the file is not a binary plist or the
-    private parser is unavailable, so the caller keeps its existing behaviour.
+    value is dropped. Returns the content and the number of values dropped. The
+    content is None when the data is not a binary plist or the private parser is
+    unavailable, so the caller keeps its existing behaviour.
     """
     parser_class = getattr(plistlib, '_BinaryPlistParser', None)
-    if parser_class is None:
-        return None
+    if parser_class is None or data[:8] != b'bplist00':
+        return None, 0
     try:
-        with open(file_path, 'rb') as file:
-            if file.read(8) != b'bplist00':
-                return None
-
         skipped = []
 
         class _Tolerant(parser_class):
@@ -841,31 +1058,81 @@ def _read_binary_plist_tolerantly(file_path):
         arguments = {'dict_type': dict}
         if 'aware_datetime' in inspect.signature(parser_class.__init__).parameters:
             arguments['aware_datetime'] = False
-        with open(file_path, 'rb') as file:
-            content = _Tolerant(**arguments).parse(file)
+        content = _Tolerant(**arguments).parse(io.BytesIO(data))
     except Exception:  # pylint: disable=broad-exception-caught
-        return None
-    if skipped:
-        logfunc(f'{file_path}: {len(skipped)} value(s) held a date outside the representable '
-                'range and are reported empty; the rest of the plist was read')
-    return content
-
+        return None, 0
+    return content, len(skipped)
+
+
+# Plists read by get_plist_file_content(), shared by the artifacts for the run: path ->
+# ((size, mtime), content, message logged on each read or None). Least recently read first,
+# evicted past PLIST_CACHE_MAX_BYTES of files.
+PLIST_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_plist_cache = {}
+_plist_cache_bytes = 0
+
+def _copy_plist(value):
+    """Copy the dicts and lists of a parsed plist, so a caller changing its copy does not
+    change the cached one. Every other plist value is immutable."""
+    if isinstance(value, dict):
+        return {key: _copy_plist(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_plist(item) for item in value]
+    return value
+
+def _cache_plist(key, stamp, content, message):
+    global _plist_cache_bytes  # pylint: disable=global-statement
+    size = stamp[0]
+    if size > PLIST_CACHE_MAX_BYTES:
+        return
+    if key in _plist_cache:
+        _plist_cache_bytes -= _plist_cache.pop(key)[0][0]
+    while _plist_cache and _plist_cache_bytes + size > PLIST_CACHE_MAX_BYTES:
+        _plist_cache_bytes -= _plist_cache.pop(next(iter(_plist_cache)))[0][0]
+    _plist_cache[key] = (stamp, content, message)
+    _plist_cache_bytes += size
+
+def clear_plist_cache():
+    """Forgets the plists read by get_plist_file_content()"""
+    global _plist_cache_bytes  # pylint: disable=global-statement
+    _plist_cache.clear()
+    _plist_cache_bytes = 0
 
 def get_plist_file_content(file_path):
+    """Returns the content of a plist file, NSKeyedArchiver plists deserialized, or {} if it
+    cannot be read. Each file is parsed once for the run, and read again only if its size or
+    modification time changes. The caller gets its own copy to change."""
+    materialize_file(file_path)
     try:
+        key = str(file_path)
         with open(file_path, 'rb') as file:
-            plist_content = plistlib.load(file)
-            if isinstance(plist_content, dict) and plist_content.get('$archiver', '') == 'NSKeyedArchiver':
-                return nska_deserialize.deserialize_plist(file_path)
-            return plist_content
+            stat = os.fstat(file.fileno())
+            stamp = (stat.st_size, stat.st_mtime_ns)
+            cached = _plist_cache.get(key)
+            if cached is not None and cached[0] == stamp:
+                _plist_cache[key] = _plist_cache.pop(key)
+                if cached[2]:
+                    logfunc(cached[2])  # each artifact reading the file is told, as before
+                return _copy_plist(cached[1])
+            data = file.read()
+        message = None
+        try:
+            plist_content = _load_plist(data)
+        except plistlib.InvalidFileException:
+            plist_content, skipped = _read_binary_plist_tolerantly(data)
+            if plist_content is None:
+                raise
+            if skipped:
+                message = (f'{file_path}: {skipped} value(s) held a date outside the representable '
+                           'range and are reported empty; the rest of the plist was read')
+                logfunc(message)
+        _cache_plist(key, stamp, plist_content, message)
+        return _copy_plist(plist_content)
     except FileNotFoundError:
         logfunc(f"Error: Plist file not found at {file_path}")
     except PermissionError:
         logfunc(f"Error: Permission denied when trying to read {file_path}")
     except plistlib.InvalidFileException:
-        recovered = _read_binary_plist_tolerantly(file_path)
-        if recovered is not None:
-            return recovered
         logfunc(f"Error: Invalid plist file format in {file_path}")
     except xml.parsers.expat.ExpatError:
         logfunc(f"Error: Malformed XML in plist file {file_path}")
@@ -910,6 +1177,7 @@ def open_sqlite_db_readonly(path):
     '''Opens a sqlite db in read-only mode, so original db (and -wal/journal are intact)'''
     try:
         if path:
+            materialize_file(path)
             path = get_sqlite_db_path(path)
             with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as db:
                 return db
@@ -918,19 +1186,127 @@ def open_sqlite_db_readonly(path):
         logfunc(f" - {str(e)}")
     return None
 
+SQLITE_POOL_MAX_SIZE = 32  # connections kept open, a WAL db in mode=ro holds 3 file descriptors
+
+_sqlite_pool = OrderedDict()
+_sqlite_schemas = {}
+_sqlite_cursors = {}  # path -> weakref.WeakSet of the cursors handed out on its connection
+
+def get_pooled_sqlite_db(path):
+    '''Returns a read-only connection to a sqlite db, opened on first use and shared until it is
+    the least recently used of more than SQLITE_POOL_MAX_SIZE connections, or the end of the run.
+    A connection with a cursor of get_pooled_sqlite_cursor() still in use is not closed before
+    the end of the run. Callers must not close it, the pool does.'''
+    if not path:
+        return None
+    key = str(path)
+    db = _sqlite_pool.get(key)
+    if db is not None:
+        _sqlite_pool.move_to_end(key)
+    else:
+        try:
+            materialize_file(path)
+            db = sqlite3.connect(f"file:{get_sqlite_db_path(path)}?mode=ro", uri=True, check_same_thread=False)
+        except sqlite3.OperationalError as e:
+            logfunc(f"Error with {path}:")
+            logfunc(f" - {str(e)}")
+            return None
+        _sqlite_pool[key] = db
+        _evict_sqlite_connections()
+    return db
+
+def get_pooled_sqlite_cursor(path):
+    '''Returns a cursor on the pooled connection to a sqlite db (see get_pooled_sqlite_db()),
+    or None. The connection stays open as long as the cursor is referenced.'''
+    db = get_pooled_sqlite_db(path)
+    if not db:
+        return None
+    cursor = db.cursor()
+    _sqlite_cursors.setdefault(str(path), weakref.WeakSet()).add(cursor)
+    return cursor
+
+def _evict_sqlite_connections():
+    # An artifact may still iterate a cursor of the least recently used connection while it
+    # queries many other databases, so connections with a cursor in use are skipped
+    for key in list(_sqlite_pool)[:-1]:
+        if len(_sqlite_pool) <= SQLITE_POOL_MAX_SIZE:
+            break
+        if _sqlite_cursors.get(key):
+            continue
+        _sqlite_pool.pop(key).close()
+        _sqlite_schemas.pop(key, None)
+        _sqlite_cursors.pop(key, None)
+
+class SqliteSchema:
+    '''
+    The tables and views of a sqlite db, read once from sqlite_master, and the columns of
+    its tables, read from table_info the first time they are asked for.
+    Attributes:
+        version (int): The schema_version of the db when it was read.
+        tables (set): The names of the tables.
+        views (set): The names of the views.
+    '''
+
+    def __init__(self, db, version):
+        self.version = version
+        self.tables = set()
+        self.views = set()
+        for object_type, name in db.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'view')"):
+            (self.tables if object_type == 'table' else self.views).add(name)
+        self.queries = {}  # query -> (query with absent columns nulled, names of the absent columns)
+        self._db = db
+        self._columns = {}
+
+    def columns(self, table_name):
+        '''Returns the lower-cased names of the columns of a table or view, empty if there is none'''
+        key = table_name.lower()
+        if key not in self._columns:
+            self._columns[key] = {row[1].lower() for row in self._db.execute(f"pragma table_info('{table_name}');")}
+        return self._columns[key]
+
+def get_sqlite_schema(path):
+    '''Returns the SqliteSchema of a sqlite db, read again only if the schema has changed
+    since, or None if the db cannot be read.'''
+    db = get_pooled_sqlite_db(path)
+    if not db:
+        return None
+    key = str(path)
+    try:
+        version = db.execute('PRAGMA schema_version').fetchone()[0]
+        schema = _sqlite_schemas.get(key)
+        if schema is None or schema.version != version:
+            schema = _sqlite_schemas[key] = SqliteSchema(db, version)
+        return schema
+    except sqlite3.Error as ex:
+        logfunc(f"Error reading the schema of {path}: {str(ex)}")
+    return None
+
+def close_sqlite_pool():
+    '''Closes the connections opened by get_pooled_sqlite_db() and forgets their schemas'''
+    for db in _sqlite_pool.values():
+        db.close()
+    _sqlite_pool.clear()
+    _sqlite_schemas.clear()
+    _sqlite_cursors.clear()
+
 def attach_sqlite_db_readonly(path, db_name):
     '''Return the query to attach a sqlite db in read-only mode.
     path: str --> Path of the SQLite DB to attach
     db_name: str --> Name of the SQLite DB in the query'''
+    materialize_file(path)
     path = get_sqlite_db_path(path)
     return  f'''ATTACH DATABASE "file:{path}?mode=ro" AS {db_name}'''
 
 def get_sqlite_db_records(path, query, attach_query=None):
-    db = open_sqlite_db_readonly(path)
-    if db:
-        db.row_factory = sqlite3.Row  # For fetching columns by name
+    # An attached db stays attached to the connection, so that query gets a connection of its own
+    if attach_query:
+        db = open_sqlite_db_readonly(path)
+        cursor = db.cursor() if db else None
+    else:
+        cursor = get_pooled_sqlite_cursor(path)
+    if cursor is not None:
         try:
-            cursor = db.cursor()
+            cursor.row_factory = sqlite3.Row  # For fetching columns by name
             if attach_query:
                 cursor.execute(attach_query)
             cursor.execute(query)
@@ -966,38 +1342,18 @@ def get_sqlite_multiple_db_records(path_list, query, data_headers):
 
 def does_column_exist_in_db(path, table_name, col_name):
     '''Checks if a specific col exists'''
-    db = open_sqlite_db_readonly(path)
-    col_name = col_name.lower()
-    if db:
-        query = f"pragma table_info('{table_name}');"
+    schema = get_sqlite_schema(path)
+    if schema:
         try:
-            db.row_factory = sqlite3.Row # For fetching columns by name
-            cursor = db.cursor()
-            cursor.execute(query)
-            all_rows = cursor.fetchall()
-            for row in all_rows:
-                if row['name'].lower() == col_name:
-                    return True
+            return col_name.lower() in schema.columns(table_name)
         except sqlite3.Error as ex:
-            logfunc(f"Query error, query={query} Error={str(ex)}")
-        finally:
-            db.close()
+            logfunc(f"Query error, query=pragma table_info('{table_name}'); Error={str(ex)}")
     return False
 
 def does_table_exist_in_db(path, table_name):
     '''Checks if a table with specified name exists in an sqlite db'''
-    db = open_sqlite_db_readonly(path)
-    if db:    
-        try:
-            query = f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}'"
-            cursor = db.execute(query)
-            for _ in cursor:
-                return True
-        except sqlite3.Error as ex:
-            logfunc(f"Query error, query={query} Error={str(ex)}")
-        finally:
-            db.close()
-    return False
+    schema = get_sqlite_schema(path)
+    return bool(schema) and table_name in schema.tables
 
 def null_absent_columns(path, query):
     '''Replace references to columns the database lacks with NULL.
@@ -1015,17 +1371,20 @@ def null_absent_columns(path, query):
     this costs nothing on a large table.
 
     Returns the query unchanged if the database cannot be read or the error is
-    anything other than a missing column.
+    anything other than a missing column. The result is kept with the schema of the
+    database, so a query run once per file or per row is compiled only once.
     '''
-    db = open_sqlite_db_readonly(path)
-    if not db:
+    schema = get_sqlite_schema(path)
+    if not schema:
         return query
 
-    replaced = []
-    try:
+    if query not in schema.queries:
+        db = get_pooled_sqlite_db(path)
+        nulled_query = query
+        replaced = []
         for _ in range(50):                  # a query cannot need more than this
             try:
-                db.execute('EXPLAIN ' + query)
+                db.execute('EXPLAIN ' + nulled_query)
                 break
             except sqlite3.OperationalError as ex:
                 match = re.match(r'no such column:\s*(\S+)', str(ex))
@@ -1035,18 +1394,16 @@ def null_absent_columns(path, query):
                 if reference in replaced:
                     break                    # not making progress, leave it alone
                 replaced.append(reference)
-                query = _null_out_column(query, reference)
+                nulled_query = _null_out_column(nulled_query, reference)
             except sqlite3.Error:
                 break
-    finally:
-        # Artifacts call this once per query, so an unclosed handle here is one
-        # leak per query for the whole run rather than a one-off.
-        db.close()
+        schema.queries[query] = (nulled_query, replaced)
+    nulled_query, replaced = schema.queries[query]
 
     if replaced:
         logfunc(f'{os.path.basename(path)}: column(s) absent from this version are reported '
                 f'empty: {", ".join(sorted(replaced))}')
-    return query
+    return nulled_query
 
 
 def _null_out_column(query, reference):
@@ -1071,34 +1428,21 @@ def _null_out_column(query, reference):
 
 def does_view_exist_in_db(path, table_name):
     '''Checks if a table with specified name exists in an sqlite db'''
-    db = open_sqlite_db_readonly(path)
-    if db:
-        try:
-            query = f"SELECT name FROM sqlite_master WHERE type='view' AND name='{table_name}'"
-            cursor = db.execute(query)
-            for _ in cursor:
-                return True
-        except sqlite3.Error as ex:
-            logfunc(f"Query error, query={query} Error={str(ex)}")
-        finally:
-            db.close()
-    return False
+    schema = get_sqlite_schema(path)
+    return bool(schema) and table_name in schema.views
 
 
-def tsv(report_folder, data_headers, data_list, tsvname, source_file=None):  # pylint: disable=unused-argument
+def tsv(report_folder, data_headers, data_list, tsvname, source_file=None, write_headers=True):  # pylint: disable=unused-argument
     report_folder = report_folder.rstrip('/')
     report_folder = report_folder.rstrip('\\')
     report_folder_base = os.path.dirname(os.path.dirname(report_folder))
     tsv_report_folder = os.path.join(report_folder_base, '_TSV Exports')
-
-    if os.path.isdir(tsv_report_folder):
-        pass
-    else:
-        os.makedirs(tsv_report_folder)
+    os.makedirs(tsv_report_folder, exist_ok=True)
     
     with open(os.path.join(tsv_report_folder, tsvname + '.tsv'), 'a', encoding='utf-8-sig') as tsvfile:
         tsv_writer = csv.writer(tsvfile, delimiter='\t')
-        tsv_writer.writerow(data_headers)
+        if write_headers:
+            tsv_writer.writerow(data_headers)
         
         for i in data_list:
             tsv_writer.writerow(i)
@@ -1107,7 +1451,7 @@ def timeline(report_folder, tlactivity, data_list, data_headers):
     report_folder = report_folder.rstrip('/')
     report_folder = report_folder.rstrip('\\')
     report_folder_base = os.path.dirname(os.path.dirname(report_folder))
-    tl_report_folder = os.path.join(report_folder_base, '_Timeline')
+    tl_report_folder = os.path.join(OutputParameters.staging_folder or report_folder_base, '_Timeline')
 
     if os.path.isdir(tl_report_folder):
         tldb = os.path.join(tl_report_folder, 'tl.db')
@@ -1129,14 +1473,15 @@ def timeline(report_folder, tlactivity, data_list, data_headers):
         )
         db.commit()
     
+    timeline_rows = []
     for entry in data_list:
         entry = [str(field) for field in entry]
         
         data_dict = dict(zip(data_headers, entry))
 
         data_str = json.dumps(data_dict)
-        cursor.executemany(
-            "INSERT INTO data VALUES(?,?,?)", [(str(entry[0]), tlactivity, data_str)])
+        timeline_rows.append((str(entry[0]), tlactivity, data_str))
+    cursor.executemany("INSERT INTO data VALUES(?,?,?)", timeline_rows)
 
     db.commit()
     db.close()
@@ -1174,16 +1519,19 @@ def kmlgen(report_folder, kmlactivity, data_list, data_headers):
         report_folder = report_folder.rstrip('\\')
         report_folder_base = os.path.dirname(os.path.dirname(report_folder))
         kml_report_folder = os.path.join(report_folder_base, '_KML Exports')
-        if os.path.isdir(kml_report_folder):
-            latlongdb = os.path.join(kml_report_folder, '_latlong.db')
+        latlong_folder = os.path.join(OutputParameters.staging_folder, '_KML Exports') \
+            if OutputParameters.staging_folder else kml_report_folder
+        os.makedirs(kml_report_folder, exist_ok=True)
+        if os.path.exists(os.path.join(latlong_folder, '_latlong.db')):
+            latlongdb = os.path.join(latlong_folder, '_latlong.db')
             db = sqlite3.connect(latlongdb)
             cursor = db.cursor()
             cursor.execute('''PRAGMA synchronous = EXTRA''')
             cursor.execute('''PRAGMA journal_mode = WAL''')
             db.commit()
         else:
-            os.makedirs(kml_report_folder)
-            latlongdb = os.path.join(kml_report_folder, '_latlong.db')
+            os.makedirs(latlong_folder, exist_ok=True)
+            latlongdb = os.path.join(latlong_folder, '_latlong.db')
             db = sqlite3.connect(latlongdb)
             cursor = db.cursor()
             cursor.execute(
@@ -1402,6 +1750,56 @@ def device_info(category, label, value, source_file=""):
         
     identifiers[category] = values
 
+def merge_device_info(other_identifiers):
+    """
+    Adds device information recorded in another process to the identifiers dictionary,
+    keeping the single value / list of values layout device_info() builds.
+    Args:
+        other_identifiers (dict): An identifiers dictionary, as built by device_info()
+    """
+    for category, labels in other_identifiers.items():
+        values = identifiers.get(category, {})
+        for label, data in labels.items():
+            value_objs = data if isinstance(data, list) else [data]
+            for value_obj in value_objs:
+                if label not in values:
+                    values[label] = value_obj
+                elif isinstance(values[label], list):
+                    values[label].append(value_obj)
+                else:
+                    values[label] = [values[label], value_obj]
+        identifiers[category] = values
+
+def merge_staged_exports(staging_folder, report_folder_base):
+    """
+    Appends the timeline and KML location rows a worker process wrote to its staging
+    folder (see OutputParameters.staging_folder) to the databases of the report.
+    Args:
+        staging_folder (str): The staging folder of the worker task
+        report_folder_base (str): The base folder of the report
+    """
+    staged_databases = (
+        ('_Timeline', 'tl.db', 'CREATE TABLE data(key TEXT, activity TEXT, datalist TEXT)'),
+        ('_KML Exports', '_latlong.db',
+         'CREATE TABLE data(timestamp TEXT, latitude TEXT, longitude TEXT, activity TEXT)'),
+    )
+    for folder, db_name, create_table in staged_databases:
+        staged_db = os.path.join(staging_folder, folder, db_name)
+        if not os.path.exists(staged_db):
+            continue
+        os.makedirs(os.path.join(report_folder_base, folder), exist_ok=True)
+        report_db = os.path.join(report_folder_base, folder, db_name)
+        db = sqlite3.connect(report_db)
+        try:
+            if not db.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='data'").fetchone():
+                db.execute(create_table)
+            db.execute('ATTACH DATABASE ? AS staged', (staged_db,))
+            db.execute('INSERT INTO data SELECT * FROM staged.data')
+            db.commit()
+            db.execute('DETACH DATABASE staged')
+        finally:
+            db.close()
+
 def write_lava_only_log():
     """Crates the lava_only_artifacts log file"""
     with open(OutputParameters.screen_output_file_path_lava_only, 'w', encoding='utf8') as lava_log:
@@ -1540,9 +1938,14 @@ def convert_time_obj_to_utc(ts):
     timestamp = ts.replace(tzinfo=timezone.utc)
     return timestamp
 
+@lru_cache(maxsize=None)
+def get_timezone(time_offset):
+    '''Returns the pytz timezone of a name, looked up once per name for the run'''
+    return pytz.timezone(time_offset)
+
 def convert_utc_human_to_timezone(utc_time, time_offset):
     #fetch the timezone information
-    tz_info = pytz.timezone(time_offset)
+    tz_info = get_timezone(time_offset)
     
     #convert utc to timezone
     timezone_time = utc_time.astimezone(tz_info)
@@ -1555,7 +1958,7 @@ def convert_ts_int_to_timezone(time, time_offset):
     utc_time = convert_ts_int_to_utc(time)
 
     #fetch the timezone information
-    tz_info = pytz.timezone(time_offset)
+    tz_info = get_timezone(time_offset)
     
     #convert utc to timezone
     timezone_time = utc_time.astimezone(tz_info)
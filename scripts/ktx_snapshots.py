@@ -0,0 +1,211 @@
+"""
+Conversion of the KTX snapshots iOS saves for apps into images the report can show.
+
+Each snapshot is an ASTC 4x4 texture, usually LZFSE compressed, that has to be
+decompressed, decoded and saved again as an image, which takes a good part of a second
+for a full screen snapshot. An extraction holds thousands of them.
+
+convert_ktx_snapshots() converts the snapshots of an artifact in one call instead of
+one by one. With --workers N, the conversions are spread across N processes when there
+are at least SNAPSHOT_PARALLEL_MIN_COUNT of them. With --snapshot_cache, each image is
+also kept in the LEAPP shared directory, named after the SHA-1 of the KTX file it was
+converted from, and a snapshot converted on an earlier run is copied from there instead
+of being decoded again. At the end of the run, the least recently used images are
+deleted until the cache is under SNAPSHOT_CACHE_MAX_SIZE (see prune_snapshot_cache()).
+The cache folder can be deleted at any time.
+
+The images are saved as PNG, as they always were, or with --snapshot_format webp as
+lossless WebP, which keeps every pixel, alpha included, and saves about twice as fast.
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+
+from concurrent.futures import ProcessPoolExecutor
+
+import liblzfse
+from PIL import Image
+
+from leapp_functions.app import history
+from scripts.ilapfuncs import logfunc
+from scripts.ktx.ios_ktx2png import KTX_reader
+
+SNAPSHOT_CACHE_FOLDER_NAME = 'snapshot_cache'
+SNAPSHOT_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+SNAPSHOT_PARALLEL_MIN_COUNT = 16
+
+# The Pillow format, save options and MIME type of each output format
+SNAPSHOT_FORMATS = {
+    # compress_type=3 as per https://github.com/python-pillow/Pillow/issues/5986
+    'png': ('PNG', {'compress_type': 3}, 'image/png'),
+    'webp': ('WEBP', {'lossless': True, 'method': 0, 'quality': 0, 'exact': True}, 'image/webp'),
+}
+
+# Set from the command line by crunch_artifacts() and in each worker process of the artifact pool
+_workers = 1
+_options = {'cache_folder': None, 'image_format': 'png'}
+
+
+def set_snapshot_workers(workers):
+    """Sets the number of processes the snapshots of an artifact are converted across"""
+    global _workers  # pylint: disable=global-statement
+    _workers = max(1, workers)
+
+
+def set_snapshot_options(cache_folder=None, image_format='png'):
+    """
+    Sets where converted snapshots are kept between runs, None to not keep them, and the
+    format they are saved in, a key of SNAPSHOT_FORMATS.
+    """
+    if image_format not in SNAPSHOT_FORMATS:
+        raise ValueError(f'Unknown snapshot format {image_format}')
+    _options.update(cache_folder=cache_folder, image_format=image_format)
+
+
+def get_snapshot_options():
+    """Returns the arguments of the last set_snapshot_options() call, as a dict"""
+    return dict(_options)
+
+
+def get_snapshot_cache_folder():
+    """Returns the folder of the converted snapshots in the LEAPP shared directory."""
+    return str(history.get_shared_directory() / SNAPSHOT_CACHE_FOLDER_NAME)
+
+
+def get_snapshot_extension():
+    """Returns the file extension of the converted snapshots, without the dot"""
+    return _options['image_format']
+
+
+def get_snapshot_mime_type():
+    """Returns the MIME type of the converted snapshots"""
+    return SNAPSHOT_FORMATS[_options['image_format']][2]
+
+
+def _cached_path(cache_folder, key, image_format):
+    return os.path.join(cache_folder, key[:2], f'{key}.{image_format}')
+
+
+def _store(cache_folder, key, image_format, image_path):
+    """Copies a converted image into the cache, renamed into place so that a reader never sees part of it"""
+    cached_path = _cached_path(cache_folder, key, image_format)
+    try:
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(cached_path), suffix='.tmp')
+        os.close(handle)
+        try:
+            shutil.copyfile(image_path, temp_path)
+            os.replace(temp_path, cached_path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+    except OSError:
+        pass  # the cache only saves time, the image itself was converted
+
+
+def convert_ktx(ktx_path, save_to_path, image_format='png', cache_folder=None):
+    """
+    Converts a valid iOS KTX image, or copies its conversion from the cache folder.
+    Args:
+        ktx_path (str): The path to the KTX file.
+        save_to_path (str): The path to save the image to, overwritten if it exists.
+        image_format (str): A key of SNAPSHOT_FORMATS.
+        cache_folder (str): The folder of the converted snapshots, or None.
+    Returns:
+        tuple: (True if the image was saved, the error to log or '')
+    """
+    with open(ktx_path, 'rb') as f:
+        data = f.read()
+    key = None
+    if cache_folder:
+        key = hashlib.sha1(data).hexdigest()
+        try:
+            cached_path = _cached_path(cache_folder, key, image_format)
+            shutil.copyfile(cached_path, save_to_path)
+            os.utime(cached_path)  # recently used, see prune_snapshot_cache()
+            return True, ''
+        except OSError:
+            pass  # not converted yet
+
+    ktx = KTX_reader()
+    f = io.BytesIO(data)
+    try:
+        if not ktx.validate_header(f):
+            return False, ''
+        texture = ktx.get_uncompressed_texture_data(f)
+        image = Image.frombytes('RGBA', (ktx.pixelWidth, ktx.pixelHeight), texture, 'astc', (4, 4, False))
+        pil_format, save_options, _ = SNAPSHOT_FORMATS[image_format]
+        image.save(save_to_path, pil_format, **save_options)
+    except (OSError, ValueError, liblzfse.error) as ex:  # pylint: disable=c-extension-no-member
+        return False, f'Had an exception - {str(ex)}'
+    if key:
+        _store(cache_folder, key, image_format, save_to_path)
+    return True, ''
+
+
+def prune_snapshot_cache(cache_folder, max_size=SNAPSHOT_CACHE_MAX_SIZE):
+    """
+    Deletes the least recently used images of the cache folder until it holds at most
+    max_size bytes. An image is used when it is stored or copied from the cache.
+    Args:
+        cache_folder (str): The folder of the converted snapshots.
+        max_size (int): The size cap in bytes.
+    Returns:
+        int: The number of files deleted.
+    """
+    entries = []
+    for root, _, names in os.walk(cache_folder):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    size = sum(entry[1] for entry in entries)
+    deleted = 0
+    for _, file_size, path in sorted(entries):
+        if size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        size -= file_size
+        deleted += 1
+    return deleted
+
+
+def _convert_ktx(arguments):
+    return convert_ktx(*arguments)
+
+
+def convert_ktx_snapshots(conversions, workers=None):
+    """
+    Converts KTX snapshots in the format and with the cache folder set by
+    set_snapshot_options(), logging the errors.
+    Args:
+        conversions (list): (KTX path, path to save the image to) tuples.
+        workers (int): The number of processes to convert across, the --workers value if None.
+    Returns:
+        list: True for each image saved, False for each KTX file that is not a valid iOS snapshot.
+    """
+    arguments = [(str(ktx_path), str(save_to_path), _options['image_format'], _options['cache_folder'])
+                 for ktx_path, save_to_path in conversions]
+    workers = min(workers or _workers, len(arguments))
+    if workers > 1 and len(arguments) >= SNAPSHOT_PARALLEL_MIN_COUNT:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_convert_ktx, arguments,
+                                        chunksize=max(1, len(arguments) // (workers * 4))))
+    else:
+        results = [convert_ktx(*argument) for argument in arguments]
+
+    converted = []
+    for saved, error in results:
+        if error:
+            logfunc(error)
+        converted.append(saved)
+    return converted
@@ -19,10 +19,16 @@ Functions:
     lava_create_sqlite_table: Creates a SQLite table for artifact data.
     lava_insert_sqlite_data: Inserts data rows into a SQLite table.
     lava_get_media_item: Retrieves media item information from database.
+    lava_has_media_item: Checks whether a media item was checked in during the run.
     lava_insert_sqlite_media_item: Inserts media item metadata into database.
     lava_get_media_references: Retrieves media reference information.
+    lava_has_media_reference: Checks whether a media reference was added during the run.
     lava_insert_sqlite_media_references: Inserts media reference into database.
     lava_get_full_media_info: Retrieves complete media information with joins.
+    lava_get_full_media_infos: Retrieves complete media information for many references.
+    lava_flush: Writes the queued rows to the database.
+    lava_commit: Writes the queued rows and commits them.
+    lava_merge_staged_output: Merges the output of an artifact run in a worker process.
     lava_finalize_output: Finalizes and saves LAVA output files.
 """
 
@@ -45,6 +51,23 @@ lava_db_name = '_lava_artifacts.db'
 lava_json_name = '_lava_data.lava'
 LAVA_SCHEMA_VERSION = 2
 
+# The rows of the bookkeeping tables (file paths, search patterns, media) are queued and
+# written with executemany, and the run only commits once per artifact, in
+# lava_add_module(): a commit per row was an fsync per row, and there can be hundreds
+# of thousands of file links and media references. Queued rows are written out before
+# any read, so reads see them.
+LAVA_BATCH_SIZE = 10000
+# Artifact tables hold a few text columns per row, often long ones
+LAVA_PAGE_SIZE = 8192
+# Stays below the 999 host parameters older SQLite builds allow in a statement
+LAVA_MEDIA_INFO_CHUNK_SIZE = 500
+_pending_rows = OrderedDict()
+_pending_count = 0
+# The ids of the media items and references written during the run, so checking media
+# in does not query the database for every media cell of an artifact
+_media_item_ids = set()
+_media_reference_ids = set()
+
 
 def sanitize_sql_name(name):
     """
@@ -143,8 +166,17 @@ def initialize_lava(input_path, output_path, input_type, profile_filename=None):
 
     db_path = os.path.join(output_path, lava_db_name)
     lava_db = sqlite3.connect(db_path)
+    _pending_rows.clear()
+    _media_item_ids.clear()
+    _media_reference_ids.clear()
 
     cursor = lava_db.cursor()
+    # Set before the first table is created, the page size cannot change afterwards in WAL mode.
+    # A crash mid run leaves an incomplete report either way, so the run does not wait on fsync;
+    # lava_finalize_output() switches back to a rollback journal with the last commit.
+    cursor.execute(f'PRAGMA page_size = {LAVA_PAGE_SIZE}')
+    cursor.execute('PRAGMA journal_mode = WAL')
+    cursor.execute('PRAGMA synchronous = OFF')
     cursor.execute('''CREATE TABLE _artifact_search_patterns (
                         id INTEGER PRIMARY KEY,
                         module_name TEXT NOT NULL,
@@ -324,6 +356,8 @@ def lava_add_module(module_name, module_status, file_count=None, artifact_name=N
         None
     Global Variables:
         lava_data (dict): A global dictionary that contains a list of modules under the key 'modules'.
+    The module is added once its artifact is done, which is when the rows the artifact
+    wrote are committed.
     """
 
 
@@ -336,6 +370,7 @@ def lava_add_module(module_name, module_status, file_count=None, artifact_name=N
     if file_count is not None:
         module["file_count"] = file_count
     lava_data["modules"].append(module)
+    lava_commit()
 
 
 def lava_create_sqlite_table(table_name, data):
@@ -381,7 +416,6 @@ def lava_create_sqlite_table(table_name, data):
 
     columns_sql = ', '.join(columns)
     cursor.execute(f"CREATE TABLE IF NOT EXISTS {quote_sql_name(sanitized_table_name)} ({columns_sql})")
-    lava_db.commit()
 
     return sanitized_table_name, column_map, object_columns
 
@@ -473,9 +507,8 @@ def lava_insert_sqlite_data(table_name, data, object_columns, headers, column_ma
             processed_row.append(value)
         rows_to_insert.append(tuple(processed_row))
 
-    # Execute the insert
+    # Execute the insert, committed with the rest of the artifact's rows
     cursor.executemany(query, rows_to_insert)
-    lava_db.commit()
 
 
 def lava_update_record_count(category, tablename, record_count):
@@ -508,6 +541,7 @@ def lava_get_media_item(media_id):
         sqlite3.Row or None: A row object containing all columns from the _lava_media_items table
     """
 
+    lava_flush()
     cursor = lava_db.cursor()
     query = "SELECT * FROM _lava_media_items WHERE id = ?"
     return cursor.execute(query, (media_id,)).fetchone()
@@ -530,8 +564,7 @@ def lava_insert_sqlite_media_item(media_item):
         None
     """
 
-    cursor = lava_db.cursor()
-    sql = '''INSERT INTO _lava_media_items
+    sql = '''INSERT OR IGNORE INTO _lava_media_items
                 ("id", "source_path", "extraction_path", "type", "metadata", "created_at", "updated_at", "is_embedded")
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)'''
 
@@ -545,12 +578,20 @@ def lava_insert_sqlite_media_item(media_item):
         media_item.updated_at if media_item.updated_at else None,
         media_item.is_embedded
     )
+    _queue_row(sql, params)
+    _media_item_ids.add(media_item.id)
 
-    try:
-        cursor.execute(sql, params)
-        lava_db.commit()
-    except sqlite3.IntegrityError as e:
-        print(str(e))
+
+def lava_has_media_item(media_id):
+    """
+    Checks whether a media item was checked in during the run, without querying the database.
+    Args:
+        media_id (str): The unique identifier of the media item.
+    Returns:
+        bool: True if the media item is in _lava_media_items.
+    """
+
+    return media_id in _media_item_ids
 
 
 def lava_get_media_references(media_ref):
@@ -562,6 +603,7 @@ def lava_get_media_references(media_ref):
         tuple or None: A tuple containing the row data if found, None otherwise.
     """
 
+    lava_flush()
     cursor = lava_db.cursor()
     query = "SELECT * FROM _lava_media_references WHERE id = ?"
     return cursor.execute(query, (media_ref,)).fetchone()
@@ -582,8 +624,7 @@ def lava_insert_sqlite_media_references(media_references):
         None
     """
 
-    cursor = lava_db.cursor()
-    sql = '''INSERT INTO _lava_media_references
+    sql = '''INSERT OR IGNORE INTO _lava_media_references
                 ("id", "media_item_id", "module_name", "artifact_name", "name")
                 VALUES (?, ?, ?, ?, ?)'''
 
@@ -594,16 +635,28 @@ def lava_insert_sqlite_media_references(media_references):
         media_references.artifact_name,
         media_references.name
     )
-    cursor.execute(sql, params)
-    lava_db.commit()
+    _queue_row(sql, params)
+    _media_reference_ids.add(media_references.id)
+
+
+def lava_has_media_reference(media_ref):
+    """
+    Checks whether a media reference was added during the run, without querying the database.
+    Args:
+        media_ref (str): The ID of the media reference.
+    Returns:
+        bool: True if the media reference is in _lava_media_references.
+    """
+
+    return media_ref in _media_reference_ids
 
 
 def lava_get_full_media_info(media_ref_id):
     """
     Retrieves complete media information for a given media reference ID from the LAVA database.
     This function queries the _lava_media_info table to fetch all columns for a specific
-    media item identified by its reference ID. The function uses a global database connection
-    and sets the row factory to sqlite3.Row for dictionary-like access to results.
+    media item identified by its reference ID. The cursor returns sqlite3.Row objects
+    for dictionary-like access to results.
     Args:
         media_ref_id (str): The unique media reference identifier to look up in the database.
     Returns:
@@ -611,8 +664,9 @@ def lava_get_full_media_info(media_ref_id):
                             None if no matching media_ref_id exists in the database.
     """
 
-    lava_db.row_factory = sqlite3.Row
+    lava_flush()
     cursor = lava_db.cursor()
+    cursor.row_factory = sqlite3.Row
     query = '''
     SELECT *
     FROM _lava_media_info
@@ -621,6 +675,34 @@ def lava_get_full_media_info(media_ref_id):
     return cursor.execute(query, (media_ref_id,)).fetchone()
 
 
+def lava_get_full_media_infos(media_ref_ids):
+    """
+    Retrieves complete media information for many media reference IDs at once.
+    The IDs are looked up in the _lava_media_info view with one IN query per
+    LAVA_MEDIA_INFO_CHUNK_SIZE IDs, instead of one query per ID.
+    Args:
+        media_ref_ids (iterable): The media reference identifiers to look up.
+    Returns:
+        dict: A sqlite3.Row with all media information fields for each media_ref_id found.
+    """
+
+    lava_flush()
+    media_ref_ids = list(dict.fromkeys(media_ref_ids))
+    cursor = lava_db.cursor()
+    cursor.row_factory = sqlite3.Row
+    media_infos = {}
+    for start in range(0, len(media_ref_ids), LAVA_MEDIA_INFO_CHUNK_SIZE):
+        chunk = media_ref_ids[start:start + LAVA_MEDIA_INFO_CHUNK_SIZE]
+        query = f'''
+        SELECT *
+        FROM _lava_media_info
+        WHERE media_ref_id IN ({", ".join("?" * len(chunk))})
+        '''
+        for row in cursor.execute(query, chunk):
+            media_infos[row['media_ref_id']] = row
+    return media_infos
+
+
 def lava_insert_sqlite_artifact_search_pattern(artifact_regex_id, module_name, artifact_name, regex):
     """
     Inserts artifact search pattern into the _artifact_search_patterns table.
@@ -631,18 +713,12 @@ def lava_insert_sqlite_artifact_search_pattern(artifact_regex_id, module_name, a
         regex (str): The regular expression for the artifact search pattern.
     """
 
-    cursor = lava_db.cursor()
-    sql = '''INSERT INTO _artifact_search_patterns
+    sql = '''INSERT OR IGNORE INTO _artifact_search_patterns
                 ("id", "module_name", "artifact_name", "regex")
                 VALUES (?, ?, ?, ?)'''
 
     data = (artifact_regex_id, module_name, artifact_name, regex)
-
-    try:
-        cursor.execute(sql, data)
-        lava_db.commit()
-    except sqlite3.IntegrityError as e:
-        print(str(e))
+    _queue_row(sql, data)
 
 
 def lava_insert_sqlite_file_path(file_id, file_path):
@@ -653,18 +729,12 @@ def lava_insert_sqlite_file_path(file_id, file_path):
         file_path (str): Relative file path to store.
     """
 
-    cursor = lava_db.cursor()
-    sql = '''INSERT INTO _file_path_list
+    sql = '''INSERT OR IGNORE INTO _file_path_list
                 ("id", "file_path")
                 VALUES (?, ?)'''
 
     data = (file_id, file_path)
-
-    try:
-        cursor.execute(sql, data)
-        lava_db.commit()
-    except sqlite3.IntegrityError as e:
-        print(str(e))
+    _queue_row(sql, data)
 
 
 def lava_insert_sqlite_artifact_link_pattern_to_file(artifact_regex_id, file_id):
@@ -675,18 +745,98 @@ def lava_insert_sqlite_artifact_link_pattern_to_file(artifact_regex_id, file_id)
         file_id (int): ID of the related file path entry.
     """
 
-    cursor = lava_db.cursor()
-    sql = '''INSERT INTO _artifact_pattern_to_file
+    sql = '''INSERT OR IGNORE INTO _artifact_pattern_to_file
                 ("artifact_search_pattern_id", "file_path_id")
                 VALUES (?, ?)'''
 
     data = (artifact_regex_id, file_id)
+    _queue_row(sql, data)
+
+
+def _queue_row(sql, params):
+    """Queues a row for the next executemany of its statement."""
+    global _pending_count  # pylint: disable=global-statement
+    _pending_rows.setdefault(sql, []).append(params)
+    _pending_count += 1
+    if _pending_count >= LAVA_BATCH_SIZE:
+        lava_flush()
+
+
+def lava_flush():
+    """
+    Writes the queued rows to the database, one executemany per statement. The rows of a
+    statement keep the order they were queued in, and the statements run in the order each
+    was first queued, so rows of different statements are not written in queue order. The
+    rows are committed with the next lava_commit().
+    """
+    global _pending_count  # pylint: disable=global-statement
+    if not _pending_rows:
+        return
+    cursor = lava_db.cursor()
+    for sql, rows in _pending_rows.items():
+        cursor.executemany(sql, rows)
+    _pending_rows.clear()
+    _pending_count = 0
+
+
+def lava_commit():
+    """Writes the queued rows and commits everything written since the last commit."""
+    lava_flush()
+    lava_db.commit()
+
 
+def lava_merge_staged_output(staged_db_path, staged_artifacts, staged_modules):
+    """
+    Merge the LAVA output of an artifact run in a worker process into this run.
+    A worker writes to its own _lava_artifacts.db (see scripts/artifact_pool.py), so its
+    artifact tables are copied over here, and its media items and references are added
+    unless an earlier artifact already checked the same media in.
+    Args:
+        staged_db_path (str): The path to the worker's _lava_artifacts.db.
+        staged_artifacts (dict): The worker's lava_data["artifacts"].
+        staged_modules (list): The worker's lava_data["meta"]["modules"].
+    """
+
+    for category, artifacts in staged_artifacts.items():
+        lava_data["artifacts"].setdefault(category, []).extend(artifacts)
+    for staged_module in staged_modules:
+        module_info = next((m for m in lava_data['meta']['modules']
+                            if m['module_name'] == staged_module['module_name']), None)
+        if module_info:
+            module_info['artifacts'].extend(staged_module['artifacts'])
+        else:
+            lava_data['meta']['modules'].append(staged_module)
+
+    if not os.path.exists(staged_db_path):
+        return
+    # A database cannot be attached within a transaction
+    lava_commit()
+    cursor = lava_db.cursor()
+    cursor.execute('ATTACH DATABASE ? AS staged', (staged_db_path,))
     try:
-        cursor.execute(sql, data)
+        existing_tables = {row[0] for row in cursor.execute(
+            "SELECT name FROM main.sqlite_master WHERE type='table'")}
+        staged_tables = cursor.execute(
+            "SELECT name, sql FROM staged.sqlite_master WHERE type='table'").fetchall()
+        for table_name, create_sql in staged_tables:
+            if table_name in ('_lava_media_items', '_lava_media_references'):
+                cursor.execute(f"INSERT OR IGNORE INTO main.{quote_sql_name(table_name)} "
+                               f"SELECT * FROM staged.{quote_sql_name(table_name)}")
+                media_ids = _media_item_ids if table_name == '_lava_media_items' else _media_reference_ids
+                media_ids.update(row[0] for row in cursor.execute(
+                    f"SELECT id FROM staged.{quote_sql_name(table_name)}"))
+                continue
+            if table_name.startswith('_'):
+                continue  # search patterns and file paths are only written by the main process
+            if table_name not in existing_tables:
+                cursor.execute(create_sql)
+            columns = ', '.join(quote_sql_name(row[1]) for row in cursor.execute(
+                f"PRAGMA staged.table_info({quote_sql_name(table_name)})"))
+            cursor.execute(f"INSERT INTO main.{quote_sql_name(table_name)} ({columns}) "
+                           f"SELECT {columns} FROM staged.{quote_sql_name(table_name)}")
         lava_db.commit()
-    except sqlite3.IntegrityError as e:
-        print(str(e))
+    finally:
+        cursor.execute('DETACH DATABASE staged')
 
 
 def lava_finalize_output(output_path):
@@ -727,5 +877,11 @@ def lava_finalize_output(output_path):
     with open(os.path.join(output_path, lava_json_name), 'w', encoding='utf-8') as f:
         json.dump(lava_data, f, indent=4)
 
+    # Commit what is left and leave a single file behind: switching back to a rollback
+    # journal checkpoints the WAL into the database and removes it
+    lava_commit()
+    lava_db.execute('PRAGMA synchronous = FULL')
+    lava_db.execute('PRAGMA journal_mode = DELETE')
+
     # Close the SQLite database
     lava_db.close()
@@ -0,0 +1,147 @@
+"""
+Working copies of Photos.sqlite for the Photos.sqlite artifacts (Ph0xx modules).
+
+About forty artifacts query the same Photos.sqlite, each with its own large query that
+joins ZASSET to ZADDITIONALASSETATTRIBUTES, ZEXTENDEDATTRIBUTES, ZINTERNALRESOURCE and
+a dozen more tables. Many of the join columns have no index in the database as Photos
+writes it, so SQLite builds a temporary index for them, or scans the table once per
+asset, in every query of every artifact.
+
+get_photos_db_records() runs these queries against a working copy of the database
+instead, made once per process on first use: in memory, or in the output folder if the
+database is larger than PHOTOS_MEMORY_LIMIT. The working copy is writable, so the first
+query that joins on a column without an index adds one, with its statistics, and every
+later query of every Ph artifact uses it. The evidence is only ever read. With --workers,
+the Ph modules all run in the same worker process (see scripts/artifact_pool.py), so the
+copy is made, and indexed, once.
+"""
+
+import os
+import re
+import sqlite3
+
+from scripts.context import Context
+from scripts.ilapfuncs import get_pooled_sqlite_cursor, get_pooled_sqlite_db, logfunc, null_absent_columns
+
+WORKING_COPY_FOLDER_NAME = '_photos_working_copies'
+PHOTOS_MEMORY_LIMIT = 1024 * 1024 * 1024
+INDEX_PREFIX = 'ileapp_'
+
+# "JOIN <table> [AS] <alias> ON <condition>", the condition ending where the next clause starts
+_JOIN_RE = re.compile(r'\bJOIN\s+(\w+)\s+(?:AS\s+)?(\w+)\s+ON\s+(.*?)'
+                      r'(?=\b(?:LEFT|INNER|CROSS|JOIN|WHERE|GROUP|ORDER|UNION|LIMIT)\b|\)|$)',
+                      re.IGNORECASE | re.DOTALL)
+_COLUMN_RE = re.compile(r'\b(\w+)\.(\w+)\b')
+
+_working_copies = {}
+
+
+class PhotosWorkingCopy:
+    """
+    A writable copy of a Photos.sqlite, with the indexes its queries need added as they run.
+    Attributes:
+        db (sqlite3.Connection): The connection to the copy.
+        path (str): The file of the copy, None if it is in memory.
+    Methods:
+        index_joins(query): Adds the indexes the joins of a query lack.
+        close(): Closes the copy.
+    """
+
+    def __init__(self, source, path=None):
+        """
+        Args:
+            source (sqlite3.Connection): The read-only connection to the database to copy.
+            path (str): The file to copy it to, in memory if None.
+        """
+        self.path = path
+        self.db = sqlite3.connect(path or ':memory:', check_same_thread=False)
+        source.backup(self.db)
+        self._indexed = set()
+        for table_name, in self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+            for index in self.db.execute(f'PRAGMA index_list("{table_name}")').fetchall():
+                first_column = self.db.execute(f'PRAGMA index_info("{index[1]}")').fetchone()
+                if first_column:
+                    self._indexed.add((table_name.upper(), first_column[2].upper()))
+
+    def index_joins(self, query):
+        """Adds an index for each join of the query that matches on no column an index starts with"""
+        tables_indexed = set()
+        for table_name, alias, condition in _JOIN_RE.findall(query):
+            keys = [(table_name.upper(), column_name.upper())
+                    for qualifier, column_name in _COLUMN_RE.findall(condition) if qualifier.upper() == alias.upper()]
+            if not keys or any(key[1] == 'Z_PK' or key in self._indexed for key in keys):
+                continue
+            # The first column is the one the join is on, those after it narrow it down
+            self._indexed.add(keys[0])
+            try:
+                self.db.execute(f'CREATE INDEX "{INDEX_PREFIX}{table_name}_{keys[0][1]}" '
+                                f'ON "{table_name}" ("{keys[0][1]}")')
+                tables_indexed.add(table_name)
+            except sqlite3.Error:
+                pass  # not a column of this version of the table, null_absent_columns deals with it
+        if tables_indexed:
+            self.db.execute('PRAGMA analysis_limit = 1000')
+            for table_name in tables_indexed:
+                self.db.execute(f'ANALYZE "{table_name}"')
+            self.db.commit()
+
+    def close(self):
+        """Closes the copy and deletes its file"""
+        self.db.close()
+        if self.path:
+            os.remove(self.path)
+
+
+def _make_working_copy(path, source):
+    size = sum(os.path.getsize(file_path) for file_path in (path, f'{path}-wal') if os.path.isfile(file_path))
+    if size <= PHOTOS_MEMORY_LIMIT:
+        return PhotosWorkingCopy(source)
+    folder = os.path.join(Context.get_output_params().output_folder_base, WORKING_COPY_FOLDER_NAME)
+    os.makedirs(folder, exist_ok=True)
+    return PhotosWorkingCopy(source, os.path.join(folder, f'{os.getpid()}_{len(_working_copies)}.sqlite'))
+
+
+def get_photos_working_copy(path):
+    """Returns the PhotosWorkingCopy of a Photos.sqlite, made on first use, or None if it cannot be read"""
+    key = str(path)
+    if key not in _working_copies:
+        source = get_pooled_sqlite_db(path)
+        if not source:
+            return None
+        try:
+            _working_copies[key] = _make_working_copy(key, source)
+        except sqlite3.Error as ex:
+            logfunc(f'Error copying {path}: {str(ex)}')
+            _working_copies[key] = None
+    return _working_copies[key]
+
+
+def get_photos_db_records(path, query):
+    """
+    Runs a query of a Photos.sqlite artifact on the working copy of the database, with the
+    columns this version of the database lacks reported empty (see null_absent_columns).
+    Returns a cursor over sqlite3.Row records, as get_sqlite_db_records does, or [] on error.
+    """
+    query = null_absent_columns(path, query)
+    working_copy = get_photos_working_copy(path)
+    cursor = working_copy.db.cursor() if working_copy else get_pooled_sqlite_cursor(path)
+    if cursor is None:
+        return []
+    try:
+        if working_copy:
+            working_copy.index_joins(query)
+        cursor.row_factory = sqlite3.Row
+        cursor.execute(query)
+        return cursor
+    except sqlite3.Error as ex:
+        logfunc(f"Error with {path}:")
+        logfunc(f" - {str(ex)}")
+    return []
+
+
+def close_photos_working_copies():
+    """Closes the working copies made by this process"""
+    for working_copy in _working_copies.values():
+        if working_copy:
+            working_copy.close()
+    _working_copies.clear()
@@ -169,6 +169,11 @@ class PluginLoader:
                 # Add artifact_info to PluginSpec
                 self._plugins[name] = PluginSpec(name, py_file.stem, category, search, func, artifact_info)
 
+    @property
+    def plugin_paths(self) -> typing.List[pathlib.Path]:
+        """The artifact directories this loader was built from."""
+        return list(self._plugin_paths)
+
     @property
     def plugins(self) -> typing.Iterable[PluginSpec]:
         """
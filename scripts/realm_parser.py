@@ -4,8 +4,9 @@
 #   * the two crush framework imports below are replaced with minimal local
 #     shims so the module is self-contained (iLEAPP has no crush.core.vfs /
 #     crush.parsers.base); the RealmParser class is kept verbatim but iLEAPP
-#     calls the module-level parse_realm_file() helper appended at the end
-#     instead, which reads a plain file path and returns decoded tables.
+#     calls the module-level parse_realm_file() / realm_table_names() /
+#     realm_rows() helpers appended at the end instead, which read a plain
+#     file path through mmap and return decoded tables, names or rows.
 # The upstream author's copyright and SPDX header above are preserved.
 #
 # This is vendored third-party code kept faithful to upstream, so it is not
@@ -78,8 +79,10 @@ about its own BID-decode arithmetic, not about Realm's file layout).
 """
 from __future__ import annotations
 
+import contextlib
 import decimal
 import math
+import mmap
 import os
 import re
 import struct
@@ -2219,8 +2222,155 @@ class RealmParser(AbstractParser):
 
 
 # ---------------------------------------------------------------------------
-# iLEAPP entry point (added during vendoring; not part of the upstream file)
+# iLEAPP entry points (added during vendoring; not part of the upstream file)
 # ---------------------------------------------------------------------------
+#
+# The file is read through a read-only mmap rather than into a bytes object.
+# The decoders above only slice and index their buffer, so only the pages the
+# arrays they read live in are loaded. The header, the schemas and the layout
+# of each table read (its columns and ClusterTree leaves) are kept per path
+# for the run, so several artifacts reading the same file pay for them once,
+# and realm_rows() decodes only the columns of the table asked for, one leaf
+# at a time.
+
+class _RealmFile:
+    """The header, schemas and table layouts of a Realm file, read once."""
+
+    def __init__(self, data, stamp):
+        self.stamp = stamp
+        self.header = _parse_realm_header(data)
+        self.roots: dict[str, int] = {}
+        self.schemas: dict[str, list[str]] = {}
+        self._layouts: dict[tuple[str, str], dict[str, Any] | None] = {}
+        if not self.header:
+            return
+        top0 = int.from_bytes(data[0:8], "little")
+        top1 = int.from_bytes(data[8:16], "little")
+        active_index = self.header["Active top reference"]
+        self.roots["active"] = top1 if active_index == 1 else top0
+        self.roots["inactive"] = top0 if active_index == 1 else top1
+        for label, offset in self.roots.items():
+            self.schemas[label] = _extract_schema(data, offset, len(data))
+
+    def layout(self, data, section, class_name):
+        """The layout of a table (see _table_layout), None if it has none."""
+        key = (section, class_name)
+        if key not in self._layouts:
+            schema = self.schemas.get(section) or []
+            self._layouts[key] = _table_layout(data, self.roots[section], schema, class_name, len(data)) \
+                if class_name in schema else None
+        return self._layouts[key]
+
+
+_realm_files: dict[str, _RealmFile] = {}
+
+
+@contextlib.contextmanager
+def _mapped_realm(path):
+    """Yields the file at *path* as a read-only mmap (b"" when empty)."""
+    with open(path, "rb") as handle:
+        data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) \
+            if os.fstat(handle.fileno()).st_size else b""
+    try:
+        yield data
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def _get_realm_file(path, data):
+    stat = os.stat(path)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    realm = _realm_files.get(path)
+    if realm is None or realm.stamp != stamp:
+        realm = _realm_files[path] = _RealmFile(data, stamp)
+    return realm
+
+
+def _table_layout(data, root_offset, schema, class_name, file_size):
+    """Locate one table the way _extract_table_data() does, without decoding it.
+
+    Returns {column_names, key_map, leaves}, key_map being its column infos
+    by cluster slot, or None. When two tables share the name, the last one
+    that _extract_table_data() would decode is used, as parse_realm_file()
+    keeps the last one too.
+    """
+    root_hdr = _parse_array_header(data, root_offset)
+    if root_hdr is None or not root_hdr["has_refs"]:
+        return None
+    root_eb = _elem_bytes(root_hdr)
+    if root_eb < 1 or root_hdr["Element count (size)"] < 2:
+        return None
+    table_refs_off = _read_ref(data, root_offset + 8, 1, root_eb)
+    if table_refs_off <= 0 or table_refs_off >= file_size:
+        return None
+    tr_hdr = _parse_array_header(data, table_refs_off)
+    if tr_hdr is None or not tr_hdr["has_refs"]:
+        return None
+    tr_eb = _elem_bytes(tr_hdr)
+    num_tables = min(tr_hdr["Element count (size)"], len(schema))
+
+    for t_idx in reversed(range(num_tables)):
+        if schema[t_idx] != class_name:
+            continue
+        table_ref = _read_ref(data, table_refs_off + 8, t_idx, tr_eb)
+        if table_ref <= 0 or table_ref >= file_size:
+            continue
+        t_hdr = _parse_array_header(data, table_ref)
+        if t_hdr is None or not t_hdr["has_refs"] or t_hdr["Element count (size)"] < 3:
+            continue
+        t_eb = _elem_bytes(t_hdr)
+        cluster_root_ref = _read_ref(data, table_ref + 8, 2, t_eb)
+        if cluster_root_ref <= 0 or cluster_root_ref >= file_size:
+            continue
+        col_infos = _extract_column_info(data, table_ref, t_eb, file_size)
+        if not col_infos:
+            continue
+        leaves = _walk_cluster_leaves(data, cluster_root_ref, file_size)
+        if not leaves:
+            continue
+        return {
+            "column_names": _extract_column_names(data, table_ref, t_eb, file_size),
+            "key_map": {info["cluster_idx"]: info for info in col_infos},
+            "leaves": leaves,
+        }
+    return None
+
+
+def _iter_table_rows(data, layout, file_size):
+    """Decode a table leaf by leaf, as _extract_table_data() does, yielding
+    each row as a {column_name: value} dict."""
+    names = layout["column_names"]
+    key_map = layout["key_map"]
+    for leaf_ref, _ in layout["leaves"]:
+        leaf_hdr = _parse_array_header(data, leaf_ref)
+        if leaf_hdr is None or not leaf_hdr["has_refs"]:
+            continue
+        leaf_eb = _elem_bytes(leaf_hdr)
+        num_cluster = leaf_hdr["Element count (size)"]
+        leaf_row_count, _ = _read_cluster_key_info(data, leaf_ref, leaf_eb, file_size)
+        if leaf_row_count is None:
+            leaf_row_count = _derive_row_count(data, leaf_ref, num_cluster, leaf_eb, file_size) or 0
+
+        columns: dict[int, list[Any]] = {}
+        for c_idx in range(1, num_cluster):
+            col_info = key_map.get(c_idx)
+            if col_info is None:
+                continue
+            col_ref = _read_ref(data, leaf_ref + 8, c_idx, leaf_eb)
+            values = None
+            if 0 < col_ref < file_size:
+                values = _decode_column_values(data, col_ref, file_size, col_info)
+            if values is None:
+                values = [None] * leaf_row_count
+            elif len(values) < leaf_row_count:
+                values = values + [None] * (leaf_row_count - len(values))
+            columns[col_info["user_col_idx"]] = values
+
+        for i in range(leaf_row_count):
+            yield {name: columns[j][i] if j in columns else None for j, name in enumerate(names)}
+
+
 def parse_realm_file(path):
     """Parse an unencrypted Realm file at ``path``.
 
@@ -2229,54 +2379,57 @@ def parse_realm_file(path):
     'row_count'}. 'columns' is keyed by positional index; column_names[i] gives
     the property name for column i. Returns {'header': None, ...} when the file
     is not a decodable (e.g. encrypted or corrupt) Realm file.
+
+    This decodes every table; use realm_table_names() to check which classes a
+    file has and realm_rows() to read one of them.
     """
-    with open(path, "rb") as handle:
-        data = handle.read()
-    file_size = len(data)
-    header = _parse_realm_header(data)
-    result = {"header": header, "active": {}, "inactive": {}}
-    if not header:
-        return result
-    top0 = int.from_bytes(data[0:8], "little")
-    top1 = int.from_bytes(data[8:16], "little")
-    active_index = header["Active top reference"]
-    active_off = top1 if active_index == 1 else top0
-    inactive_off = top0 if active_index == 1 else top1
-    for label, offset in (("active", active_off), ("inactive", inactive_off)):
-        schema = _extract_schema(data, offset, file_size)
-        if not schema:
-            continue
-        key_map = _build_table_key_map(data, offset, schema, file_size)
-        for table in _extract_table_data(data, offset, schema, file_size, key_map):
-            result[label][table["name"]] = {
-                "column_names": table.get("column_names", []),
-                "column_types": table.get("column_types", []),
-                "columns": table.get("columns", {}),
-                "row_count": table.get("row_count", 0),
-            }
+    with _mapped_realm(path) as data:
+        file_size = len(data)
+        realm = _get_realm_file(path, data)
+        result = {"header": realm.header, "active": {}, "inactive": {}}
+        for label, offset in realm.roots.items():
+            schema = realm.schemas[label]
+            if not schema:
+                continue
+            key_map = _build_table_key_map(data, offset, schema, file_size)
+            for table in _extract_table_data(data, offset, schema, file_size, key_map):
+                result[label][table["name"]] = {
+                    "column_names": table.get("column_names", []),
+                    "column_types": table.get("column_types", []),
+                    "columns": table.get("columns", {}),
+                    "row_count": table.get("row_count", 0),
+                }
     return result
 
 
+def realm_table_names(path, section="active"):
+    """Return the class (table) names the schema of ``section`` declares.
+
+    Reads only the header and the schema, once per path for the run. A
+    missing file or one that is not a decodable Realm file has none.
+    """
+    if not path or not os.path.isfile(path):
+        return []
+    with _mapped_realm(path) as data:
+        return list(_get_realm_file(path, data).schemas.get(section, []))
+
+
 def realm_rows(path, class_name, section="active"):
     """Yield each row of ``class_name`` as a {column_name: value} dict.
 
-    Convenience wrapper over parse_realm_file() for iLEAPP artifacts. ``section``
-    is 'active' (live objects) or 'inactive' (the other top-ref: older/removed
-    schema state). Missing table or file yields nothing.
+    ``section`` is 'active' (live objects) or 'inactive' (the other top-ref:
+    older/removed schema state). Only the columns of ``class_name`` are
+    decoded, one ClusterTree leaf at a time. Missing table or file yields
+    nothing.
     """
     if not path or not os.path.isfile(path):
         # Artifacts pass '' when the app's Realm is not in the extraction. The
         # docstring above promises nothing rather than an exception, so honour it.
         return
-    table = parse_realm_file(path).get(section, {}).get(class_name)
-    if not table:
-        return
-    names = table["column_names"]
-    columns = table["columns"]
-    row_count = table["row_count"]
-    for i in range(row_count):
-        row = {}
-        for j, name in enumerate(names):
-            values = columns.get(j)
-            row[name] = values[i] if values is not None and i < len(values) else None
-        yield row
+    with _mapped_realm(path) as data:
+        realm = _get_realm_file(path, data)
+        if section not in realm.roots:
+            return
+        layout = realm.layout(data, section, class_name)
+        if layout:
+            yield from _iter_table_rows(data, layout, len(data))
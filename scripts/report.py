@@ -4,17 +4,18 @@ sidebar navigation, and the index summary page with case information and credits
 """
 
 import html
+import json
 import os
 from pathlib import Path
 import shutil
 
 from collections import OrderedDict
-from scripts.html_parts import nav_bar_script, nav_bar_script_footer, \
+from scripts.html_parts import nav_bar_script_footer, \
     page_header, page_footer, body_start, body_end, body_sidebar_setup, body_sidebar_trailer, \
     body_main_header, body_main_data_title, body_main_trailer, thank_you_note, credits_block, \
     individual_contributor, blog_icon, twitter_icon, github_icon, blank_icon, tabs_code, \
-    tabs_code_with_lava, body_sidebar_dynamic_data_placeholder
-from scripts.ilapfuncs import logfunc
+    tabs_code_with_lava, body_sidebar_data, sidebar_data_js
+from scripts.artifact_report import get_page_base_name, shard_folders
 from scripts.version_info import leapp_version, ileapp_contributors
 
 from leapp_functions.data_sources.text_files import get_txt_file_content
@@ -32,7 +33,8 @@ def generate_report(reportfolderbase, time_in_secs, time_hms, extraction_type, i
                     casedata, profile_filename, icons, lava_only):
     """
     Builds the full HTML report by assembling sidebar navigation from .temphtml artifact files,
-    writing final .html pages, and generating the index.html summary page.
+    moving them to their final .html names, and generating the index.html summary page.
+    The sidebar is written once, in _elements/sidebar_data.js, which every page loads.
     """
 
     tabler_icon_names = get_tabler_icon_names()
@@ -83,6 +85,8 @@ def generate_report(reportfolderbase, time_in_secs, time_hms, extraction_type, i
                         side_list[section_header] = []
                         nav_list_data += side_heading.format(section_header)
                     side_list[section_header].append(fullpath)
+                    if get_page_base_name(filename) is not None:
+                        continue  # Only the first page of a paged report is in the sidebar
                     icon_name = icons.get(section_header, {}).get(filename, "")
                     if not icon_name:
                         # Some modules write reports under runtime names that differ from the
@@ -108,31 +112,31 @@ def generate_report(reportfolderbase, time_in_secs, time_hms, extraction_type, i
                         '', tail.replace(".temphtml", ".html").replace(" ", "_"),
                         icon, filename.replace("_", " "))
 
-    # Now that we have all the file paths, start writing the files
+    # Now that we have all the file paths, move the pages to their final location. They
+    # load the sidebar from _elements/sidebar_data.js, so they are renamed as they are
+    # rather than rewritten with a copy of the sidebar each (issue #1746)
+
+    # The rows of large tables are in shard folders beside their page, which follow it
+    for shard_folder in sorted(shard_folders):
+        if os.path.isdir(shard_folder):
+            os.replace(shard_folder, os.path.join(reportfolderbase, '_HTML',
+                                                  os.path.basename(shard_folder).replace(" ", "_")))
+    shard_folders.clear()
 
     for _, path_list in side_list.items():
         for path in path_list:
             old_filename = os.path.basename(path)
             filename = old_filename.replace(".temphtml", ".html").replace(" ", "_")
-            # search for it in nav_list_data, then mark that one as 'active' tab
-            active_nav_list_data = mark_item_active(nav_list_data, filename) + nav_bar_script
-            # Stream the (potentially very large) artifact page to its final
-            # location, injecting the sidebar navigation without loading the
-            # whole file into memory (issue #1746).
-            dest_path = os.path.join(reportfolderbase, '_HTML', filename)
-            stream_insert_sidebar_code(path, dest_path, active_nav_list_data)
-
-            # Now delete .temphtml
-            os.remove(path)
-            # If dir is empty, delete it
-            try:
-                os.rmdir(os.path.dirname(path))
-            except OSError:
-                pass  # Perhaps it was not empty!
+            os.replace(path, os.path.join(reportfolderbase, '_HTML', filename))
+        # If dir is empty, delete it
+        try:
+            os.rmdir(os.path.dirname(path_list[0]))
+        except OSError:
+            pass  # Perhaps it was not empty!
 
     # Create index.html's page content
     create_index_html(reportfolderbase, time_in_secs, time_hms, extraction_type, image_input_path,
-                      nav_list_data, casedata, profile_filename, lava_only)
+                      casedata, profile_filename, lava_only)
     elements_folder = os.path.join(reportfolderbase, '_HTML', '_elements')
     __location__ = os.path.dirname(os.path.abspath(__file__))
 
@@ -147,6 +151,8 @@ def generate_report(reportfolderbase, time_in_secs, time_hms, extraction_type, i
         print("shutil reported an error. Maybe due to recursive directory copying.")
         if os.path.exists(os.path.join(elements_folder, 'MDB-Free_4.13.0')):
             print("_elements folder seems fine. Probably nothing to worry about")
+    with open(os.path.join(elements_folder, 'sidebar_data.js'), 'w', encoding='utf8') as f:
+        f.write(sidebar_data_js.format(json.dumps(nav_list_data)))
 
 
 def get_file_content(path):
@@ -158,7 +164,7 @@ def get_file_content(path):
 
 
 def create_index_html(reportfolderbase, time_in_secs, time_hms, extraction_type, image_input_path,
-                      nav_list_data, casedata, profile_filename, lava_only):
+                      casedata, profile_filename, lava_only):
     '''Write out the index.html page to the report folder'''
     case_list = []
     agency_logo_mimetype = ''
@@ -238,14 +244,13 @@ def create_index_html(reportfolderbase, time_in_secs, time_hms, extraction_type,
     body_heading = 'iOS Logs, Events, And Plists Parser'
     body_description = 'iLEAPP is an open source project that aims to parse '\
         'every known iOS artifact for the purpose of forensic analysis.'
-    active_nav_list_data = mark_item_active(nav_list_data, filename) + nav_bar_script
 
     html_reportfolderbase = Path(reportfolderbase).joinpath('_HTML')
     html_reportfolderbase.mkdir(exist_ok=True)
     with html_reportfolderbase.joinpath(filename).open('w', encoding='utf8') as f:
         f.write(page_header.format(page_title))
         f.write(body_start.format(f"iLEAPP {leapp_version}"))
-        f.write(body_sidebar_setup + active_nav_list_data + body_sidebar_trailer)
+        f.write(body_sidebar_setup + body_sidebar_data + body_sidebar_trailer)
         f.write(body_main_header + body_main_data_title.format(body_heading, body_description))
         f.write(content)
         f.write(thank_you_note)
@@ -322,59 +327,3 @@ def generate_key_val_table_without_headings(title, data_list, agency_logo_mimety
     code += table_footer_code
 
     return code
-
-
-def stream_insert_sidebar_code(src_path, dest_path, sidebar_code):
-    """Copy the artifact page from src_path to dest_path, replacing the first
-    sidebar placeholder with sidebar_code, without loading the whole file into
-    memory.
-
-    Artifact pages can grow to several GB for large extractions, so reading an
-    entire page and concatenating strings (the previous approach) could exhaust
-    memory and raise MemoryError during report generation (issue #1746). The
-    placeholder is written near the top of every page, so only a small head
-    buffer is retained while searching for it; the large table body that
-    follows is streamed to the destination in fixed-size chunks."""
-    placeholder = body_sidebar_dynamic_data_placeholder
-    marker_len = len(placeholder)
-    chunk_size = 1024 * 1024  # 1 MiB
-    keep = marker_len - 1  # bytes a placeholder split across a chunk could span
-    with open(src_path, 'r', encoding='utf8') as src, \
-            open(dest_path, 'w', encoding='utf8') as dst:
-        buffer = ''
-        inserted = False
-        while True:
-            chunk = src.read(chunk_size)
-            if not chunk:
-                break
-            buffer += chunk
-            pos = buffer.find(placeholder)
-            if pos >= 0:
-                dst.write(buffer[:pos])
-                dst.write(sidebar_code)
-                dst.write(buffer[pos + marker_len:])
-                buffer = ''
-                inserted = True
-                # Copy the remainder of the (large) file in bounded chunks.
-                shutil.copyfileobj(src, dst, chunk_size)
-                break
-            # Placeholder not found yet: flush everything except a small tail
-            # that could still hold a placeholder split across the boundary.
-            if len(buffer) > keep:
-                dst.write(buffer[:-keep])
-                buffer = buffer[-keep:]
-        if not inserted:
-            if buffer:
-                dst.write(buffer)
-            logfunc(f'Error, could not find {placeholder} in file {src_path}')
-
-
-def mark_item_active(data, itemname):
-    '''Finds itemname in data, then marks that node as active. Return value is changed data'''
-    pos = data.find(f'" href="{itemname}"')
-    if pos < 0:
-        logfunc(f'Error, could not find {itemname} in {data}')
-        return data
-    else:
-        ret = data[0: pos] + " active" + data[pos:]
-        return ret
@@ -6,6 +6,7 @@ metadata (creation/modification dates), and decrypting encrypted iTunes backups.
 
 Classes:
     FileInfo: Container for file metadata (source path, creation date, modification date)
+    PatternIndex: Matches many search patterns against a file listing in one pass
     FileSeekerBase: Abstract base class for file searching implementations
     FileSeekerDir: File seeker for local directories
     FileSeekerItunes: File seeker for iTunes backups (supports encryption)
@@ -21,12 +22,15 @@ Functions:
 """
 
 import time as timex
+import contextlib
 import fnmatch
 import os
 import tarfile
 import hashlib
 import struct
 
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from shutil import copy2
 from zipfile import ZipFile
@@ -41,8 +45,14 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from scripts.ilapfuncs import get_plist_file_content, get_plist_content, logfunc, \
     is_platform_windows, open_sqlite_db_readonly, sanitize_file_path
 from scripts.filetype import guess_mime
+from scripts.extraction_cache import ExtractionCache, DEFAULT_MAX_SIZE
+from scripts.evidence_index import get_index_path, load_files, load_tar_members, save_files, save_tar_members
+from scripts.gzip_index import GzipIndexedReader, open_indexed_gzip, save_gzip_index
 
 normcase = lru_cache(maxsize=None)(os.path.normcase)
+_DECRYPTION_CHUNK_SIZE = 1024 * 1024
+# Files of an encrypted backup decrypted ahead of the searches for them at any one time
+_DECRYPTION_PREFETCH = 32
 domains = {
     "AppDomain-": "private/var/mobile/Containers/Data/Application",
     "AppDomainGroup-": "private/var/mobile/Containers/Shared/AppGroup",
@@ -277,19 +287,248 @@ class FileInfo:
         self.modification_date = modification_date
 
 
+_GLOB_CHARS = frozenset('*?[]')
+
+
+def _literal_parts(pattern):
+    """
+    Returns the literal parts that any path a normcased pattern matches must contain, as
+    (file name, extension, directory names): its file name if it ends in one
+    ("*/Library/SMS/sms.db"), otherwise its extension if it ends in one
+    ("*/Caches/*.sqlite"), and the names between two slashes ("*/Library/SMS/sms.db*").
+    None and [] for the parts it does not have.
+    """
+    parts = pattern.split(normcase('/'))
+    name = parts[-1] if len(parts) > 1 else None
+    directories = [part for part in parts[1:-1] if part and not _GLOB_CHARS.intersection(part)]
+    if not name:
+        return None, None, directories
+    if not _GLOB_CHARS.intersection(name):
+        return name, None, directories
+    extension = name[name.rfind('.'):] if '.' in name else None
+    if extension and _GLOB_CHARS.intersection(extension):
+        extension = None
+    return None, extension, directories
+
+
+class PatternIndex:
+    """
+    Matches a set of search patterns against a file listing in a single pass.
+    Searching pattern by pattern costs one regex call per pattern per file. Instead each
+    pattern is filed under a literal part that any path it matches must contain, and
+    each path is only tested against the patterns filed under parts it has:
+        - its file name, for patterns ending in one ("*/Library/SMS/sms.db")
+        - its extension, for patterns ending in one ("*/Caches/*.sqlite")
+        - a directory name, the deepest one between two slashes ("*/Library/SMS/sms.db*")
+    Patterns with none of these ("*.db*") are tested against every path.
+    Attributes:
+        patterns (list): The distinct patterns of the index, in the order given.
+    Methods:
+        match_all(paths): Returns the paths matched by each pattern.
+    """
+
+    def __init__(self, filepatterns):
+        self.patterns = list(dict.fromkeys(filepatterns))
+        self._by_name = {}
+        self._by_extension = {}
+        self._by_directory = {}
+        self._unbucketed = []
+        for filepattern in self.patterns:
+            pattern = normcase(filepattern)
+            entry = (filepattern, _compile_pattern(pattern))
+            name, extension, directories = _literal_parts(pattern)
+            if name:
+                self._by_name.setdefault(name, []).append(entry)
+            elif extension:
+                self._by_extension.setdefault(extension, []).append(entry)
+            elif directories:
+                self._by_directory.setdefault(directories[-1], []).append(entry)
+            else:
+                self._unbucketed.append(entry)
+
+    def match_all(self, paths):
+        """
+        Tests every path against the patterns filed under its file name, extension and
+        directory names.
+        Args:
+            paths (iterable): Source paths, matched as "root/" + path like FileSeekerDir.search.
+        Returns:
+            dict: Each pattern mapped to the list of paths it matched, in listing order.
+        """
+        matches = {filepattern: [] for filepattern in self.patterns}
+        root = normcase('root/')
+        sep = normcase('/')
+        by_name = self._by_name
+        by_extension = self._by_extension
+        by_directory = self._by_directory
+        unbucketed = self._unbucketed
+        for path in paths:
+            candidate = root + normcase(path)
+            parts = candidate.split(sep)
+            name = parts[-1]
+            entries = list(by_name.get(name, ()))
+            dot = name.rfind('.')
+            if dot != -1:
+                entries.extend(by_extension.get(name[dot:], ()))
+            for directory in set(parts[:-1]):
+                entries.extend(by_directory.get(directory, ()))
+            entries.extend(unbucketed)
+            for filepattern, pat in entries:
+                if pat(candidate) is not None:
+                    matches[filepattern].append(path)
+        return matches
+
+
+class PathIndex:
+    """
+    Narrows a search pattern to the paths of a file listing that can match it, so that
+    searching one pattern does not test it against every path. The counterpart of
+    PatternIndex: each path is filed under its file name, its extension and the names of
+    its directories, and a pattern is only tested against the paths filed under the
+    literal part of it (see PatternIndex) that the fewest paths have. Directory names are
+    filed per directory rather than per path, so the index stays about the size of the
+    listing. Patterns with no literal part are tested against every path.
+    Methods:
+        candidates(filepattern): Returns the positions, in listing order, of the paths
+            the pattern may match.
+    """
+
+    def __init__(self, paths):
+        by_name = self._by_name = defaultdict(list)
+        by_extension = self._by_extension = defaultdict(list)
+        directory_paths = self._directory_paths = defaultdict(list)  # directory -> positions of the paths in it
+        sep = normcase('/')
+        position = -1
+        for position, path in enumerate(paths):
+            directory, _, name = normcase(path).rpartition(sep)
+            by_name[name].append(position)
+            dot = name.rfind('.')
+            if dot != -1:
+                by_extension[name[dot:]].append(position)
+            directory_paths[directory].append(position)
+        self._count = position + 1
+        by_directory = self._by_directory = defaultdict(list)  # directory name -> directories with it in their path
+        directory_counts = self._directory_counts = defaultdict(int)  # directory name -> number of paths under it
+        for directory, positions in directory_paths.items():
+            for directory_name in set(directory.split(sep)):
+                by_directory[directory_name].append(directory)
+                directory_counts[directory_name] += len(positions)
+
+    def candidates(self, filepattern):
+        """
+        Returns the positions of the paths that may match a pattern, in listing order.
+        Every path that matches it is among them.
+        """
+        name, extension, directories = _literal_parts(normcase(filepattern))
+        best = None  # (number of candidates, positions or the directory name to gather them from)
+        if name is not None:
+            best = (len(self._by_name.get(name, ())), self._by_name.get(name, []))
+        elif extension is not None:
+            best = (len(self._by_extension.get(extension, ())), self._by_extension.get(extension, []))
+        for directory_name in directories:
+            count = self._directory_counts.get(directory_name, 0)
+            if best is None or count < best[0]:
+                best = (count, directory_name)
+        if best is None:
+            return range(self._count)
+        if isinstance(best[1], list):
+            return best[1]
+        positions = []
+        for directory in self._by_directory.get(best[1], ()):
+            positions.extend(self._directory_paths[directory])
+        positions.sort()
+        return positions
+
+
 class FileSeekerBase:
     """
     Abstract base class for file seeking operations.
     This class provides an interface for searching files and performing cleanup operations
     in different storage contexts (e.g., filesystem, archives, databases).
     """
+    supports_lazy_extraction = False
+
+    def __init__(self):
+        self._extraction_cache = None
+        self._defer_extraction = False
+        self._lazy_members = {}
+        self._member_keys = {}
+        self._deferred = set()
+        self._path_index = None
+        self._pid = os.getpid()
+
+    def __getstate__(self):
+        # The path index is rebuilt on first use rather than sent to a worker process
+        state = self.__dict__.copy()
+        state['_path_index'] = None
+        return state
+
     def search(self, filepattern, return_on_first_hit=False):
         '''Returns a list of paths for files/folders that matched'''
         raise NotImplementedError
 
+    def index_patterns(self, filepatterns):
+        '''Optionally prepares the patterns that will be searched, so that each search is cheaper'''
+
     def cleanup(self):
         '''close any open handles'''
 
+    def reopen(self):
+        '''
+        Opens the handles of the seeker again if another process opened them. A worker
+        process of the artifact pool calls it first: a forked worker inherits the open
+        archive of the main process, and reading it through the same file offset as the
+        main process and the other workers returns corrupt data.
+        '''
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._reopen()
+
+    def _reopen(self):
+        '''Opens the handles of the seeker again, in a process other than the one that opened them'''
+
+    def enable_lazy_extraction(self, cache_folder, max_size=DEFAULT_MAX_SIZE):
+        '''Defers extracting the matches of artifacts that declare "lazy_extraction"'''
+        if not self.supports_lazy_extraction:
+            raise NotImplementedError(f'{type(self).__name__} does not support lazy extraction')
+        self._extraction_cache = ExtractionCache(cache_folder, max_size, on_evict=self._deferred.add)
+
+    def share_extraction_cache(self, processes):
+        '''
+        Splits the size cap of the extraction cache evenly between the processes of a run.
+        Each process keeps its own count of what it stored, so together they stay under
+        the cap only if each has a share of it.
+        '''
+        if self._extraction_cache:
+            self._extraction_cache.max_size //= processes
+
+    @contextlib.contextmanager
+    def artifact_scope(self, lazy_extraction=False):
+        '''
+        Searches and reads made within the scope are for one artifact. If lazy extraction
+        is enabled and the artifact declares "lazy_extraction", its matches are not
+        extracted until they are read. Files extracted within the scope cannot be evicted
+        until it ends.
+        '''
+        previous = self._defer_extraction
+        self._defer_extraction = bool(lazy_extraction) and self._extraction_cache is not None
+        try:
+            yield self
+        finally:
+            self._defer_extraction = previous
+            if self._extraction_cache:
+                self._extraction_cache.unpin()
+
+    def materialize(self, path):
+        '''Makes sure a file returned by search() is on disk before it is read. Returns the path.'''
+        return path
+
+    def _candidates(self, paths, filepattern):
+        '''Returns the positions in paths, the listing of the seeker, of the paths a pattern may match'''
+        if self._path_index is None:
+            self._path_index = PathIndex(paths)
+        return self._path_index.candidates(filepattern)
+
 
 class FileSeekerDir(FileSeekerBase):
     """
@@ -303,23 +542,37 @@ class FileSeekerDir(FileSeekerBase):
         searched (dict): Cache of search results, mapping file patterns to lists of matched paths.
         copied (dict): Mapping of source file paths to their copied destination paths.
         file_infos (dict): Dictionary storing FileInfo objects with metadata for copied files.
+        _indexed_matches (dict): Source paths matched by each pattern passed to index_patterns().
+        index_folder (str): The folder of the evidence indexes, or None to not keep one.
     Methods:
         build_files_list(directory): Recursively scans directory and populates _all_files list.
+            With an index_folder, the listing is loaded from the evidence index when it
+            has one, and saved there otherwise.
+        index_patterns(filepatterns): Matches all the patterns against _all_files in one pass.
         search(filepattern, return_on_first_hit=False, force=False): Searches for files matching
             the given pattern, copies them to data_folder, and returns matching paths.
     """
 
-    def __init__(self, directory, data_folder):
+    def __init__(self, directory, data_folder, index_folder=None):
         FileSeekerBase.__init__(self)
         self.directory = directory
         self._all_files = []
         self.data_folder = data_folder
-        logfunc('Building files listing...')
-        self.build_files_list(directory)
-        logfunc(f'File listing complete - {len(self._all_files)} files')
+        self.index_folder = index_folder
+        indexed_files = load_files(directory, index_folder) if index_folder else None
+        if indexed_files is not None:
+            self._all_files = [indexed_file.path for indexed_file in indexed_files]
+            logfunc(f'File listing loaded from the evidence index - {len(self._all_files)} files')
+        else:
+            logfunc('Building files listing...')
+            self.build_files_list(directory)
+            logfunc(f'File listing complete - {len(self._all_files)} files')
+            if index_folder:
+                self._save_files_list()
         self.searched = {}
         self.copied = {}
         self.file_infos = {}
+        self._indexed_matches = {}
 
     def build_files_list(self, directory):
         '''Populates all paths in directory into _all_files'''
@@ -332,42 +585,62 @@ class FileSeekerDir(FileSeekerBase):
         except OSError as ex:
             logfunc(f'Error reading {directory} ' + str(ex))
 
+    def _save_files_list(self):
+        files = []
+        for item in self._all_files:
+            try:
+                stat = os.lstat(item)
+                files.append((item, stat.st_size, stat.st_mtime, stat.st_ctime, None))
+            except OSError:
+                files.append((item, None, None, None, None))
+        save_files(self.directory, self.index_folder, files)
+
+    def index_patterns(self, filepatterns):
+        '''Matches every pattern against _all_files in one pass, for search() to look up'''
+        logfunc(f'Indexing {len(filepatterns)} search patterns...')
+        self._indexed_matches.update(PatternIndex(filepatterns).match_all(self._all_files))
+
     def search(self, filepattern, return_on_first_hit=False, force=False):
         if filepattern in self.searched and not force:
             pathlist = self.searched[filepattern]
             return self.searched[filepattern][0] if return_on_first_hit and pathlist else pathlist
         pathlist = []
-        pat = _compile_pattern(normcase(filepattern))
-        root = normcase("root/")
-        for item in self._all_files:
-            if pat(root + normcase(item)) is not None:
-                item_rel_path = item.replace(self.directory, '')
-                data_path = os.path.join(self.data_folder, item_rel_path[1:])
-                if is_platform_windows():
-                    data_path = data_path.replace('/', '\\')
-                if item not in self.copied or force:
-                    try:
-                        if os.path.isdir(item):
-                            pass
-                        elif os.path.isfile(item):
-                            os.makedirs(os.path.dirname(data_path), exist_ok=True)
-                            copy2(item, data_path)
-                            self.copied[item] = data_path
-                            creation_date = Path(item).stat().st_ctime
-                            modification_date = Path(item).stat().st_mtime
-                            file_info = FileInfo(item, creation_date, modification_date)
-                            self.file_infos[data_path] = file_info
-                        else:
-                            logfunc(f"INFO: Item '{item}' is neither a file nor a directory "
-                                    "(e.g. symlink not followed, or broken). Skipped.")
-                    except OSError as ex:
-                        logfunc(f'Could not copy {item} to {data_path} ' + str(ex))
-                else:
-                    data_path = self.copied[item]
-                pathlist.append(data_path)
-                if return_on_first_hit:
-                    self.searched[filepattern] = pathlist
-                    return data_path
+        if filepattern in self._indexed_matches:
+            matched_items = self._indexed_matches[filepattern]
+        else:
+            pat = _compile_pattern(normcase(filepattern))
+            root = normcase("root/")
+            candidates = self._candidates(self._all_files, filepattern)
+            matched_items = (self._all_files[position] for position in candidates
+                             if pat(root + normcase(self._all_files[position])) is not None)
+        for item in matched_items:
+            item_rel_path = item.replace(self.directory, '')
+            data_path = os.path.join(self.data_folder, item_rel_path[1:])
+            if is_platform_windows():
+                data_path = data_path.replace('/', '\\')
+            if item not in self.copied or force:
+                try:
+                    if os.path.isdir(item):
+                        pass
+                    elif os.path.isfile(item):
+                        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+                        copy2(item, data_path)
+                        self.copied[item] = data_path
+                        creation_date = Path(item).stat().st_ctime
+                        modification_date = Path(item).stat().st_mtime
+                        file_info = FileInfo(item, creation_date, modification_date)
+                        self.file_infos[data_path] = file_info
+                    else:
+                        logfunc(f"INFO: Item '{item}' is neither a file nor a directory "
+                                "(e.g. symlink not followed, or broken). Skipped.")
+                except OSError as ex:
+                    logfunc(f'Could not copy {item} to {data_path} ' + str(ex))
+            else:
+                data_path = self.copied[item]
+            pathlist.append(data_path)
+            if return_on_first_hit:
+                self.searched[filepattern] = pathlist
+                return data_path
         self.searched[filepattern] = pathlist
         return pathlist
 
@@ -389,20 +662,35 @@ class FileSeekerItunes(FileSeekerBase):
         searched (dict): A dictionary storing search results for file patterns.
         copied (dict): A dictionary tracking copied files and their destinations.
         file_infos (dict): A dictionary storing file information such as creation and modification dates.
+        index_folder (str): The folder of the evidence indexes, or None to not keep one.
+        _indexed_dates (dict): The creation and modification dates of each hash filename,
+            when the listing was loaded from or saved to the evidence index.
+        _decryptions (dict): The decryption of each file of an encrypted backup, queued on a
+            thread pool by search() for all its matches at once, or ahead of the artifacts
+            that search for it. Each file is decrypted a chunk at a time.
+        _prefetch_queue (deque): The files matched by the patterns passed to index_patterns(),
+            decrypted in order with at most _DECRYPTION_PREFETCH of them queued at a time.
     Methods:
-        __init__(directory, data_folder, backup_type, decryption_keys):
+        __init__(directory, data_folder, backup_type, decryption_keys, index_folder=None):
             Initializes the FileSeekerItunes instance and builds the file listing based on the backup type.
+            With an index_folder, the listing of an unencrypted backup is loaded from the
+            evidence index when it has one, and saved there otherwise. The listing of an
+            encrypted backup is never saved, as its Manifest.db is itself encrypted.
         get_root_path_from_domain(domain):
             Retrieves the root path associated with a given domain.
         build_files_list_from_manifest_db(manifest_path):
             Populates paths from Manifest.db files into _all_files.
         build_files_list_from_manifest_mbdb(manifest_path):
             Populates paths from Manifest.mbdb files into _all_files.
+        index_patterns(filepatterns):
+            Starts decrypting the files the patterns match, if the backup is encrypted.
         search(filepattern, return_on_first_hit=False, force=False):
             Searches for files matching the given pattern and returns their paths.
+        cleanup():
+            Stops the decryption of files no search has asked for yet.
     """
 
-    def __init__(self, directory, data_folder, backup_type, decryption_keys):
+    def __init__(self, directory, data_folder, backup_type, decryption_keys, index_folder=None):
         FileSeekerBase.__init__(self)
         self.directory = directory
         self._all_files = {}
@@ -411,6 +699,22 @@ class FileSeekerItunes(FileSeekerBase):
         self.files_metadata = {}
         self.decryption_keys = decryption_keys
         self.backup_type = backup_type
+        self.index_folder = index_folder if not decryption_keys else None
+        self._indexed_dates = {}
+        self._decryption_pool = None
+        self._decryptions = {}
+        self._prefetch_queue = deque()
+        self._prefetching = set()
+        self.searched = {}
+        self.copied = {}
+        self.file_infos = {}
+        indexed_files = load_files(directory, self.index_folder) if self.index_folder else None
+        if indexed_files is not None:
+            for indexed_file in indexed_files:
+                self._all_files[indexed_file.path] = indexed_file.ref
+                self._indexed_dates[indexed_file.ref] = (indexed_file.ctime, indexed_file.mtime)
+            logfunc(f'File listing loaded from the evidence index - {len(self._all_files)} files')
+            return
         logfunc('Building files listing...')
         if backup_type == "db":
             manifest_path = os.path.join(directory, "Manifest.db")
@@ -430,9 +734,31 @@ class FileSeekerItunes(FileSeekerBase):
             manifest_path = os.path.join(directory, "Manifest.mbdb")
             self.build_files_list_from_manifest_mbdb(manifest_path)
         logfunc(f'File listing complete - {len(self._all_files)} files')
-        self.searched = {}
-        self.copied = {}
-        self.file_infos = {}
+        if self.index_folder:
+            self._save_files_list()
+
+    def _get_file_dates(self, hash_filename):
+        if hash_filename in self._indexed_dates:
+            return self._indexed_dates[hash_filename]
+        if self.backup_type == "db":
+            metadata = get_plist_content(self.files_metadata[hash_filename])
+            return metadata.get('Birth', 0), metadata.get('LastModified', 0)
+        # TO DO: extract creation and modification dates from manifest.mbdb
+        return 0, 0
+
+    def _save_files_list(self):
+        files = []
+        for full_path, hash_filename in self._all_files.items():
+            size = None
+            creation_date, modification_date = 0, 0
+            if self.backup_type == "db":
+                metadata = get_plist_content(self.files_metadata[hash_filename])
+                size = metadata.get('Size')
+                creation_date, modification_date = metadata.get('Birth', 0), metadata.get('LastModified', 0)
+                # Kept so that search() does not parse the metadata again
+                self._indexed_dates[hash_filename] = (creation_date, modification_date)
+            files.append((full_path, size, modification_date, creation_date, hash_filename))
+        save_files(self.directory, self.index_folder, files)
 
     def get_root_path_from_domain(self, domain):
         """
@@ -553,61 +879,120 @@ class FileSeekerItunes(FileSeekerBase):
             logfunc(f'Error opening Manifest.mbdb from {self.directory}, ' + str(ex))
             raise ex
 
+    def __getstate__(self):
+        # A worker process starts a decryption pool of its own if it searches again
+        state = FileSeekerBase.__getstate__(self)
+        state['_decryption_pool'] = None
+        state['_decryptions'] = {}
+        state['_prefetch_queue'] = deque()
+        state['_prefetching'] = set()
+        return state
+
+    def _reopen(self):
+        # A forked process inherits the decryption pool without its threads, so nothing
+        # it submits there would ever run
+        self._decryption_pool = None
+        self._decryptions = {}
+        self._prefetch_queue = deque()
+        self._prefetching = set()
+
+    def _data_path(self, relative_path):
+        data_path = os.path.join(self.data_folder, sanitize_file_path(relative_path))
+        if is_platform_windows():
+            data_path = data_path.replace('/', '\\')
+        return data_path
+
+    def _original_location(self, hash_filename):
+        if self.backup_type == "db":
+            return os.path.join(self.directory, hash_filename[:2], hash_filename)
+        return os.path.join(self.directory, hash_filename)
+
+    def index_patterns(self, filepatterns):
+        '''Starts decrypting the files matched by the patterns of an encrypted backup, in order'''
+        if not self.decryption_keys:
+            return
+        matches = PatternIndex(filepatterns).match_all(self._all_files)
+        for filepattern in dict.fromkeys(filepatterns):
+            # search() matches the relative paths without the "root/" prefix PatternIndex adds
+            self._prefetch_queue.extend(fnmatch.filter(matches[filepattern], filepattern))
+        self._prefetch()
+
+    def _prefetch(self):
+        '''Queues the next files of _prefetch_queue, up to _DECRYPTION_PREFETCH decryptions at a time'''
+        self._prefetching = {future for future in self._prefetching if not future.done()}
+        while self._prefetch_queue and len(self._prefetching) < _DECRYPTION_PREFETCH:
+            future = self._start_decryption(self._prefetch_queue.popleft())
+            if not future.done():
+                self._prefetching.add(future)
+
+    def _start_decryption(self, relative_path):
+        '''Queues the decryption of a file on the decryption pool, unless already queued'''
+        original_location = self._original_location(self._all_files[relative_path])
+        future = self._decryptions.get(original_location)
+        if future is None:
+            if self._decryption_pool is None:
+                self._decryption_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1),
+                                                           thread_name_prefix='itunes-decryption')
+            future = self._decryption_pool.submit(
+                self._decrypt_file, self._all_file_meta[relative_path], original_location,
+                self._data_path(relative_path))
+            self._decryptions[original_location] = future
+        return future
+
+    def _decrypt_file(self, file_meta, original_location, data_path):
+        '''Decrypts a file of an encrypted backup to data_path, a chunk at a time'''
+        protection_classes = self.decryption_keys[0]
+        if file_meta['Class'] not in protection_classes:
+            raise KeyError(file_meta['Class'])
+        # Grab the file's key
+        file_unwrapped_key = crypt.aes_key_unwrap(protection_classes[file_meta['Class']]['Unwrapped'],
+                                                  file_meta['Key'])
+        # Apple uses a 0'd out 16-byte IV
+        decryptor = Cipher(algorithms.AES(file_unwrapped_key), modes.CBC(b'\x00' * 16)).decryptor()
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        # Only write the expected size, no padding
+        remaining = file_meta['Size']
+        with open(original_location, "rb") as original_file, open(data_path, "wb") as decrypted_file:
+            for chunk in iter(lambda: original_file.read(_DECRYPTION_CHUNK_SIZE), b''):
+                decrypted = decryptor.update(chunk)
+                if remaining > 0:
+                    decrypted_file.write(decrypted[:remaining])
+                    remaining -= len(decrypted)
+            decryptor.finalize()
+
     def search(self, filepattern, return_on_first_hit=False, force=False):
         if filepattern in self.searched and not force:
             pathlist = self.searched[filepattern]
             return self.searched[filepattern][0] if return_on_first_hit and pathlist else pathlist
         pathlist = []
         matching_keys = fnmatch.filter(self._all_files, filepattern)
+        if self.decryption_keys:
+            # Queue all the matches first, so that they are decrypted in parallel
+            for relative_path in matching_keys[:1] if return_on_first_hit else matching_keys:
+                original_location = self._original_location(self._all_files[relative_path])
+                if original_location not in self.copied or force:
+                    if force and original_location in self.copied:
+                        self._decryptions.pop(original_location, None)
+                    self._start_decryption(relative_path)
+            self._prefetch()
         for relative_path in matching_keys:
             hash_filename = self._all_files[relative_path]
-            if self.backup_type == "db":
-                original_location = os.path.join(self.directory, hash_filename[:2], hash_filename)
-                metadata = get_plist_content(self.files_metadata[hash_filename])
-                creation_date = metadata.get('Birth', 0)
-                modification_date = metadata.get('LastModified', 0)
-            else:
-                original_location = os.path.join(self.directory, hash_filename)
-                # TO DO: extract creation and modification dates from manifest.mbdb
-                creation_date = 0
-                modification_date = 0
-            data_path = os.path.join(self.data_folder, sanitize_file_path(relative_path))
-            if is_platform_windows():
-                data_path = data_path.replace('/', '\\')
+            original_location = self._original_location(hash_filename)
+            creation_date, modification_date = self._get_file_dates(hash_filename)
+            data_path = self._data_path(relative_path)
             if original_location not in self.copied or force:
                 try:
-                    os.makedirs(os.path.dirname(data_path), exist_ok=True)
-
                     # Handle encrypted backups differently, don't just copy the encrypted files
                     if self.decryption_keys:
-                        protection_classes = self.decryption_keys[0]
-                        # Snag the right protection class
-                        tmp_file_meta = self._all_file_meta[relative_path]
-                        if tmp_file_meta['Class'] not in protection_classes:
-                            logfunc(f'Can\'t locate the protection class for {relative_path}: {tmp_file_meta["Class"]}')
-                            raise KeyError
-                        tmp_protection_class = protection_classes[tmp_file_meta['Class']]
-
-                        # Grab the file's key
-                        tmp_file_wrapped_key = tmp_file_meta['Key']
-                        tmp_file_unwrapped_key = crypt.aes_key_unwrap(tmp_protection_class['Unwrapped'],
-                                                                      tmp_file_wrapped_key)
-
-                        # Open the file and snag the contents
-                        with open(original_location, "rb") as temp_original_file:
-                            # Decrypt the contents, Apple uses a 0'd out 16-byte IV
-                            cipher = Cipher(
-                                algorithms.AES(tmp_file_unwrapped_key),
-                                modes.CBC(b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'))
-                            decryptor = cipher.decryptor()
-                            decrypted_contents = decryptor.update(temp_original_file.read()) + decryptor.finalize()
-
-                            # Write the decrypt into the expected located, only write the expected size, no padding
-                            with open(data_path, "wb") as temp_new_file:
-                                temp_new_file.write(decrypted_contents[0:tmp_file_meta['Size']])
+                        try:
+                            self._start_decryption(relative_path).result()
+                        except KeyError as ex:
+                            logfunc(f'Can\'t locate the protection class for {relative_path}: {ex}')
+                            raise
 
                     # If not encrypted, just copy the thing
                     else:
+                        os.makedirs(os.path.dirname(data_path), exist_ok=True)
                         copy2(original_location, data_path)
 
                     source_path = relative_path.replace('\\', '/')
@@ -625,47 +1010,163 @@ class FileSeekerItunes(FileSeekerBase):
         self.searched[filepattern] = pathlist
         return pathlist
 
+    def cleanup(self):
+        self._prefetch_queue.clear()
+        if self._decryption_pool is not None:
+            self._decryption_pool.shutdown(cancel_futures=True)
+            self._decryption_pool = None
+
 
-class FileSeekerTar(FileSeekerBase):
+class FileSeekerArchive(FileSeekerBase):
     """
-    This is a class that extends FileSeekerBase to facilitate searching and extracting files
+    Base class of the seekers that extract their matches from an archive.
+
+    They can defer extraction (see enable_lazy_extraction()): for artifacts that declare
+    "lazy_extraction", search() returns the paths matches will be extracted to, and each
+    file is only extracted by materialize(), which the file helpers of scripts/ilapfuncs.py
+    call when the artifact first reads it.
+    """
+    supports_lazy_extraction = True
+
+    def materialize(self, path):
+        '''
+        Extracts a file returned by search() if its extraction was deferred, along with
+        its SQLite journal files. Returns the path.
+        '''
+        if path in self._deferred:
+            for deferred_path in (path, f'{path}-wal', f'{path}-shm', f'{path}-journal'):
+                if deferred_path in self._deferred:
+                    self._extract_deferred(deferred_path, evictable=self._defer_extraction)
+        return path
+
+    def _defer_member(self, member, path):
+        self._lazy_members[path] = member
+        self._deferred.add(path)
+
+    def _materialize_found(self, found):
+        '''Extracts deferred matches returned to an artifact that reads files directly'''
+        if self._deferred and not self._defer_extraction:
+            for path in [found] if isinstance(found, str) else found:
+                self.materialize(path)
+        return found
+
+    def _extract_deferred(self, path, evictable):
+        member = self._lazy_members[path]
+        try:
+            key = self._member_keys.get(path)
+            if not key or not self._extraction_cache.link(key, path, evictable):
+                with self._open_member(member) as source:
+                    self._member_keys[path] = self._extraction_cache.store(source, path, evictable)
+            self._deferred.discard(path)
+            mtime = self._member_mtime(member)
+            if mtime is not None:
+                os.utime(path, (mtime, mtime))
+        except (OSError, KeyError) as ex:
+            logfunc(f'Could not write file to filesystem, path was {path} ' + str(ex))
+
+    def _open_member(self, member):
+        '''Returns a binary file object reading an archive member'''
+        raise NotImplementedError
+
+    def _member_mtime(self, member):
+        '''Returns the modification time to set on an extracted member, or None'''
+        raise NotImplementedError
+
+
+class FileSeekerTar(FileSeekerArchive):
+    """
+    This is a class that extends FileSeekerArchive to facilitate searching and extracting files
     from a tar archive. It supports both gzip and regular tar files.
     Attributes:
         tar_file_path (str): The path to the tar file.
         data_folder (str): The directory where extracted files will be stored.
         is_gzip (bool): Indicates if the tar file is gzipped.
-        tar_file (tarfile.TarFile): The opened tar file object.
+        index_folder (str): The folder of the evidence indexes, or None to not keep one.
+        tar_file (tarfile.TarFile): The opened tar file object. A gzipped tar file is read
+            through scripts/gzip_index.py, which can seek without inflating from the start.
+        members (list): The tarfile.TarInfo of each member, loaded from the evidence index
+            when it has them.
         searched (dict): A dictionary to keep track of searched file patterns and their results.
         copied (dict): A dictionary to keep track of files that have been copied.
         file_infos (dict): A dictionary to store file information for extracted files.
     Methods:
-        __init__(tar_file_path, data_folder):
+        __init__(tar_file_path, data_folder, index_folder=None):
             Initializes the FileSeekerTar instance with the specified tar file path and data folder.
+            With an index_folder, the member list is saved there and reused on the next run.
         search(filepattern, return_on_first_hit=False, force=False):
             Searches for files matching the given pattern in the tar archive and extracts them to the data folder.
             Returns a list of paths to the extracted files or the first hit if specified.
+            With lazy extraction enabled, files matched for an artifact that declares
+            "lazy_extraction" are extracted by materialize() instead.
         cleanup():
             Closes the tar file to free up resources.
     """
-
-    def __init__(self, tar_file_path, data_folder):
-        FileSeekerBase.__init__(self)
+    def __init__(self, tar_file_path, data_folder, index_folder=None):
+        FileSeekerArchive.__init__(self)
+        self.tar_file_path = tar_file_path
         self.is_gzip = tar_file_path.lower().endswith('gz')
-        mode = 'r:gz' if self.is_gzip else 'r'
-        self.tar_file = tarfile.open(tar_file_path, mode)
+        self.index_folder = index_folder
+        self.tar_file = self._open_archive()
         self.data_folder = data_folder
         self.searched = {}
         self.copied = {}
         self.file_infos = {}
+        self.members = self._load_members()
+
+    def __getstate__(self):
+        # Open archive handles cannot be pickled; a worker process reopens the archive
+        state = FileSeekerBase.__getstate__(self)
+        del state['tar_file']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.tar_file = None
+        self._pid = None
+        self.reopen()
+
+    def _reopen(self):
+        reader = self.tar_file.fileobj if self.tar_file is not None and self.is_gzip else None
+        if isinstance(reader, GzipIndexedReader):
+            reader.reopen()  # keeps the seek points the main process built
+        else:
+            self.tar_file = self._open_archive()
+
+    def _gzip_index_path(self):
+        if self.index_folder is None:
+            return None
+        return get_index_path(self.tar_file_path, self.index_folder, '.gzidx')
+
+    def _open_archive(self):
+        if not self.is_gzip:
+            return tarfile.open(self.tar_file_path, 'r')
+        # A seekable reader, so extracting a member does not inflate the archive from its start
+        reader = open_indexed_gzip(self.tar_file_path, self._gzip_index_path())
+        return tarfile.open(fileobj=reader, mode='r:')
+
+    def _load_members(self):
+        if self.index_folder is not None:
+            members = load_tar_members(self.tar_file_path, self.index_folder)
+            if members is not None:
+                logfunc(f'Loaded the member list of {self.tar_file_path} from the evidence index')
+                return members
+        members = self.tar_file.getmembers()
+        if self.index_folder is not None:
+            save_tar_members(self.tar_file_path, self.index_folder, members)
+            if self.is_gzip:
+                save_gzip_index(self.tar_file.fileobj, self._gzip_index_path())
+        return members
 
     def search(self, filepattern, return_on_first_hit=False, force=False):
         if filepattern in self.searched and not force:
             pathlist = self.searched[filepattern]
-            return self.searched[filepattern][0] if return_on_first_hit and pathlist else pathlist
+            return self._materialize_found(
+                self.searched[filepattern][0] if return_on_first_hit and pathlist else pathlist)
         pathlist = []
         pat = _compile_pattern(normcase(filepattern))
         root = normcase("root/")
-        for member in self.tar_file.getmembers():
+        for position in self._candidates((member.name for member in self.members), filepattern):
+            member = self.members[position]
             if pat(root + normcase(member.name)) is not None:
                 clean_name = sanitize_file_path(member.name)
                 full_path = os.path.join(self.data_folder, Path(clean_name))
@@ -673,6 +1174,10 @@ class FileSeekerTar(FileSeekerBase):
                     try:
                         if member.isdir():
                             os.makedirs(full_path, exist_ok=True)
+                        elif self._defer_extraction and member.isfile():
+                            self._defer_member(member, full_path)
+                            self.file_infos[full_path] = FileInfo(member.name, 0, member.mtime)
+                            self.copied[member.name] = full_path
                         else:
                             parent_dir = os.path.dirname(full_path)
                             if not os.path.exists(parent_dir):
@@ -691,17 +1196,26 @@ class FileSeekerTar(FileSeekerBase):
                 pathlist.append(full_path)
                 if return_on_first_hit:
                     self.searched[filepattern] = pathlist
-                    return full_path
+                    return self._materialize_found(full_path)
         self.searched[filepattern] = pathlist
-        return pathlist
+        return self._materialize_found(pathlist)
+
+    def _open_member(self, member):
+        return self.tar_file.extractfile(member)
+
+    def _member_mtime(self, member):
+        return member.mtime
 
     def cleanup(self):
         self.tar_file.close()
+        if self.is_gzip:
+            # tarfile leaves a file object it was given open
+            self.tar_file.fileobj.close()
 
 
-class FileSeekerZip(FileSeekerBase):
+class FileSeekerZip(FileSeekerArchive):
     """
-    This is a class that extends FileSeekerBase to facilitate searching and extracting files from a ZIP archive.
+    This is a class that extends FileSeekerArchive to facilitate searching and extracting files from a ZIP archive.
     Attributes:
         zip_file (ZipFile): The ZIP file object representing the archive.
         name_list (list): A list of file names contained in the ZIP archive.
@@ -716,12 +1230,14 @@ class FileSeekerZip(FileSeekerBase):
             Decodes the extended timestamp information from the extra data of a file in the ZIP archive.
         search(filepattern, return_on_first_hit=False, force=False):
             Searches for files matching the specified pattern in the ZIP archive and extracts them if found.
+            With lazy extraction enabled, files matched for an artifact that declares
+            "lazy_extraction" are extracted by materialize() instead.
         cleanup():
             Closes the ZIP file to free up resources.
     """
-
     def __init__(self, zip_file_path, data_folder):
-        FileSeekerBase.__init__(self)
+        FileSeekerArchive.__init__(self)
+        self.zip_file_path = zip_file_path
         self.zip_file = ZipFile(zip_file_path)
         self.name_list = self.zip_file.namelist()
         self.data_folder = data_folder
@@ -729,6 +1245,20 @@ class FileSeekerZip(FileSeekerBase):
         self.copied = {}
         self.file_infos = {}
 
+    def __getstate__(self):
+        # Open archive handles cannot be pickled; a worker process reopens the archive
+        state = FileSeekerBase.__getstate__(self)
+        del state['zip_file']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._pid = None
+        self.reopen()
+
+    def _reopen(self):
+        self.zip_file = ZipFile(self.zip_file_path)
+
     def decode_extended_timestamp(self, extra_data):
         """
         Decode extended timestamps from the provided extra data.
@@ -764,24 +1294,30 @@ class FileSeekerZip(FileSeekerBase):
     def search(self, filepattern, return_on_first_hit=False, force=False):
         if filepattern in self.searched and not force:
             pathlist = self.searched[filepattern]
-            return self.searched[filepattern][0] if return_on_first_hit and pathlist else pathlist
+            return self._materialize_found(
+                self.searched[filepattern][0] if return_on_first_hit and pathlist else pathlist)
         pathlist = []
         pat = _compile_pattern(normcase(filepattern))
         root = normcase("root/")
-        for member in self.name_list:
+        for position in self._candidates(self.name_list, filepattern):
+            member = self.name_list[position]
             if member.startswith("__MACOSX"):
                 continue
             if pat(root + normcase(member)) is not None:
                 if member not in self.copied or force:
                     try:
-                        extracted_path = self._extract_member(member)
+                        if self._defer_extraction and not member.endswith('/'):
+                            extracted_path = self._member_path(member)
+                            self._defer_member(member, extracted_path)
+                        else:
+                            extracted_path = self._extract_member(member)
                         f = self.zip_file.getinfo(member)
                         creation_date, modification_date = self.decode_extended_timestamp(f.extra)
                         file_info = FileInfo(member, creation_date, modification_date)
                         self.file_infos[extracted_path] = file_info
-                        date_time = f.date_time
-                        date_time = timex.mktime(date_time + (0, 0, -1))
-                        os.utime(extracted_path, (date_time, date_time))
+                        if extracted_path not in self._deferred:
+                            date_time = self._member_mtime(member)
+                            os.utime(extracted_path, (date_time, date_time))
                         self.copied[member] = extracted_path
                     except OSError as ex:
                         logfunc(f'Could not write file to filesystem, path was {member} ' + str(ex))
@@ -791,9 +1327,25 @@ class FileSeekerZip(FileSeekerBase):
                 pathlist.append(extracted_path)
                 if return_on_first_hit:
                     self.searched[filepattern] = pathlist
-                    return extracted_path
+                    return self._materialize_found(extracted_path)
         self.searched[filepattern] = pathlist
-        return pathlist
+        return self._materialize_found(pathlist)
+
+    def _member_path(self, member):
+        """Returns the path _extract_member() extracts a member to."""
+        clean_member = sanitize_file_path(member)
+        parts = [part for part in clean_member.split('/')
+                 if part not in ('', '.', '..')]
+        if clean_member == member:
+            # ZipFile.extract() normalizes the path it writes to
+            return os.path.normpath(os.path.join(self.data_folder, *parts))
+        return os.path.join(self.data_folder, *parts)
+
+    def _open_member(self, member):
+        return self.zip_file.open(member)
+
+    def _member_mtime(self, member):
+        return timex.mktime(self.zip_file.getinfo(member).date_time + (0, 0, -1))
 
     def _extract_member(self, member):
         """Extract one member, sanitizing names ZipFile.extract() cannot write.
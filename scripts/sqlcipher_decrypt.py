@@ -6,12 +6,17 @@ an extra binary dependency.
 
 Only the subset needed to read an encrypted database is implemented: the file
 is decrypted to a plaintext copy which callers open with the stdlib sqlite3.
+The copy is written as the pages are decrypted, a chunk at a time, so databases
+of several GB decrypt in bounded memory.
 """
+import contextlib
 import hashlib
 import hmac
 import os
 import struct
 
+from concurrent.futures import ThreadPoolExecutor
+
 from Crypto.Cipher import AES
 
 DEFAULT_PAGE_SIZE = 4096
@@ -24,12 +29,24 @@ WAL_HEADER_SIZE = 32
 WAL_FRAME_HEADER_SIZE = 24
 WAL_MAGIC = (0x377F0682, 0x377F0683)
 
+# Pages read, decrypted and written at a time
+CHUNK_PAGES = 1024
+
+# Set from --workers by crunch_artifacts() and in each worker process of the artifact pool
+_workers = 1
+
 
 def _reserve_size(hmac_length):
     """Bytes reserved at the end of each page: IV + HMAC, padded to an AES block."""
     return ((IV_LENGTH + hmac_length + 15) // 16) * 16
 
 
+def set_sqlcipher_workers(workers):
+    """Sets the number of threads the pages of a database are decrypted across"""
+    global _workers  # pylint: disable=global-statement
+    _workers = max(1, workers)
+
+
 def _decrypt_page(page, page_number, encryption_key, hmac_key, digest, hmac_length, reserve,
                   page_size, plaintext_header_size=0):
     """Decrypt one SQLCipher page. Returns (plaintext_body, hmac_verified)."""
@@ -39,61 +56,96 @@ def _decrypt_page(page, page_number, encryption_key, hmac_key, digest, hmac_leng
     body_end = page_size - reserve
     iv = page[body_end:body_end + IV_LENGTH]
     stored_hmac = page[body_end + IV_LENGTH:body_end + IV_LENGTH + hmac_length]
-    calculated = hmac.new(hmac_key,
-                          page[body_start:body_end + IV_LENGTH]
-                          + page_number.to_bytes(4, 'little'),
-                          digest).digest()
+    mac = hmac.new(hmac_key, page[body_start:body_end + IV_LENGTH], digest)
+    mac.update(page_number.to_bytes(4, 'little'))
     body = AES.new(encryption_key, AES.MODE_CBC, iv).decrypt(page[body_start:body_end])
     if page_number == 1:
         # Restore the bytes that were never encrypted
-        body = (page[:plaintext_header_size] if plaintext_header_size
+        body = (bytes(page[:plaintext_header_size]) if plaintext_header_size
                 else b'SQLite format 3\x00') + body
-    return body + b'\x00' * reserve, hmac.compare_digest(calculated, stored_hmac)
+    return body + b'\x00' * reserve, hmac.compare_digest(mac.digest(), stored_hmac)
+
+
+def _decrypt_run(run, page_settings):
+    """Decrypt (page_number, page) pairs. Returns (plaintext bodies, pages verified)."""
+    bodies = []
+    verified = 0
+    for page_number, page in run:
+        body, page_ok = _decrypt_page(page, page_number, *page_settings)
+        bodies.append(body)
+        verified += page_ok
+    return bodies, verified
+
+
+def _decrypt_pages(pages, page_settings, executor, workers):
+    """Decrypt (page_number, page) pairs, split in one run per thread when there
+    is an executor. Returns (plaintext bodies in order, pages verified)."""
+    if executor is None or len(pages) < 2 * workers:
+        return _decrypt_run(pages, page_settings)
+    run_length = -(-len(pages) // workers)
+    bodies = []
+    verified = 0
+    for run_bodies, run_verified in executor.map(
+            _decrypt_run, [pages[start:start + run_length] for start in range(0, len(pages), run_length)],
+            [page_settings] * workers):
+        bodies.extend(run_bodies)
+        verified += run_verified
+    return bodies, verified
 
 
 def _wal_pages(wal_path, page_size):
-    """Yield (page_number, raw_encrypted_page) for the committed frames of a SQLCipher WAL.
+    """Locate the committed frames of a SQLCipher WAL.
 
     SQLCipher leaves the WAL and frame headers readable and encrypts only the page
-    payloads, so frames can be located without the key. Later frames supersede
-    earlier ones for the same page; anything after the final commit frame is an
-    incomplete transaction and is ignored.
-    """
-    with open(wal_path, 'rb') as wal_file:
-        wal = wal_file.read()
-    if len(wal) < WAL_HEADER_SIZE:
-        return {}, 0
-    if struct.unpack('>I', wal[0:4])[0] not in WAL_MAGIC:
-        return {}, 0
-
-    header_salts = wal[16:24]
-    frame_size = WAL_FRAME_HEADER_SIZE + page_size
-    frame_count = (len(wal) - WAL_HEADER_SIZE) // frame_size
+    payloads, so frames can be located without the key. Only the frame headers are
+    read. Later frames supersede earlier ones for the same page; anything after the
+    final commit frame is an incomplete transaction and is ignored.
 
-    latest = {}
+    Returns ({page_number: offset of its page in the WAL}, database size in pages
+    after the last commit, 0 when there is none).
+    """
     committed = {}
     database_pages = 0
-    for index in range(frame_count):
-        offset = WAL_HEADER_SIZE + index * frame_size
-        frame_header = wal[offset:offset + WAL_FRAME_HEADER_SIZE]
-        if frame_header[8:16] != header_salts:
-            continue  # frame belongs to an earlier WAL generation
-        page_number = struct.unpack('>I', frame_header[0:4])[0]
-        commit_size = struct.unpack('>I', frame_header[4:8])[0]
-        latest[page_number] = wal[offset + WAL_FRAME_HEADER_SIZE:offset + frame_size]
-        if commit_size:
-            # Transaction boundary: everything seen so far is durable
-            committed = dict(latest)
-            database_pages = commit_size
+    with open(wal_path, 'rb') as wal_file:
+        wal_header = wal_file.read(WAL_HEADER_SIZE)
+        if len(wal_header) < WAL_HEADER_SIZE:
+            return committed, database_pages
+        if struct.unpack('>I', wal_header[0:4])[0] not in WAL_MAGIC:
+            return committed, database_pages
+
+        header_salts = wal_header[16:24]
+        frame_size = WAL_FRAME_HEADER_SIZE + page_size
+        frame_count = (os.fstat(wal_file.fileno()).st_size - WAL_HEADER_SIZE) // frame_size
+
+        pending = {}
+        for index in range(frame_count):
+            offset = WAL_HEADER_SIZE + index * frame_size
+            wal_file.seek(offset)
+            frame_header = wal_file.read(WAL_FRAME_HEADER_SIZE)
+            if frame_header[8:16] != header_salts:
+                continue  # frame belongs to an earlier WAL generation
+            page_number, commit_size = struct.unpack('>II', frame_header[0:8])
+            if not page_number:
+                continue  # not a valid frame, pages are numbered from 1
+            pending[page_number] = offset + WAL_FRAME_HEADER_SIZE
+            if commit_size:
+                # Transaction boundary: everything seen so far is durable
+                committed.update(pending)
+                pending.clear()
+                database_pages = commit_size
     return committed, database_pages
 
 
 def decrypt_sqlcipher_db(encrypted_path, passphrase, output_path, page_size=DEFAULT_PAGE_SIZE,
                          kdf_iterations=1, hmac_algorithm='sha1', kdf_algorithm='sha1',
                          raw_key=False, apply_wal=True, plaintext_header_size=0,
-                         external_salt=None):
+                         external_salt=None, workers=None):
     """Decrypt a SQLCipher database to a plaintext SQLite file.
 
+    The database is read, decrypted and written CHUNK_PAGES pages at a time, and
+    committed WAL frames are then decrypted and written over their pages in place,
+    so memory use does not grow with the size of the database.
+
     Args:
         encrypted_path: path to the encrypted database.
         passphrase: passphrase string, or hex string when raw_key is True.
@@ -113,6 +165,9 @@ def decrypt_sqlcipher_db(encrypted_path, passphrase, output_path, page_size=DEFA
         external_salt: the 16 byte salt, when it is not stored in the file. A
             non-zero plaintext header displaces the salt, so it is kept with the
             key instead (Signal for iOS stores both together in the keychain).
+        workers: threads the pages of each chunk are decrypted across. AES and
+            the HMAC release the GIL, so this scales with cores. Defaults to the
+            number set with set_sqlcipher_workers() from --workers.
 
     Returns:
         (pages_decrypted, pages_whose_hmac_verified), counting replayed WAL frames
@@ -121,53 +176,60 @@ def decrypt_sqlcipher_db(encrypted_path, passphrase, output_path, page_size=DEFA
     """
     hmac_length = HMAC_LENGTHS[hmac_algorithm]
     reserve = _reserve_size(hmac_length)
+    workers = workers or _workers
 
-    with open(encrypted_path, 'rb') as encrypted_file:
-        raw = encrypted_file.read()
-    if len(raw) < page_size:
+    main_pages = os.path.getsize(encrypted_path) // page_size
+    if not main_pages:
         return 0, 0
 
-    salt = external_salt if external_salt else raw[:16]
-    if raw_key:
-        encryption_key = passphrase if isinstance(passphrase, (bytes, bytearray)) \
-            else bytes.fromhex(passphrase)
-    else:
-        encryption_key = hashlib.pbkdf2_hmac(kdf_algorithm, passphrase.encode(), salt,
-                                             kdf_iterations, 32)
-    hmac_key = hashlib.pbkdf2_hmac(kdf_algorithm, encryption_key,
-                                   bytes(byte ^ 0x3A for byte in salt), FAST_KDF_ITER, 32)
-
-    digest = getattr(hashlib, hmac_algorithm)
-    decrypted_pages = verified = 0
-
-    pages = []
-    for page_index in range(len(raw) // page_size):
-        body, page_ok = _decrypt_page(raw[page_index * page_size:(page_index + 1) * page_size],
-                                      page_index + 1, encryption_key, hmac_key, digest,
-                                      hmac_length, reserve, page_size, plaintext_header_size)
-        pages.append(body)
-        decrypted_pages += 1
-        verified += page_ok
-
-    # Recent activity often lives only in the write-ahead log, so replay it over
-    # the main database image before handing the file to sqlite3
-    if apply_wal:
-        wal_path = encrypted_path + '-wal'
-        if os.path.exists(wal_path):
-            wal_pages, database_pages = _wal_pages(wal_path, page_size)
-            for page_number, encrypted_page in sorted(wal_pages.items()):
-                body, page_ok = _decrypt_page(encrypted_page, page_number, encryption_key,
-                                              hmac_key, digest, hmac_length, reserve, page_size,
-                                              plaintext_header_size)
-                while len(pages) < page_number:
-                    pages.append(b'\x00' * page_size)
-                pages[page_number - 1] = body
-                decrypted_pages += 1
-                verified += page_ok
-            if database_pages:
-                pages = pages[:database_pages]
-
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, 'wb') as output_file:
-        output_file.write(b''.join(pages))
+    with open(encrypted_path, 'rb') as encrypted_file:
+        salt = external_salt if external_salt else encrypted_file.read(16)
+        if raw_key:
+            encryption_key = passphrase if isinstance(passphrase, (bytes, bytearray)) \
+                else bytes.fromhex(passphrase)
+        else:
+            encryption_key = hashlib.pbkdf2_hmac(kdf_algorithm, passphrase.encode(), salt,
+                                                 kdf_iterations, 32)
+        hmac_key = hashlib.pbkdf2_hmac(kdf_algorithm, encryption_key,
+                                       bytes(byte ^ 0x3A for byte in salt), FAST_KDF_ITER, 32)
+        page_settings = (encryption_key, hmac_key, getattr(hashlib, hmac_algorithm), hmac_length,
+                         reserve, page_size, plaintext_header_size)
+        decrypted_pages = verified = 0
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, 'wb') as output_file, \
+                ThreadPoolExecutor(max_workers=workers) if workers > 1 else contextlib.nullcontext() as executor:
+            encrypted_file.seek(0)
+            for first_page in range(1, main_pages + 1, CHUNK_PAGES):
+                chunk = memoryview(encrypted_file.read(min(CHUNK_PAGES, main_pages - first_page + 1) * page_size))
+                pages = [(first_page + index, chunk[index * page_size:(index + 1) * page_size])
+                         for index in range(len(chunk) // page_size)]
+                bodies, chunk_verified = _decrypt_pages(pages, page_settings, executor, workers)
+                output_file.write(b''.join(bodies))
+                decrypted_pages += len(bodies)
+                verified += chunk_verified
+
+            # Recent activity often lives only in the write-ahead log, so replay it over
+            # the main database image before handing the file to sqlite3
+            wal_path = encrypted_path + '-wal'
+            if apply_wal and os.path.exists(wal_path):
+                wal_pages, database_pages = _wal_pages(wal_path, page_size)
+                output_pages = main_pages
+                with open(wal_path, 'rb') as wal_file:
+                    page_numbers = sorted(wal_pages)
+                    for start in range(0, len(page_numbers), CHUNK_PAGES):
+                        pages = []
+                        for page_number in page_numbers[start:start + CHUNK_PAGES]:
+                            wal_file.seek(wal_pages[page_number])
+                            pages.append((page_number, wal_file.read(page_size)))
+                        bodies, chunk_verified = _decrypt_pages(pages, page_settings, executor, workers)
+                        for (page_number, _), body in zip(pages, bodies):
+                            # Writing past the end leaves the pages skipped zero filled
+                            output_file.seek((page_number - 1) * page_size)
+                            output_file.write(body)
+                            output_pages = max(output_pages, page_number)
+                        decrypted_pages += len(bodies)
+                        verified += chunk_verified
+                if database_pages and database_pages < output_pages:
+                    output_file.truncate(database_pages * page_size)
     return decrypted_pages, verified
@@ -0,0 +1,188 @@
+"""
+Timestamp conversion for whole columns.
+
+The artifacts convert timestamps a value at a time with the functions of
+scripts/ilapfuncs.py, a few Python calls per row. For the artifacts that return
+millions of rows, the functions of this module convert a whole column in one call
+instead: a list, a tuple, a NumPy array or any iterable of values, such as one column
+read from a cursor. convert_columns() converts columns of the rows of a query in place
+of a loop over them.
+
+Each function returns, for each value, exactly what its counterpart in ilapfuncs
+returns, empty values and the values it cannot convert included, and raises where it
+raises. When NumPy is installed, the numeric values are brought to whole seconds in
+bulk, with the magnitude rules of convert_unix_ts_in_seconds(), and turned into
+datetime objects by datetime.fromtimestamp() without a Python call per value. The
+values NumPy cannot take exactly (text, out of range values, integers too large for a
+double) go through the function of ilapfuncs. Without NumPy, every value does.
+
+    column                      function of ilapfuncs
+    convert_unix_ts_column      convert_unix_ts_to_utc
+    convert_cocoa_ts_column     convert_cocoa_core_data_ts_to_utc
+    webkit_timestamps_column    webkit_timestampsconv
+    convert_ts_int_column_to_timezone    convert_ts_int_to_timezone
+"""
+
+from datetime import datetime, timedelta, timezone
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from scripts.ilapfuncs import _UNIX_EPOCH_UTC, convert_cocoa_core_data_ts_to_utc, convert_ts_int_to_timezone, \
+    convert_ts_int_to_utc, convert_unix_ts_to_utc, get_timezone, webkit_timestampsconv
+
+COCOA_EPOCH_OFFSET = 978307200
+
+# The seconds from the Unix epoch of datetime.min and datetime.max
+_MIN_SECONDS = -62135596800
+_MAX_SECONDS = 253402300799
+
+_NUMERIC_TYPES = (int, float)
+
+
+def _numeric(values):
+    """
+    Splits a column into the positions of its int and float values, which NumPy takes, and
+    the rest. Returns (positions or None when every value is numeric, float64 array of the
+    numeric values, other positions).
+    """
+    if not values:
+        return None, np.empty(0), []
+    if set(map(type, values)).issubset(_NUMERIC_TYPES):
+        return None, np.array(values, dtype=np.float64), []
+    positions = []
+    others = []
+    for position, value in enumerate(values):
+        (positions if type(value) in _NUMERIC_TYPES else others).append(position)  # pylint: disable=unidiomatic-typecheck
+    return positions, np.array([values[position] for position in positions], dtype=np.float64), others
+
+
+def _from_seconds(seconds):
+    """Aware UTC datetimes for an int64 array of whole seconds within datetime's range"""
+    if not len(seconds):
+        return []
+    if seconds.min() >= 0:
+        return list(map(datetime.fromtimestamp, seconds.tolist(), repeat(timezone.utc)))
+    # fromtimestamp() raises for values before 1970 on some platforms, as ilapfuncs notes
+    return [datetime.fromtimestamp(second, timezone.utc) if second >= 0
+            else _UNIX_EPOCH_UTC + timedelta(seconds=second) for second in seconds.tolist()]
+
+
+def _convert_unix(values, offset, scalar):
+    """The epoch conversion of convert_unix_ts_to_utc(), after adding offset to each value"""
+    values = values if isinstance(values, list) else list(values)
+    if np is None:
+        return [scalar(value) for value in values]
+    result = list(values)
+    positions, x, others = _numeric(values)
+    for position in others:
+        result[position] = scalar(values[position])
+    if positions is None:
+        positions = range(len(values))
+
+    # Empty values are returned as they are, and a sum of zero as the sum
+    take = x != 0
+    if offset:
+        # An integer past 2**53 is added exactly before it is made a float
+        take &= np.abs(x) < 2 ** 53
+        x = x + offset
+        take &= x != 0
+    take &= np.isfinite(x) & (np.abs(x) < 2 ** 63)
+    ts = np.where(take, x, 0).astype(np.int64)
+    magnitude = np.abs(ts)
+    seconds = np.where(magnitude >= 10 ** 16, ts // 1_000_000_000,
+                       np.where(magnitude >= 10 ** 13, ts // 1_000_000,
+                                np.where(magnitude >= 10 ** 10, ts // 1_000, ts)))
+    in_range = take & (seconds >= _MIN_SECONDS) & (seconds <= _MAX_SECONDS)
+
+    indexes = np.flatnonzero(in_range).tolist()
+    for index, converted in zip(indexes, _from_seconds(seconds[in_range])):
+        result[positions[index]] = converted
+    for index in np.flatnonzero(~in_range).tolist():
+        position = positions[index]
+        if values[position]:
+            result[position] = scalar(values[position])
+    return result
+
+
+def convert_unix_ts_column(values):
+    """
+    Converts a column of Unix timestamps in seconds, milliseconds, microseconds or
+    nanoseconds, as convert_unix_ts_to_utc() converts each value. Returns a list.
+    """
+    return _convert_unix(values, 0, convert_unix_ts_to_utc)
+
+
+def convert_cocoa_ts_column(values):
+    """
+    Converts a column of Cocoa Core Data timestamps, as convert_cocoa_core_data_ts_to_utc()
+    converts each value. Returns a list.
+    """
+    return _convert_unix(values, COCOA_EPOCH_OFFSET, convert_cocoa_core_data_ts_to_utc)
+
+
+def webkit_timestamps_column(values):
+    """
+    Converts a column of Cocoa timestamps keeping their microseconds, as
+    webkit_timestampsconv() converts each value. Returns a list.
+    """
+    values = values if isinstance(values, list) else list(values)
+    if np is None:
+        return [webkit_timestampsconv(value) for value in values]
+    result = list(values)
+    positions, x, others = _numeric(values)
+    for position in others:
+        result[position] = webkit_timestampsconv(values[position])
+    if positions is None:
+        positions = range(len(values))
+    exact = np.abs(x) < 2 ** 53
+    for index, timestamp in zip(np.flatnonzero(exact).tolist(), (x[exact] + COCOA_EPOCH_OFFSET).tolist()):
+        result[positions[index]] = datetime.fromtimestamp(timestamp, timezone.utc)
+    for index in np.flatnonzero(~exact).tolist():
+        result[positions[index]] = webkit_timestampsconv(values[positions[index]])
+    return result
+
+
+def convert_ts_int_column_to_timezone(values, time_offset):
+    """
+    Converts a column of Unix timestamps in seconds to a timezone, as
+    convert_ts_int_to_timezone() converts each value. Returns a list.
+    """
+    values = values if isinstance(values, list) else list(values)
+    if np is None:
+        return [convert_ts_int_to_timezone(value, time_offset) for value in values]
+    tz_info = get_timezone(time_offset)
+    result = list(values)
+    positions, x, others = _numeric(values)
+    for position in others:
+        result[position] = convert_ts_int_to_timezone(values[position], time_offset)
+    if positions is None:
+        positions = range(len(values))
+    # Whole seconds only: convert_ts_int_to_utc() rounds a fraction as timedelta does
+    take = (np.floor(x) == x) & (x >= _MIN_SECONDS) & (x <= _MAX_SECONDS)
+    indexes = np.flatnonzero(take).tolist()
+    for index, converted in zip(indexes, _from_seconds(x[take].astype(np.int64))):
+        result[positions[index]] = converted.astimezone(tz_info)
+    for index in np.flatnonzero(~take).tolist():
+        result[positions[index]] = convert_ts_int_to_utc(values[positions[index]]).astimezone(tz_info)
+    return result
+
+
+def convert_columns(rows, converters):
+    """
+    Converts columns of a list of rows, such as those of a cursor, each with one call.
+    Args:
+        rows (iterable): The rows, each a sequence.
+        converters (dict): The function converting a column, such as
+            convert_unix_ts_column, by column index.
+    Returns:
+        list: The rows as lists, with the columns converted.
+    """
+    rows = [list(row) for row in rows]
+    for index, converter in converters.items():
+        for row, value in zip(rows, converter([row[index] for row in rows])):
+            row[index] = value
+    return rows